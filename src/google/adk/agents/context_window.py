@@ -0,0 +1,400 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Token budgets for the contents of LLM requests.
+
+An agent with a `ContextWindowConfig` fits the contents of each LLM request to
+a token budget, estimated locally. The history is cut at turn boundaries,
+i.e. before user contents that are not function responses, so function calls
+always stay with their responses. The last turn is always kept.
+"""
+
+from __future__ import annotations
+
+import abc
+import collections
+import json
+from typing import Any
+from typing import Callable
+from typing import Optional
+from typing import TYPE_CHECKING
+from typing import Union
+
+from google.genai import types
+from pydantic import BaseModel
+from pydantic import ConfigDict
+from pydantic import Field
+from typing_extensions import override
+
+if TYPE_CHECKING:
+  from ..models.base_llm import BaseLlm
+  from .invocation_context import InvocationContext
+
+TokenEstimator = Callable[[types.Content], int]
+
+_CHARS_PER_TOKEN = 4
+# Gemini bills images, and each second of video or audio, as 258 tokens.
+_MEDIA_TOKENS = 258
+
+
+def estimate_tokens(content: types.Content) -> int:
+  """Estimates the number of tokens of a content, from its size."""
+  num_chars = 0
+  num_tokens = 0
+  for part in content.parts or []:
+    if part.text:
+      num_chars += len(part.text)
+    elif part.function_call:
+      num_chars += len(part.function_call.name or '')
+      num_chars += _json_length(part.function_call.args)
+    elif part.function_response:
+      num_chars += len(part.function_response.name or '')
+      num_chars += _json_length(part.function_response.response)
+    elif part.executable_code:
+      num_chars += len(part.executable_code.code or '')
+    elif part.code_execution_result:
+      num_chars += len(part.code_execution_result.output or '')
+    elif part.inline_data or part.file_data:
+      num_tokens += _MEDIA_TOKENS
+  return num_tokens + -(-num_chars // _CHARS_PER_TOKEN)
+
+
+class ContextWindowStrategy(abc.ABC):
+  """Fits the contents of LLM requests to a token budget."""
+
+  @abc.abstractmethod
+  async def fit(
+      self,
+      contents: list[types.Content],
+      *,
+      max_tokens: int,
+      estimate_tokens: TokenEstimator,
+      invocation_context: InvocationContext,
+  ) -> list[types.Content]:
+    """Returns the contents to send, within `max_tokens` if possible.
+
+    The parts of `contents` are shared with the session history and must not be
+    modified.
+
+    Args:
+      contents: The contents of the request, in chronological order.
+      max_tokens: The token budget of the contents.
+      estimate_tokens: Estimates the number of tokens of a content.
+      invocation_context: The context of the invocation.
+
+    Returns:
+      The contents to send instead. They exceed `max_tokens` only if the last
+      turn does on its own.
+    """
+
+
+class KeepRecentTurns(ContextWindowStrategy):
+  """Keeps the most recent turns that fit the budget."""
+
+  def __init__(self, max_turns: Optional[int] = None):
+    """
+    Args:
+      max_turns: The maximum number of turns to keep, however small they are.
+    """
+    self.max_turns = max_turns
+
+  @override
+  async def fit(
+      self,
+      contents: list[types.Content],
+      *,
+      max_tokens: int,
+      estimate_tokens: TokenEstimator,
+      invocation_context: InvocationContext,
+  ) -> list[types.Content]:
+    turn_starts = _turn_starts(contents)
+    if self.max_turns is not None and len(turn_starts) > self.max_turns:
+      contents = contents[turn_starts[-max(self.max_turns, 1)] :]
+    return _evict_oldest_turns(contents, max_tokens, estimate_tokens)[1]
+
+
+class DropToolPayloads(ContextWindowStrategy):
+  """Drops the function responses of older turns, then the oldest turns.
+
+  Function responses of older turns are replaced by a placeholder, since they
+  are usually large and not needed anymore once the model answered them.
+  """
+
+  def __init__(
+      self,
+      keep_recent_turns: int = 1,
+      placeholder: str = 'Omitted to fit the context window.',
+  ):
+    """
+    Args:
+      keep_recent_turns: The number of most recent turns whose function
+        responses are kept.
+      placeholder: The result reported instead of a dropped function response.
+    """
+    self.keep_recent_turns = keep_recent_turns
+    self.placeholder = placeholder
+
+  @override
+  async def fit(
+      self,
+      contents: list[types.Content],
+      *,
+      max_tokens: int,
+      estimate_tokens: TokenEstimator,
+      invocation_context: InvocationContext,
+  ) -> list[types.Content]:
+    if sum(estimate_tokens(content) for content in contents) <= max_tokens:
+      return contents
+    turn_starts = _turn_starts(contents)
+    if self.keep_recent_turns <= 0:
+      num_older_contents = len(contents)
+    elif self.keep_recent_turns <= len(turn_starts):
+      num_older_contents = turn_starts[-self.keep_recent_turns]
+    else:
+      num_older_contents = 0
+    contents = [
+        self._drop_function_responses(content)
+        for content in contents[:num_older_contents]
+    ] + contents[num_older_contents:]
+    return _evict_oldest_turns(contents, max_tokens, estimate_tokens)[1]
+
+  def _drop_function_responses(self, content: types.Content) -> types.Content:
+    if not any(part.function_response for part in content.parts or []):
+      return content
+    parts = [
+        types.Part(
+            function_response=types.FunctionResponse(
+                id=part.function_response.id,
+                name=part.function_response.name,
+                response={'result': self.placeholder},
+            )
+        )
+        if part.function_response
+        else part
+        for part in content.parts
+    ]
+    return content.model_copy(update={'parts': parts})
+
+
+class SummarizeEvictedHistory(ContextWindowStrategy):
+  """Replaces the evicted turns by a rolling summary.
+
+  The oldest turns are evicted until the contents fit `target_ratio` of the
+  budget, and summarized by an LLM. The window then stays put, and the summary
+  is reused, as long as the contents fit the budget. When the window moves,
+  the newly evicted turns are summarized together with the previous summary.
+
+  Summaries are cached per session, branch and agent, in memory.
+  """
+
+  def __init__(
+      self,
+      model: Optional[Union[str, BaseLlm]] = None,
+      *,
+      target_ratio: float = 0.75,
+      instruction: str = (
+          'Summarize the following conversation between a user and an AI'
+          ' agent. Keep the facts, decisions and open questions the agent needs'
+          ' to continue the conversation. Reply with the summary only.'
+      ),
+      max_cached_summaries: int = 1000,
+  ):
+    """
+    Args:
+      model: The model writing the summaries. Defaults to the model of the
+        agent.
+      target_ratio: The ratio of the budget the contents are cut down to when
+        the window moves, so that it does not move on every turn.
+      instruction: The system instruction of the summarization requests.
+      max_cached_summaries: The maximum number of summaries cached. The least
+        recently used ones are dropped first.
+    """
+    self.model = model
+    self.target_ratio = target_ratio
+    self.instruction = instruction
+    self.max_cached_summaries = max_cached_summaries
+    # The number of evicted contents, the last of them, and their summary, by
+    # session, branch and agent.
+    self._summaries: collections.OrderedDict[
+        tuple[str, str, str, Optional[str], str],
+        tuple[int, types.Content, types.Content],
+    ] = collections.OrderedDict()
+
+  @override
+  async def fit(
+      self,
+      contents: list[types.Content],
+      *,
+      max_tokens: int,
+      estimate_tokens: TokenEstimator,
+      invocation_context: InvocationContext,
+  ) -> list[types.Content]:
+    key = (
+        invocation_context.app_name,
+        invocation_context.user_id,
+        invocation_context.session.id,
+        invocation_context.branch,
+        invocation_context.agent.name,
+    )
+    cached = self._summaries.get(key)
+    if cached and not _is_cached_summary_valid(cached, contents):
+      # The history changed, e.g. by a compaction of the session.
+      del self._summaries[key]
+      cached = None
+    if cached:
+      num_evicted, _, summary = cached
+      kept = [summary] + contents[num_evicted:]
+      if sum(estimate_tokens(content) for content in kept) <= max_tokens:
+        # The window did not move.
+        self._summaries.move_to_end(key)
+        return kept
+      summary_tokens = estimate_tokens(summary)
+    else:
+      if sum(estimate_tokens(content) for content in contents) <= max_tokens:
+        return contents
+      num_evicted, summary, summary_tokens = 0, None, 0
+
+    # Leaves room for the summary, assuming it does not grow much.
+    evicted, kept = _evict_oldest_turns(
+        contents[num_evicted:],
+        max(int(max_tokens * self.target_ratio) - summary_tokens, 0),
+        estimate_tokens,
+    )
+    if not evicted:
+      return ([summary] if summary else []) + kept
+    summary = await self._summarize(summary, evicted, invocation_context)
+    num_evicted += len(evicted)
+    self._summaries[key] = (num_evicted, contents[num_evicted - 1], summary)
+    self._summaries.move_to_end(key)
+    while len(self._summaries) > self.max_cached_summaries:
+      self._summaries.popitem(last=False)
+    return [summary] + kept
+
+  async def _summarize(
+      self,
+      previous_summary: Optional[types.Content],
+      evicted: list[types.Content],
+      invocation_context: InvocationContext,
+  ) -> types.Content:
+    from ..models.llm_request import LlmRequest
+    from ..models.registry import LLMRegistry
+
+    if self.model is None:
+      llm = invocation_context.agent.canonical_model
+    elif isinstance(self.model, str):
+      llm = LLMRegistry.get_llm(self.model)
+    else:
+      llm = self.model
+    transcript = '\n'.join(
+        _transcript_line(content)
+        for content in (
+            [previous_summary] if previous_summary else []
+        ) + evicted
+    )
+    llm_request = LlmRequest(
+        model=llm.model,
+        contents=[types.UserContent(transcript)],
+        config=types.GenerateContentConfig(system_instruction=self.instruction),
+    )
+    texts = []
+    async for llm_response in llm.generate_content_async(llm_request):
+      if llm_response.content and llm_response.content.parts:
+        texts.extend(
+            part.text for part in llm_response.content.parts if part.text
+        )
+    return types.UserContent(
+        f'Summary of the earlier conversation: {"".join(texts)}'
+    )
+
+
+class ContextWindowConfig(BaseModel):
+  """The token budget of the contents of the LLM requests of an agent."""
+
+  model_config = ConfigDict(arbitrary_types_allowed=True)
+
+  max_tokens: int = Field(gt=0)
+  """The maximum number of tokens of the contents, as estimated by
+  `token_estimator`."""
+  strategy: ContextWindowStrategy = Field(default_factory=KeepRecentTurns)
+  """How the contents are fit to the budget."""
+  token_estimator: TokenEstimator = estimate_tokens
+  """Estimates the number of tokens of a content."""
+
+
+def _is_cached_summary_valid(
+    cached: tuple[int, types.Content, types.Content],
+    contents: list[types.Content],
+) -> bool:
+  """Whether contents still start with the contents a summary was made of."""
+  num_evicted, last_evicted, _ = cached
+  return (
+      num_evicted < len(contents)
+      and contents[num_evicted - 1] == last_evicted
+      and num_evicted in _turn_starts(contents)
+  )
+
+
+def _turn_starts(contents: list[types.Content]) -> list[int]:
+  """The indices of the contents starting a turn."""
+  return [
+      i
+      for i, content in enumerate(contents)
+      if content.role == 'user'
+      and not any(part.function_response for part in content.parts or [])
+  ]
+
+
+def _evict_oldest_turns(
+    contents: list[types.Content],
+    max_tokens: int,
+    estimate_tokens: TokenEstimator,
+) -> tuple[list[types.Content], list[types.Content]]:
+  """Splits contents into the oldest turns and the most recent ones that fit."""
+  num_tokens = [estimate_tokens(content) for content in contents]
+  total_tokens = sum(num_tokens)
+  if total_tokens <= max_tokens:
+    return [], contents
+  cut = 0
+  for turn_start in _turn_starts(contents):
+    if turn_start == 0:
+      continue
+    total_tokens -= sum(num_tokens[cut:turn_start])
+    cut = turn_start
+    if total_tokens <= max_tokens:
+      break
+  return contents[:cut], contents[cut:]
+
+
+def _json_length(value: Any) -> int:
+  if not value:
+    return 0
+  return len(json.dumps(value, default=str))
+
+
+def _transcript_line(content: types.Content) -> str:
+  texts = []
+  for part in content.parts or []:
+    if part.text:
+      texts.append(part.text)
+    elif part.function_call:
+      texts.append(
+          f'called tool `{part.function_call.name}` with parameters:'
+          f' {part.function_call.args}'
+      )
+    elif part.function_response:
+      texts.append(
+          f'tool `{part.function_response.name}` returned result:'
+          f' {part.function_response.response}'
+      )
+  return f'[{content.role}] {" ".join(texts)}'
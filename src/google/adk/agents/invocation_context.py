@@ -14,6 +14,7 @@
 
 from __future__ import annotations
 
+from typing import Any
 from typing import Optional
 import uuid
 
@@ -155,6 +156,28 @@ class InvocationContext(BaseModel):
   of this invocation.
   """
 
+  _contents_builders: dict[tuple[Optional[str], str], Any] = {}
+  """The builders of the LLM request contents, by branch and agent name.
+
+  Shared with the contexts copied from this one, so that each step of an agent
+  only processes the events added since its previous step.
+  """
+
+  _rendered_instructions: dict[str, Any] = {}
+  """The rendered instructions of this invocation, by instruction template.
+
+  Shared with the contexts copied from this one, so that instructions are only
+  rendered again when the state or artifacts they depend on change.
+  """
+
+  _hydrated_blobs: dict[str, types.Part] = {}
+  """The blobs offloaded by the session service that were loaded back into the
+  LLM requests of this invocation, by blob URI.
+
+  Shared with the contexts copied from this one, so that each blob is only
+  loaded once per invocation.
+  """
+
   def increment_llm_call_count(
       self,
   ):
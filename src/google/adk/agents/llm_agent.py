@@ -47,6 +47,7 @@ from ..tools.function_tool import FunctionTool
 from ..tools.tool_context import ToolContext
 from .base_agent import BaseAgent
 from .callback_context import CallbackContext
+from .context_window import ContextWindowConfig
 from .invocation_context import InvocationContext
 from .readonly_context import ReadonlyContext
 
@@ -109,6 +110,12 @@ class LlmAgent(BaseAgent):
   tools: list[ToolUnion] = Field(default_factory=list)
   """Tools available to this agent."""
 
+  max_concurrent_tool_calls: int = Field(default=10, ge=1)
+  """The maximum number of function calls of a model response run concurrently.
+
+  Set it to 1 to run the function calls one after another.
+  """
+
   generate_content_config: Optional[types.GenerateContentConfig] = None
   """The additional content generation configurations.
 
@@ -126,12 +133,21 @@ class LlmAgent(BaseAgent):
   """Disallows LLM-controlled transferring to the peer agents."""
   # LLM-based agent transfer configs - End
 
+  _canonical_tools_cache: tuple[list[ToolUnion], list[BaseTool]] = ([], [])
+  """The tools, as of the last conversion, and their conversion to BaseTool."""
+
   include_contents: Literal['default', 'none'] = 'default'
   """Whether to include contents in the model request.
 
   When set to 'none', the model request will not include any contents, such as
   user messages, tool results, etc.
   """
+  context_window: Optional[ContextWindowConfig] = None
+  """The token budget of the contents of the model requests.
+
+  Older turns are evicted, or summarized, according to its strategy to fit the
+  budget. The contents are not bounded if not set.
+  """
 
   # Controlled input/output configurations - Start
   input_schema: Optional[type[BaseModel]] = None
@@ -252,7 +268,7 @@ class LlmAgent(BaseAgent):
     if isinstance(self.model, BaseLlm):
       return self.model
     elif self.model:  # model is non-empty str
-      return LLMRegistry.new_llm(self.model)
+      return LLMRegistry.get_llm(self.model)
     else:  # find model from ancestors.
       ancestor_agent = self.parent_agent
       while ancestor_agent is not None:
@@ -287,7 +303,19 @@ class LlmAgent(BaseAgent):
 
     This method is only for use by Agent Development Kit.
     """
-    return [_convert_tool_union_to_tool(tool) for tool in self.tools]
+    # The tools are converted again only once self.tools changed, so that the
+    # converted tools keep their cached function declarations across steps.
+    cached_tools, canonical_tools = self._canonical_tools_cache
+    if len(cached_tools) != len(self.tools) or any(
+        cached_tool is not tool
+        for cached_tool, tool in zip(cached_tools, self.tools)
+    ):
+      cached_tools = list(self.tools)
+      canonical_tools = [
+          _convert_tool_union_to_tool(tool) for tool in cached_tools
+      ]
+      self._canonical_tools_cache = (cached_tools, canonical_tools)
+    return list(canonical_tools)
 
   @property
   def _llm_flow(self) -> BaseLlmFlow:
@@ -118,7 +118,7 @@ async def run_cli(
 
   artifact_service = InMemoryArtifactService()
   session_service = InMemorySessionService()
-  session = session_service.create_session(
+  session = await session_service.create_session_async(
       app_name=agent_folder_name, user_id='test_user'
   )
 
@@ -172,7 +172,7 @@ async def run_cli(
       session_path = f'{agent_module_path}/{session_id}.session.json'
 
     # Fetch the session again to get all the details.
-    session = session_service.get_session(
+    session = await session_service.get_session_async(
         app_name=session.app_name,
         user_id=session.user_id,
         session_id=session.id,
@@ -20,6 +20,7 @@ import os
 import sys
 import traceback
 from typing import Any
+from typing import AsyncGenerator
 from typing import Generator
 from typing import Optional
 import uuid
@@ -157,12 +158,93 @@ def run_evals(
 ) -> Generator[EvalResult, None, None]:
   try:
     from ..evaluation.agent_evaluator import EvaluationGenerator
-    from ..evaluation.response_evaluator import ResponseEvaluator
-    from ..evaluation.trajectory_evaluator import TrajectoryEvaluator
   except ModuleNotFoundError as e:
     raise ModuleNotFoundError(MISSING_EVAL_DEPENDENCIES_MESSAGE) from e
 
   """Returns a summary of eval runs."""
+  for eval_set_file, eval_name, eval_data, initial_session in _get_eval_items(
+      eval_set_to_evals
+  ):
+    try:
+      print(f"Running Eval: {eval_set_file}:{eval_name}")
+      session_id = f"{EVAL_SESSION_ID_PREFIX}{str(uuid.uuid4())}"
+
+      scrape_result = EvaluationGenerator._process_query_with_root_agent(
+          data=eval_data,
+          root_agent=root_agent,
+          reset_func=reset_func,
+          initial_session=initial_session,
+          session_id=session_id,
+          session_service=session_service,
+          artifact_service=artifact_service,
+      )
+
+      yield _evaluate_scrape_result(
+          eval_set_file,
+          eval_name,
+          session_id,
+          scrape_result,
+          eval_metrics,
+          print_detailed_results,
+      )
+
+    except Exception as e:
+      print(f"Error: {e}")
+      logger.info("Error: %s", str(traceback.format_exc()))
+
+
+async def run_evals_async(
+    eval_set_to_evals: dict[str, list[str]],
+    root_agent: Agent,
+    reset_func: Optional[Any],
+    eval_metrics: list[EvalMetric],
+    session_service=None,
+    artifact_service=None,
+    print_detailed_results=False,
+) -> AsyncGenerator[EvalResult, None]:
+  """Runs evals like `run_evals`, with the async API of the session service."""
+  try:
+    from ..evaluation.agent_evaluator import EvaluationGenerator
+  except ModuleNotFoundError as e:
+    raise ModuleNotFoundError(MISSING_EVAL_DEPENDENCIES_MESSAGE) from e
+
+  for eval_set_file, eval_name, eval_data, initial_session in _get_eval_items(
+      eval_set_to_evals
+  ):
+    try:
+      print(f"Running Eval: {eval_set_file}:{eval_name}")
+      session_id = f"{EVAL_SESSION_ID_PREFIX}{str(uuid.uuid4())}"
+
+      scrape_result = (
+          await EvaluationGenerator._process_query_with_root_agent_async(
+              data=eval_data,
+              root_agent=root_agent,
+              reset_func=reset_func,
+              initial_session=initial_session,
+              session_id=session_id,
+              session_service=session_service,
+              artifact_service=artifact_service,
+          )
+      )
+
+      yield _evaluate_scrape_result(
+          eval_set_file,
+          eval_name,
+          session_id,
+          scrape_result,
+          eval_metrics,
+          print_detailed_results,
+      )
+
+    except Exception as e:
+      print(f"Error: {e}")
+      logger.info("Error: %s", str(traceback.format_exc()))
+
+
+def _get_eval_items(
+    eval_set_to_evals: dict[str, list[str]],
+) -> Generator[tuple[str, str, Any, dict[str, Any]], None, None]:
+  """Yields the eval set file, name, data and initial session of each eval."""
   for eval_set_file, evals_to_run in eval_set_to_evals.items():
     with open(eval_set_file, "r", encoding="utf-8") as file:
       eval_items = json.load(file)  # Load JSON into a list
@@ -177,94 +259,91 @@ def run_evals(
       if evals_to_run and eval_name not in evals_to_run:
         continue
 
-      try:
-        print(f"Running Eval: {eval_set_file}:{eval_name}")
-        session_id = f"{EVAL_SESSION_ID_PREFIX}{str(uuid.uuid4())}"
-
-        scrape_result = EvaluationGenerator._process_query_with_root_agent(
-            data=eval_data,
-            root_agent=root_agent,
-            reset_func=reset_func,
-            initial_session=initial_session,
-            session_id=session_id,
-            session_service=session_service,
-            artifact_service=artifact_service,
-        )
-
-        eval_metric_results = []
-        for eval_metric in eval_metrics:
-          eval_metric_result = None
-          if eval_metric.metric_name == TOOL_TRAJECTORY_SCORE_KEY:
-            score = TrajectoryEvaluator.evaluate(
-                [scrape_result], print_detailed_results=print_detailed_results
-            )
-            eval_metric_result = _get_eval_metric_result(eval_metric, score)
-          elif eval_metric.metric_name == RESPONSE_MATCH_SCORE_KEY:
-            score = ResponseEvaluator.evaluate(
-                [scrape_result],
-                [RESPONSE_MATCH_SCORE_KEY],
-                print_detailed_results=print_detailed_results,
-            )
-            eval_metric_result = _get_eval_metric_result(
-                eval_metric, score["rouge_1/mean"].item()
-            )
-          elif eval_metric.metric_name == RESPONSE_EVALUATION_SCORE_KEY:
-            score = ResponseEvaluator.evaluate(
-                [scrape_result],
-                [RESPONSE_EVALUATION_SCORE_KEY],
-                print_detailed_results=print_detailed_results,
-            )
-            eval_metric_result = _get_eval_metric_result(
-                eval_metric, score["coherence/mean"].item()
-            )
-          else:
-            logger.warning("`%s` is not supported.", eval_metric.metric_name)
-            eval_metric_results.append((
-                eval_metric,
-                EvalMetricResult(eval_status=EvalStatus.NOT_EVALUATED),
-            ))
-
-          eval_metric_results.append((
-              eval_metric,
-              eval_metric_result,
-          ))
-          _print_eval_metric_result(eval_metric, eval_metric_result)
-
-        final_eval_status = EvalStatus.NOT_EVALUATED
-
-        # Go over the all the eval statuses and mark the final eval status as
-        # passed if all of them pass, otherwise mark the final eval status to
-        # failed.
-        for eval_metric_result in eval_metric_results:
-          eval_status = eval_metric_result[1].eval_status
-          if eval_status == EvalStatus.PASSED:
-            final_eval_status = EvalStatus.PASSED
-          elif eval_status == EvalStatus.NOT_EVALUATED:
-            continue
-          elif eval_status == EvalStatus.FAILED:
-            final_eval_status = EvalStatus.FAILED
-            break
-          else:
-            raise ValueError("Unknown eval status.")
-
-        yield EvalResult(
-            eval_set_file=eval_set_file,
-            eval_id=eval_name,
-            final_eval_status=final_eval_status,
-            eval_metric_results=eval_metric_results,
-            session_id=session_id,
-        )
-
-        if final_eval_status == EvalStatus.PASSED:
-          result = "✅ Passed"
-        else:
-          result = "❌ Failed"
-
-        print(f"Result: {result}\n")
-
-      except Exception as e:
-        print(f"Error: {e}")
-        logger.info("Error: %s", str(traceback.format_exc()))
+      yield eval_set_file, eval_name, eval_data, initial_session
+
+
+def _evaluate_scrape_result(
+    eval_set_file: str,
+    eval_name: str,
+    session_id: str,
+    scrape_result: Any,
+    eval_metrics: list[EvalMetric],
+    print_detailed_results: bool,
+) -> EvalResult:
+  """Scores the responses of an eval run against the eval metrics."""
+  from ..evaluation.response_evaluator import ResponseEvaluator
+  from ..evaluation.trajectory_evaluator import TrajectoryEvaluator
+
+  eval_metric_results = []
+  for eval_metric in eval_metrics:
+    eval_metric_result = None
+    if eval_metric.metric_name == TOOL_TRAJECTORY_SCORE_KEY:
+      score = TrajectoryEvaluator.evaluate(
+          [scrape_result], print_detailed_results=print_detailed_results
+      )
+      eval_metric_result = _get_eval_metric_result(eval_metric, score)
+    elif eval_metric.metric_name == RESPONSE_MATCH_SCORE_KEY:
+      score = ResponseEvaluator.evaluate(
+          [scrape_result],
+          [RESPONSE_MATCH_SCORE_KEY],
+          print_detailed_results=print_detailed_results,
+      )
+      eval_metric_result = _get_eval_metric_result(
+          eval_metric, score["rouge_1/mean"].item()
+      )
+    elif eval_metric.metric_name == RESPONSE_EVALUATION_SCORE_KEY:
+      score = ResponseEvaluator.evaluate(
+          [scrape_result],
+          [RESPONSE_EVALUATION_SCORE_KEY],
+          print_detailed_results=print_detailed_results,
+      )
+      eval_metric_result = _get_eval_metric_result(
+          eval_metric, score["coherence/mean"].item()
+      )
+    else:
+      logger.warning("`%s` is not supported.", eval_metric.metric_name)
+      eval_metric_results.append((
+          eval_metric,
+          EvalMetricResult(eval_status=EvalStatus.NOT_EVALUATED),
+      ))
+
+    eval_metric_results.append((
+        eval_metric,
+        eval_metric_result,
+    ))
+    _print_eval_metric_result(eval_metric, eval_metric_result)
+
+  final_eval_status = EvalStatus.NOT_EVALUATED
+
+  # Go over the all the eval statuses and mark the final eval status as
+  # passed if all of them pass, otherwise mark the final eval status to
+  # failed.
+  for eval_metric_result in eval_metric_results:
+    eval_status = eval_metric_result[1].eval_status
+    if eval_status == EvalStatus.PASSED:
+      final_eval_status = EvalStatus.PASSED
+    elif eval_status == EvalStatus.NOT_EVALUATED:
+      continue
+    elif eval_status == EvalStatus.FAILED:
+      final_eval_status = EvalStatus.FAILED
+      break
+    else:
+      raise ValueError("Unknown eval status.")
+
+  if final_eval_status == EvalStatus.PASSED:
+    result = "✅ Passed"
+  else:
+    result = "❌ Failed"
+
+  print(f"Result: {result}\n")
+
+  return EvalResult(
+      eval_set_file=eval_set_file,
+      eval_id=eval_name,
+      final_eval_status=final_eval_status,
+      eval_metric_results=eval_metric_results,
+      session_id=session_id,
+  )
 
 
 def _get_eval_metric_result(eval_metric, score):
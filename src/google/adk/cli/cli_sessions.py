@@ -0,0 +1,112 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from typing import Optional
+
+import click
+from sqlalchemy.engine import make_url
+
+from ..sessions.base_session_service import BaseSessionService
+from ..sessions.session_export import export_sessions
+from ..sessions.session_export import ExportFormat
+from ..sessions.session_export import import_sessions
+from ..sessions.session_export import open_session_record_writer
+from ..sessions.session_export import read_session_records
+
+
+def is_async_db_url(db_url: str) -> bool:
+  """Whether the database URL uses an asyncio driver, e.g. asyncpg."""
+  try:
+    return make_url(db_url).get_dialect().is_async
+  except Exception:
+    return False
+
+
+def create_session_service(session_db_url: str) -> BaseSessionService:
+  """Creates the session service of a `--session_db_url`."""
+  if session_db_url.startswith("agentengine://"):
+    from ..sessions.vertex_ai_session_service import VertexAiSessionService
+
+    return VertexAiSessionService(
+        os.environ["GOOGLE_CLOUD_PROJECT"],
+        os.environ["GOOGLE_CLOUD_LOCATION"],
+    )
+  if is_async_db_url(session_db_url):
+    from ..sessions.async_database_session_service import AsyncDatabaseSessionService
+
+    return AsyncDatabaseSessionService(db_url=session_db_url)
+  from ..sessions.database_session_service import DatabaseSessionService
+
+  return DatabaseSessionService(db_url=session_db_url)
+
+
+async def run_export(
+    *,
+    session_db_url: str,
+    app_name: str,
+    user_id: Optional[str],
+    output_path: str,
+    export_format: ExportFormat,
+    cursor: Optional[str],
+    batch_size: int,
+):
+  """Exports the sessions of a user, or of all users, to a file.
+
+  The cursors are reported after each batch.
+  """
+  session_service = create_session_service(session_db_url)
+  # A resumed export adds the remaining batches to the output of the first.
+  writer = open_session_record_writer(
+      output_path, export_format, append=cursor is not None
+  )
+  try:
+    async for next_cursor in export_sessions(
+        session_service,
+        writer,
+        app_name=app_name,
+        user_id=user_id,
+        cursor=cursor,
+        batch_size=batch_size,
+    ):
+      if next_cursor:
+        click.echo(f"Exported a batch, resume with --cursor={next_cursor}")
+  finally:
+    writer.close()
+  if user_id is None:
+    click.echo(f"Exported the sessions of {app_name} to {output_path}.")
+  else:
+    click.echo(f"Exported the sessions of {user_id} to {output_path}.")
+
+
+async def run_import(
+    *,
+    session_db_url: str,
+    input_path: str,
+    export_format: ExportFormat,
+    skip_records: int,
+):
+  """Imports the sessions of a file, reporting the checkpoints."""
+  session_service = create_session_service(session_db_url)
+  num_records = skip_records
+  async for num_records in import_sessions(
+      session_service,
+      read_session_records(input_path, export_format),
+      skip_records=skip_records,
+  ):
+    click.echo(
+        f"Imported {num_records} records, resume with"
+        f" --skip_records={num_records}"
+    )
+  click.echo(f"Imported {num_records} records from {input_path}.")
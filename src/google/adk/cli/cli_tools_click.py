@@ -26,6 +26,7 @@ import uvicorn
 
 from . import cli_create
 from . import cli_deploy
+from . import cli_sessions
 from .cli import run_cli
 from .cli_eval import MISSING_EVAL_DEPENDENCIES_MESSAGE
 from .fast_api import get_fast_api_app
@@ -47,6 +48,12 @@ def deploy():
   pass
 
 
+@main.group()
+def sessions():
+  """Exports and imports sessions."""
+  pass
+
+
 @main.command("create")
 @click.option(
     "--model",
@@ -254,6 +261,17 @@ def cli_eval(
   - See https://docs.sqlalchemy.org/en/20/core/engines.html#backend-specific-urls for more details on supported DB URLs."""
     ),
 )
+@click.option(
+    "--session_cache_size",
+    type=int,
+    default=0,
+    show_default=True,
+    help=(
+        "Optional. The number of sessions to cache in memory in front of the"
+        " --session_db_url store, or 0 to disable the cache. Only enable it"
+        " when this server is the only writer of the sessions."
+    ),
+)
 @click.option(
     "--port",
     type=int,
@@ -301,6 +319,7 @@ def cli_web(
     agents_dir: str,
     log_to_tmp: bool,
     session_db_url: str = "",
+    session_cache_size: int = 0,
     log_level: str = "INFO",
     allow_origins: Optional[list[str]] = None,
     port: int = 8000,
@@ -347,6 +366,7 @@ def cli_web(
   app = get_fast_api_app(
       agent_dir=agents_dir,
       session_db_url=session_db_url,
+      session_cache_size=session_cache_size,
       allow_origins=allow_origins,
       web=True,
       trace_to_cloud=trace_to_cloud,
@@ -376,6 +396,17 @@ def cli_web(
   - See https://docs.sqlalchemy.org/en/20/core/engines.html#backend-specific-urls for more details on supported DB URLs."""
     ),
 )
+@click.option(
+    "--session_cache_size",
+    type=int,
+    default=0,
+    show_default=True,
+    help=(
+        "Optional. The number of sessions to cache in memory in front of the"
+        " --session_db_url store, or 0 to disable the cache. Only enable it"
+        " when this server is the only writer of the sessions."
+    ),
+)
 @click.option(
     "--port",
     type=int,
@@ -425,6 +456,7 @@ def cli_api_server(
     agents_dir: str,
     log_to_tmp: bool,
     session_db_url: str = "",
+    session_cache_size: int = 0,
     log_level: str = "INFO",
     allow_origins: Optional[list[str]] = None,
     port: int = 8000,
@@ -450,6 +482,7 @@ def cli_api_server(
       get_fast_api_app(
           agent_dir=agents_dir,
           session_db_url=session_db_url,
+          session_cache_size=session_cache_size,
           allow_origins=allow_origins,
           web=False,
           trace_to_cloud=trace_to_cloud,
@@ -462,6 +495,126 @@ def cli_api_server(
   server.run()
 
 
+_SESSION_DB_URL_HELP = """Required. The database URL of the sessions.
+
+  - Use 'agentengine://<agent_engine_resource_id>' to connect to Agent Engine sessions.
+
+  - Use 'sqlite://<path_to_sqlite_file>' to connect to a SQLite DB.
+
+  - See https://docs.sqlalchemy.org/en/20/core/engines.html#backend-specific-urls for more details on supported DB URLs."""
+
+
+@sessions.command("export")
+@click.option("--session_db_url", required=True, help=_SESSION_DB_URL_HELP)
+@click.option("--app_name", required=True, help="Required. The app name.")
+@click.option(
+    "--user_id",
+    help=(
+        "Optional. The user id. If not set, the sessions of all users of the"
+        " app are exported."
+    ),
+)
+@click.option(
+    "--format",
+    "export_format",
+    type=click.Choice(["jsonl", "parquet"]),
+    default="jsonl",
+    show_default=True,
+    help="Optional. The format of the output file.",
+)
+@click.option(
+    "--cursor",
+    help=(
+        "Optional. A cursor reported by a previous export, to resume it. Only"
+        " the remaining sessions are written to the output file."
+    ),
+)
+@click.option(
+    "--batch_size",
+    type=int,
+    default=100,
+    show_default=True,
+    help="Optional. The number of sessions exported between cursors.",
+)
+@click.argument("output_path", type=click.Path(dir_okay=False))
+def cli_sessions_export(
+    session_db_url: str,
+    app_name: str,
+    user_id: Optional[str],
+    export_format: str,
+    cursor: Optional[str],
+    batch_size: int,
+    output_path: str,
+):
+  """Exports the sessions of a user, or of all users of an app, to a file.
+
+  OUTPUT_PATH: The path of the JSON Lines or Parquet file to write.
+
+  Without --user_id, the sessions of all users are exported, which the
+  in-memory, database and Agent Engine session services support.
+
+  Example:
+
+    adk sessions export --session_db_url=[db_url] --app_name=[app_name]
+    --user_id=[user_id] sessions.jsonl
+
+    adk sessions export --session_db_url=[db_url] --app_name=[app_name]
+    all_sessions.jsonl
+  """
+  asyncio.run(
+      cli_sessions.run_export(
+          session_db_url=session_db_url,
+          app_name=app_name,
+          user_id=user_id,
+          output_path=output_path,
+          export_format=export_format,
+          cursor=cursor,
+          batch_size=batch_size,
+      )
+  )
+
+
+@sessions.command("import")
+@click.option("--session_db_url", required=True, help=_SESSION_DB_URL_HELP)
+@click.option(
+    "--format",
+    "export_format",
+    type=click.Choice(["jsonl", "parquet"]),
+    default="jsonl",
+    show_default=True,
+    help="Optional. The format of the input file.",
+)
+@click.option(
+    "--skip_records",
+    type=int,
+    default=0,
+    help="Optional. A checkpoint reported by a previous import, to resume it.",
+)
+@click.argument("input_path", type=click.Path(exists=True, dir_okay=False))
+def cli_sessions_import(
+    session_db_url: str,
+    export_format: str,
+    skip_records: int,
+    input_path: str,
+):
+  """Imports the sessions of a file written by `adk sessions export`.
+
+  INPUT_PATH: The path of the JSON Lines or Parquet file to read.
+
+  Example:
+
+    adk sessions import --session_db_url=[db_url] sessions.jsonl
+  """
+  asyncio.run(
+      cli_sessions.run_import(
+          session_db_url=session_db_url,
+          input_path=input_path,
+          export_format=export_format,
+          skip_records=skip_records,
+      )
+  )
+
+
 @deploy.command("cloud_run")
 @click.option(
     "--project",
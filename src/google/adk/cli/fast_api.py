@@ -51,6 +51,9 @@ from opentelemetry.sdk.trace import TracerProvider
 from pydantic import BaseModel
 from pydantic import ValidationError
 from starlette.types import Lifespan
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
 
 from ..agents import RunConfig
 from ..agents.live_request_queue import LiveRequest
@@ -61,6 +64,9 @@ from ..artifacts import InMemoryArtifactService
 from ..events.event import Event
 from ..memory.in_memory_memory_service import InMemoryMemoryService
 from ..runners import Runner
+from ..sessions.async_database_session_service import AsyncDatabaseSessionService
+from ..sessions.blob_offload import hydrate_session
+from ..sessions.caching_session_service import CachingSessionService
 from ..sessions.database_session_service import DatabaseSessionService
 from ..sessions.in_memory_session_service import InMemorySessionService
 from ..sessions.session import Session
@@ -69,6 +75,7 @@ from .cli_eval import EVAL_SESSION_ID_PREFIX
 from .cli_eval import EvalMetric
 from .cli_eval import EvalMetricResult
 from .cli_eval import EvalStatus
+from .cli_sessions import is_async_db_url
 from .utils import create_empty_state
 from .utils import envs
 from .utils import evals
@@ -130,10 +137,26 @@ class RunEvalResult(BaseModel):
   session_id: str
 
 
+class _ClosingStreamingResponse(StreamingResponse):
+  """A streaming response that closes its async generator when it ends.
+
+  Starlette stops iterating the generator when the client disconnects, but
+  leaves it suspended until it is garbage collected. Closing it right away runs
+  its cleanup, e.g. releases the session lock of a `Runner.run_async` it wraps.
+  """
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+    try:
+      await super().__call__(scope, receive, send)
+    finally:
+      await self.body_iterator.aclose()
+
+
 def get_fast_api_app(
     *,
     agent_dir: str,
     session_db_url: str = "",
+    session_cache_size: int = 0,
     allow_origins: Optional[list[str]] = None,
     web: bool,
     trace_to_cloud: bool = False,
@@ -211,8 +234,16 @@ def get_fast_api_app(
           os.environ["GOOGLE_CLOUD_PROJECT"],
           os.environ["GOOGLE_CLOUD_LOCATION"],
       )
+    elif is_async_db_url(session_db_url):
+      session_service = AsyncDatabaseSessionService(db_url=session_db_url)
     else:
       session_service = DatabaseSessionService(db_url=session_db_url)
+    if session_cache_size > 0:
+      # Sessions are read by the API handlers and then again by the runner,
+      # so keep them cached instead of fetching them from the store twice.
+      session_service = CachingSessionService(
+          session_service, max_sessions=session_cache_size
+      )
   else:
     session_service = InMemorySessionService()
 
@@ -244,28 +275,34 @@ def get_fast_api_app(
       "/apps/{app_name}/users/{user_id}/sessions/{session_id}",
       response_model_exclude_none=True,
   )
-  def get_session(app_name: str, user_id: str, session_id: str) -> Session:
+  async def get_session(
+      app_name: str, user_id: str, session_id: str
+  ) -> Session:
     # Connect to managed session if agent_engine_id is set.
     app_name = agent_engine_id if agent_engine_id else app_name
-    session = session_service.get_session(
+    session = await session_service.get_session_async(
         app_name=app_name, user_id=user_id, session_id=session_id
     )
     if not session:
       raise HTTPException(status_code=404, detail="Session not found")
-    return session
+    # Return the media offloaded by the session service, not references to it.
+    return await asyncio.to_thread(
+        hydrate_session, session, session_service=session_service
+    )
 
   @app.get(
       "/apps/{app_name}/users/{user_id}/sessions",
       response_model_exclude_none=True,
   )
-  def list_sessions(app_name: str, user_id: str) -> list[Session]:
+  async def list_sessions(app_name: str, user_id: str) -> list[Session]:
     # Connect to managed session if agent_engine_id is set.
     app_name = agent_engine_id if agent_engine_id else app_name
+    list_sessions_response = await session_service.list_sessions_async(
+        app_name=app_name, user_id=user_id
+    )
     return [
         session
-        for session in session_service.list_sessions(
-            app_name=app_name, user_id=user_id
-        ).sessions
+        for session in list_sessions_response.sessions
         # Remove sessions that were generated as a part of Eval.
         if not session.id.startswith(EVAL_SESSION_ID_PREFIX)
     ]
@@ -274,7 +311,7 @@ def get_fast_api_app(
       "/apps/{app_name}/users/{user_id}/sessions/{session_id}",
       response_model_exclude_none=True,
   )
-  def create_session_with_id(
+  async def create_session_with_id(
       app_name: str,
       user_id: str,
       session_id: str,
@@ -283,7 +320,7 @@ def get_fast_api_app(
     # Connect to managed session if agent_engine_id is set.
     app_name = agent_engine_id if agent_engine_id else app_name
     if (
-        session_service.get_session(
+        await session_service.get_session_async(
             app_name=app_name, user_id=user_id, session_id=session_id
         )
         is not None
@@ -294,7 +331,7 @@ def get_fast_api_app(
       )
 
     logger.info("New session created: %s", session_id)
-    return session_service.create_session(
+    return await session_service.create_session_async(
         app_name=app_name, user_id=user_id, state=state, session_id=session_id
     )
 
@@ -302,7 +339,7 @@ def get_fast_api_app(
       "/apps/{app_name}/users/{user_id}/sessions",
       response_model_exclude_none=True,
   )
-  def create_session(
+  async def create_session(
       app_name: str,
       user_id: str,
       state: Optional[dict[str, Any]] = None,
@@ -311,7 +348,7 @@ def get_fast_api_app(
     app_name = agent_engine_id if agent_engine_id else app_name
 
     logger.info("New session created")
-    return session_service.create_session(
+    return await session_service.create_session_async(
         app_name=app_name, user_id=user_id, state=state
     )
 
@@ -385,7 +422,7 @@ def get_fast_api_app(
       )
 
     # Get the session
-    session = session_service.get_session(
+    session = await session_service.get_session_async(
         app_name=app_name, user_id=req.user_id, session_id=req.session_id
     )
     assert session, "Session not found."
@@ -451,7 +488,7 @@ def get_fast_api_app(
   async def run_eval(
       app_name: str, eval_set_id: str, req: RunEvalRequest
   ) -> list[RunEvalResult]:
-    from .cli_eval import run_evals
+    from .cli_eval import run_evals_async
 
     """Runs an eval given the details in the eval request."""
     # Create a mapping from eval set file to all the evals that needed to be
@@ -466,8 +503,9 @@ def get_fast_api_app(
           "Eval ids to run list is empty. We will all evals in the eval set."
       )
     root_agent = await _get_root_agent_async(app_name)
-    eval_results = list(
-        run_evals(
+    eval_results = [
+        eval_result
+        async for eval_result in run_evals_async(
             eval_set_to_evals,
             root_agent,
             getattr(root_agent, "reset_data", None),
@@ -475,7 +513,7 @@ def get_fast_api_app(
             session_service=session_service,
             artifact_service=artifact_service,
         )
-    )
+    ]
 
     run_eval_results = []
     for eval_result in eval_results:
@@ -492,10 +530,10 @@ def get_fast_api_app(
     return run_eval_results
 
   @app.delete("/apps/{app_name}/users/{user_id}/sessions/{session_id}")
-  def delete_session(app_name: str, user_id: str, session_id: str):
+  async def delete_session(app_name: str, user_id: str, session_id: str):
     # Connect to managed session if agent_engine_id is set.
     app_name = agent_engine_id if agent_engine_id else app_name
-    session_service.delete_session(
+    await session_service.delete_session_async(
         app_name=app_name, user_id=user_id, session_id=session_id
     )
 
@@ -590,7 +628,7 @@ def get_fast_api_app(
   async def agent_run(req: AgentRunRequest) -> list[Event]:
     # Connect to managed session if agent_engine_id is set.
     app_id = agent_engine_id if agent_engine_id else req.app_name
-    session = session_service.get_session(
+    session = await session_service.get_session_async(
         app_name=app_id, user_id=req.user_id, session_id=req.session_id
     )
     if not session:
@@ -612,7 +650,7 @@ def get_fast_api_app(
     # Connect to managed session if agent_engine_id is set.
     app_id = agent_engine_id if agent_engine_id else req.app_name
     # SSE endpoint
-    session = session_service.get_session(
+    session = await session_service.get_session_async(
         app_name=app_id, user_id=req.user_id, session_id=req.session_id
     )
     if not session:
@@ -623,23 +661,29 @@ def get_fast_api_app(
       try:
         stream_mode = StreamingMode.SSE if req.streaming else StreamingMode.NONE
         runner = await _get_runner_async(req.app_name)
-        async for event in runner.run_async(
+        events = runner.run_async(
             user_id=req.user_id,
             session_id=req.session_id,
             new_message=req.new_message,
             run_config=RunConfig(streaming_mode=stream_mode),
-        ):
-          # Format as SSE data
-          sse_event = event.model_dump_json(exclude_none=True, by_alias=True)
-          logger.info("Generated event in agent run streaming: %s", sse_event)
-          yield f"data: {sse_event}\n\n"
+        )
+        try:
+          async for event in events:
+            # Format as SSE data
+            sse_event = event.model_dump_json(exclude_none=True, by_alias=True)
+            logger.info("Generated event in agent run streaming: %s", sse_event)
+            yield f"data: {sse_event}\n\n"
+        finally:
+          # Also when the client disconnects, so the invocation stops and
+          # releases the session.
+          await events.aclose()
       except Exception as e:
         logger.exception("Error in event_generator: %s", e)
         # You might want to yield an error event here
         yield f'data: {{"error": "{str(e)}"}}\n\n'
 
     # Returns a streaming response with the proper media type for SSE
-    return StreamingResponse(
+    return _ClosingStreamingResponse(
         event_generator(),
         media_type="text/event-stream",
     )
@@ -653,7 +697,7 @@ def get_fast_api_app(
   ):
     # Connect to managed session if agent_engine_id is set.
     app_id = agent_engine_id if agent_engine_id else app_name
-    session = session_service.get_session(
+    session = await session_service.get_session_async(
         app_name=app_id, user_id=user_id, session_id=session_id
     )
     session_events = session.events if session else []
@@ -710,7 +754,7 @@ def get_fast_api_app(
 
     # Connect to managed session if agent_engine_id is set.
     app_id = agent_engine_id if agent_engine_id else app_name
-    session = session_service.get_session(
+    session = await session_service.get_session_async(
         app_name=app_id, user_id=user_id, session_id=session_id
     )
     if not session:
@@ -117,6 +117,100 @@ class EvaluationGenerator:
       artifact_service=None,
   ):
     """Process a query using the agent and evaluation dataset."""
+    runner, app_name, user_id, session_id, session_state = (
+        EvaluationGenerator._prepare_runner(
+            data,
+            root_agent,
+            initial_session,
+            session_id,
+            session_service,
+            artifact_service,
+        )
+    )
+    _ = runner.session_service.create_session(
+        app_name=app_name,
+        user_id=user_id,
+        state=session_state,
+        session_id=session_id,
+    )
+
+    # Reset agent state for each query
+    if callable(reset_func):
+      reset_func()
+
+    responses = data.copy()
+
+    for index, eval_entry in enumerate(responses):
+      query = eval_entry["query"]
+      content = types.Content(role="user", parts=[types.Part(text=query)])
+      events = runner.run(
+          user_id=user_id, session_id=session_id, new_message=content
+      )
+      EvaluationGenerator._record_turn(responses[index], events)
+
+    return responses
+
+  @staticmethod
+  async def _process_query_with_root_agent_async(
+      data,
+      root_agent,
+      reset_func,
+      initial_session={},
+      session_id=None,
+      session_service=None,
+      artifact_service=None,
+  ):
+    """Process a query using the agent and evaluation dataset, asynchronously.
+
+    Unlike `_process_query_with_root_agent`, it only uses the async API of the
+    session service, e.g. for an `AsyncDatabaseSessionService`.
+    """
+    runner, app_name, user_id, session_id, session_state = (
+        EvaluationGenerator._prepare_runner(
+            data,
+            root_agent,
+            initial_session,
+            session_id,
+            session_service,
+            artifact_service,
+        )
+    )
+    _ = await runner.session_service.create_session_async(
+        app_name=app_name,
+        user_id=user_id,
+        state=session_state,
+        session_id=session_id,
+    )
+
+    # Reset agent state for each query
+    if callable(reset_func):
+      reset_func()
+
+    responses = data.copy()
+
+    for index, eval_entry in enumerate(responses):
+      query = eval_entry["query"]
+      content = types.Content(role="user", parts=[types.Part(text=query)])
+      events = [
+          event
+          async for event in runner.run_async(
+              user_id=user_id, session_id=session_id, new_message=content
+          )
+      ]
+      EvaluationGenerator._record_turn(responses[index], events)
+
+    return responses
+
+  @staticmethod
+  def _prepare_runner(
+      data,
+      root_agent,
+      initial_session,
+      session_id,
+      session_service,
+      artifact_service,
+  ):
+    """Mocks the tools of the dataset and creates the runner of an eval."""
 
     # we don't know which tools belong to which agent
     # so we just apply to any agents that has certain tool outputs
@@ -143,13 +237,6 @@ class EvaluationGenerator:
     user_id = initial_session.get("user_id", "test_user_id")
     session_id = session_id if session_id else str(uuid.uuid4())
 
-    _ = session_service.create_session(
-        app_name=app_name,
-        user_id=user_id,
-        state=initial_session.get("state", {}),
-        session_id=session_id,
-    )
-
     if not artifact_service:
       artifact_service = InMemoryArtifactService()
     runner = Runner(
@@ -158,35 +245,32 @@ class EvaluationGenerator:
         artifact_service=artifact_service,
         session_service=session_service,
     )
+    return (
+        runner,
+        app_name,
+        user_id,
+        session_id,
+        initial_session.get("state", {}),
+    )
 
-    # Reset agent state for each query
-    if callable(reset_func):
-      reset_func()
-
-    responses = data.copy()
-
-    for index, eval_entry in enumerate(responses):
-      response = None
-      query = eval_entry["query"]
-      content = types.Content(role="user", parts=[types.Part(text=query)])
-      turn_actual_tool_uses = []
-
-      for event in runner.run(
-          user_id=user_id, session_id=session_id, new_message=content
-      ):
-        if event.is_final_response() and event.content and event.content.parts:
-          response = event.content.parts[0].text
-        elif event.get_function_calls():
-          for call in event.get_function_calls():
-            turn_actual_tool_uses.append({
-                EvalConstants.TOOL_NAME: call.name,
-                EvalConstants.TOOL_INPUT: call.args,
-            })
-
-      responses[index]["actual_tool_use"] = turn_actual_tool_uses
-      responses[index]["response"] = response
-
-    return responses
+  @staticmethod
+  def _record_turn(eval_entry, events):
+    """Records the response and the tool uses of a turn in its eval entry."""
+    response = None
+    turn_actual_tool_uses = []
+
+    for event in events:
+      if event.is_final_response() and event.content and event.content.parts:
+        response = event.content.parts[0].text
+      elif event.get_function_calls():
+        for call in event.get_function_calls():
+          turn_actual_tool_uses.append({
+              EvalConstants.TOOL_NAME: call.name,
+              EvalConstants.TOOL_INPUT: call.args,
+          })
+
+    eval_entry["actual_tool_use"] = turn_actual_tool_uses
+    eval_entry["response"] = response
 
   @staticmethod
   def _process_query_with_session(session_data, data):
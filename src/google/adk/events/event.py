@@ -124,7 +124,38 @@ class Event(LlmResponse):
         return self.content.parts[-1].code_execution_result is not None
     return False
 
+  def _merge_llm_response(self, llm_response: LlmResponse) -> Event:
+    """Returns a copy of this event with the fields set in `llm_response`.
+
+    Trusted fast path for the flows, without the validation of the merged
+    dumps: both models are already valid. The content is shared with
+    `llm_response`, and the dicts of the actions are copied.
+    """
+    update = {
+        name: value
+        for name, value in self.__dict__.items()
+        if value is not None
+    }
+    update['actions'] = self.actions.model_copy(
+        update={
+            name: dict(value)
+            for name, value in self.actions.__dict__.items()
+            if isinstance(value, dict)
+        }
+    )
+    for name in LlmResponse.model_fields:
+      value = getattr(llm_response, name)
+      if value is not None:
+        update[name] = value
+    return self.model_copy(update=update)
+
   @staticmethod
   def new_id():
-    characters = string.ascii_letters + string.digits
-    return ''.join(random.choice(characters) for _ in range(8))
+    return random.randbytes(8).translate(_ID_CHARACTERS).decode()
+
+
+# Maps each byte to a letter or digit, for 8 random bytes to make an id. The
+# first 8 characters are slightly more likely, which is fine for ids.
+_ID_CHARACTERS = bytes(
+    ord((string.ascii_letters + string.digits)[i % 62]) for i in range(256)
+)
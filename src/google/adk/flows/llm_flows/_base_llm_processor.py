@@ -31,6 +31,14 @@ if TYPE_CHECKING:
 class BaseLlmRequestProcessor(ABC):
   """Base class for LLM request processor."""
 
+  is_independent: bool = False
+  """Whether the processor only reads the model of the request and only appends
+  contents, instructions and tools to it.
+
+  Consecutive independent processors run concurrently, each on a request of its
+  own. Their additions are then appended to the request in their order.
+  """
+
   @abstractmethod
   async def run_async(
       self, invocation_context: InvocationContext, llm_request: LlmRequest
@@ -16,12 +16,14 @@ from __future__ import annotations
 
 from abc import ABC
 import asyncio
+import itertools
 import logging
 from typing import AsyncGenerator
 from typing import cast
 from typing import Optional
 from typing import TYPE_CHECKING
 
+from google.genai import types
 from websockets.exceptions import ConnectionClosedOK
 
 from ...agents.base_agent import BaseAgent
@@ -37,6 +39,8 @@ from ...models.llm_response import LlmResponse
 from ...telemetry import trace_call_llm
 from ...telemetry import trace_send_data
 from ...telemetry import tracer
+from ...tools.base_tool import _find_tool_with_function_declarations
+from ...tools.base_tool import BaseTool
 from ...tools.tool_context import ToolContext
 from . import functions
 
@@ -272,17 +276,61 @@ class BaseLlmFlow(ABC):
     if not isinstance(agent, LlmAgent):
       return
 
-    # Runs processors.
-    for processor in self.request_processors:
-      async for event in processor.run_async(invocation_context, llm_request):
-        yield event
+    # Runs processors. Consecutive independent processors run concurrently.
+    for is_independent, group in itertools.groupby(
+        self.request_processors, lambda processor: processor.is_independent
+    ):
+      if not is_independent:
+        for processor in group:
+          async for event in processor.run_async(
+              invocation_context, llm_request
+          ):
+            yield event
+        continue
 
-    # Run processors for tools.
-    for tool in agent.canonical_tools:
-      tool_context = ToolContext(invocation_context)
-      await tool.process_llm_request(
-          tool_context=tool_context, llm_request=llm_request
-      )
+      async def run_processor(
+          processor: BaseLlmRequestProcessor,
+      ) -> tuple[list[Event], LlmRequest]:
+        child_request = _new_child_request(llm_request)
+        events = [
+            event
+            async for event in processor.run_async(
+                invocation_context, child_request
+            )
+        ]
+        return events, child_request
+
+      for events, child_request in await asyncio.gather(
+          *(run_processor(processor) for processor in group)
+      ):
+        _merge_child_request(llm_request, child_request)
+        for event in events:
+          yield event
+
+    # Run processors for tools. Consecutive independent tools run concurrently.
+    for is_independent, group in itertools.groupby(
+        agent.canonical_tools, lambda tool: tool.is_independent
+    ):
+      if not is_independent:
+        for tool in group:
+          tool_context = ToolContext(invocation_context)
+          await tool.process_llm_request(
+              tool_context=tool_context, llm_request=llm_request
+          )
+        continue
+
+      async def process_llm_request(tool: BaseTool) -> LlmRequest:
+        child_request = _new_child_request(llm_request)
+        await tool.process_llm_request(
+            tool_context=ToolContext(invocation_context),
+            llm_request=child_request,
+        )
+        return child_request
+
+      for child_request in await asyncio.gather(
+          *(process_llm_request(tool) for tool in group)
+      ):
+        _merge_child_request(llm_request, child_request)
 
   async def _postprocess_async(
       self,
@@ -536,10 +584,9 @@ class BaseLlmFlow(ABC):
       llm_response: LlmResponse,
       model_response_event: Event,
   ) -> Event:
-    model_response_event = Event.model_validate({
-        **model_response_event.model_dump(exclude_none=True),
-        **llm_response.model_dump(exclude_none=True),
-    })
+    model_response_event = model_response_event._merge_llm_response(
+        llm_response
+    )
 
     if model_response_event.content:
       function_calls = model_response_event.get_function_calls()
@@ -557,3 +604,34 @@ class BaseLlmFlow(ABC):
     from ...agents.llm_agent import LlmAgent
 
     return cast(LlmAgent, invocation_context.agent).canonical_model
+
+
+def _new_child_request(llm_request: LlmRequest) -> LlmRequest:
+  """Creates the request an independent processor or tool appends to."""
+  return LlmRequest(
+      model=llm_request.model, config=types.GenerateContentConfig()
+  )
+
+
+def _merge_child_request(llm_request: LlmRequest, child_request: LlmRequest):
+  """Appends what an independent processor or tool added to its request."""
+  llm_request.contents.extend(child_request.contents)
+  child_config = child_request.config
+  if child_config and child_config.system_instruction:
+    llm_request.append_instructions([child_config.system_instruction])
+  if child_config and child_config.tools:
+    if not llm_request.config:
+      llm_request.config = types.GenerateContentConfig()
+    if not llm_request.config.tools:
+      llm_request.config.tools = []
+    for tool in child_config.tools:
+      if isinstance(tool, types.Tool) and tool.function_declarations:
+        if tool_with_function_declarations := (
+            _find_tool_with_function_declarations(llm_request)
+        ):
+          tool_with_function_declarations.function_declarations.extend(
+              tool.function_declarations
+          )
+          continue
+      llm_request.config.tools.append(tool)
+  llm_request.tools_dict.update(child_request.tools_dict)
@@ -25,6 +25,7 @@ from typing_extensions import override
 from ...agents.invocation_context import InvocationContext
 from ...events.event import Event
 from ...models.llm_request import LlmRequest
+from ...sessions.blob_offload import hydrate_blob_references_async
 from ._base_llm_processor import BaseLlmRequestProcessor
 from .functions import remove_client_function_call_id
 from .functions import REQUEST_EUC_FUNCTION_CALL_NAME
@@ -44,10 +45,19 @@ class _ContentLlmRequestProcessor(BaseLlmRequestProcessor):
       return
 
     if agent.include_contents != 'none':
-      llm_request.contents = _get_contents(
-          invocation_context.branch,
-          invocation_context.session.events,
-          agent.name,
+      key = (invocation_context.branch, agent.name)
+      builder = invocation_context._contents_builders.get(key)
+      if builder is None:
+        builder = _ContentsBuilder(invocation_context.branch, agent.name)
+        invocation_context._contents_builders[key] = builder
+      llm_request.contents = builder.build(invocation_context.session.events)
+      # Blobs offloaded by the session service are only loaded for the events
+      # that made it into the request, once per invocation.
+      await hydrate_blob_references_async(
+          llm_request.contents,
+          session_service=invocation_context.session_service,
+          session=invocation_context.session,
+          loaded_parts=invocation_context._hydrated_blobs,
       )
 
     # Maintain async generator behavior
@@ -198,38 +208,95 @@ def _get_contents(
   Returns:
     A list of contents.
   """
-  filtered_events = []
-  # Parse the events, leaving the contents and the function calls and
-  # responses from the current agent.
-  for event in events:
+  return _ContentsBuilder(current_branch, agent_name).build(events)
+
+
+class _ContentsBuilder:
+  """Builds the contents for the LLM requests of an agent incrementally.
+
+  The events are filtered, and their contents copied without client function
+  call IDs, once. Each build only processes the events appended since the
+  previous one, unless the earlier events were replaced, e.g. by compaction.
+
+  The normalized contents are shared between builds. Each build returns
+  shallow copies of them, so that the list of parts of a content can be
+  modified, but the parts themselves must not be.
+  """
+
+  def __init__(self, current_branch: Optional[str], agent_name: str):
+    self.current_branch = current_branch
+    self.agent_name = agent_name
+    self._reset()
+
+  def _reset(self):
+    self._num_events = 0
+    self._first_event: Optional[Event] = None
+    self._last_event: Optional[Event] = None
+    self._filtered_events: list[Event] = []
+    # The normalized contents of the filtered events, by event object id.
+    self._contents: dict[int, types.Content] = {}
+
+  def build(self, events: list[Event]) -> list[types.Content]:
+    """Returns the contents for the LLM request, given the session events."""
+    if self._num_events and (
+        len(events) < self._num_events
+        or events[0] is not self._first_event
+        or events[self._num_events - 1] is not self._last_event
+    ):
+      self._reset()
+    for event in events[self._num_events :]:
+      filtered_event = self._filter_event(event)
+      if filtered_event:
+        self._filtered_events.append(filtered_event)
+        self._contents[id(filtered_event)] = _normalize_content(
+            filtered_event.content
+        )
+    if events:
+      self._num_events = len(events)
+      self._first_event = events[0]
+      self._last_event = events[-1]
+
+    result_events = _rearrange_events_for_latest_function_response(
+        self._filtered_events
+    )
+    result_events = _rearrange_events_for_async_function_responses_in_history(
+        result_events
+    )
+    contents = []
+    for event in result_events:
+      content = self._contents.get(id(event))
+      if content is None:
+        # A new event merging function responses.
+        contents.append(_normalize_content(event.content))
+      else:
+        contents.append(
+            content.model_copy(update={'parts': list(content.parts or [])})
+        )
+    return contents
+
+  def _filter_event(self, event: Event) -> Optional[Event]:
+    """Returns the event as seen by the agent, or None to leave it out."""
     if not event.content or not event.content.role:
       # Skip events without content, or generated neither by user nor by model.
       # E.g. events purely for mutating session states.
-      continue
-    if not _is_event_belongs_to_branch(current_branch, event):
+      return None
+    if not _is_event_belongs_to_branch(self.current_branch, event):
       # Skip events not belong to current branch.
-      continue
+      return None
     if _is_auth_event(event):
       # skip auth event
-      continue
-    filtered_events.append(
-        _convert_foreign_event(event)
-        if _is_other_agent_reply(agent_name, event)
-        else event
-    )
+      return None
+    # Keeps the contents and the function calls and responses from the current
+    # agent.
+    if _is_other_agent_reply(self.agent_name, event):
+      return _convert_foreign_event(event)
+    return event
 
-  result_events = _rearrange_events_for_latest_function_response(
-      filtered_events
-  )
-  result_events = _rearrange_events_for_async_function_responses_in_history(
-      result_events
-  )
-  contents = []
-  for event in result_events:
-    content = copy.deepcopy(event.content)
-    remove_client_function_call_id(content)
-    contents.append(content)
-  return contents
+
+def _normalize_content(content: types.Content) -> types.Content:
+  content = copy.deepcopy(content)
+  remove_client_function_call_id(content)
+  return content
 
 
 def _is_other_agent_reply(current_agent_name: str, event: Event) -> bool:
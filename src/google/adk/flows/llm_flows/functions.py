@@ -31,7 +31,6 @@ from ...agents.active_streaming_tool import ActiveStreamingTool
 from ...agents.invocation_context import InvocationContext
 from ...auth.auth_tool import AuthToolArguments
 from ...events.event import Event
-from ...events.event_actions import EventActions
 from ...telemetry import trace_tool_call
 from ...telemetry import trace_tool_response
 from ...telemetry import tracer
@@ -136,54 +135,58 @@ async def handle_function_calls_async(
   if not isinstance(agent, LlmAgent):
     return
 
-  function_calls = function_call_event.get_function_calls()
-
-  function_response_events: list[Event] = []
-  for function_call in function_calls:
-    if filters and function_call.id not in filters:
-      continue
-    tool, tool_context = _get_tool_and_context(
-        invocation_context,
-        function_call_event,
-        function_call,
-        tools_dict,
-    )
-    # do not use "args" as the variable name, because it is a reserved keyword
-    # in python debugger.
-    function_args = function_call.args or {}
-    function_response = None
-    # Calls the tool if before_tool_callback does not exist or returns None.
-    if agent.before_tool_callback:
-      function_response = agent.before_tool_callback(
-          tool=tool, args=function_args, tool_context=tool_context
-      )
+  function_calls = [
+      function_call
+      for function_call in function_call_event.get_function_calls()
+      if not filters or function_call.id in filters
+  ]
 
-    if not function_response:
-      function_response = await __call_tool_async(
-          tool, args=function_args, tool_context=tool_context
-      )
+  if len(function_calls) <= 1 or agent.max_concurrent_tool_calls == 1:
+    function_response_events = [
+        await _call_function_async(
+            invocation_context, function_call_event, function_call, tools_dict
+        )
+        for function_call in function_calls
+    ]
+  else:
+    # Runs the independent function calls concurrently. The response events
+    # keep the order of the function calls.
+    semaphore = asyncio.Semaphore(agent.max_concurrent_tool_calls)
+    # The calls of a non-reentrant tool wait for each other.
+    tool_locks = {
+        function_call.name: asyncio.Lock()
+        for function_call in function_calls
+        if function_call.name in tools_dict
+        and not tools_dict[function_call.name].is_reentrant
+    }
 
-    # Calls after_tool_callback if it exists.
-    if agent.after_tool_callback:
-      new_response = agent.after_tool_callback(
-          tool=tool,
-          args=function_args,
-          tool_context=tool_context,
-          tool_response=function_response,
-      )
-      if new_response:
-        function_response = new_response
+    async def call_function(function_call: types.FunctionCall):
+      async with semaphore:
+        return await _call_function_async(
+            invocation_context, function_call_event, function_call, tools_dict
+        )
 
-    if tool.is_long_running:
-      # Allow long running function to return None to not provide function response.
-      if not function_response:
-        continue
+    async def call_non_reentrant_function(function_call: types.FunctionCall):
+      async with tool_locks[function_call.name]:
+        return await call_function(function_call)
 
-    # Builds the function response event.
-    function_response_event = __build_response_event(
-        tool, function_response, tool_context, invocation_context
-    )
-    function_response_events.append(function_response_event)
+    tasks = [
+        asyncio.ensure_future(
+            call_non_reentrant_function(function_call)
+            if function_call.name in tool_locks
+            else call_function(function_call)
+        )
+        for function_call in function_calls
+    ]
+    try:
+      function_response_events = await asyncio.gather(*tasks)
+    except BaseException:
+      for task in tasks:
+        task.cancel()
+      raise
+  function_response_events = [
+      event for event in function_response_events if event
+  ]
 
   if not function_response_events:
     return None
@@ -203,6 +206,57 @@ async def handle_function_calls_async(
   return merged_event
 
 
+async def _call_function_async(
+    invocation_context: InvocationContext,
+    function_call_event: Event,
+    function_call: types.FunctionCall,
+    tools_dict: dict[str, BaseTool],
+) -> Optional[Event]:
+  """Calls a function and returns its response event, if any."""
+  agent = invocation_context.agent
+  tool, tool_context = _get_tool_and_context(
+      invocation_context,
+      function_call_event,
+      function_call,
+      tools_dict,
+  )
+  # do not use "args" as the variable name, because it is a reserved keyword
+  # in python debugger.
+  function_args = function_call.args or {}
+  function_response = None
+  # Calls the tool if before_tool_callback does not exist or returns None.
+  if agent.before_tool_callback:
+    function_response = agent.before_tool_callback(
+        tool=tool, args=function_args, tool_context=tool_context
+    )
+
+  if not function_response:
+    function_response = await __call_tool_async(
+        tool, args=function_args, tool_context=tool_context
+    )
+
+  # Calls after_tool_callback if it exists.
+  if agent.after_tool_callback:
+    new_response = agent.after_tool_callback(
+        tool=tool,
+        args=function_args,
+        tool_context=tool_context,
+        tool_response=function_response,
+    )
+    if new_response:
+      function_response = new_response
+
+  if tool.is_long_running:
+    # Allow long running function to return None to not provide function response.
+    if not function_response:
+      return None
+
+  # Builds the function response event.
+  return __build_response_event(
+      tool, function_response, tool_context, invocation_context
+  )
+
+
 async def handle_function_calls_live(
     invocation_context: InvocationContext,
     function_call_event: Event,
@@ -462,16 +516,14 @@ def merge_parallel_function_response_events(
   # Use the first event as the "base" for common attributes
   base_event = function_response_events[0]
 
-  # Merge actions from all events
-
-  merged_actions = EventActions()
+  # Merge actions from all events. Later events take precedence, except for the
+  # requested auth configs which are merged.
   merged_requested_auth_configs = {}
   for event in function_response_events:
     merged_requested_auth_configs.update(event.actions.requested_auth_configs)
-    merged_actions = merged_actions.model_copy(
-        update=event.actions.model_dump()
-    )
-  merged_actions.requested_auth_configs = merged_requested_auth_configs
+  merged_actions = function_response_events[-1].actions.model_copy(
+      update={'requested_auth_configs': merged_requested_auth_configs}
+  )
   # Create the new merged event
   merged_event = Event(
       invocation_id=Event.new_id(),
@@ -479,8 +531,7 @@ def merge_parallel_function_response_events(
       branch=base_event.branch,
       content=types.Content(role='user', parts=merged_parts),
       actions=merged_actions,  # Optionally merge actions if required
+      # Use the base_event as the timestamp
+      timestamp=base_event.timestamp,
   )
-
-  # Use the base_event as the timestamp
-  merged_event.timestamp = base_event.timestamp
   return merged_event
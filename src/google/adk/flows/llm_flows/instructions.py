@@ -16,10 +16,14 @@
 
 from __future__ import annotations
 
+import dataclasses
+import functools
 import re
 from typing import AsyncGenerator
 from typing import Generator
+from typing import Optional
 from typing import TYPE_CHECKING
+from typing import Union
 
 from typing_extensions import override
 
@@ -77,39 +81,154 @@ def _populate_values(
     instruction_template: str,
     context: InvocationContext,
 ) -> str:
-  """Populates values in the instruction template, e.g. state, artifact, etc."""
-
-  def _replace_match(match) -> str:
-    var_name = match.group().lstrip('{').rstrip('}').strip()
-    optional = False
-    if var_name.endswith('?'):
-      optional = True
-      var_name = var_name.removesuffix('?')
-    if var_name.startswith('artifact.'):
-      var_name = var_name.removeprefix('artifact.')
-      if context.artifact_service is None:
-        raise ValueError('Artifact service is not initialized.')
-      artifact = context.artifact_service.load_artifact(
-          app_name=context.session.app_name,
-          user_id=context.session.user_id,
-          session_id=context.session.id,
-          filename=var_name,
-      )
-      if not var_name:
-        raise KeyError(f'Artifact {var_name} not found.')
-      return str(artifact)
-    else:
-      if not _is_valid_state_name(var_name):
-        return match.group()
-      if var_name in context.session.state:
-        return str(context.session.state[var_name])
-      else:
-        if optional:
-          return ''
-        else:
-          raise KeyError(f'Context variable not found: `{var_name}`.')
-
-  return re.sub(r'{+[^{}]*}+', _replace_match, instruction_template)
+  """Populates values in the instruction template, e.g. state, artifact, etc.
+
+  The rendered instruction is reused within the invocation until the state keys
+  or artifacts it depends on change.
+  """
+  rendered = context._rendered_instructions.get(instruction_template)
+  if rendered is None or rendered.is_stale(context):
+    template = _compile_template(instruction_template)
+    rendered = _RenderedInstruction(template, context)
+    context._rendered_instructions[instruction_template] = rendered
+  return rendered.text
+
+
+@dataclasses.dataclass(frozen=True)
+class _Placeholder:
+  """A `{var_name}` or `{artifact.filename}` placeholder of a template."""
+
+  name: str
+  optional: bool
+  is_artifact: bool
+
+
+class _InstructionTemplate:
+  """An instruction template, parsed into text and placeholders."""
+
+  def __init__(self, instruction_template: str):
+    self.segments: list[Union[str, _Placeholder]] = []
+    text_start = 0
+    for match in re.finditer(r'{+[^{}]*}+', instruction_template):
+      placeholder = _parse_placeholder(match.group())
+      if placeholder is None:
+        continue
+      self.segments.append(instruction_template[text_start : match.start()])
+      self.segments.append(placeholder)
+      text_start = match.end()
+    self.segments.append(instruction_template[text_start:])
+    self.state_keys = frozenset(
+        segment.name
+        for segment in self.segments
+        if isinstance(segment, _Placeholder) and not segment.is_artifact
+    )
+    self.artifact_names = frozenset(
+        segment.name
+        for segment in self.segments
+        if isinstance(segment, _Placeholder) and segment.is_artifact
+    )
+
+  def render(self, context: InvocationContext) -> str:
+    """Renders the template with the session state and artifacts."""
+    return ''.join(
+        _render_placeholder(segment, context)
+        if isinstance(segment, _Placeholder)
+        else segment
+        for segment in self.segments
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_template(instruction_template: str) -> _InstructionTemplate:
+  return _InstructionTemplate(instruction_template)
+
+
+class _RenderedInstruction:
+  """An instruction rendered from a template, and the values it depends on."""
+
+  def __init__(
+      self, template: _InstructionTemplate, context: InvocationContext
+  ):
+    self.template = template
+    self.session = context.session
+    self.num_events = len(context.session.events)
+    self.last_event = (
+        context.session.events[-1] if context.session.events else None
+    )
+    # The values as rendered, so that values modified in place, e.g. with
+    # `state['x'].append(...)`, are detected too.
+    self.state_values = {
+        key: _state_value_text(context, key) for key in template.state_keys
+    }
+    self.text = template.render(context)
+
+  def is_stale(self, context: InvocationContext) -> bool:
+    """Whether the state keys or artifacts of the template changed since."""
+    session = context.session
+    if (
+        session is not self.session
+        or len(session.events) < self.num_events
+        or (
+            self.num_events
+            and session.events[self.num_events - 1] is not self.last_event
+        )
+    ):
+      return True
+    if any(
+        _state_value_text(context, key) != value
+        for key, value in self.state_values.items()
+    ):
+      return True
+    # Catches new artifact versions.
+    return any(
+        not self.template.artifact_names.isdisjoint(
+            event.actions.artifact_delta
+        )
+        for event in session.events[self.num_events :]
+    )
+
+
+def _state_value_text(context: InvocationContext, key: str) -> Optional[str]:
+  """Returns a state value as rendered, or None if it is not set."""
+  if key not in context.session.state:
+    return None
+  return str(context.session.state[key])
+
+
+def _parse_placeholder(match: str) -> Optional[_Placeholder]:
+  """Parses a `{...}` match, or returns None if it is not a placeholder."""
+  var_name = match.lstrip('{').rstrip('}').strip()
+  optional = False
+  if var_name.endswith('?'):
+    optional = True
+    var_name = var_name.removesuffix('?')
+  if var_name.startswith('artifact.'):
+    return _Placeholder(var_name.removeprefix('artifact.'), optional, True)
+  if not _is_valid_state_name(var_name):
+    return None
+  return _Placeholder(var_name, optional, False)
+
+
+def _render_placeholder(
+    placeholder: _Placeholder, context: InvocationContext
+) -> str:
+  if placeholder.is_artifact:
+    if context.artifact_service is None:
+      raise ValueError('Artifact service is not initialized.')
+    artifact = context.artifact_service.load_artifact(
+        app_name=context.session.app_name,
+        user_id=context.session.user_id,
+        session_id=context.session.id,
+        filename=placeholder.name,
+    )
+    if not placeholder.name:
+      raise KeyError(f'Artifact {placeholder.name} not found.')
+    return str(artifact)
+  if placeholder.name in context.session.state:
+    return str(context.session.state[placeholder.name])
+  if placeholder.optional:
+    return ''
+  raise KeyError(f'Context variable not found: `{placeholder.name}`.')
 
 
 def _is_valid_state_name(var_name):
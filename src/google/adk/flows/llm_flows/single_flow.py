@@ -21,6 +21,7 @@ from . import _code_execution
 from . import _nl_planning
 from . import basic
 from . import contents
+from . import context_window
 from . import identity
 from . import instructions
 from .base_llm_flow import BaseLlmFlow
@@ -43,6 +44,9 @@ class SingleFlow(BaseLlmFlow):
         instructions.request_processor,
         identity.request_processor,
         contents.request_processor,
+        # Fits the contents to the token budget before they are processed
+        # further.
+        context_window.request_processor,
         # Some implementations of NL Planning mark planning contents as thoughts
         # in the post processor. Since these need to be unmarked, NL Planning
         # should be after contents.
@@ -15,15 +15,23 @@
 """Defines the interface to support a model."""
 
 from .base_llm import BaseLlm
+from .caching_llm import CachingLlm
 from .google_llm import Gemini
 from .llm_request import LlmRequest
 from .llm_response import LlmResponse
+from .llm_response_cache import BaseLlmResponseCache
+from .llm_response_cache import InMemoryLlmResponseCache
+from .llm_response_cache import SqliteLlmResponseCache
 from .registry import LLMRegistry
 
 __all__ = [
     'BaseLlm',
+    'BaseLlmResponseCache',
+    'CachingLlm',
     'Gemini',
+    'InMemoryLlmResponseCache',
     'LLMRegistry',
+    'SqliteLlmResponseCache',
 ]
 
 
@@ -0,0 +1,165 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Replays the responses of identical LLM requests."""
+
+from __future__ import annotations
+
+import base64
+import enum
+import hashlib
+import json
+from typing import Any
+from typing import AsyncGenerator
+from typing import Optional
+
+from pydantic import BaseModel
+from pydantic import Field
+from pydantic import model_validator
+from pydantic import PrivateAttr
+from typing_extensions import override
+
+from .base_llm import BaseLlm
+from .base_llm_connection import BaseLlmConnection
+from .llm_request import LlmRequest
+from .llm_response import LlmResponse
+from .llm_response_cache import BaseLlmResponseCache
+from .llm_response_cache import InMemoryLlmResponseCache
+
+
+class CachingLlm(BaseLlm):
+  """Wraps an LLM to replay the responses of identical requests.
+
+  Requests are keyed by a hash of the model, the contents, the config,
+  including the tool declarations, and whether the response is streamed.
+  Streamed responses are recorded and replayed chunk by chunk. Responses with
+  an error, and responses whose stream was not fully consumed, are not cached.
+
+  A `before_model_callback` can set `llm_request.bypass_cache` for requests
+  that must reach the model, e.g. because their answer changes over time.
+
+  Live connections are not cached.
+
+  Example:
+    agent = LlmAgent(
+        name='faq_agent',
+        model=CachingLlm(
+            llm=Gemini(model='gemini-2.0-flash'),
+            cache=SqliteLlmResponseCache('llm_responses.db'),
+            ttl=24 * 3600,
+        ),
+    )
+  """
+
+  llm: BaseLlm
+  """The LLM whose responses are cached."""
+  cache: BaseLlmResponseCache = Field(default_factory=InMemoryLlmResponseCache)
+  """The store of the responses."""
+  ttl: Optional[float] = None
+  """The number of seconds responses are replayed for, or None to replay them
+  until the cache evicts them."""
+
+  _hits: int = PrivateAttr(default=0)
+  _misses: int = PrivateAttr(default=0)
+
+  @model_validator(mode='before')
+  @classmethod
+  def _default_model_to_wrapped_llm(cls, data: Any) -> Any:
+    if (
+        isinstance(data, dict)
+        and 'model' not in data
+        and isinstance(data.get('llm'), BaseLlm)
+    ):
+      data = {**data, 'model': data['llm'].model}
+    return data
+
+  @property
+  def hits(self) -> int:
+    """The number of requests answered from the cache."""
+    return self._hits
+
+  @property
+  def misses(self) -> int:
+    """The number of requests sent to the LLM, excluding bypassed ones."""
+    return self._misses
+
+  @override
+  async def generate_content_async(
+      self, llm_request: LlmRequest, stream: bool = False
+  ) -> AsyncGenerator[LlmResponse, None]:
+    if llm_request.bypass_cache:
+      async for llm_response in self.llm.generate_content_async(
+          llm_request, stream=stream
+      ):
+        yield llm_response
+      return
+
+    key = self._request_key(llm_request, stream)
+    cached_responses = await self.cache.get(key)
+    if cached_responses is not None:
+      self._hits += 1
+      for llm_response in cached_responses:
+        yield llm_response
+      return
+
+    self._misses += 1
+    responses = []
+    async for llm_response in self.llm.generate_content_async(
+        llm_request, stream=stream
+    ):
+      # Recorded before the flow modifies it, e.g. to add function call ids.
+      responses.append(llm_response.model_copy(deep=True))
+      yield llm_response
+    if responses and not any(response.error_code for response in responses):
+      await self.cache.put(key, responses, self.ttl)
+
+  @override
+  def connect(self, llm_request: LlmRequest) -> BaseLlmConnection:
+    return self.llm.connect(llm_request)
+
+  def _request_key(self, llm_request: LlmRequest, stream: bool) -> str:
+    """Returns the canonical hash of a request."""
+    payload = {
+        'llm': type(self.llm).__qualname__,
+        'model': llm_request.model or self.llm.model,
+        'contents': [
+            content.model_dump(exclude_none=True)
+            for content in llm_request.contents
+        ],
+        'config': (
+            llm_request.config.model_dump(exclude_none=True)
+            if llm_request.config
+            else None
+        ),
+        'stream': stream,
+    }
+    data = json.dumps(
+        payload, sort_keys=True, separators=(',', ':'), default=_json_default
+    )
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def _json_default(value: Any) -> Any:
+  """Converts the values of request dumps that JSON does not support."""
+  if isinstance(value, bytes):
+    return base64.b64encode(value).decode()
+  if isinstance(value, enum.Enum):
+    return value.value
+  if isinstance(value, BaseModel):
+    return value.model_dump(mode='json', exclude_none=True)
+  if isinstance(value, type) and issubclass(value, BaseModel):
+    # E.g. the response schema of an agent with an output schema.
+    return value.model_json_schema()
+  # Values without a stable representation only cause cache misses.
+  return repr(value)
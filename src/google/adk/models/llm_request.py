@@ -54,6 +54,10 @@ class LlmRequest(BaseModel):
   tools_dict: dict[str, BaseTool] = Field(default_factory=dict, exclude=True)
   """The tools dictionary."""
 
+  bypass_cache: bool = Field(default=False, exclude=True)
+  """Whether a `CachingLlm` sends the request to the model, without replaying or
+  storing its response. Set by callbacks, e.g. for time-sensitive requests."""
+
   def append_instructions(self, instructions: list[str]) -> None:
     """Appends instructions to the system instruction.
 
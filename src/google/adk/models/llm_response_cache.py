@@ -0,0 +1,194 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Stores of LLM responses for `CachingLlm`."""
+
+from __future__ import annotations
+
+import abc
+import asyncio
+import collections
+import json
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from typing_extensions import override
+
+from .llm_response import LlmResponse
+
+
+class BaseLlmResponseCache(abc.ABC):
+  """Stores the responses of LLM requests by request key."""
+
+  @abc.abstractmethod
+  async def get(self, key: str) -> Optional[list[LlmResponse]]:
+    """Returns the responses stored for a key, or None if there are none.
+
+    Expired responses are never returned. The returned responses are copies
+    that the caller may modify.
+    """
+
+  @abc.abstractmethod
+  async def put(
+      self, key: str, responses: list[LlmResponse], ttl: Optional[float] = None
+  ):
+    """Stores the responses of a key, replacing the ones stored before.
+
+    Args:
+      key: The key of the request.
+      responses: The responses of the request, in order. Streaming responses
+        are stored chunk by chunk.
+      ttl: The number of seconds the responses are returned for, or None to
+        keep them until they are evicted.
+    """
+
+
+class InMemoryLlmResponseCache(BaseLlmResponseCache):
+  """Keeps the most recently used responses in process memory."""
+
+  def __init__(self, *, max_entries: int = 1000):
+    """
+    Args:
+      max_entries: The maximum number of requests whose responses are kept.
+        The least recently used ones are evicted first.
+    """
+    if max_entries < 1:
+      raise ValueError('max_entries must be at least 1.')
+    self.max_entries = max_entries
+    # The responses and their expiration time, least recently used first.
+    self._entries: collections.OrderedDict[
+        str, tuple[list[LlmResponse], Optional[float]]
+    ] = collections.OrderedDict()
+
+  @override
+  async def get(self, key: str) -> Optional[list[LlmResponse]]:
+    entry = self._entries.get(key)
+    if entry is None:
+      return None
+    responses, expires_at = entry
+    if expires_at is not None and expires_at <= time.time():
+      del self._entries[key]
+      return None
+    self._entries.move_to_end(key)
+    return [response.model_copy(deep=True) for response in responses]
+
+  @override
+  async def put(
+      self, key: str, responses: list[LlmResponse], ttl: Optional[float] = None
+  ):
+    self._entries[key] = (
+        [response.model_copy(deep=True) for response in responses],
+        None if ttl is None else time.time() + ttl,
+    )
+    self._entries.move_to_end(key)
+    while len(self._entries) > self.max_entries:
+      self._entries.popitem(last=False)
+
+
+class SqliteLlmResponseCache(BaseLlmResponseCache):
+  """Keeps responses in a SQLite database, e.g. to share them across runs.
+
+  Responses are stored as JSON, so they are shared by all the processes using
+  the same database file. Expired responses are deleted when they are read,
+  and by `delete_expired`.
+  """
+
+  def __init__(self, path: str, *, max_entries: Optional[int] = None):
+    """
+    Args:
+      path: The path of the database file, created if needed.
+      max_entries: The maximum number of requests whose responses are kept, or
+        None for no limit. The least recently stored ones are evicted first.
+    """
+    if max_entries is not None and max_entries < 1:
+      raise ValueError('max_entries must be at least 1.')
+    self.path = path
+    self.max_entries = max_entries
+    self._lock = threading.Lock()
+    self._connection = sqlite3.connect(path, check_same_thread=False)
+    with self._lock, self._connection:
+      self._connection.execute(
+          'CREATE TABLE IF NOT EXISTS llm_responses ('
+          ' key TEXT PRIMARY KEY,'
+          ' responses TEXT NOT NULL,'
+          ' stored_at REAL NOT NULL,'
+          ' expires_at REAL)'
+      )
+      self._connection.execute(
+          'CREATE INDEX IF NOT EXISTS llm_responses_stored_at'
+          ' ON llm_responses (stored_at)'
+      )
+
+  @override
+  async def get(self, key: str) -> Optional[list[LlmResponse]]:
+    row = await asyncio.to_thread(self._get, key)
+    if row is None:
+      return None
+    return [
+        LlmResponse.model_validate(response) for response in json.loads(row)
+    ]
+
+  @override
+  async def put(
+      self, key: str, responses: list[LlmResponse], ttl: Optional[float] = None
+  ):
+    data = json.dumps([
+        response.model_dump(mode='json', exclude_none=True)
+        for response in responses
+    ])
+    await asyncio.to_thread(self._put, key, data, ttl)
+
+  def delete_expired(self) -> int:
+    """Deletes the expired responses and returns how many were deleted."""
+    with self._lock, self._connection:
+      return self._connection.execute(
+          'DELETE FROM llm_responses WHERE expires_at <= ?', (time.time(),)
+      ).rowcount
+
+  def close(self):
+    """Closes the database connection."""
+    with self._lock:
+      self._connection.close()
+
+  def _get(self, key: str) -> Optional[str]:
+    with self._lock, self._connection:
+      row = self._connection.execute(
+          'SELECT responses, expires_at FROM llm_responses WHERE key = ?',
+          (key,),
+      ).fetchone()
+      if row is None:
+        return None
+      responses, expires_at = row
+      if expires_at is not None and expires_at <= time.time():
+        self._connection.execute(
+            'DELETE FROM llm_responses WHERE key = ?', (key,)
+        )
+        return None
+      return responses
+
+  def _put(self, key: str, data: str, ttl: Optional[float]):
+    now = time.time()
+    with self._lock, self._connection:
+      self._connection.execute(
+          'INSERT OR REPLACE INTO llm_responses VALUES (?, ?, ?, ?)',
+          (key, data, now, None if ttl is None else now + ttl),
+      )
+      if self.max_entries is not None:
+        self._connection.execute(
+            'DELETE FROM llm_responses WHERE key IN (SELECT key FROM'
+            ' llm_responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,),
+        )
@@ -16,10 +16,17 @@
 
 from __future__ import annotations
 
+import asyncio
 from functools import lru_cache
 import logging
+import os
 import re
+import threading
+from typing import AsyncGenerator
+from typing import Awaitable
+from typing import Optional
 from typing import TYPE_CHECKING
+import weakref
 
 if TYPE_CHECKING:
   from .base_llm import BaseLlm
@@ -34,6 +41,32 @@ Key is the regex that matches the model name.
 Value is the class that implements the model.
 """
 
+_CLIENT_ENV_VARS = (
+    'GOOGLE_GENAI_USE_VERTEXAI',
+    'GOOGLE_API_KEY',
+    'GOOGLE_CLOUD_PROJECT',
+    'GOOGLE_CLOUD_LOCATION',
+)
+"""The environment variables configuring the clients of the LLMs."""
+
+_llm_pool: dict[tuple[str, tuple[Optional[str], ...]], BaseLlm] = {}
+"""The LLM instances shared outside of event loops."""
+_loop_llm_pools: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop,
+    dict[tuple[str, tuple[Optional[str], ...]], BaseLlm],
+] = weakref.WeakKeyDictionary()
+"""The LLM instances shared within each event loop.
+
+The async HTTP clients of the LLMs keep connections tied to the event loop that
+opened them, so instances are not shared between event loops. Since the clients
+reference their event loop, the pool of a loop is dropped explicitly when the
+loop shuts down, see `_drop_loop_llm_pool`, or else once the loop is closed.
+"""
+_loop_llm_pool_guards: dict[asyncio.AbstractEventLoop, AsyncGenerator] = {}
+"""The async generators dropping the pools of the event loops."""
+# Reentrant, since closing a guard drops the pool of its loop.
+_llm_pool_lock = threading.RLock()
+
 
 class LLMRegistry:
   """Registry for LLMs."""
@@ -51,6 +84,47 @@ class LLMRegistry:
 
     return LLMRegistry.resolve(model)(model=model)
 
+  @staticmethod
+  def get_llm(model: str) -> BaseLlm:
+    """Gets the shared LLM instance of a model.
+
+    Instances are created on first use and shared by every agent of the process
+    using the model with the same client configuration, so that their HTTP
+    connections are kept alive and reused across steps and sessions. Each event
+    loop has its own instances.
+
+    Args:
+        model: The model name.
+
+    Returns:
+        The LLM instance.
+    """
+    key = (model, tuple(os.environ.get(name) for name in _CLIENT_ENV_VARS))
+    try:
+      loop = asyncio.get_running_loop()
+    except RuntimeError:
+      loop = None
+    with _llm_pool_lock:
+      if loop is None:
+        pool = _llm_pool
+      else:
+        pool = _loop_llm_pools.get(loop)
+        if pool is None:
+          # Loops closed without `shutdown_asyncgens()` did not drop theirs.
+          for other_loop in list(_loop_llm_pools):
+            if other_loop.is_closed():
+              _step_async_generator(_loop_llm_pool_guards[other_loop].aclose())
+          pool = _loop_llm_pools[loop] = {}
+          guard = _drop_loop_llm_pool(loop)
+          # Starting the generator registers it with the loop, which only
+          # keeps a weak reference to it.
+          _step_async_generator(guard.asend(None))
+          _loop_llm_pool_guards[loop] = guard
+      llm = pool.get(key)
+      if llm is None:
+        llm = pool[key] = LLMRegistry.new_llm(model)
+      return llm
+
   @staticmethod
   def _register(model_name_regex: str, llm_cls: type[BaseLlm]):
     """Registers a new LLM class.
@@ -69,6 +143,11 @@ class LLMRegistry:
       )
 
     _llm_registry_dict[model_name_regex] = llm_cls
+    # The registered class may replace the class of pooled instances.
+    with _llm_pool_lock:
+      _llm_pool.clear()
+      for pool in _loop_llm_pools.values():
+        pool.clear()
 
   @staticmethod
   def register(llm_cls: type[BaseLlm]):
@@ -100,3 +179,28 @@ class LLMRegistry:
         return llm_class
 
     raise ValueError(f'Model {model} not found.')
+
+
+async def _drop_loop_llm_pool(
+    loop: asyncio.AbstractEventLoop,
+) -> AsyncGenerator[None, None]:
+  """Drops the LLM pool of an event loop when the loop shuts down.
+
+  Started from within the loop, the generator is finalized by
+  `loop.shutdown_asyncgens()`, which `asyncio.run` calls before closing the
+  loop. Unlike a task, it is not pending in the meantime.
+  """
+  try:
+    yield
+  finally:
+    with _llm_pool_lock:
+      _loop_llm_pools.pop(loop, None)
+      _loop_llm_pool_guards.pop(loop, None)
+
+
+def _step_async_generator(awaitable: Awaitable) -> None:
+  """Runs an `asend()` or `aclose()` awaitable that does not suspend."""
+  try:
+    awaitable.send(None)
+  except (StopIteration, StopAsyncIteration):
+    pass
@@ -41,6 +41,8 @@ from .memory.in_memory_memory_service import InMemoryMemoryService
 from .sessions.base_session_service import BaseSessionService
 from .sessions.in_memory_session_service import InMemorySessionService
 from .sessions.session import Session
+from .sessions.session_lock import BaseSessionLock
+from .sessions.session_lock import InMemorySessionLock
 from .telemetry import tracer
 from .tools.built_in_code_execution_tool import built_in_code_execution
 
@@ -60,6 +62,9 @@ class Runner:
       artifact_service: The artifact service for the runner.
       session_service: The session service for the runner.
       memory_service: The memory service for the runner.
+      session_lock: The lock serializing the invocations on a session.
+      session_lock_timeout: The maximum number of seconds an invocation waits
+        for its session.
   """
 
   app_name: str
@@ -72,6 +77,10 @@ class Runner:
   """The session service for the runner."""
   memory_service: Optional[BaseMemoryService] = None
   """The memory service for the runner."""
+  session_lock: BaseSessionLock
+  """The lock serializing the invocations on a session."""
+  session_lock_timeout: Optional[float] = 60.0
+  """The maximum number of seconds an invocation waits for its session."""
 
   def __init__(
       self,
@@ -81,6 +90,8 @@ class Runner:
       artifact_service: Optional[BaseArtifactService] = None,
       session_service: BaseSessionService,
       memory_service: Optional[BaseMemoryService] = None,
+      session_lock: Optional[BaseSessionLock] = None,
+      session_lock_timeout: Optional[float] = 60.0,
   ):
     """Initializes the Runner.
 
@@ -90,12 +101,20 @@ class Runner:
         artifact_service: The artifact service for the runner.
         session_service: The session service for the runner.
         memory_service: The memory service for the runner.
+        session_lock: The lock serializing the invocations on a session.
+          Defaults to an in-process lock; use a `DatabaseSessionLock` when
+          several processes serve the same sessions.
+        session_lock_timeout: The maximum number of seconds an invocation
+          waits for the invocations queued before it on the session, or None
+          to wait indefinitely.
     """
     self.app_name = app_name
     self.agent = agent
     self.artifact_service = artifact_service
     self.session_service = session_service
     self.memory_service = memory_service
+    self.session_lock = session_lock or InMemorySessionLock()
+    self.session_lock_timeout = session_lock_timeout
 
   def run(
       self,
@@ -162,6 +181,11 @@ class Runner:
   ) -> AsyncGenerator[Event, None]:
     """Main entry method to run the agent in this runner.
 
+    The invocation holds the `session_lock` of the session until it ends.
+    Callers that stop iterating early must close the generator with
+    `aclose()`, which stops the invocation and releases the lock; otherwise the
+    lock is only released once the generator is garbage collected.
+
     Args:
       user_id: The user ID of the session.
       session_id: The session ID of the session.
@@ -170,36 +194,59 @@ class Runner:
 
     Yields:
       The events generated by the agent.
+
+    Raises:
+      SessionLockTimeoutError: If another invocation holds the session for
+        longer than `session_lock_timeout`.
     """
     with tracer.start_as_current_span('invocation'):
-      session = self.session_service.get_session(
-          app_name=self.app_name, user_id=user_id, session_id=session_id
-      )
-      if not session:
-        raise ValueError(f'Session not found: {session_id}')
-
-      invocation_context = self._new_invocation_context(
-          session,
-          new_message=new_message,
-          run_config=run_config,
-      )
-      root_agent = self.agent
-
-      if new_message:
-        self._append_new_message_to_session(
-            session,
-            new_message,
-            invocation_context,
-            run_config.save_input_blobs_as_artifacts,
+      # Concurrent invocations on the session wait for each other, so their
+      # events do not interleave. The lock is released when the generator is
+      # closed while suspended at a yield, too.
+      async with self.session_lock.lock(
+          app_name=self.app_name,
+          user_id=user_id,
+          session_id=session_id,
+          timeout=self.session_lock_timeout,
+      ):
+        session = await self.session_service.get_session_async(
+            app_name=self.app_name, user_id=user_id, session_id=session_id
         )
+        if not session:
+          raise ValueError(f'Session not found: {session_id}')
 
-      invocation_context.agent = self._find_agent_to_run(session, root_agent)
-      async for event in invocation_context.agent.run_async(invocation_context):
-        if not event.partial:
-          self.session_service.append_event(session=session, event=event)
-        yield event
-
-  def _append_new_message_to_session(
+        invocation_context = self._new_invocation_context(
+            session,
+            new_message=new_message,
+            run_config=run_config,
+        )
+        root_agent = self.agent
+
+        try:
+          if new_message:
+            await self._append_new_message_to_session(
+                session,
+                new_message,
+                invocation_context,
+                run_config.save_input_blobs_as_artifacts,
+            )
+
+          invocation_context.agent = self._find_agent_to_run(
+              session, root_agent
+          )
+          async for event in invocation_context.agent.run_async(
+              invocation_context
+          ):
+            if not event.partial:
+              await self.session_service.append_event_async(
+                  session=session, event=event
+              )
+            yield event
+        finally:
+          # Persists the events buffered by write-behind session services.
+          await self.session_service.flush_async(session=session)
+
+  async def _append_new_message_to_session(
       self,
       session: Session,
       new_message: types.Content,
@@ -241,7 +288,7 @@ class Runner:
         author='user',
         content=new_message,
     )
-    self.session_service.append_event(session=session, event=event)
+    await self.session_service.append_event_async(session=session, event=event)
 
   async def run_live(
       self,
@@ -260,6 +307,9 @@ class Runner:
     Yields:
         The events generated by the agent.
 
+    Live invocations do not take the `session_lock` of the session, since they
+    stay open for as long as the connection does.
+
     .. warning::
         This feature is **experimental** and its API or behavior may change
         in future releases.
@@ -293,9 +343,14 @@ class Runner:
               active_streaming_tools
           )
 
-    async for event in invocation_context.agent.run_live(invocation_context):
-      self.session_service.append_event(session=session, event=event)
-      yield event
+    try:
+      async for event in invocation_context.agent.run_live(invocation_context):
+        await self.session_service.append_event_async(
+            session=session, event=event
+        )
+        yield event
+    finally:
+      await self.session_service.flush_async(session=session)
 
   def close_session(self, session: Session):
     """Closes a session and adds it to the memory service (experimental feature).
@@ -14,8 +14,15 @@
 import logging
 
 from .base_session_service import BaseSessionService
+from .caching_session_service import CachingSessionService
+from .compaction import CompactionConfig
+from .compaction import EventSummarizer
+from .event_codec import EventCodec
 from .in_memory_session_service import InMemorySessionService
 from .session import Session
+from .session_lock import BaseSessionLock
+from .session_lock import InMemorySessionLock
+from .session_lock import SessionLockTimeoutError
 from .state import State
 from .vertex_ai_session_service import VertexAiSessionService
 
@@ -23,9 +30,16 @@ logger = logging.getLogger(__name__)
 
 
 __all__ = [
+    'BaseSessionLock',
     'BaseSessionService',
+    'CachingSessionService',
+    'CompactionConfig',
+    'EventCodec',
+    'EventSummarizer',
+    'InMemorySessionLock',
     'InMemorySessionService',
     'Session',
+    'SessionLockTimeoutError',
     'State',
     'VertexAiSessionService',
 ]
@@ -39,3 +53,33 @@ except ImportError:
       'DatabaseSessionService require sqlalchemy>=2.0, please ensure it is'
       ' installed correctly.'
   )
+
+try:
+  from .database_session_lock import DatabaseSessionLock
+
+  __all__.append('DatabaseSessionLock')
+except ImportError:
+  logger.debug(
+      'DatabaseSessionLock require sqlalchemy>=2.0, please ensure it is'
+      ' installed correctly.'
+  )
+
+try:
+  from .async_database_session_service import AsyncDatabaseSessionService
+
+  __all__.append('AsyncDatabaseSessionService')
+except ImportError:
+  logger.debug(
+      'AsyncDatabaseSessionService require sqlalchemy>=2.0 with asyncio'
+      ' support, please ensure it is installed correctly.'
+  )
+
+try:
+  from .msgpack_event_codec import MsgpackEventCodec
+
+  __all__.append('MsgpackEventCodec')
+except ImportError:
+  logger.debug(
+      'MsgpackEventCodec requires msgpack, please install it if you want to'
+      ' store events in the msgpack format.'
+  )
@@ -0,0 +1,799 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import logging
+import threading
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Literal
+from typing import Optional
+from typing import TypeVar
+import weakref
+
+from google.genai import types
+from sqlalchemy import delete
+from sqlalchemy import select
+from sqlalchemy.exc import ArgumentError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.asyncio import AsyncSession as DatabaseSessionFactory
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from typing_extensions import override
+
+from ..artifacts.base_artifact_service import BaseArtifactService
+from ..events.event import Event
+from .base_session_service import BaseSessionService
+from .base_session_service import GetSessionConfig
+from .base_session_service import ListEventsResponse
+from .base_session_service import ListSessionsResponse
+from .blob_offload import load_blob
+from .blob_offload import offload_inline_data
+from .compaction import apply_compaction
+from .compaction import CompactionConfig
+from .compaction import EventSummarizer
+from .compaction import split_events_for_compaction
+from .compaction import summarize_events_async
+from .database_session_service import _apply_rebase
+from .database_session_service import _archive_storage_events
+from .database_session_service import _check_rebase
+from .database_session_service import _check_upsert_support
+from .database_session_service import _create_tables
+from .database_session_service import _delete_old_session_state_entries
+from .database_session_service import _delete_session_state_entries
+from .database_session_service import _delete_storage_sessions
+from .database_session_service import _extract_events_state_delta
+from .database_session_service import _extract_state_delta
+from .database_session_service import _from_storage_event
+from .database_session_service import _is_in_memory_sqlite_url
+from .database_session_service import _merge_state
+from .database_session_service import _requires_legacy_actions
+from .database_session_service import _select_state_entries
+from .database_session_service import _select_storage_events
+from .database_session_service import _select_storage_events_page
+from .database_session_service import _select_storage_sessions_page
+from .database_session_service import _select_update_time
+from .database_session_service import _session_scoped_state
+from .database_session_service import _split_state_entries
+from .database_session_service import _state_entry_rows
+from .database_session_service import _to_list_events_response
+from .database_session_service import _to_list_sessions_response
+from .database_session_service import _to_storage_event
+from .database_session_service import _update_session_statement
+from .database_session_service import _upsert_state_entries_statement
+from .database_session_service import StorageAppState
+from .database_session_service import StorageSession
+from .database_session_service import StorageUserState
+from .event_codec import EventCodec
+from .session import Session
+
+logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+class AsyncDatabaseSessionService(BaseSessionService):
+  """A session service that uses an async database driver for storage.
+
+  It shares the table schema with `DatabaseSessionService`, but talks to the
+  database through `sqlalchemy.ext.asyncio`, so no call blocks the event loop.
+  The database URL must use an async driver, e.g. `postgresql+asyncpg://...` or
+  `sqlite+aiosqlite://...`.
+
+  The `*_async` methods are the primary API. The sync methods run them to
+  completion on an event loop of their own in a worker thread, like
+  `Runner.run`, so they block the caller (and its event loop, if any) until
+  done; they are meant for scripts and tests.
+
+  Unlike `DatabaseSessionService`, there is no write-behind mode: each appended
+  event is written in a transaction of its own, which does not block the event
+  loop.
+  """
+
+  def __init__(
+      self,
+      db_url: str,
+      *,
+      event_codec: Optional[EventCodec] = None,
+      artifact_service: Optional[BaseArtifactService] = None,
+      blob_offload_min_bytes: int = 64 * 1024,
+      conflict_retries: int = 0,
+      state_layout: Literal["document", "per_key"] = "document",
+      compaction_config: Optional[CompactionConfig] = None,
+  ):
+    """
+    Args:
+        db_url: The database URL to connect to. Must use an async driver.
+        event_codec: The codec of the event payloads. JSON columns are used if
+          not set.
+        artifact_service: If set, inline data of at least
+          `blob_offload_min_bytes` is stored once in it instead of in the event
+          rows. See `DatabaseSessionService`.
+        blob_offload_min_bytes: The minimum size of the inline data to offload.
+        conflict_retries: How many times a write from a stale session is rebased
+          onto the stored session and retried, as long as the state deltas of
+          the write and of the concurrent writes touch different keys. If 0,
+          writes from stale sessions fail.
+        state_layout: How the states are stored, either `"document"` or
+          `"per_key"`. See `DatabaseSessionService`.
+        compaction_config: If set, sessions are compacted when the session
+          object events are appended to has more than
+          `compaction_config.max_events` events.
+    """
+    if conflict_retries < 0:
+      raise ValueError("conflict_retries must not be negative.")
+    if state_layout not in ("document", "per_key"):
+      raise ValueError(f"Invalid state_layout: {state_layout}.")
+    try:
+      db_engine = create_async_engine(db_url)
+    except Exception as e:
+      if isinstance(e, ArgumentError):
+        raise ValueError(
+            f"Invalid database URL format or argument '{db_url}'."
+        ) from e
+      if isinstance(e, ImportError):
+        raise ValueError(
+            f"Database related module not found for URL '{db_url}'."
+        ) from e
+      raise ValueError(
+          f"Failed to create database engine for URL '{db_url}'"
+      ) from e
+
+    self.db_engine: AsyncEngine = db_engine
+    self.event_codec = event_codec
+    self.artifact_service = artifact_service
+    self.blob_offload_min_bytes = blob_offload_min_bytes
+    self.conflict_retries = conflict_retries
+    self.state_layout = state_layout
+    self.compaction_config = compaction_config
+    if state_layout == "per_key":
+      _check_upsert_support(self.db_engine.dialect)
+
+    # DB session factory method
+    self.DatabaseSessionFactory: async_sessionmaker[DatabaseSessionFactory] = (
+        async_sessionmaker(bind=self.db_engine, expire_on_commit=False)
+    )
+
+    # The sync methods run on short-lived event loops, and pooled connections
+    # of async drivers cannot move between event loops, so those loops get an
+    # engine without a pool. An in-memory database only exists on its single
+    # connection, which is shared instead.
+    if _is_in_memory_sqlite_url(db_url):
+      self._sync_db_engine = self.db_engine
+    else:
+      self._sync_db_engine = create_async_engine(db_url, poolclass=NullPool)
+    self._SyncDatabaseSessionFactory: async_sessionmaker[
+        DatabaseSessionFactory
+    ] = async_sessionmaker(bind=self._sync_db_engine, expire_on_commit=False)
+    self._sync_executor = ThreadPoolExecutor(
+        thread_name_prefix="AsyncDatabaseSessionService"
+    )
+    self._sync_thread = threading.local()
+
+    # Tables can only be created once an event loop is running, so this is
+    # done lazily on first use. An asyncio lock is bound to the event loop it
+    # is first used on, so each loop gets its own.
+    self._tables_created = False
+    self._legacy_actions = False
+    self._tables_locks: weakref.WeakKeyDictionary[
+        asyncio.AbstractEventLoop, asyncio.Lock
+    ] = weakref.WeakKeyDictionary()
+
+  def _in_sync_call(self) -> bool:
+    """Whether the current thread runs the async methods for sync ones."""
+    return getattr(self._sync_thread, "active", False)
+
+  def _session_factory(self) -> async_sessionmaker[DatabaseSessionFactory]:
+    if self._in_sync_call():
+      return self._SyncDatabaseSessionFactory
+    return self.DatabaseSessionFactory
+
+  def _run_sync(self, method: Callable[..., Awaitable[_T]], **kwargs) -> _T:
+    """Runs an async method to completion for its sync counterpart."""
+
+    def _thread_main() -> _T:
+      self._sync_thread.active = True
+      return asyncio.run(method(**kwargs))
+
+    return self._sync_executor.submit(_thread_main).result()
+
+  async def _ensure_tables(self):
+    if self._tables_created:
+      return
+    tables_lock = self._tables_locks.setdefault(
+        asyncio.get_running_loop(), asyncio.Lock()
+    )
+    async with tables_lock:
+      if self._tables_created:
+        return
+      db_engine = (
+          self._sync_db_engine if self._in_sync_call() else self.db_engine
+      )
+      async with db_engine.begin() as connection:
+        await connection.run_sync(_create_tables)
+        self._legacy_actions = await connection.run_sync(
+            _requires_legacy_actions
+        )
+      self._tables_created = True
+
+  @override
+  async def create_session_async(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      state: Optional[dict[str, Any]] = None,
+      session_id: Optional[str] = None,
+  ) -> Session:
+    await self._ensure_tables()
+    async with self._session_factory()() as sessionFactory:
+
+      # Fetch app and user states from storage
+      app_state, user_state, _ = await self._read_states(
+          sessionFactory, app_name, user_id
+      )
+
+      # Extract state deltas
+      app_state_delta, user_state_delta, session_state = _extract_state_delta(
+          state
+      )
+
+      # Apply state delta
+      app_state.update(app_state_delta)
+      user_state.update(user_state_delta)
+
+      # Store the session
+      storage_session = StorageSession(
+          app_name=app_name,
+          user_id=user_id,
+          id=session_id,
+          state=session_state if self.state_layout == "document" else {},
+      )
+      sessionFactory.add(storage_session)
+      await sessionFactory.flush()
+
+      # Store the states
+      await self._write_state_deltas(
+          sessionFactory,
+          (app_name, user_id, storage_session.id),
+          app_state_delta,
+          user_state_delta,
+          session_state,
+      )
+      await sessionFactory.commit()
+
+      await sessionFactory.refresh(storage_session)
+
+      # Merge states for response
+      merged_state = _merge_state(app_state, user_state, session_state)
+      session = Session(
+          app_name=str(storage_session.app_name),
+          user_id=str(storage_session.user_id),
+          id=str(storage_session.id),
+          state=merged_state,
+          last_update_time=storage_session.update_time.timestamp(),
+          version=storage_session.version,
+      )
+      return session
+
+  @override
+  async def get_session_async(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      session_id: str,
+      config: Optional[GetSessionConfig] = None,
+  ) -> Optional[Session]:
+    await self._ensure_tables()
+    async with self._session_factory()() as sessionFactory:
+      storage_session = await sessionFactory.get(
+          StorageSession, (app_name, user_id, session_id)
+      )
+      if storage_session is None:
+        return None
+
+      storage_events = (
+          await sessionFactory.scalars(
+              _select_storage_events(app_name, user_id, session_id, config)
+          )
+      ).all()
+
+      # Fetch states from storage
+      app_state, user_state, session_state = await self._read_states(
+          sessionFactory, app_name, user_id, session_id
+      )
+
+      # Merge states
+      merged_state = _merge_state(app_state, user_state, session_state)
+
+      # Convert storage session to session
+      session = Session(
+          app_name=app_name,
+          user_id=user_id,
+          id=session_id,
+          state=merged_state,
+          last_update_time=storage_session.update_time.timestamp(),
+          version=storage_session.version,
+      )
+      session.events = [
+          _from_storage_event(e, self.event_codec) for e in storage_events
+      ]
+    return session
+
+  @override
+  async def list_sessions_async(
+      self,
+      *,
+      app_name: str,
+      user_id: Optional[str],
+      page_size: Optional[int] = None,
+      page_token: Optional[str] = None,
+      updated_after: Optional[float] = None,
+      updated_before: Optional[float] = None,
+  ) -> ListSessionsResponse:
+    await self._ensure_tables()
+    async with self._session_factory()() as sessionFactory:
+      storage_sessions = (
+          await sessionFactory.scalars(
+              _select_storage_sessions_page(
+                  app_name,
+                  user_id,
+                  page_size,
+                  page_token,
+                  updated_after,
+                  updated_before,
+              )
+          )
+      ).all()
+      return _to_list_sessions_response(storage_sessions, page_size)
+
+  @override
+  async def delete_session_async(
+      self, *, app_name: str, user_id: str, session_id: str
+  ) -> None:
+    await self._ensure_tables()
+    async with self._session_factory()() as sessionFactory:
+      stmt = delete(StorageSession).where(
+          StorageSession.app_name == app_name,
+          StorageSession.user_id == user_id,
+          StorageSession.id == session_id,
+      )
+      await sessionFactory.execute(stmt)
+      if self.state_layout == "per_key":
+        await sessionFactory.execute(
+            _delete_session_state_entries(app_name, user_id, session_id)
+        )
+      await sessionFactory.commit()
+
+  @override
+  async def delete_sessions_async(
+      self, *, app_name: str, user_id: str, session_ids: list[str]
+  ) -> None:
+    await self._ensure_tables()
+    async with self._session_factory()() as sessionFactory:
+      if self.state_layout == "per_key":
+        await sessionFactory.execute(
+            _delete_session_state_entries(app_name, user_id, session_ids)
+        )
+      await sessionFactory.execute(
+          _delete_storage_sessions(
+              app_name, user_id, StorageSession.id.in_(session_ids)
+          )
+      )
+      await sessionFactory.commit()
+
+  @override
+  async def purge_sessions_older_than_async(
+      self,
+      *,
+      app_name: str,
+      cutoff_time: float,
+      user_id: Optional[str] = None,
+  ) -> int:
+    await self._ensure_tables()
+    is_old = StorageSession.update_time < datetime.fromtimestamp(cutoff_time)
+    async with self._session_factory()() as sessionFactory:
+      if self.state_layout == "per_key":
+        await sessionFactory.execute(
+            _delete_old_session_state_entries(app_name, user_id, is_old)
+        )
+      result = await sessionFactory.execute(
+          _delete_storage_sessions(app_name, user_id, is_old)
+      )
+      await sessionFactory.commit()
+      return result.rowcount
+
+  @override
+  async def append_event_async(self, session: Session, event: Event) -> Event:
+    logger.info(f"Append event: {event} to session {session.id}")
+
+    if event.partial:
+      return event
+
+    await self._ensure_tables()
+    storage_event = event
+    if self.artifact_service:
+      storage_event = await asyncio.to_thread(
+          offload_inline_data,
+          event,
+          artifact_service=self.artifact_service,
+          app_name=session.app_name,
+          user_id=session.user_id,
+          session_id=session.id,
+          min_size_bytes=self.blob_offload_min_bytes,
+      )
+    base_state = _session_scoped_state(session.state)
+    app_state_delta, user_state_delta, session_state_delta = (
+        _extract_events_state_delta([event])
+    )
+    key = (session.app_name, session.user_id, session.id)
+    expected_version = session.version
+    rebased_keys = set()
+    rebases = 0
+    async with self._session_factory()() as sessionFactory:
+      while True:
+        storage_session = await sessionFactory.get(
+            StorageSession, key, populate_existing=True
+        )
+        if storage_session.version != expected_version:
+          _, _, stored_state = await self._read_states(sessionFactory, *key)
+          changed_keys = _check_rebase(
+              session,
+              storage_session.version,
+              stored_state,
+              base_state,
+              session_state_delta,
+              rebases < self.conflict_retries,
+          )
+          rebases += 1
+          rebased_keys |= changed_keys
+          base_state = stored_state
+          expected_version = storage_session.version
+
+        session_state = None
+        if self.state_layout == "document":
+          session_state = dict(storage_session.state)
+          session_state.update(session_state_delta)
+        result = await sessionFactory.execute(
+            _update_session_statement(
+                key,
+                expected_version,
+                session_state,
+                sessionFactory.bind.dialect,
+            )
+        )
+        if sessionFactory.bind.dialect.update_returning:
+          update_time = result.scalar_one_or_none()
+        elif result.rowcount:
+          update_time = await sessionFactory.scalar(_select_update_time(key))
+        else:
+          update_time = None
+        if update_time is not None:
+          break
+        # A concurrent write got in between, retry against the new version.
+        await sessionFactory.rollback()
+
+      await self._write_state_deltas(
+          sessionFactory,
+          key,
+          app_state_delta,
+          user_state_delta,
+          session_state_delta,
+      )
+
+      sessionFactory.add(
+          _to_storage_event(
+              session, storage_event, self.event_codec, self._legacy_actions
+          )
+      )
+
+      await sessionFactory.commit()
+
+    _apply_rebase(session, base_state, rebased_keys)
+    session.version = expected_version + 1
+    session.last_update_time = update_time.timestamp()
+
+    # Also update the in-memory session
+    super().append_event(session=session, event=event)
+
+    if (
+        self.compaction_config
+        and len(session.events) > self.compaction_config.max_events
+    ):
+      await self.compact_session_async(
+          session=session,
+          keep_recent_events=self.compaction_config.keep_recent_events,
+          summarizer=self.compaction_config.summarizer,
+      )
+    return event
+
+  @override
+  def load_blob(
+      self, *, session: Session, blob_uri: str
+  ) -> Optional[types.Part]:
+    if not self.artifact_service:
+      return None
+    return load_blob(
+        blob_uri,
+        artifact_service=self.artifact_service,
+        app_name=session.app_name,
+        user_id=session.user_id,
+        session_id=session.id,
+    )
+
+  @override
+  async def compact_session_async(
+      self,
+      *,
+      session: Session,
+      keep_recent_events: int,
+      summarizer: Optional[EventSummarizer] = None,
+  ) -> int:
+    await self._ensure_tables()
+    key = (session.app_name, session.user_id, session.id)
+    async with self._session_factory()() as sessionFactory:
+      storage_events = (
+          await sessionFactory.scalars(_select_storage_events(*key))
+      ).all()
+      archived, kept = split_events_for_compaction(
+          [_from_storage_event(e, self.event_codec) for e in storage_events],
+          keep_recent_events,
+      )
+      if not archived:
+        return 0
+      summary = await summarize_events_async(archived, summarizer, kept)
+
+      await sessionFactory.execute(
+          _archive_storage_events(key, storage_events[len(archived) - 1])
+      )
+      if summary:
+        sessionFactory.add(
+            _to_storage_event(
+                session, summary, self.event_codec, self._legacy_actions
+            )
+        )
+      await sessionFactory.commit()
+
+    apply_compaction(session, {event.id for event in archived}, summary)
+    return len(archived)
+
+  async def _read_states(
+      self,
+      sessionFactory: DatabaseSessionFactory,
+      app_name: str,
+      user_id: str,
+      session_id: Optional[str] = None,
+  ) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any]]:
+    """Reads the app, user and (if `session_id` is set) session states."""
+    if self.state_layout == "per_key":
+      return _split_state_entries(
+          await sessionFactory.scalars(
+              _select_state_entries(app_name, user_id, session_id)
+          )
+      )
+    storage_app_state = await sessionFactory.get(StorageAppState, (app_name))
+    storage_user_state = await sessionFactory.get(
+        StorageUserState, (app_name, user_id)
+    )
+    storage_session = (
+        await sessionFactory.get(
+            StorageSession, (app_name, user_id, session_id)
+        )
+        if session_id
+        else None
+    )
+    return (
+        dict(storage_app_state.state) if storage_app_state else {},
+        dict(storage_user_state.state) if storage_user_state else {},
+        dict(storage_session.state) if storage_session else {},
+    )
+
+  async def _write_state_deltas(
+      self,
+      sessionFactory: DatabaseSessionFactory,
+      key: tuple[str, str, str],
+      app_state_delta: dict[str, Any],
+      user_state_delta: dict[str, Any],
+      session_state_delta: dict[str, Any],
+  ):
+    """Writes the state deltas, except the session state of the document layout.
+
+    In the document layout, the session state is written with the session row.
+    """
+    if self.state_layout == "per_key":
+      rows = _state_entry_rows(
+          key, app_state_delta, user_state_delta, session_state_delta
+      )
+      if rows:
+        await sessionFactory.execute(
+            _upsert_state_entries_statement(sessionFactory.bind.dialect, rows)
+        )
+      return
+
+    app_name, user_id, _ = key
+    storage_app_state = await sessionFactory.get(StorageAppState, (app_name))
+    storage_user_state = await sessionFactory.get(
+        StorageUserState, (app_name, user_id)
+    )
+    # Create state tables if not exist
+    if not storage_app_state:
+      storage_app_state = StorageAppState(app_name=app_name, state={})
+      sessionFactory.add(storage_app_state)
+    if not storage_user_state:
+      storage_user_state = StorageUserState(
+          app_name=app_name, user_id=user_id, state={}
+      )
+      sessionFactory.add(storage_user_state)
+    if app_state_delta:
+      storage_app_state.state.update(app_state_delta)
+    if user_state_delta:
+      storage_user_state.state.update(user_state_delta)
+
+  @override
+  async def list_events_async(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      session_id: str,
+      page_size: Optional[int] = None,
+      page_token: Optional[str] = None,
+  ) -> ListEventsResponse:
+    await self._ensure_tables()
+    async with self._session_factory()() as sessionFactory:
+      storage_events = (
+          await sessionFactory.scalars(
+              _select_storage_events_page(
+                  app_name, user_id, session_id, page_size, page_token
+              )
+          )
+      ).all()
+      return _to_list_events_response(
+          storage_events, page_size, self.event_codec
+      )
+
+  @override
+  def create_session(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      state: Optional[dict[str, Any]] = None,
+      session_id: Optional[str] = None,
+  ) -> Session:
+    return self._run_sync(
+        self.create_session_async,
+        app_name=app_name,
+        user_id=user_id,
+        state=state,
+        session_id=session_id,
+    )
+
+  @override
+  def get_session(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      session_id: str,
+      config: Optional[GetSessionConfig] = None,
+  ) -> Optional[Session]:
+    return self._run_sync(
+        self.get_session_async,
+        app_name=app_name,
+        user_id=user_id,
+        session_id=session_id,
+        config=config,
+    )
+
+  @override
+  def list_sessions(
+      self,
+      *,
+      app_name: str,
+      user_id: Optional[str],
+      page_size: Optional[int] = None,
+      page_token: Optional[str] = None,
+      updated_after: Optional[float] = None,
+      updated_before: Optional[float] = None,
+  ) -> ListSessionsResponse:
+    return self._run_sync(
+        self.list_sessions_async,
+        app_name=app_name,
+        user_id=user_id,
+        page_size=page_size,
+        page_token=page_token,
+        updated_after=updated_after,
+        updated_before=updated_before,
+    )
+
+  @override
+  def delete_session(
+      self, *, app_name: str, user_id: str, session_id: str
+  ) -> None:
+    self._run_sync(
+        self.delete_session_async,
+        app_name=app_name,
+        user_id=user_id,
+        session_id=session_id,
+    )
+
+  @override
+  def delete_sessions(
+      self, *, app_name: str, user_id: str, session_ids: list[str]
+  ) -> None:
+    self._run_sync(
+        self.delete_sessions_async,
+        app_name=app_name,
+        user_id=user_id,
+        session_ids=session_ids,
+    )
+
+  @override
+  def purge_sessions_older_than(
+      self,
+      *,
+      app_name: str,
+      cutoff_time: float,
+      user_id: Optional[str] = None,
+  ) -> int:
+    return self._run_sync(
+        self.purge_sessions_older_than_async,
+        app_name=app_name,
+        cutoff_time=cutoff_time,
+        user_id=user_id,
+    )
+
+  @override
+  def append_event(self, session: Session, event: Event) -> Event:
+    return self._run_sync(self.append_event_async, session=session, event=event)
+
+  @override
+  def compact_session(
+      self,
+      *,
+      session: Session,
+      keep_recent_events: int,
+      summarizer: Optional[EventSummarizer] = None,
+  ) -> int:
+    return self._run_sync(
+        self.compact_session_async,
+        session=session,
+        keep_recent_events=keep_recent_events,
+        summarizer=summarizer,
+    )
+
+  @override
+  def list_events(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      session_id: str,
+      page_size: Optional[int] = None,
+      page_token: Optional[str] = None,
+  ) -> ListEventsResponse:
+    return self._run_sync(
+        self.list_events_async,
+        app_name=app_name,
+        user_id=user_id,
+        session_id=session_id,
+        page_size=page_size,
+        page_token=page_token,
+    )
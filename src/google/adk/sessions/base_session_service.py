@@ -13,13 +13,18 @@
 # limitations under the License.
 
 import abc
+import base64
+import json
 from typing import Any
+from typing import Iterable
 from typing import Optional
 
+from google.genai import types
 from pydantic import BaseModel
 from pydantic import Field
 
 from ..events.event import Event
+from .compaction import EventSummarizer
 from .session import Session
 from .state import State
 
@@ -36,6 +41,7 @@ class ListSessionsResponse(BaseModel):
   The events and states are not set within each Session object.
   """
   sessions: list[Session] = Field(default_factory=list)
+  next_page_token: Optional[str] = None
 
 
 class ListEventsResponse(BaseModel):
@@ -48,6 +54,22 @@ class BaseSessionService(abc.ABC):
   """Base class for session services.
 
   The service provides a set of methods for managing sessions and events.
+
+  Besides the abstract methods, the following are optional, and only supported
+  by some services:
+
+  - `list_sessions` with `user_id=None`, listing the sessions of all the users
+    of an app: `InMemorySessionService`, `DatabaseSessionService`,
+    `AsyncDatabaseSessionService` and `VertexAiSessionService`.
+  - `purge_sessions_older_than` with `user_id=None`: the services above. The
+    default implementation lists and deletes the sessions one by one, the
+    database and in-memory services delete them in bulk.
+  - `compact_session`: `InMemorySessionService`, `DatabaseSessionService` and
+    `AsyncDatabaseSessionService`. The others raise `NotImplementedError`.
+  - `flush` and `load_blob` do nothing unless the service buffers writes or
+    offloads blobs, e.g. `DatabaseSessionService` if configured to.
+
+  `CachingSessionService` supports what its backing service supports.
   """
 
   @abc.abstractmethod
@@ -87,9 +109,39 @@ class BaseSessionService(abc.ABC):
 
   @abc.abstractmethod
   def list_sessions(
-      self, *, app_name: str, user_id: str
+      self,
+      *,
+      app_name: str,
+      user_id: Optional[str],
+      page_size: Optional[int] = None,
+      page_token: Optional[str] = None,
+      updated_after: Optional[float] = None,
+      updated_before: Optional[float] = None,
   ) -> ListSessionsResponse:
-    """Lists all the sessions."""
+    """Lists the sessions of a user, or of all the users of an app.
+
+    The paging and filter arguments were added after the first release.
+    Services implementing the former signature, `list_sessions(*, app_name,
+    user_id)`, still work with callers that do not set them.
+
+    Args:
+      app_name: the name of the app.
+      user_id: the id of the user. If None, the sessions of all the users of
+        the app are listed, by services that support it (see the class
+        docstring); the others raise `NotImplementedError`.
+      page_size: the maximum number of sessions to return. All the remaining
+        sessions are returned if not set.
+      page_token: the `next_page_token` of a previous response, to continue
+        listing from where it stopped.
+      updated_after: if set, only sessions last updated at or after this time
+        are listed.
+      updated_before: if set, only sessions last updated before this time are
+        listed.
+
+    Returns:
+      The sessions, and the token of the next page if there may be more
+      sessions.
+    """
     pass
 
   @abc.abstractmethod
@@ -106,15 +158,142 @@ class BaseSessionService(abc.ABC):
       app_name: str,
       user_id: str,
       session_id: str,
+      page_size: Optional[int] = None,
+      page_token: Optional[str] = None,
   ) -> ListEventsResponse:
-    """Lists events in a session."""
+    """Lists events in a session in chronological order.
+
+    The paging arguments were added after the first release. Services
+    implementing the former signature, `list_events(*, app_name, user_id,
+    session_id)`, still work with callers that do not set them.
+
+    Args:
+      app_name: the name of the app.
+      user_id: the id of the user.
+      session_id: the id of the session.
+      page_size: the maximum number of events to return. All the remaining
+        events are returned if not set.
+      page_token: the `next_page_token` of a previous response, to continue
+        listing from where it stopped.
+
+    Returns:
+      The events, and the token of the next page if there are more events.
+    """
     pass
 
+  def delete_sessions(
+      self, *, app_name: str, user_id: str, session_ids: list[str]
+  ) -> None:
+    """Deletes sessions of a user. Ids of missing sessions are ignored."""
+    for session_id in session_ids:
+      self.delete_session(
+          app_name=app_name, user_id=user_id, session_id=session_id
+      )
+
+  def purge_sessions_older_than(
+      self,
+      *,
+      app_name: str,
+      cutoff_time: float,
+      user_id: Optional[str] = None,
+  ) -> int:
+    """Deletes the sessions last updated before a time.
+
+    Args:
+      app_name: the name of the app.
+      cutoff_time: the sessions last updated before this time are deleted.
+      user_id: the id of the user whose sessions are deleted. The sessions of
+        all the users of the app are deleted if not set.
+
+    Returns:
+      The number of deleted sessions.
+
+    Raises:
+      NotImplementedError: If `user_id` is None and the service cannot list
+        the sessions of all the users.
+    """
+    # All the pages are listed before deleting, so that deletions do not
+    # shift the pages.
+    session_keys = []
+    page_token = None
+    while True:
+      response = self.list_sessions(
+          app_name=app_name,
+          user_id=user_id,
+          page_token=page_token,
+          updated_before=cutoff_time,
+      )
+      session_keys.extend(
+          (session.user_id, session.id) for session in response.sessions
+      )
+      page_token = response.next_page_token
+      if not page_token:
+        break
+    for session_user_id, session_id in session_keys:
+      self.delete_session(
+          app_name=app_name, user_id=session_user_id, session_id=session_id
+      )
+    return len(session_keys)
+
   def close_session(self, *, session: Session):
     """Closes a session."""
     # TODO: determine whether we want to finalize the session here.
     pass
 
+  def flush(self, *, session: Session) -> None:
+    """Persists any writes of the session that are still buffered.
+
+    Services that write through (the default) have nothing to flush.
+    """
+    pass
+
+  def load_blob(
+      self, *, session: Session, blob_uri: str
+  ) -> Optional[types.Part]:
+    """Loads a blob this service offloaded from the events of a session.
+
+    Services that offload large inline data replace it in the stored events by
+    `file_data` parts referencing the blob, see `sessions.blob_offload`.
+
+    Args:
+      session: The session whose events reference the blob.
+      blob_uri: The URI of the `file_data` part referencing the blob.
+
+    Returns:
+      The `inline_data` part of the blob, or None if this service did not
+      offload it.
+    """
+    return None
+
+  def compact_session(
+      self,
+      *,
+      session: Session,
+      keep_recent_events: int,
+      summarizer: Optional[EventSummarizer] = None,
+  ) -> int:
+    """Archives all but the most recent events of a session.
+
+    Later reads of the session only return the summary of the archived events
+    (if any) followed by the kept events. The events of `session` are updated
+    accordingly.
+
+    Args:
+      session: The session to compact.
+      keep_recent_events: The number of most recent events to keep.
+      summarizer: The summarizer of the archived events.
+
+    Returns:
+      The number of archived events.
+
+    Raises:
+      NotImplementedError: If the service does not support compaction, see the
+        class docstring.
+    """
+    raise NotImplementedError(
+        f'{type(self).__name__} does not support compaction.'
+    )
+
   def append_event(self, session: Session, event: Event) -> Event:
     """Appends an event to a session object."""
     if event.partial:
@@ -123,6 +302,143 @@ class BaseSessionService(abc.ABC):
     session.events.append(event)
     return event
 
+  # The async counterparts below are what `Runner` and the API server call.
+  # By default they delegate to the sync methods, which is fine for services
+  # that never block (e.g. `InMemorySessionService`). Services that do network
+  # or disk I/O should override them so the event loop is not blocked.
+
+  async def create_session_async(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      state: Optional[dict[str, Any]] = None,
+      session_id: Optional[str] = None,
+  ) -> Session:
+    """Creates a new session asynchronously. See `create_session`."""
+    return self.create_session(
+        app_name=app_name,
+        user_id=user_id,
+        state=state,
+        session_id=session_id,
+    )
+
+  async def get_session_async(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      session_id: str,
+      config: Optional[GetSessionConfig] = None,
+  ) -> Optional[Session]:
+    """Gets a session asynchronously. See `get_session`."""
+    return self.get_session(
+        app_name=app_name,
+        user_id=user_id,
+        session_id=session_id,
+        config=config,
+    )
+
+  async def list_sessions_async(
+      self,
+      *,
+      app_name: str,
+      user_id: Optional[str],
+      page_size: Optional[int] = None,
+      page_token: Optional[str] = None,
+      updated_after: Optional[float] = None,
+      updated_before: Optional[float] = None,
+  ) -> ListSessionsResponse:
+    """Lists the sessions asynchronously. See `list_sessions`."""
+    # Only the arguments that are set are passed, so that services implementing
+    # the former `list_sessions(*, app_name, user_id)` keep working.
+    return self.list_sessions(
+        app_name=app_name,
+        user_id=user_id,
+        **_set_kwargs(
+            page_size=page_size,
+            page_token=page_token,
+            updated_after=updated_after,
+            updated_before=updated_before,
+        ),
+    )
+
+  async def delete_session_async(
+      self, *, app_name: str, user_id: str, session_id: str
+  ) -> None:
+    """Deletes a session asynchronously. See `delete_session`."""
+    return self.delete_session(
+        app_name=app_name, user_id=user_id, session_id=session_id
+    )
+
+  async def delete_sessions_async(
+      self, *, app_name: str, user_id: str, session_ids: list[str]
+  ) -> None:
+    """Deletes sessions of a user asynchronously. See `delete_sessions`."""
+    return self.delete_sessions(
+        app_name=app_name, user_id=user_id, session_ids=session_ids
+    )
+
+  async def purge_sessions_older_than_async(
+      self,
+      *,
+      app_name: str,
+      cutoff_time: float,
+      user_id: Optional[str] = None,
+  ) -> int:
+    """Deletes old sessions asynchronously. See `purge_sessions_older_than`."""
+    return self.purge_sessions_older_than(
+        app_name=app_name, cutoff_time=cutoff_time, user_id=user_id
+    )
+
+  async def list_events_async(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      session_id: str,
+      page_size: Optional[int] = None,
+      page_token: Optional[str] = None,
+  ) -> ListEventsResponse:
+    """Lists events in a session asynchronously. See `list_events`."""
+    # Only the arguments that are set are passed, so that services implementing
+    # the former `list_events(*, app_name, user_id, session_id)` keep working.
+    return self.list_events(
+        app_name=app_name,
+        user_id=user_id,
+        session_id=session_id,
+        **_set_kwargs(page_size=page_size, page_token=page_token),
+    )
+
+  async def close_session_async(self, *, session: Session):
+    """Closes a session asynchronously. See `close_session`."""
+    return self.close_session(session=session)
+
+  async def flush_async(self, *, session: Session) -> None:
+    """Persists buffered writes of the session asynchronously. See `flush`."""
+    return self.flush(session=session)
+
+  async def compact_session_async(
+      self,
+      *,
+      session: Session,
+      keep_recent_events: int,
+      summarizer: Optional[EventSummarizer] = None,
+  ) -> int:
+    """Compacts a session asynchronously. See `compact_session`."""
+    return self.compact_session(
+        session=session,
+        keep_recent_events=keep_recent_events,
+        summarizer=summarizer,
+    )
+
+  async def append_event_async(self, session: Session, event: Event) -> Event:
+    """Appends an event to a session object asynchronously.
+
+    See `append_event`.
+    """
+    return self.append_event(session=session, event=event)
+
   def __update_session_state(self, session: Session, event: Event):
     """Updates the session state based on the event."""
     if not event.actions or not event.actions.state_delta:
@@ -131,3 +447,63 @@ class BaseSessionService(abc.ABC):
       if key.startswith(State.TEMP_PREFIX):
         continue
       session.state.update({key: value})
+
+
+def _encode_page_token(values: list[Any]) -> str:
+  """Encodes the position to resume a listing from as an opaque token."""
+  return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def _decode_page_token(page_token: str) -> list[Any]:
+  """Decodes a token created by `_encode_page_token`."""
+  try:
+    return json.loads(base64.urlsafe_b64decode(page_token.encode()))
+  except ValueError as e:
+    raise ValueError(f'Invalid page token: {page_token}') from e
+
+
+def _page_sessions(
+    sessions: Iterable[Session],
+    page_size: Optional[int],
+    page_token: Optional[str],
+    updated_after: Optional[float],
+    updated_before: Optional[float],
+) -> ListSessionsResponse:
+  """Filters and pages sessions listed in memory. See `list_sessions`."""
+  last_key = tuple(_decode_page_token(page_token)) if page_token else None
+  sessions = sorted(
+      (
+          session
+          for session in sessions
+          if (last_key is None or _session_position(session) > last_key)
+          and (
+              updated_after is None or session.last_update_time >= updated_after
+          )
+          and (
+              updated_before is None
+              or session.last_update_time < updated_before
+          )
+      ),
+      key=_session_position,
+  )
+  next_page_token = None
+  if page_size is not None and len(sessions) > page_size:
+    sessions = sessions[:page_size]
+    next_page_token = _encode_page_token(list(_session_position(sessions[-1])))
+  return ListSessionsResponse(
+      sessions=sessions, next_page_token=next_page_token
+  )
+
+
+def _session_position(session: Session) -> tuple[str, str]:
+  """The position of a session in the listings of `list_sessions`.
+
+  Session ids are only unique per user, so listings of all the users of an app
+  are ordered by user first.
+  """
+  return (session.user_id, session.id)
+
+
+def _set_kwargs(**kwargs: Any) -> dict[str, Any]:
+  """Returns the keyword arguments that are not None."""
+  return {name: value for name, value in kwargs.items() if value is not None}
@@ -0,0 +1,291 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Offloading of large inline_data parts of events to an artifact service.
+
+An offloaded part is saved once as an artifact named after the SHA-256 of its
+bytes, and replaced in the event by a `file_data` part whose URI references
+that artifact. The artifacts are saved under a session ID of their own, so they
+are not listed with the artifacts of the session.
+
+References are hydrated back to `inline_data` only when the contents of an LLM
+request are built, or when a session is returned to API clients. They are
+resolved by the session service that offloaded them, see
+`BaseSessionService.load_blob`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+from typing import Optional
+from typing import TYPE_CHECKING
+
+from google.genai import types
+
+from ..artifacts.base_artifact_service import BaseArtifactService
+from ..events.event import Event
+from .session import Session
+
+if TYPE_CHECKING:
+  from .base_session_service import BaseSessionService
+
+logger = logging.getLogger(__name__)
+
+BLOB_URI_PREFIX = 'adk-blob://'
+"""The URI prefix of the `file_data` parts referencing offloaded blobs."""
+
+_BLOB_FILENAME_PREFIX = 'adk-blob-'
+_BLOB_SESSION_ID_PREFIX = 'adk-blobs:'
+
+
+def _blob_filename(digest: str) -> str:
+  return f'{_BLOB_FILENAME_PREFIX}{digest}'
+
+
+def _blob_session_id(session_id: str) -> str:
+  """Returns the session ID the blobs of a session are saved under."""
+  return f'{_BLOB_SESSION_ID_PREFIX}{session_id}'
+
+
+def is_blob_reference(part: types.Part) -> bool:
+  """Whether the part references an offloaded blob."""
+  return bool(
+      part.file_data
+      and part.file_data.file_uri
+      and part.file_data.file_uri.startswith(BLOB_URI_PREFIX)
+  )
+
+
+def offload_inline_data(
+    event: Event,
+    *,
+    artifact_service: BaseArtifactService,
+    app_name: str,
+    user_id: str,
+    session_id: str,
+    min_size_bytes: int,
+) -> Event:
+  """Offloads the large inline_data parts of an event.
+
+  Args:
+    event: The event to offload.
+    artifact_service: The artifact service to store the blobs in.
+    app_name: The app name of the session.
+    user_id: The user ID of the session.
+    session_id: The ID of the session.
+    min_size_bytes: The minimum size of the inline data to offload.
+
+  Returns:
+    The event itself if nothing was offloaded, otherwise a copy of the event
+    with the offloaded parts replaced by references.
+  """
+  if not event.content or not event.content.parts:
+    return event
+
+  parts = []
+  offloaded = False
+  for part in event.content.parts:
+    if (
+        part.inline_data
+        and part.inline_data.data
+        and len(part.inline_data.data) >= min_size_bytes
+    ):
+      digest = hashlib.sha256(part.inline_data.data).hexdigest()
+      filename = _blob_filename(digest)
+      # Blobs are content-addressed, so identical bytes are stored once.
+      if not artifact_service.list_versions(
+          app_name=app_name,
+          user_id=user_id,
+          session_id=_blob_session_id(session_id),
+          filename=filename,
+      ):
+        artifact_service.save_artifact(
+            app_name=app_name,
+            user_id=user_id,
+            session_id=_blob_session_id(session_id),
+            filename=filename,
+            artifact=types.Part(inline_data=part.inline_data),
+        )
+      part = types.Part(
+          file_data=types.FileData(
+              file_uri=f'{BLOB_URI_PREFIX}{digest}',
+              mime_type=part.inline_data.mime_type,
+          )
+      )
+      offloaded = True
+    parts.append(part)
+
+  if not offloaded:
+    return event
+  return event.model_copy(
+      update={'content': event.content.model_copy(update={'parts': parts})}
+  )
+
+
+def load_blob(
+    blob_uri: str,
+    *,
+    artifact_service: BaseArtifactService,
+    app_name: str,
+    user_id: str,
+    session_id: str,
+) -> Optional[types.Part]:
+  """Loads a blob offloaded by `offload_inline_data`.
+
+  Args:
+    blob_uri: The URI of the reference to the blob.
+    artifact_service: The artifact service the blob was stored in.
+    app_name: The app name of the session.
+    user_id: The user ID of the session.
+    session_id: The ID of the session.
+
+  Returns:
+    The `inline_data` part of the blob, or None if it is not found.
+  """
+  if not blob_uri.startswith(BLOB_URI_PREFIX):
+    return None
+  return artifact_service.load_artifact(
+      app_name=app_name,
+      user_id=user_id,
+      session_id=_blob_session_id(session_id),
+      filename=_blob_filename(blob_uri[len(BLOB_URI_PREFIX) :]),
+  )
+
+
+def hydrate_blob_references(
+    contents: list[types.Content],
+    *,
+    session_service: BaseSessionService,
+    session: Session,
+) -> None:
+  """Replaces the blob references in the contents with their inline data.
+
+  The contents are modified in place.
+
+  Args:
+    contents: The contents to hydrate.
+    session_service: The session service that offloaded the blobs.
+    session: The session the contents are from.
+
+  Raises:
+    ValueError: If a referenced blob cannot be loaded.
+  """
+  loaded_parts = {
+      blob_uri: _load_blob_part(
+          blob_uri, session_service=session_service, session=session
+      )
+      for blob_uri in _blob_uris(contents)
+  }
+  _replace_blob_references(contents, loaded_parts)
+
+
+async def hydrate_blob_references_async(
+    contents: list[types.Content],
+    *,
+    session_service: BaseSessionService,
+    session: Session,
+    loaded_parts: Optional[dict[str, types.Part]] = None,
+) -> None:
+  """Like `hydrate_blob_references`, but loads the blobs in worker threads.
+
+  Args:
+    contents: The contents to hydrate.
+    session_service: The session service that offloaded the blobs.
+    session: The session the contents are from.
+    loaded_parts: The blobs of the session loaded earlier, by blob URI. Only
+      the missing blobs are loaded, and added to it.
+
+  Raises:
+    ValueError: If a referenced blob cannot be loaded.
+  """
+  if loaded_parts is None:
+    loaded_parts = {}
+  missing_uris = [
+      blob_uri
+      for blob_uri in _blob_uris(contents)
+      if blob_uri not in loaded_parts
+  ]
+  parts = await asyncio.gather(*(
+      asyncio.to_thread(
+          _load_blob_part,
+          blob_uri,
+          session_service=session_service,
+          session=session,
+      )
+      for blob_uri in missing_uris
+  ))
+  loaded_parts.update(zip(missing_uris, parts))
+  _replace_blob_references(contents, loaded_parts)
+
+
+def _blob_uris(contents: list[types.Content]) -> set[str]:
+  """Returns the URIs of the blobs referenced in the contents."""
+  return {
+      part.file_data.file_uri
+      for content in contents
+      for part in content.parts or []
+      if is_blob_reference(part)
+  }
+
+
+def _load_blob_part(
+    blob_uri: str, *, session_service: BaseSessionService, session: Session
+) -> types.Part:
+  loaded_part = session_service.load_blob(session=session, blob_uri=blob_uri)
+  if loaded_part is None:
+    raise ValueError(f'Offloaded blob {blob_uri} not found.')
+  return loaded_part
+
+
+def _replace_blob_references(
+    contents: list[types.Content], loaded_parts: dict[str, types.Part]
+) -> None:
+  for content in contents:
+    if not content.parts:
+      continue
+    for i, part in enumerate(content.parts):
+      if is_blob_reference(part):
+        content.parts[i] = loaded_parts[part.file_data.file_uri]
+
+
+def hydrate_session(
+    session: Session, *, session_service: BaseSessionService
+) -> Session:
+  """Returns the session with the blob references in its events hydrated.
+
+  The events with references are copied, the other events and the session
+  itself are left as they are.
+
+  Args:
+    session: The session to hydrate.
+    session_service: The session service that offloaded the blobs.
+
+  Raises:
+    ValueError: If a referenced blob cannot be loaded.
+  """
+  events = []
+  for event in session.events:
+    if event.content and event.content.parts:
+      if any(is_blob_reference(part) for part in event.content.parts):
+        content = event.content.model_copy(
+            update={'parts': list(event.content.parts)}
+        )
+        hydrate_blob_references(
+            [content], session_service=session_service, session=session
+        )
+        event = event.model_copy(update={'content': content})
+    events.append(event)
+  return session.model_copy(update={'events': events})
@@ -0,0 +1,540 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import copy
+import logging
+from typing import Any
+from typing import Optional
+
+from google.genai import types
+from typing_extensions import override
+
+from ..events.event import Event
+from .base_session_service import BaseSessionService
+from .base_session_service import GetSessionConfig
+from .base_session_service import ListEventsResponse
+from .base_session_service import ListSessionsResponse
+from .compaction import EventSummarizer
+from .session import Session
+from .state import State
+
+logger = logging.getLogger(__name__)
+
+_SessionKey = tuple[str, str, str]
+_UserKey = tuple[str, str]
+
+
+class CachingSessionService(BaseSessionService):
+  """A read-through cache in front of another session service.
+
+  Recently used sessions are kept in process memory. Events appended through
+  this service are applied to the cached copy as well, so a session is only
+  fetched from the backing service on its first use, after it was evicted, or
+  after it was invalidated. A cached session is invalidated when it is deleted
+  or compacted, and when an append reveals that it is out of date, i.e. the
+  appended-to session had a different version or update time than the cached
+  one, the backing service rejected the append, or the backing service rebased
+  the append onto writes made by others.
+
+  The `app:` and `user:` state is not cached per session. It is kept once per
+  app and per user, refreshed whenever a session is fetched from the backing
+  service, and updated by the events appended through this service, so that a
+  session read from the cache sees the app and user state written through its
+  other sessions.
+
+  The cache does not see writes made by other processes until one of these
+  happens, so it should only be used when this process is the only writer of
+  its sessions.
+
+  Sessions returned from the cache get their own events list and state dict,
+  but share the `Event` objects with the cache, so callers must treat events as
+  read-only.
+  """
+
+  def __init__(
+      self, session_service: BaseSessionService, *, max_sessions: int = 1000
+  ):
+    """
+    Args:
+      session_service: The backing session service.
+      max_sessions: The maximum number of cached sessions.
+    """
+    if max_sessions < 1:
+      raise ValueError('max_sessions must be at least 1.')
+    self.session_service = session_service
+    self.max_sessions = max_sessions
+    self.hits = 0
+    """The number of sessions read from the cache."""
+    self.misses = 0
+    """The number of sessions read from the backing service."""
+    self.invalidations = 0
+    """The number of cached sessions dropped because they were out of date."""
+    # The cached sessions, least recently used first, with their
+    # session-scoped state only.
+    self._sessions: collections.OrderedDict[_SessionKey, Session] = (
+        collections.OrderedDict()
+    )
+    # The `app:` and `user:` state of the cached sessions.
+    self._app_states: dict[str, dict[str, Any]] = {}
+    self._user_states: dict[_UserKey, dict[str, Any]] = {}
+    # The number of cached sessions of each user, to drop their user state
+    # along with their last session.
+    self._user_session_counts: collections.Counter[_UserKey] = (
+        collections.Counter()
+    )
+
+  @property
+  def hit_rate(self) -> float:
+    """The fraction of session reads served from the cache."""
+    reads = self.hits + self.misses
+    return self.hits / reads if reads else 0.0
+
+  @override
+  def create_session(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      state: Optional[dict[str, Any]] = None,
+      session_id: Optional[str] = None,
+  ) -> Session:
+    session = self.session_service.create_session(
+        app_name=app_name, user_id=user_id, state=state, session_id=session_id
+    )
+    self._put(session)
+    return session
+
+  @override
+  async def create_session_async(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      state: Optional[dict[str, Any]] = None,
+      session_id: Optional[str] = None,
+  ) -> Session:
+    session = await self.session_service.create_session_async(
+        app_name=app_name, user_id=user_id, state=state, session_id=session_id
+    )
+    self._put(session)
+    return session
+
+  @override
+  def get_session(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      session_id: str,
+      config: Optional[GetSessionConfig] = None,
+  ) -> Optional[Session]:
+    session = self._get((app_name, user_id, session_id), config)
+    if session:
+      return session
+    session = self.session_service.get_session(
+        app_name=app_name, user_id=user_id, session_id=session_id, config=config
+    )
+    if session and not config:
+      self._put(session)
+    return session
+
+  @override
+  async def get_session_async(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      session_id: str,
+      config: Optional[GetSessionConfig] = None,
+  ) -> Optional[Session]:
+    session = self._get((app_name, user_id, session_id), config)
+    if session:
+      return session
+    session = await self.session_service.get_session_async(
+        app_name=app_name, user_id=user_id, session_id=session_id, config=config
+    )
+    if session and not config:
+      self._put(session)
+    return session
+
+  @override
+  def list_sessions(
+      self,
+      *,
+      app_name: str,
+      user_id: Optional[str],
+      page_size: Optional[int] = None,
+      page_token: Optional[str] = None,
+      updated_after: Optional[float] = None,
+      updated_before: Optional[float] = None,
+  ) -> ListSessionsResponse:
+    return self.session_service.list_sessions(
+        app_name=app_name,
+        user_id=user_id,
+        page_size=page_size,
+        page_token=page_token,
+        updated_after=updated_after,
+        updated_before=updated_before,
+    )
+
+  @override
+  async def list_sessions_async(
+      self,
+      *,
+      app_name: str,
+      user_id: Optional[str],
+      page_size: Optional[int] = None,
+      page_token: Optional[str] = None,
+      updated_after: Optional[float] = None,
+      updated_before: Optional[float] = None,
+  ) -> ListSessionsResponse:
+    return await self.session_service.list_sessions_async(
+        app_name=app_name,
+        user_id=user_id,
+        page_size=page_size,
+        page_token=page_token,
+        updated_after=updated_after,
+        updated_before=updated_before,
+    )
+
+  @override
+  def delete_session(
+      self, *, app_name: str, user_id: str, session_id: str
+  ) -> None:
+    self._pop((app_name, user_id, session_id))
+    self.session_service.delete_session(
+        app_name=app_name, user_id=user_id, session_id=session_id
+    )
+
+  @override
+  async def delete_session_async(
+      self, *, app_name: str, user_id: str, session_id: str
+  ) -> None:
+    self._pop((app_name, user_id, session_id))
+    await self.session_service.delete_session_async(
+        app_name=app_name, user_id=user_id, session_id=session_id
+    )
+
+  @override
+  def delete_sessions(
+      self, *, app_name: str, user_id: str, session_ids: list[str]
+  ) -> None:
+    for session_id in session_ids:
+      self._pop((app_name, user_id, session_id))
+    self.session_service.delete_sessions(
+        app_name=app_name, user_id=user_id, session_ids=session_ids
+    )
+
+  @override
+  async def delete_sessions_async(
+      self, *, app_name: str, user_id: str, session_ids: list[str]
+  ) -> None:
+    for session_id in session_ids:
+      self._pop((app_name, user_id, session_id))
+    await self.session_service.delete_sessions_async(
+        app_name=app_name, user_id=user_id, session_ids=session_ids
+    )
+
+  @override
+  def purge_sessions_older_than(
+      self,
+      *,
+      app_name: str,
+      cutoff_time: float,
+      user_id: Optional[str] = None,
+  ) -> int:
+    self._drop_sessions(app_name, user_id)
+    return self.session_service.purge_sessions_older_than(
+        app_name=app_name, cutoff_time=cutoff_time, user_id=user_id
+    )
+
+  @override
+  async def purge_sessions_older_than_async(
+      self,
+      *,
+      app_name: str,
+      cutoff_time: float,
+      user_id: Optional[str] = None,
+  ) -> int:
+    self._drop_sessions(app_name, user_id)
+    return await self.session_service.purge_sessions_older_than_async(
+        app_name=app_name, cutoff_time=cutoff_time, user_id=user_id
+    )
+
+  @override
+  def list_events(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      session_id: str,
+      page_size: Optional[int] = None,
+      page_token: Optional[str] = None,
+  ) -> ListEventsResponse:
+    return self.session_service.list_events(
+        app_name=app_name,
+        user_id=user_id,
+        session_id=session_id,
+        page_size=page_size,
+        page_token=page_token,
+    )
+
+  @override
+  async def list_events_async(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      session_id: str,
+      page_size: Optional[int] = None,
+      page_token: Optional[str] = None,
+  ) -> ListEventsResponse:
+    return await self.session_service.list_events_async(
+        app_name=app_name,
+        user_id=user_id,
+        session_id=session_id,
+        page_size=page_size,
+        page_token=page_token,
+    )
+
+  @override
+  def close_session(self, *, session: Session):
+    self.session_service.close_session(session=session)
+
+  @override
+  async def close_session_async(self, *, session: Session):
+    await self.session_service.close_session_async(session=session)
+
+  @override
+  def flush(self, *, session: Session) -> None:
+    self.session_service.flush(session=session)
+    self._sync_metadata(session)
+
+  @override
+  async def flush_async(self, *, session: Session) -> None:
+    await self.session_service.flush_async(session=session)
+    self._sync_metadata(session)
+
+  @override
+  def load_blob(
+      self, *, session: Session, blob_uri: str
+  ) -> Optional[types.Part]:
+    return self.session_service.load_blob(session=session, blob_uri=blob_uri)
+
+  @override
+  def compact_session(
+      self,
+      *,
+      session: Session,
+      keep_recent_events: int,
+      summarizer: Optional[EventSummarizer] = None,
+  ) -> int:
+    self._pop(_key(session))
+    return self.session_service.compact_session(
+        session=session,
+        keep_recent_events=keep_recent_events,
+        summarizer=summarizer,
+    )
+
+  @override
+  async def compact_session_async(
+      self,
+      *,
+      session: Session,
+      keep_recent_events: int,
+      summarizer: Optional[EventSummarizer] = None,
+  ) -> int:
+    self._pop(_key(session))
+    return await self.session_service.compact_session_async(
+        session=session,
+        keep_recent_events=keep_recent_events,
+        summarizer=summarizer,
+    )
+
+  @override
+  def append_event(self, session: Session, event: Event) -> Event:
+    cached_session = self._check_cached(session)
+    try:
+      self.session_service.append_event(session=session, event=event)
+    except Exception:
+      self._invalidate(session)
+      raise
+    self._apply_event(cached_session, session, event)
+    return event
+
+  @override
+  async def append_event_async(self, session: Session, event: Event) -> Event:
+    cached_session = self._check_cached(session)
+    try:
+      await self.session_service.append_event_async(
+          session=session, event=event
+      )
+    except Exception:
+      self._invalidate(session)
+      raise
+    self._apply_event(cached_session, session, event)
+    return event
+
+  def _get(
+      self, key: _SessionKey, config: Optional[GetSessionConfig]
+  ) -> Optional[Session]:
+    cached_session = self._sessions.get(key)
+    if cached_session is None:
+      self.misses += 1
+      return None
+    self.hits += 1
+    self._sessions.move_to_end(key)
+    return _copy_session(
+        cached_session,
+        _select_events(cached_session.events, config),
+        {
+            **cached_session.state,
+            **self._app_states.get(key[0], {}),
+            **self._user_states.get(key[:2], {}),
+        },
+    )
+
+  def _put(self, session: Session):
+    key = _key(session)
+    if key not in self._sessions:
+      self._user_session_counts[key[:2]] += 1
+    self._sessions[key] = _copy_session(
+        session, session.events, _scoped_state(session.state, None)
+    )
+    self._sessions.move_to_end(key)
+    # The backing service returns the current app and user state.
+    self._app_states[key[0]] = _scoped_state(session.state, State.APP_PREFIX)
+    self._user_states[key[:2]] = _scoped_state(session.state, State.USER_PREFIX)
+    while len(self._sessions) > self.max_sessions:
+      self._pop(next(iter(self._sessions)))
+
+  def _pop(self, key: _SessionKey) -> Optional[Session]:
+    """Drops a cached session, and the user state of its user's last one."""
+    cached_session = self._sessions.pop(key, None)
+    if cached_session is not None:
+      user_key = key[:2]
+      self._user_session_counts[user_key] -= 1
+      if not self._user_session_counts[user_key]:
+        del self._user_session_counts[user_key]
+        self._user_states.pop(user_key, None)
+    return cached_session
+
+  def _drop_sessions(self, app_name: str, user_id: Optional[str]):
+    """Drops the cached sessions of an app, or of one of its users."""
+    for key in list(self._sessions):
+      if key[0] == app_name and user_id in (None, key[1]):
+        self._pop(key)
+
+  def _invalidate(self, session: Session):
+    if self._pop(_key(session)) is not None:
+      self.invalidations += 1
+
+  def _check_cached(self, session: Session) -> Optional[Session]:
+    """Returns the cached session if it is in sync with `session`."""
+    cached_session = self._sessions.get(_key(session))
+    if cached_session is None:
+      return None
+    if (
+        cached_session.version != session.version
+        or cached_session.last_update_time != session.last_update_time
+    ):
+      logger.debug('Cached session %s is out of date.', session.id)
+      self._invalidate(session)
+      return None
+    return cached_session
+
+  def _apply_event(
+      self, cached_session: Optional[Session], session: Session, event: Event
+  ):
+    """Applies an event appended to `session` to its cached copy."""
+    if cached_session is None or event.partial:
+      return
+    if session.version > cached_session.version + 1:
+      # The backing service rebased the append onto writes made by others,
+      # whose events the cached session does not have.
+      self._invalidate(session)
+      return
+    cached_session.events.append(event)
+    if len(cached_session.events) != len(session.events):
+      # The backing service compacted the session, or `session` only has a
+      # window of the events.
+      self._invalidate(session)
+      return
+    # `session` has the state the backing service ended up with, including
+    # the keys changed by the writes an append was rebased onto.
+    cached_session.state = _scoped_state(session.state, None)
+    if event.actions and event.actions.state_delta:
+      key = _key(session)
+      app_state = self._app_states.setdefault(key[0], {})
+      user_state = self._user_states.setdefault(key[:2], {})
+      for state_key, value in event.actions.state_delta.items():
+        if state_key.startswith(State.APP_PREFIX):
+          app_state[state_key] = value
+        elif state_key.startswith(State.USER_PREFIX):
+          user_state[state_key] = value
+    cached_session.version = session.version
+    cached_session.last_update_time = session.last_update_time
+
+  def _sync_metadata(self, session: Session):
+    cached_session = self._sessions.get(_key(session))
+    if cached_session is not None:
+      cached_session.version = session.version
+      cached_session.last_update_time = session.last_update_time
+
+
+def _key(session: Session) -> _SessionKey:
+  return (session.app_name, session.user_id, session.id)
+
+
+def _copy_session(
+    session: Session, events: list[Event], state: dict[str, Any]
+) -> Session:
+  return session.model_copy(
+      update={'state': copy.deepcopy(state), 'events': list(events)}
+  )
+
+
+def _scoped_state(
+    state: dict[str, Any], prefix: Optional[str]
+) -> dict[str, Any]:
+  """Returns the keys of a state with a prefix, or the session-scoped keys."""
+  if prefix:
+    return {
+        key: value for key, value in state.items() if key.startswith(prefix)
+    }
+  return {
+      key: value
+      for key, value in state.items()
+      if not key.startswith(
+          (State.APP_PREFIX, State.USER_PREFIX, State.TEMP_PREFIX)
+      )
+  }
+
+
+def _select_events(
+    events: list[Event], config: Optional[GetSessionConfig]
+) -> list[Event]:
+  """Selects the events of a cached session requested by `config`."""
+  if config:
+    if config.num_recent_events:
+      return events[-config.num_recent_events :]
+    if config.after_timestamp:
+      i = len(events) - 1
+      while i >= 0:
+        if events[i].timestamp < config.after_timestamp:
+          break
+        i -= 1
+      return events[i + 1 :]
+  return events
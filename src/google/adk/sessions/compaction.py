@@ -0,0 +1,169 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compaction of the event log of sessions.
+
+Compacting a session archives all but its most recent events. The state of a
+session is stored folded, independently of its events, so it is not affected.
+The archived events can be replaced by a single summary event produced by an
+`EventSummarizer`, which then stands in for them in the LLM history.
+"""
+
+from __future__ import annotations
+
+import abc
+import asyncio
+from typing import Optional
+
+from google.genai import types
+from pydantic import BaseModel
+from pydantic import ConfigDict
+from pydantic import Field
+from pydantic import model_validator
+
+from ..events.event import Event
+from .session import Session
+
+
+class EventSummarizer(abc.ABC):
+  """Summarizes the events archived by a session compaction."""
+
+  @abc.abstractmethod
+  def summarize(self, events: list[Event]) -> Optional[types.Content]:
+    """Summarizes events.
+
+    Args:
+      events: The events being archived, in chronological order. A summary of
+        a previous compaction comes first if there is one.
+
+    Returns:
+      The content of the event replacing `events` in the session, or None to
+      archive them without a summary.
+    """
+
+  async def summarize_async(
+      self, events: list[Event]
+  ) -> Optional[types.Content]:
+    """Summarizes events asynchronously. See `summarize`.
+
+    Runs `summarize` in a worker thread by default, so that summarizers calling
+    a model do not block the event loop. Summarizers that can call the model
+    asynchronously should override it.
+    """
+    return await asyncio.to_thread(self.summarize, events)
+
+
+class CompactionConfig(BaseModel):
+  """The configuration of the automatic compaction of sessions."""
+
+  model_config = ConfigDict(arbitrary_types_allowed=True)
+
+  max_events: int = Field(gt=0)
+  """A session is compacted once it has more than this many events."""
+  keep_recent_events: int = Field(ge=0)
+  """The number of most recent events kept by a compaction."""
+  summarizer: Optional[EventSummarizer] = None
+  """The summarizer of the archived events. They are dropped from the history
+  without a summary if not set."""
+
+  @model_validator(mode='after')
+  def _check_keep_recent_events(self) -> CompactionConfig:
+    if self.keep_recent_events >= self.max_events:
+      raise ValueError('keep_recent_events must be less than max_events.')
+    return self
+
+
+def split_events_for_compaction(
+    events: list[Event], keep_recent_events: int
+) -> tuple[list[Event], list[Event]]:
+  """Splits events into the ones to archive and the ones to keep.
+
+  At least `keep_recent_events` events are kept. More are kept if needed to
+  not separate function responses from their function calls.
+
+  Returns:
+    The events to archive and the events to keep.
+  """
+  start = max(len(events) - keep_recent_events, 0)
+  while 0 < start < len(events) and events[start].get_function_responses():
+    start -= 1
+  return events[:start], events[start:]
+
+
+_TIMESTAMP_RESOLUTION = 1e-6
+"""The resolution of the event timestamps stored by the database services."""
+
+
+def summarize_events(
+    events: list[Event],
+    summarizer: Optional[EventSummarizer],
+    kept_events: list[Event],
+) -> Optional[Event]:
+  """Builds the event replacing the archived events, if any.
+
+  Args:
+    events: The archived events.
+    summarizer: The summarizer of the archived events.
+    kept_events: The events kept by the compaction.
+  """
+  if not events or not summarizer:
+    return None
+  return _summary_event(summarizer.summarize(events), events, kept_events)
+
+
+async def summarize_events_async(
+    events: list[Event],
+    summarizer: Optional[EventSummarizer],
+    kept_events: list[Event],
+) -> Optional[Event]:
+  """Builds the event replacing the archived events asynchronously.
+
+  See `summarize_events`.
+  """
+  if not events or not summarizer:
+    return None
+  return _summary_event(
+      await summarizer.summarize_async(events), events, kept_events
+  )
+
+
+def _summary_event(
+    content: Optional[types.Content],
+    events: list[Event],
+    kept_events: list[Event],
+) -> Optional[Event]:
+  if not content:
+    return None
+  if not content.role:
+    content = content.model_copy(update={'role': 'user'})
+  # Sorts the summary strictly after the archived events and before the kept
+  # ones, also once stored with the resolution of the database services.
+  timestamp = events[-1].timestamp + _TIMESTAMP_RESOLUTION
+  if kept_events and timestamp >= kept_events[0].timestamp:
+    timestamp = (events[-1].timestamp + kept_events[0].timestamp) / 2
+  return Event(
+      invocation_id=events[-1].invocation_id,
+      author='user',
+      content=content,
+      timestamp=timestamp,
+  )
+
+
+def apply_compaction(
+    session: Session, archived_ids: set[str], summary: Optional[Event]
+):
+  """Replaces the archived events of a session object by their summary."""
+  session.events = ([summary] if summary else []) + [
+      event for event in session.events if event.id not in archived_ids
+  ]
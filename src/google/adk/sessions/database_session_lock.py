@@ -0,0 +1,130 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import contextlib
+import hashlib
+import time
+from typing import AsyncIterator
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.engine import create_engine
+from sqlalchemy.engine import Engine
+from typing_extensions import override
+
+from .session_lock import BaseSessionLock
+from .session_lock import InMemorySessionLock
+from .session_lock import SessionLockTimeoutError
+
+_TRY_LOCK_STATEMENTS = {
+    "postgresql": text("SELECT pg_try_advisory_lock(:key)"),
+    "mysql": text("SELECT GET_LOCK(:key, 0)"),
+    "mariadb": text("SELECT GET_LOCK(:key, 0)"),
+}
+_UNLOCK_STATEMENTS = {
+    "postgresql": text("SELECT pg_advisory_unlock(:key)"),
+    "mysql": text("SELECT RELEASE_LOCK(:key)"),
+    "mariadb": text("SELECT RELEASE_LOCK(:key)"),
+}
+
+
+class DatabaseSessionLock(BaseSessionLock):
+  """Locks sessions across processes with database advisory locks.
+
+  Supports PostgreSQL (`pg_advisory_lock`) and MySQL/MariaDB (`GET_LOCK`).
+  A connection is held for as long as the lock of a session is held, and the
+  database releases the lock if that connection is lost.
+
+  Waiters of the same process are queued in process, so only one of them at a
+  time polls the database for the lock.
+  """
+
+  def __init__(self, db_url: str, *, poll_interval: float = 0.1):
+    """
+    Args:
+      db_url: The URL of the database, with a synchronous driver.
+      poll_interval: The number of seconds between attempts to acquire a lock
+        held by another process.
+    """
+    self.db_engine: Engine = create_engine(db_url)
+    self.poll_interval = poll_interval
+    if self.db_engine.dialect.name not in _TRY_LOCK_STATEMENTS:
+      raise ValueError(
+          "DatabaseSessionLock does not support the"
+          f" {self.db_engine.dialect.name} dialect."
+      )
+    self._local_lock = InMemorySessionLock()
+
+  @override
+  @contextlib.asynccontextmanager
+  async def lock(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      session_id: str,
+      timeout: Optional[float] = None,
+  ) -> AsyncIterator[None]:
+    deadline = None if timeout is None else time.monotonic() + timeout
+    async with self._local_lock.lock(
+        app_name=app_name,
+        user_id=user_id,
+        session_id=session_id,
+        timeout=timeout,
+    ):
+      key = _lock_key(
+          self.db_engine.dialect.name, app_name, user_id, session_id
+      )
+      connection = await asyncio.to_thread(self.db_engine.connect)
+      try:
+        while not await asyncio.to_thread(self._try_lock, connection, key):
+          if deadline is not None and time.monotonic() >= deadline:
+            raise SessionLockTimeoutError(
+                f"Timed out waiting for the lock of session {session_id}."
+            )
+          await asyncio.sleep(self.poll_interval)
+        try:
+          yield
+        finally:
+          await asyncio.to_thread(self._unlock, connection, key)
+      finally:
+        await asyncio.to_thread(connection.close)
+
+  def _try_lock(self, connection: Connection, key) -> bool:
+    locked = connection.execute(
+        _TRY_LOCK_STATEMENTS[connection.dialect.name], {"key": key}
+    ).scalar()
+    # Advisory locks are held by the connection, not by the transaction.
+    connection.commit()
+    return bool(locked)
+
+  def _unlock(self, connection: Connection, key):
+    connection.execute(
+        _UNLOCK_STATEMENTS[connection.dialect.name], {"key": key}
+    )
+    connection.commit()
+
+
+def _lock_key(dialect_name: str, app_name: str, user_id: str, session_id: str):
+  """The key of the advisory lock of a session."""
+  digest = hashlib.sha256(
+      "\0".join((app_name, user_id, session_id)).encode("utf-8")
+  ).digest()
+  if dialect_name == "postgresql":
+    # PostgreSQL advisory locks are keyed by a signed 64-bit integer.
+    return int.from_bytes(digest[:8], "big", signed=True)
+  # MySQL lock names are limited to 64 characters.
+  return "adk:" + digest.hex()[:60]
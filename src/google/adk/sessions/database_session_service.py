@@ -12,33 +12,55 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import base64
 import copy
 from datetime import datetime
 import json
 import logging
-from typing import Any, Optional
+import threading
+from typing import Any, Iterable, Literal, Optional, Sequence, Union
 import uuid
 
 from google.genai import types
+from sqlalchemy import and_
 from sqlalchemy import Boolean
+from sqlalchemy import ColumnElement
+from sqlalchemy import Delete
 from sqlalchemy import delete
 from sqlalchemy import Dialect
 from sqlalchemy import ForeignKeyConstraint
 from sqlalchemy import func
+from sqlalchemy import Index
+from sqlalchemy import Insert
+from sqlalchemy import Integer
+from sqlalchemy import LargeBinary
+from sqlalchemy import or_
+from sqlalchemy import Select
+from sqlalchemy import select
+from sqlalchemy import text
 from sqlalchemy import Text
+from sqlalchemy import Update
+from sqlalchemy import update
+from sqlalchemy.dialects import mysql
 from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.engine import Connection
 from sqlalchemy.engine import create_engine
 from sqlalchemy.engine import Engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.exc import ArgumentError
 from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.inspection import inspect
+from sqlalchemy.orm import aliased
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm import Session as DatabaseSessionFactory
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateColumn
 from sqlalchemy.schema import MetaData
 from sqlalchemy.types import DateTime
 from sqlalchemy.types import PickleType
@@ -47,11 +69,23 @@ from sqlalchemy.types import TypeDecorator
 from typing_extensions import override
 from tzlocal import get_localzone
 
+from ..artifacts.base_artifact_service import BaseArtifactService
 from ..events.event import Event
+from ..events.event_actions import EventActions
+from .base_session_service import _decode_page_token
+from .base_session_service import _encode_page_token
 from .base_session_service import BaseSessionService
 from .base_session_service import GetSessionConfig
 from .base_session_service import ListEventsResponse
 from .base_session_service import ListSessionsResponse
+from .blob_offload import load_blob
+from .blob_offload import offload_inline_data
+from .compaction import apply_compaction
+from .compaction import CompactionConfig
+from .compaction import EventSummarizer
+from .compaction import split_events_for_compaction
+from .compaction import summarize_events
+from .event_codec import EventCodec
 from .session import Session
 from .state import State
 
@@ -66,6 +100,7 @@ class DynamicJSON(TypeDecorator):
   """
 
   impl = Text  # Default implementation is TEXT
+  cache_ok = True
 
   def load_dialect_impl(self, dialect: Dialect):
     if dialect.name == "postgresql":
@@ -113,6 +148,10 @@ class StorageSession(Base):
   update_time: Mapped[DateTime] = mapped_column(
       DateTime(), default=func.now(), onupdate=func.now()
   )
+  # Incremented by every write, for optimistic concurrency control.
+  version: Mapped[int] = mapped_column(
+      Integer, default=0, server_default=text("0")
+  )
 
   storage_events: Mapped[list["StorageEvent"]] = relationship(
       "StorageEvent",
@@ -137,7 +176,16 @@ class StorageEvent(Base):
   branch: Mapped[str] = mapped_column(String, nullable=True)
   timestamp: Mapped[DateTime] = mapped_column(DateTime(), default=func.now())
   content: Mapped[dict[str, Any]] = mapped_column(DynamicJSON, nullable=True)
-  actions: Mapped[MutableDict[str, Any]] = mapped_column(PickleType)
+  actions_json: Mapped[Optional[dict[str, Any]]] = mapped_column(
+      DynamicJSON, nullable=True
+  )
+  # Pickled `EventActions`, only written while the column is still NOT NULL in
+  # tables created before `actions_json`. See `migrate_legacy_events`.
+  actions: Mapped[Optional[Any]] = mapped_column(PickleType, nullable=True)
+  # The content, actions and grounding metadata encoded by an `EventCodec`,
+  # instead of the JSON columns.
+  payload: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+  payload_codec: Mapped[Optional[str]] = mapped_column(String, nullable=True)
 
   long_running_tool_ids_json: Mapped[Optional[str]] = mapped_column(
       Text, nullable=True
@@ -150,6 +198,8 @@ class StorageEvent(Base):
   error_code: Mapped[str] = mapped_column(String, nullable=True)
   error_message: Mapped[str] = mapped_column(String, nullable=True)
   interrupted: Mapped[bool] = mapped_column(Boolean, nullable=True)
+  # Set by compaction. Archived events are kept, but no longer loaded.
+  archived: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
 
   storage_session: Mapped[StorageSession] = relationship(
       "StorageSession",
@@ -162,6 +212,15 @@ class StorageEvent(Base):
           ["sessions.app_name", "sessions.user_id", "sessions.id"],
           ondelete="CASCADE",
       ),
+      # Serves the ordered, windowed and paginated reads of a session's
+      # events.
+      Index(
+          "idx_events_session_timestamp",
+          "app_name",
+          "user_id",
+          "session_id",
+          "timestamp",
+      ),
   )
 
   @property
@@ -207,20 +266,103 @@ class StorageUserState(Base):
   )
 
 
+class StorageStateEntry(Base):
+  """Represents a single key of an app, user or session state."""
+  __tablename__ = "state_entries"
+
+  app_name: Mapped[str] = mapped_column(String, primary_key=True)
+  scope: Mapped[str] = mapped_column(String, primary_key=True)
+  # Empty for the keys of the app state.
+  user_id: Mapped[str] = mapped_column(String, primary_key=True)
+  # Empty for the keys of the app and user states.
+  session_id: Mapped[str] = mapped_column(String, primary_key=True)
+  key: Mapped[str] = mapped_column(String, primary_key=True)
+  value: Mapped[Any] = mapped_column(DynamicJSON, nullable=True)
+  update_time: Mapped[DateTime] = mapped_column(
+      DateTime(), default=func.now(), onupdate=func.now()
+  )
+
+
 class DatabaseSessionService(BaseSessionService):
-  """A session service that uses a database for storage."""
+  """A session service that uses a database for storage.
+
+  By default every appended event is written in its own transaction. With
+  `write_behind=True`, events are buffered per session and written in a single
+  transaction (group commit) when `flush` is called, when the buffer reaches
+  `max_buffered_events`, or before the session is read or closed. `Runner`
+  flushes at the end of every invocation.
+
+  The content, actions and grounding metadata of events are stored in JSON
+  (JSONB on PostgreSQL) columns, unless an `event_codec` such as
+  `MsgpackEventCodec` is given, in which case they are stored in a single
+  compact binary column.
+
+  With `state_layout="document"` (the default), the app, user and session states
+  are each stored as one JSON document that is rewritten whenever a key
+  changes. With `state_layout="per_key"`, every key is stored in its own row of
+  the `state_entries` table, so a state delta only upserts the changed keys and
+  sessions of the same app don't contend on one app state row. The layout is
+  not converted: a database must always be used with the same layout.
+  """
 
-  def __init__(self, db_url: str):
+  def __init__(
+      self,
+      db_url: str,
+      *,
+      write_behind: bool = False,
+      max_buffered_events: int = 50,
+      event_codec: Optional[EventCodec] = None,
+      artifact_service: Optional[BaseArtifactService] = None,
+      blob_offload_min_bytes: int = 64 * 1024,
+      conflict_retries: int = 0,
+      state_layout: Literal["document", "per_key"] = "document",
+      compaction_config: Optional[CompactionConfig] = None,
+  ):
     """
     Args:
         db_url: The database URL to connect to.
+        write_behind: Whether to buffer appended events and persist them in
+          batches instead of one transaction per event.
+        max_buffered_events: The durability knob of the write-behind mode: the
+          maximum number of events buffered per session before a flush is
+          forced, i.e. the most events that can be lost if the process dies.
+        event_codec: The codec of the event payloads. JSON columns are used if
+          not set.
+        artifact_service: If set, inline data of at least
+          `blob_offload_min_bytes` is stored once in it instead of in the event
+          rows, and is only loaded back when building LLM requests.
+        blob_offload_min_bytes: The minimum size of the inline data to offload.
+        conflict_retries: How many times a write from a stale session is rebased
+          onto the stored session and retried, as long as the state deltas of
+          the write and of the concurrent writes touch different keys. If 0,
+          writes from stale sessions fail.
+        state_layout: How the states are stored, either `"document"` or
+          `"per_key"`.
+        compaction_config: If set, sessions are compacted when the session
+          object events are appended to has more than
+          `compaction_config.max_events` events.
     """
+    if max_buffered_events < 1:
+      raise ValueError("max_buffered_events must be at least 1.")
+    if conflict_retries < 0:
+      raise ValueError("conflict_retries must not be negative.")
+    if state_layout not in ("document", "per_key"):
+      raise ValueError(f"Invalid state_layout: {state_layout}.")
     # 1. Create DB engine for db connection
     # 2. Create all tables based on schema
     # 3. Initialize all properties
 
     try:
-      db_engine = create_engine(db_url)
+      if _is_in_memory_sqlite_url(db_url):
+        # Each connection to an in-memory database has its own database, so
+        # the threads of the async methods share a single connection.
+        db_engine = create_engine(
+            db_url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+      else:
+        db_engine = create_engine(db_url)
     except Exception as e:
       if isinstance(e, ArgumentError):
         raise ValueError(
@@ -249,7 +391,28 @@ class DatabaseSessionService(BaseSessionService):
 
     # Uncomment to recreate DB every time
     # Base.metadata.drop_all(self.db_engine)
-    Base.metadata.create_all(self.db_engine)
+    with self.db_engine.begin() as connection:
+      _create_tables(connection)
+      self._legacy_actions = _requires_legacy_actions(connection)
+
+    self.event_codec = event_codec
+    self.write_behind = write_behind
+    self.max_buffered_events = max_buffered_events
+    self.artifact_service = artifact_service
+    self.blob_offload_min_bytes = blob_offload_min_bytes
+    self.conflict_retries = conflict_retries
+    self.state_layout = state_layout
+    self.compaction_config = compaction_config
+    if state_layout == "per_key":
+      _check_upsert_support(self.db_engine.dialect)
+    # A map from (app name, user ID, session ID) to the session, the events
+    # appended to it that have not been written yet, and the session-scoped
+    # state before these events.
+    self._pending_events: dict[
+        tuple[str, str, str],
+        tuple[Session, list[Event], dict[str, Any]],
+    ] = {}
+    self._pending_events_lock = threading.Lock()
 
   @override
   def create_session(
@@ -269,24 +432,10 @@ class DatabaseSessionService(BaseSessionService):
     with self.DatabaseSessionFactory() as sessionFactory:
 
       # Fetch app and user states from storage
-      storage_app_state = sessionFactory.get(StorageAppState, (app_name))
-      storage_user_state = sessionFactory.get(
-          StorageUserState, (app_name, user_id)
+      app_state, user_state, _ = self._read_states(
+          sessionFactory, app_name, user_id
       )
 
-      app_state = storage_app_state.state if storage_app_state else {}
-      user_state = storage_user_state.state if storage_user_state else {}
-
-      # Create state tables if not exist
-      if not storage_app_state:
-        storage_app_state = StorageAppState(app_name=app_name, state={})
-        sessionFactory.add(storage_app_state)
-      if not storage_user_state:
-        storage_user_state = StorageUserState(
-            app_name=app_name, user_id=user_id, state={}
-        )
-        sessionFactory.add(storage_user_state)
-
       # Extract state deltas
       app_state_delta, user_state_delta, session_state = _extract_state_delta(
           state
@@ -296,20 +445,24 @@ class DatabaseSessionService(BaseSessionService):
       app_state.update(app_state_delta)
       user_state.update(user_state_delta)
 
-      # Store app and user state
-      if app_state_delta:
-        storage_app_state.state = app_state
-      if user_state_delta:
-        storage_user_state.state = user_state
-
       # Store the session
       storage_session = StorageSession(
           app_name=app_name,
           user_id=user_id,
           id=session_id,
-          state=session_state,
+          state=session_state if self.state_layout == "document" else {},
       )
       sessionFactory.add(storage_session)
+      sessionFactory.flush()
+
+      # Store the states
+      self._write_state_deltas(
+          sessionFactory,
+          (app_name, user_id, storage_session.id),
+          app_state_delta,
+          user_state_delta,
+          session_state,
+      )
       sessionFactory.commit()
 
       sessionFactory.refresh(storage_session)
@@ -322,6 +475,7 @@ class DatabaseSessionService(BaseSessionService):
           id=str(storage_session.id),
           state=merged_state,
           last_update_time=storage_session.update_time.timestamp(),
+          version=storage_session.version,
       )
       return session
 
@@ -337,6 +491,7 @@ class DatabaseSessionService(BaseSessionService):
     # 1. Get the storage session entry from session table
     # 2. Get all the events based on session id and filtering config
     # 3. Convert and return the session
+    self._flush_pending_events((app_name, user_id, session_id))
     with self.DatabaseSessionFactory() as sessionFactory:
       storage_session = sessionFactory.get(
           StorageSession, (app_name, user_id, session_id)
@@ -344,28 +499,15 @@ class DatabaseSessionService(BaseSessionService):
       if storage_session is None:
         return None
 
-      storage_events = (
-          sessionFactory.query(StorageEvent)
-          .filter(StorageEvent.session_id == storage_session.id)
-          .filter(
-              StorageEvent.timestamp < config.after_timestamp
-              if config
-              else True
-          )
-          .limit(config.num_recent_events if config else None)
-          .all()
-      )
+      storage_events = sessionFactory.scalars(
+          _select_storage_events(app_name, user_id, session_id, config)
+      ).all()
 
       # Fetch states from storage
-      storage_app_state = sessionFactory.get(StorageAppState, (app_name))
-      storage_user_state = sessionFactory.get(
-          StorageUserState, (app_name, user_id)
+      app_state, user_state, session_state = self._read_states(
+          sessionFactory, app_name, user_id, session_id
       )
 
-      app_state = storage_app_state.state if storage_app_state else {}
-      user_state = storage_user_state.state if storage_user_state else {}
-      session_state = storage_session.state
-
       # Merge states
       merged_state = _merge_state(app_state, user_state, session_state)
 
@@ -376,55 +518,43 @@ class DatabaseSessionService(BaseSessionService):
           id=session_id,
           state=merged_state,
           last_update_time=storage_session.update_time.timestamp(),
+          version=storage_session.version,
       )
       session.events = [
-          Event(
-              id=e.id,
-              author=e.author,
-              branch=e.branch,
-              invocation_id=e.invocation_id,
-              content=_decode_content(e.content),
-              actions=e.actions,
-              timestamp=e.timestamp.timestamp(),
-              long_running_tool_ids=e.long_running_tool_ids,
-              grounding_metadata=e.grounding_metadata,
-              partial=e.partial,
-              turn_complete=e.turn_complete,
-              error_code=e.error_code,
-              error_message=e.error_message,
-              interrupted=e.interrupted,
-          )
-          for e in storage_events
+          _from_storage_event(e, self.event_codec) for e in storage_events
       ]
     return session
 
   @override
   def list_sessions(
-      self, *, app_name: str, user_id: str
+      self,
+      *,
+      app_name: str,
+      user_id: Optional[str],
+      page_size: Optional[int] = None,
+      page_token: Optional[str] = None,
+      updated_after: Optional[float] = None,
+      updated_before: Optional[float] = None,
   ) -> ListSessionsResponse:
     with self.DatabaseSessionFactory() as sessionFactory:
-      results = (
-          sessionFactory.query(StorageSession)
-          .filter(StorageSession.app_name == app_name)
-          .filter(StorageSession.user_id == user_id)
-          .all()
-      )
-      sessions = []
-      for storage_session in results:
-        session = Session(
-            app_name=app_name,
-            user_id=user_id,
-            id=storage_session.id,
-            state={},
-            last_update_time=storage_session.update_time.timestamp(),
-        )
-        sessions.append(session)
-      return ListSessionsResponse(sessions=sessions)
+      storage_sessions = sessionFactory.scalars(
+          _select_storage_sessions_page(
+              app_name,
+              user_id,
+              page_size,
+              page_token,
+              updated_after,
+              updated_before,
+          )
+      ).all()
+      return _to_list_sessions_response(storage_sessions, page_size)
 
   @override
   def delete_session(
       self, app_name: str, user_id: str, session_id: str
   ) -> None:
+    with self._pending_events_lock:
+      self._pending_events.pop((app_name, user_id, session_id), None)
     with self.DatabaseSessionFactory() as sessionFactory:
       stmt = delete(StorageSession).where(
           StorageSession.app_name == app_name,
@@ -432,7 +562,59 @@ class DatabaseSessionService(BaseSessionService):
           StorageSession.id == session_id,
       )
       sessionFactory.execute(stmt)
+      if self.state_layout == "per_key":
+        sessionFactory.execute(
+            _delete_session_state_entries(app_name, user_id, session_id)
+        )
+      sessionFactory.commit()
+
+  @override
+  def delete_sessions(
+      self, *, app_name: str, user_id: str, session_ids: list[str]
+  ) -> None:
+    with self._pending_events_lock:
+      for session_id in session_ids:
+        self._pending_events.pop((app_name, user_id, session_id), None)
+    with self.DatabaseSessionFactory() as sessionFactory:
+      if self.state_layout == "per_key":
+        sessionFactory.execute(
+            _delete_session_state_entries(app_name, user_id, session_ids)
+        )
+      sessionFactory.execute(
+          _delete_storage_sessions(
+              app_name, user_id, StorageSession.id.in_(session_ids)
+          )
+      )
+      sessionFactory.commit()
+
+  @override
+  def purge_sessions_older_than(
+      self,
+      *,
+      app_name: str,
+      cutoff_time: float,
+      user_id: Optional[str] = None,
+  ) -> int:
+    # Sessions with buffered events are in use, and are kept once written.
+    with self._pending_events_lock:
+      keys = [
+          key
+          for key in self._pending_events
+          if key[0] == app_name and user_id in (None, key[1])
+      ]
+    for key in keys:
+      self._flush_pending_events(key)
+    is_old = StorageSession.update_time < datetime.fromtimestamp(cutoff_time)
+    with self.DatabaseSessionFactory() as sessionFactory:
+      if self.state_layout == "per_key":
+        sessionFactory.execute(
+            _delete_old_session_state_entries(app_name, user_id, is_old)
+        )
+      result = sessionFactory.execute(
+          _delete_storage_sessions(app_name, user_id, is_old)
+      )
       sessionFactory.commit()
+      return result.rowcount
 
   @override
   def append_event(self, session: Session, event: Event) -> Event:
@@ -441,92 +623,278 @@ class DatabaseSessionService(BaseSessionService):
     if event.partial:
       return event
 
-    # 1. Check if timestamp is stale
-    # 2. Update session attributes based on event config
-    # 3. Store event to table
-    with self.DatabaseSessionFactory() as sessionFactory:
-      storage_session = sessionFactory.get(
-          StorageSession, (session.app_name, session.user_id, session.id)
+    storage_event = event
+    if self.artifact_service:
+      storage_event = offload_inline_data(
+          event,
+          artifact_service=self.artifact_service,
+          app_name=session.app_name,
+          user_id=session.user_id,
+          session_id=session.id,
+          min_size_bytes=self.blob_offload_min_bytes,
       )
 
-      if storage_session.update_time.timestamp() > session.last_update_time:
-        raise ValueError(
-            f"Session last_update_time {session.last_update_time} is later than"
-            f" the upate_time in storage {storage_session.update_time}"
-        )
+    if self.write_behind:
+      self._buffer_event(session, storage_event)
+    else:
+      self._write_events(session, [storage_event])
 
-      # Fetch states from storage
-      storage_app_state = sessionFactory.get(
-          StorageAppState, (session.app_name)
+    # Also update the in-memory session
+    super().append_event(session=session, event=event)
+
+    if (
+        self.compaction_config
+        and len(session.events) > self.compaction_config.max_events
+    ):
+      self.compact_session(
+          session=session,
+          keep_recent_events=self.compaction_config.keep_recent_events,
+          summarizer=self.compaction_config.summarizer,
       )
-      storage_user_state = sessionFactory.get(
-          StorageUserState, (session.app_name, session.user_id)
+    return event
+
+  @override
+  def load_blob(
+      self, *, session: Session, blob_uri: str
+  ) -> Optional[types.Part]:
+    if not self.artifact_service:
+      return None
+    return load_blob(
+        blob_uri,
+        artifact_service=self.artifact_service,
+        app_name=session.app_name,
+        user_id=session.user_id,
+        session_id=session.id,
+    )
+
+  @override
+  def compact_session(
+      self,
+      *,
+      session: Session,
+      keep_recent_events: int,
+      summarizer: Optional[EventSummarizer] = None,
+  ) -> int:
+    self.flush(session=session)
+    key = (session.app_name, session.user_id, session.id)
+    with self.DatabaseSessionFactory() as sessionFactory:
+      storage_events = sessionFactory.scalars(
+          _select_storage_events(*key)
+      ).all()
+      archived, kept = split_events_for_compaction(
+          [_from_storage_event(e, self.event_codec) for e in storage_events],
+          keep_recent_events,
       )
+      if not archived:
+        return 0
+      summary = summarize_events(archived, summarizer, kept)
 
-      app_state = storage_app_state.state if storage_app_state else {}
-      user_state = storage_user_state.state if storage_user_state else {}
-      session_state = storage_session.state
-
-      # Extract state delta
-      app_state_delta = {}
-      user_state_delta = {}
-      session_state_delta = {}
-      if event.actions:
-        if event.actions.state_delta:
-          app_state_delta, user_state_delta, session_state_delta = (
-              _extract_state_delta(event.actions.state_delta)
-          )
+      sessionFactory.execute(
+          _archive_storage_events(key, storage_events[len(archived) - 1])
+      )
+      if summary:
+        sessionFactory.add(
+            _to_storage_event(
+                session, summary, self.event_codec, self._legacy_actions
+            )
+        )
+      sessionFactory.commit()
 
-      # Merge state
-      app_state.update(app_state_delta)
-      user_state.update(user_state_delta)
-      session_state.update(session_state_delta)
-
-      # Update storage
-      storage_app_state.state = app_state
-      storage_user_state.state = user_state
-      storage_session.state = session_state
-
-      storage_event = StorageEvent(
-          id=event.id,
-          invocation_id=event.invocation_id,
-          author=event.author,
-          branch=event.branch,
-          actions=event.actions,
-          session_id=session.id,
-          app_name=session.app_name,
-          user_id=session.user_id,
-          timestamp=datetime.fromtimestamp(event.timestamp),
-          long_running_tool_ids=event.long_running_tool_ids,
-          grounding_metadata=event.grounding_metadata,
-          partial=event.partial,
-          turn_complete=event.turn_complete,
-          error_code=event.error_code,
-          error_message=event.error_message,
-          interrupted=event.interrupted,
+    apply_compaction(session, {event.id for event in archived}, summary)
+    return len(archived)
+
+  @override
+  def flush(self, *, session: Session) -> None:
+    self._flush_pending_events((session.app_name, session.user_id, session.id))
+
+  def flush_all(self) -> None:
+    """Persists the buffered events of all sessions."""
+    with self._pending_events_lock:
+      keys = list(self._pending_events)
+    for key in keys:
+      self._flush_pending_events(key)
+
+  @override
+  def close_session(self, *, session: Session):
+    self.flush(session=session)
+
+  def _buffer_event(self, session: Session, event: Event):
+    key = (session.app_name, session.user_id, session.id)
+    with self._pending_events_lock:
+      _, events, _ = self._pending_events.setdefault(
+          key, (session, [], _session_scoped_state(session.state))
       )
-      if event.content:
-        encoded_content = event.content.model_dump(exclude_none=True)
-        # Workaround for multimodal Content throwing JSON not serializable
-        # error with SQLAlchemy.
-        for p in encoded_content["parts"]:
-          if "inline_data" in p:
-            p["inline_data"]["data"] = (
-                base64.b64encode(p["inline_data"]["data"]).decode("utf-8"),
+      events.append(event)
+      should_flush = len(events) >= self.max_buffered_events
+    if should_flush:
+      self._flush_pending_events(key)
+
+  def _flush_pending_events(self, key: tuple[str, str, str]):
+    with self._pending_events_lock:
+      pending = self._pending_events.pop(key, None)
+    if pending:
+      session, events, base_state = pending
+      self._write_events(session, events, base_state)
+
+  def _write_events(
+      self,
+      session: Session,
+      events: list[Event],
+      base_state: Optional[dict[str, Any]] = None,
+  ):
+    """Writes the events and their state deltas in a single transaction.
+
+    The session row is only updated if its version is still the version of
+    `session`, so concurrent writes are detected by the update itself.
+
+    Args:
+      session: The session the events are appended to.
+      events: The events to write.
+      base_state: The session-scoped state the events were applied on. Defaults
+        to the state of `session`.
+    """
+    if base_state is None:
+      base_state = _session_scoped_state(session.state)
+    app_state_delta, user_state_delta, session_state_delta = (
+        _extract_events_state_delta(events)
+    )
+    key = (session.app_name, session.user_id, session.id)
+    expected_version = session.version
+    rebased_keys = set()
+    rebases = 0
+    with self.DatabaseSessionFactory() as sessionFactory:
+      while True:
+        storage_session = sessionFactory.get(
+            StorageSession, key, populate_existing=True
+        )
+        if storage_session.version != expected_version:
+          _, _, stored_state = self._read_states(sessionFactory, *key)
+          changed_keys = _check_rebase(
+              session,
+              storage_session.version,
+              stored_state,
+              base_state,
+              session_state_delta,
+              rebases < self.conflict_retries,
+          )
+          rebases += 1
+          rebased_keys |= changed_keys
+          base_state = stored_state
+          expected_version = storage_session.version
+
+        session_state = None
+        if self.state_layout == "document":
+          session_state = dict(storage_session.state)
+          session_state.update(session_state_delta)
+        result = sessionFactory.execute(
+            _update_session_statement(
+                key,
+                expected_version,
+                session_state,
+                sessionFactory.bind.dialect,
             )
-        storage_event.content = encoded_content
+        )
+        if sessionFactory.bind.dialect.update_returning:
+          update_time = result.scalar_one_or_none()
+        elif result.rowcount:
+          update_time = sessionFactory.scalar(_select_update_time(key))
+        else:
+          update_time = None
+        if update_time is not None:
+          break
+        # A concurrent write got in between, retry against the new version.
+        sessionFactory.rollback()
+
+      self._write_state_deltas(
+          sessionFactory,
+          key,
+          app_state_delta,
+          user_state_delta,
+          session_state_delta,
+      )
 
-      sessionFactory.add(storage_event)
+      for event in events:
+        sessionFactory.add(
+            _to_storage_event(
+                session, event, self.event_codec, self._legacy_actions
+            )
+        )
 
       sessionFactory.commit()
-      sessionFactory.refresh(storage_session)
 
-      # Update timestamp with commit time
-      session.last_update_time = storage_session.update_time.timestamp()
+    _apply_rebase(session, base_state, rebased_keys)
+    session.version = expected_version + 1
+    session.last_update_time = update_time.timestamp()
 
-    # Also update the in-memory session
-    super().append_event(session=session, event=event)
-    return event
+  def _read_states(
+      self,
+      sessionFactory: DatabaseSessionFactory,
+      app_name: str,
+      user_id: str,
+      session_id: Optional[str] = None,
+  ) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any]]:
+    """Reads the app, user and (if `session_id` is set) session states."""
+    if self.state_layout == "per_key":
+      return _split_state_entries(
+          sessionFactory.scalars(
+              _select_state_entries(app_name, user_id, session_id)
+          )
+      )
+    storage_app_state = sessionFactory.get(StorageAppState, (app_name))
+    storage_user_state = sessionFactory.get(
+        StorageUserState, (app_name, user_id)
+    )
+    storage_session = (
+        sessionFactory.get(StorageSession, (app_name, user_id, session_id))
+        if session_id
+        else None
+    )
+    return (
+        dict(storage_app_state.state) if storage_app_state else {},
+        dict(storage_user_state.state) if storage_user_state else {},
+        dict(storage_session.state) if storage_session else {},
+    )
+
+  def _write_state_deltas(
+      self,
+      sessionFactory: DatabaseSessionFactory,
+      key: tuple[str, str, str],
+      app_state_delta: dict[str, Any],
+      user_state_delta: dict[str, Any],
+      session_state_delta: dict[str, Any],
+  ):
+    """Writes the state deltas, except the session state of the document layout.
+
+    In the document layout, the session state is written with the session row.
+    """
+    if self.state_layout == "per_key":
+      rows = _state_entry_rows(
+          key, app_state_delta, user_state_delta, session_state_delta
+      )
+      if rows:
+        sessionFactory.execute(
+            _upsert_state_entries_statement(sessionFactory.bind.dialect, rows)
+        )
+      return
+
+    app_name, user_id, _ = key
+    storage_app_state = sessionFactory.get(StorageAppState, (app_name))
+    storage_user_state = sessionFactory.get(
+        StorageUserState, (app_name, user_id)
+    )
+    # Create state tables if not exist
+    if not storage_app_state:
+      storage_app_state = StorageAppState(app_name=app_name, state={})
+      sessionFactory.add(storage_app_state)
+    if not storage_user_state:
+      storage_user_state = StorageUserState(
+          app_name=app_name, user_id=user_id, state={}
+      )
+      sessionFactory.add(storage_user_state)
+    if app_state_delta:
+      storage_app_state.state.update(app_state_delta)
+    if user_state_delta:
+      storage_user_state.state.update(user_state_delta)
 
   @override
   def list_events(
@@ -535,8 +903,577 @@ class DatabaseSessionService(BaseSessionService):
       app_name: str,
       user_id: str,
       session_id: str,
+      page_size: Optional[int] = None,
+      page_token: Optional[str] = None,
   ) -> ListEventsResponse:
-    raise NotImplementedError()
+    self._flush_pending_events((app_name, user_id, session_id))
+    with self.DatabaseSessionFactory() as sessionFactory:
+      storage_events = sessionFactory.scalars(
+          _select_storage_events_page(
+              app_name, user_id, session_id, page_size, page_token
+          )
+      ).all()
+      return _to_list_events_response(
+          storage_events, page_size, self.event_codec
+      )
+
+  # The async methods run the blocking database calls in worker threads, so
+  # that `Runner` and the API server do not block their event loop.
+
+  @override
+  async def create_session_async(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      state: Optional[dict[str, Any]] = None,
+      session_id: Optional[str] = None,
+  ) -> Session:
+    return await asyncio.to_thread(
+        self.create_session,
+        app_name=app_name,
+        user_id=user_id,
+        state=state,
+        session_id=session_id,
+    )
+
+  @override
+  async def get_session_async(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      session_id: str,
+      config: Optional[GetSessionConfig] = None,
+  ) -> Optional[Session]:
+    return await asyncio.to_thread(
+        self.get_session,
+        app_name=app_name,
+        user_id=user_id,
+        session_id=session_id,
+        config=config,
+    )
+
+  @override
+  async def list_sessions_async(
+      self,
+      *,
+      app_name: str,
+      user_id: Optional[str],
+      page_size: Optional[int] = None,
+      page_token: Optional[str] = None,
+      updated_after: Optional[float] = None,
+      updated_before: Optional[float] = None,
+  ) -> ListSessionsResponse:
+    return await asyncio.to_thread(
+        self.list_sessions,
+        app_name=app_name,
+        user_id=user_id,
+        page_size=page_size,
+        page_token=page_token,
+        updated_after=updated_after,
+        updated_before=updated_before,
+    )
+
+  @override
+  async def delete_session_async(
+      self, *, app_name: str, user_id: str, session_id: str
+  ) -> None:
+    await asyncio.to_thread(
+        self.delete_session,
+        app_name=app_name,
+        user_id=user_id,
+        session_id=session_id,
+    )
+
+  @override
+  async def delete_sessions_async(
+      self, *, app_name: str, user_id: str, session_ids: list[str]
+  ) -> None:
+    await asyncio.to_thread(
+        self.delete_sessions,
+        app_name=app_name,
+        user_id=user_id,
+        session_ids=session_ids,
+    )
+
+  @override
+  async def purge_sessions_older_than_async(
+      self,
+      *,
+      app_name: str,
+      cutoff_time: float,
+      user_id: Optional[str] = None,
+  ) -> int:
+    return await asyncio.to_thread(
+        self.purge_sessions_older_than,
+        app_name=app_name,
+        cutoff_time=cutoff_time,
+        user_id=user_id,
+    )
+
+  @override
+  async def list_events_async(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      session_id: str,
+      page_size: Optional[int] = None,
+      page_token: Optional[str] = None,
+  ) -> ListEventsResponse:
+    return await asyncio.to_thread(
+        self.list_events,
+        app_name=app_name,
+        user_id=user_id,
+        session_id=session_id,
+        page_size=page_size,
+        page_token=page_token,
+    )
+
+  @override
+  async def close_session_async(self, *, session: Session):
+    await asyncio.to_thread(self.close_session, session=session)
+
+  @override
+  async def flush_async(self, *, session: Session) -> None:
+    await asyncio.to_thread(self.flush, session=session)
+
+  @override
+  async def compact_session_async(
+      self,
+      *,
+      session: Session,
+      keep_recent_events: int,
+      summarizer: Optional[EventSummarizer] = None,
+  ) -> int:
+    return await asyncio.to_thread(
+        self.compact_session,
+        session=session,
+        keep_recent_events=keep_recent_events,
+        summarizer=summarizer,
+    )
+
+  @override
+  async def append_event_async(self, session: Session, event: Event) -> Event:
+    return await asyncio.to_thread(
+        self.append_event, session=session, event=event
+    )
+
+  def migrate_legacy_events(self, batch_size: int = 500) -> int:
+    """Re-encodes the events stored with pickled actions.
+
+    Rows written before the event codecs keep being readable, so this is
+    optional. It converts them in batches of `batch_size` rows, one transaction
+    per batch, so it can be interrupted and resumed. On PostgreSQL, it also
+    drops the NOT NULL constraint of the legacy pickled `actions` column, after
+    which it is no longer written.
+
+    Returns:
+      The number of migrated events.
+    """
+    if self._legacy_actions and self.db_engine.dialect.name == "postgresql":
+      with self.db_engine.begin() as connection:
+        connection.execute(
+            text("ALTER TABLE events ALTER COLUMN actions DROP NOT NULL")
+        )
+      self._legacy_actions = False
+
+    migrated = 0
+    while True:
+      with self.DatabaseSessionFactory() as sessionFactory:
+        storage_events = sessionFactory.scalars(
+            select(StorageEvent)
+            .where(
+                StorageEvent.actions_json.is_(None),
+                StorageEvent.payload.is_(None),
+                StorageEvent.actions.is_not(None),
+            )
+            .limit(batch_size)
+        ).all()
+        if not storage_events:
+          return migrated
+        for storage_event in storage_events:
+          _set_storage_event_payload(
+              storage_event,
+              _from_storage_event(storage_event, self.event_codec),
+              self.event_codec,
+              self._legacy_actions,
+          )
+        sessionFactory.commit()
+        migrated += len(storage_events)
+
+
+_MISSING = object()
+
+
+def _is_in_memory_sqlite_url(db_url: str) -> bool:
+  try:
+    url = make_url(db_url)
+  except ArgumentError:
+    return False
+  return url.get_backend_name() == "sqlite" and url.database in (
+      None,
+      "",
+      ":memory:",
+  )
+
+
+def _session_scoped_state(state: dict[str, Any]) -> dict[str, Any]:
+  """Returns the part of a merged state that is stored with the session."""
+  return {
+      key: value
+      for key, value in state.items()
+      if not key.startswith(
+          (State.APP_PREFIX, State.USER_PREFIX, State.TEMP_PREFIX)
+      )
+  }
+
+
+def _extract_events_state_delta(
+    events: list[Event],
+) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any]]:
+  """Extracts the combined app, user and session state deltas of events."""
+  app_state_delta = {}
+  user_state_delta = {}
+  session_state_delta = {}
+  for event in events:
+    if event.actions and event.actions.state_delta:
+      app_delta, user_delta, session_delta = _extract_state_delta(
+          event.actions.state_delta
+      )
+      app_state_delta.update(app_delta)
+      user_state_delta.update(user_delta)
+      session_state_delta.update(session_delta)
+  return app_state_delta, user_state_delta, session_state_delta
+
+
+def _check_rebase(
+    session: Session,
+    stored_version: int,
+    stored_state: dict[str, Any],
+    base_state: dict[str, Any],
+    session_state_delta: dict[str, Any],
+    can_rebase: bool,
+) -> set[str]:
+  """Checks that a write from a stale session can be rebased.
+
+  Returns:
+    The keys of the session state changed by the concurrent writes.
+
+  Raises:
+    ValueError: If the session is stale and the write cannot be rebased.
+  """
+  if not can_rebase:
+    raise ValueError(
+        f"Session version {session.version} is stale, the version in storage"
+        f" is {stored_version}."
+    )
+  changed_keys = {
+      key
+      for key in base_state.keys() | stored_state.keys()
+      if base_state.get(key, _MISSING) != stored_state.get(key, _MISSING)
+  }
+  conflicting_keys = changed_keys & session_state_delta.keys()
+  if conflicting_keys:
+    raise ValueError(
+        f"Session version {session.version} is stale, and the state keys"
+        f" {sorted(conflicting_keys)} were changed concurrently."
+    )
+  return changed_keys
+
+
+def _apply_rebase(
+    session: Session, stored_state: dict[str, Any], rebased_keys: set[str]
+):
+  """Updates a rebased session with the concurrently changed state keys."""
+  for key in rebased_keys:
+    if key in stored_state:
+      session.state[key] = stored_state[key]
+    else:
+      session.state.pop(key, None)
+
+
+def _update_session_statement(
+    key: tuple[str, str, str],
+    version: int,
+    state: Optional[dict[str, Any]],
+    dialect: Dialect,
+) -> Update:
+  """Updates the session if the stored version is `version`.
+
+  The session state is only updated if `state` is set. The statement returns
+  the new update time if the dialect supports it.
+  """
+  app_name, user_id, session_id = key
+  stmt = (
+      update(StorageSession)
+      .where(
+          StorageSession.app_name == app_name,
+          StorageSession.user_id == user_id,
+          StorageSession.id == session_id,
+          StorageSession.version == version,
+      )
+      .values(version=version + 1, update_time=func.now())
+      .execution_options(synchronize_session=False)
+  )
+  if state is not None:
+    stmt = stmt.values(state=state)
+  if dialect.update_returning:
+    stmt = stmt.returning(StorageSession.update_time)
+  return stmt
+
+
+def _select_update_time(key: tuple[str, str, str]) -> Select:
+  app_name, user_id, session_id = key
+  return select(StorageSession.update_time).where(
+      StorageSession.app_name == app_name,
+      StorageSession.user_id == user_id,
+      StorageSession.id == session_id,
+  )
+
+
+_APP_SCOPE = "app"
+_USER_SCOPE = "user"
+_SESSION_SCOPE = "session"
+
+
+def _check_upsert_support(dialect: Dialect):
+  if dialect.name not in ("postgresql", "sqlite", "mysql", "mariadb"):
+    raise ValueError(
+        f"The per_key state layout is not supported on {dialect.name}."
+    )
+
+
+def _state_entry_rows(
+    key: tuple[str, str, str],
+    app_state_delta: dict[str, Any],
+    user_state_delta: dict[str, Any],
+    session_state_delta: dict[str, Any],
+) -> list[dict[str, Any]]:
+  app_name, user_id, session_id = key
+  rows = []
+  for scope, scope_user_id, scope_session_id, delta in (
+      (_APP_SCOPE, "", "", app_state_delta),
+      (_USER_SCOPE, user_id, "", user_state_delta),
+      (_SESSION_SCOPE, user_id, session_id, session_state_delta),
+  ):
+    for state_key, value in delta.items():
+      rows.append({
+          "app_name": app_name,
+          "scope": scope,
+          "user_id": scope_user_id,
+          "session_id": scope_session_id,
+          "key": state_key,
+          "value": value,
+      })
+  return rows
+
+
+def _upsert_state_entries_statement(
+    dialect: Dialect, rows: list[dict[str, Any]]
+) -> Insert:
+  """Inserts the state entries, or updates the values of existing ones."""
+  _check_upsert_support(dialect)
+  if dialect.name in ("mysql", "mariadb"):
+    stmt = mysql.insert(StorageStateEntry).values(rows)
+    return stmt.on_duplicate_key_update(
+        value=stmt.inserted.value, update_time=func.now()
+    )
+  insert = postgresql.insert if dialect.name == "postgresql" else sqlite.insert
+  stmt = insert(StorageStateEntry).values(rows)
+  return stmt.on_conflict_do_update(
+      index_elements=[
+          column.name for column in StorageStateEntry.__table__.primary_key
+      ],
+      set_={"value": stmt.excluded.value, "update_time": func.now()},
+  )
+
+
+def _select_state_entries(
+    app_name: str, user_id: str, session_id: Optional[str] = None
+) -> Select:
+  """Selects the entries of the app, user and (optionally) session states."""
+  scopes = [
+      StorageStateEntry.scope == _APP_SCOPE,
+      and_(
+          StorageStateEntry.scope == _USER_SCOPE,
+          StorageStateEntry.user_id == user_id,
+      ),
+  ]
+  if session_id:
+    scopes.append(
+        and_(
+            StorageStateEntry.scope == _SESSION_SCOPE,
+            StorageStateEntry.user_id == user_id,
+            StorageStateEntry.session_id == session_id,
+        )
+    )
+  return select(StorageStateEntry).where(
+      StorageStateEntry.app_name == app_name, or_(*scopes)
+  )
+
+
+def _delete_session_state_entries(
+    app_name: str, user_id: str, session_id: Union[str, list[str]]
+) -> Delete:
+  """Deletes the state entries of a session, or of a list of sessions."""
+  return delete(StorageStateEntry).where(
+      StorageStateEntry.app_name == app_name,
+      StorageStateEntry.scope == _SESSION_SCOPE,
+      StorageStateEntry.user_id == user_id,
+      StorageStateEntry.session_id.in_(session_id)
+      if isinstance(session_id, list)
+      else StorageStateEntry.session_id == session_id,
+  )
+
+
+def _delete_old_session_state_entries(
+    app_name: str, user_id: Optional[str], is_old: ColumnElement[bool]
+) -> Delete:
+  """Deletes the state entries of the sessions matching `is_old`."""
+  stmt = delete(StorageStateEntry).where(
+      StorageStateEntry.app_name == app_name,
+      StorageStateEntry.scope == _SESSION_SCOPE,
+      select(StorageSession.id)
+      .where(
+          StorageSession.app_name == app_name,
+          StorageSession.user_id == StorageStateEntry.user_id,
+          StorageSession.id == StorageStateEntry.session_id,
+          is_old,
+      )
+      .exists(),
+  )
+  if user_id is not None:
+    stmt = stmt.where(StorageStateEntry.user_id == user_id)
+  return stmt
+
+
+def _delete_storage_sessions(
+    app_name: str, user_id: Optional[str], condition: ColumnElement[bool]
+) -> Delete:
+  """Deletes the sessions of an app, or of one of its users, in one statement.
+
+  Their events are deleted by the cascade of the foreign key.
+  """
+  stmt = delete(StorageSession).where(
+      StorageSession.app_name == app_name, condition
+  )
+  if user_id is not None:
+    stmt = stmt.where(StorageSession.user_id == user_id)
+  return stmt
+
+
+def _select_storage_sessions_page(
+    app_name: str,
+    user_id: Optional[str],
+    page_size: Optional[int],
+    page_token: Optional[str],
+    updated_after: Optional[float],
+    updated_before: Optional[float],
+) -> Select[tuple[StorageSession]]:
+  """Builds the statement that loads a page of the sessions of a user.
+
+  The sessions of all the users of the app are loaded if `user_id` is None.
+  Pages are keyed by the (user_id, id) of the last session of the previous page.
+  One extra session is selected to tell whether there is a next page.
+  """
+  stmt = select(StorageSession).where(StorageSession.app_name == app_name)
+  if user_id is not None:
+    stmt = stmt.where(StorageSession.user_id == user_id)
+  if page_token:
+    last_user_id, last_id = _decode_page_token(page_token)
+    stmt = stmt.where(
+        or_(
+            StorageSession.user_id > last_user_id,
+            and_(
+                StorageSession.user_id == last_user_id,
+                StorageSession.id > last_id,
+            ),
+        )
+    )
+  if updated_after is not None:
+    stmt = stmt.where(
+        StorageSession.update_time >= datetime.fromtimestamp(updated_after)
+    )
+  if updated_before is not None:
+    stmt = stmt.where(
+        StorageSession.update_time < datetime.fromtimestamp(updated_before)
+    )
+  stmt = stmt.order_by(StorageSession.user_id, StorageSession.id)
+  if page_size is not None:
+    stmt = stmt.limit(page_size + 1)
+  return stmt
+
+
+def _to_list_sessions_response(
+    storage_sessions: Sequence[StorageSession], page_size: Optional[int]
+) -> ListSessionsResponse:
+  """Converts a page selected by `_select_storage_sessions_page`."""
+  next_page_token = None
+  if page_size is not None and len(storage_sessions) > page_size:
+    storage_sessions = storage_sessions[:page_size]
+    last_session = storage_sessions[-1]
+    next_page_token = _encode_page_token(
+        [last_session.user_id, last_session.id]
+    )
+  return ListSessionsResponse(
+      sessions=[
+          Session(
+              app_name=storage_session.app_name,
+              user_id=storage_session.user_id,
+              id=storage_session.id,
+              state={},
+              last_update_time=storage_session.update_time.timestamp(),
+              version=storage_session.version,
+          )
+          for storage_session in storage_sessions
+      ],
+      next_page_token=next_page_token,
+  )
+
+
+def _split_state_entries(
+    entries: Iterable[StorageStateEntry],
+) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any]]:
+  """Splits state entries into the app, user and session states."""
+  states = {_APP_SCOPE: {}, _USER_SCOPE: {}, _SESSION_SCOPE: {}}
+  for entry in entries:
+    states[entry.scope][entry.key] = entry.value
+  return states[_APP_SCOPE], states[_USER_SCOPE], states[_SESSION_SCOPE]
+
+
+def _create_tables(connection: Connection):
+  """Creates the missing tables, columns and indexes."""
+  Base.metadata.create_all(connection)
+  # `create_all` skips existing tables, including the columns and indexes
+  # added to them after they were created. New columns are always nullable or
+  # have a server default.
+  inspector = inspect(connection)
+  preparer = connection.dialect.identifier_preparer
+  for table in Base.metadata.sorted_tables:
+    existing_columns = {c["name"] for c in inspector.get_columns(table.name)}
+    for column in table.columns:
+      if column.name in existing_columns:
+        continue
+      logger.info("Adding column %s to table %s", column.name, table.name)
+      connection.execute(
+          text(
+              f"ALTER TABLE {preparer.quote(table.name)} ADD COLUMN"
+              f" {CreateColumn(column).compile(dialect=connection.dialect)}"
+          )
+      )
+  for index in StorageEvent.__table__.indexes:
+    index.create(connection, checkfirst=True)
+
+
+def _requires_legacy_actions(connection: Connection) -> bool:
+  """Whether the events table still has a NOT NULL pickled actions column."""
+  for column in inspect(connection).get_columns(StorageEvent.__tablename__):
+    if column["name"] == "actions":
+      return not column["nullable"]
+  return False
+
 
 def convert_event(event: StorageEvent) -> Event:
   """Converts a storage event to an event."""
@@ -551,6 +1488,248 @@ def convert_event(event: StorageEvent) -> Event:
   )
 
 
+def _select_live_storage_events(
+    app_name: str, user_id: str, session_id: str
+) -> Select[tuple[StorageEvent]]:
+  """Selects the events of a session that are not archived."""
+  return select(StorageEvent).where(
+      StorageEvent.app_name == app_name,
+      StorageEvent.user_id == user_id,
+      StorageEvent.session_id == session_id,
+      StorageEvent.archived.isnot(True),
+  )
+
+
+def _archive_storage_events(
+    key: tuple[str, str, str], last_storage_event: StorageEvent
+) -> Update:
+  """Archives the events of a session up to and including an event."""
+  app_name, user_id, session_id = key
+  return (
+      update(StorageEvent)
+      .where(
+          StorageEvent.app_name == app_name,
+          StorageEvent.user_id == user_id,
+          StorageEvent.session_id == session_id,
+          or_(
+              StorageEvent.timestamp < last_storage_event.timestamp,
+              and_(
+                  StorageEvent.timestamp == last_storage_event.timestamp,
+                  StorageEvent.id <= last_storage_event.id,
+              ),
+          ),
+      )
+      .values(archived=True)
+      .execution_options(synchronize_session=False)
+  )
+
+
+def _select_storage_events(
+    app_name: str,
+    user_id: str,
+    session_id: str,
+    config: Optional[GetSessionConfig] = None,
+) -> Select[tuple[StorageEvent]]:
+  """Builds the statement that loads the events of a session in order.
+
+  `config.num_recent_events` takes precedence over `config.after_timestamp`,
+  like in the other session services.
+  """
+  stmt = _select_live_storage_events(app_name, user_id, session_id)
+  if config and config.num_recent_events:
+    # Reads the tail of the session backwards along the index, then restores
+    # the chronological order.
+    recent_events = aliased(
+        StorageEvent,
+        stmt.order_by(StorageEvent.timestamp.desc(), StorageEvent.id.desc())
+        .limit(config.num_recent_events)
+        .subquery(),
+    )
+    return select(recent_events).order_by(
+        recent_events.timestamp, recent_events.id
+    )
+  if config and config.after_timestamp:
+    stmt = stmt.where(
+        StorageEvent.timestamp >= datetime.fromtimestamp(config.after_timestamp)
+    )
+  return stmt.order_by(StorageEvent.timestamp, StorageEvent.id)
+
+
+def _select_storage_events_page(
+    app_name: str,
+    user_id: str,
+    session_id: str,
+    page_size: Optional[int],
+    page_token: Optional[str],
+) -> Select[tuple[StorageEvent]]:
+  """Builds the statement that loads a page of the events of a session.
+
+  Pages are keyed by the (timestamp, id) of the last event of the previous
+  page, so each page is a range scan of the index regardless of its position.
+  One extra event is selected to tell whether there is a next page.
+  """
+  stmt = _select_live_storage_events(app_name, user_id, session_id)
+  if page_token:
+    last_timestamp, last_id = _decode_page_token(page_token)
+    last_timestamp = datetime.fromisoformat(last_timestamp)
+    stmt = stmt.where(
+        or_(
+            StorageEvent.timestamp > last_timestamp,
+            and_(
+                StorageEvent.timestamp == last_timestamp,
+                StorageEvent.id > last_id,
+            ),
+        )
+    )
+  stmt = stmt.order_by(StorageEvent.timestamp, StorageEvent.id)
+  if page_size is not None:
+    stmt = stmt.limit(page_size + 1)
+  return stmt
+
+
+def _to_list_events_response(
+    storage_events: Sequence[StorageEvent],
+    page_size: Optional[int],
+    event_codec: Optional[EventCodec] = None,
+) -> ListEventsResponse:
+  """Converts a page selected by `_select_storage_events_page`."""
+  next_page_token = None
+  if page_size is not None and len(storage_events) > page_size:
+    storage_events = storage_events[:page_size]
+    last_event = storage_events[-1]
+    next_page_token = _encode_page_token(
+        [last_event.timestamp.isoformat(), last_event.id]
+    )
+  return ListEventsResponse(
+      events=[_from_storage_event(e, event_codec) for e in storage_events],
+      next_page_token=next_page_token,
+  )
+
+
+def _to_storage_event(
+    session: Session,
+    event: Event,
+    event_codec: Optional[EventCodec] = None,
+    legacy_actions: bool = False,
+) -> StorageEvent:
+  """Converts an event of the given session to a storage event."""
+  storage_event = StorageEvent(
+      id=event.id,
+      invocation_id=event.invocation_id,
+      author=event.author,
+      branch=event.branch,
+      session_id=session.id,
+      app_name=session.app_name,
+      user_id=session.user_id,
+      timestamp=datetime.fromtimestamp(event.timestamp),
+      long_running_tool_ids=event.long_running_tool_ids,
+      partial=event.partial,
+      turn_complete=event.turn_complete,
+      error_code=event.error_code,
+      error_message=event.error_message,
+      interrupted=event.interrupted,
+  )
+  _set_storage_event_payload(storage_event, event, event_codec, legacy_actions)
+  return storage_event
+
+
+def _set_storage_event_payload(
+    storage_event: StorageEvent,
+    event: Event,
+    event_codec: Optional[EventCodec],
+    legacy_actions: bool,
+):
+  """Stores the content, actions and grounding metadata of the event."""
+  if event_codec:
+    storage_event.payload = event_codec.encode({
+        "content": (
+            event.content.model_dump(exclude_none=True)
+            if event.content
+            else None
+        ),
+        "actions": event.actions.model_dump(exclude_none=True),
+        "grounding_metadata": (
+            event.grounding_metadata.model_dump(exclude_none=True)
+            if event.grounding_metadata
+            else None
+        ),
+    })
+    storage_event.payload_codec = event_codec.name
+    storage_event.content = None
+    storage_event.actions_json = None
+    storage_event.grounding_metadata = None
+  else:
+    storage_event.content = _encode_content(event.content)
+    storage_event.actions_json = event.actions.model_dump(
+        mode="json", exclude_none=True
+    )
+    storage_event.grounding_metadata = (
+        event.grounding_metadata.model_dump(mode="json", exclude_none=True)
+        if event.grounding_metadata
+        else None
+    )
+    storage_event.payload = None
+    storage_event.payload_codec = None
+  storage_event.actions = event.actions if legacy_actions else None
+
+
+def _from_storage_event(
+    storage_event: StorageEvent, event_codec: Optional[EventCodec] = None
+) -> Event:
+  """Converts a storage event to an event, decoding its payload."""
+  if storage_event.payload is not None:
+    payload = _get_event_codec(storage_event.payload_codec, event_codec).decode(
+        storage_event.payload
+    )
+    content = payload.get("content")
+    actions = payload.get("actions")
+    grounding_metadata = payload.get("grounding_metadata")
+  else:
+    content = _decode_content(storage_event.content)
+    # Rows written before `actions_json` only have the pickled actions.
+    actions = (
+        storage_event.actions_json
+        if storage_event.actions_json is not None
+        else storage_event.actions
+    )
+    grounding_metadata = storage_event.grounding_metadata
+  return Event(
+      id=storage_event.id,
+      author=storage_event.author,
+      branch=storage_event.branch,
+      invocation_id=storage_event.invocation_id,
+      content=content,
+      actions=actions if actions is not None else EventActions(),
+      timestamp=storage_event.timestamp.timestamp(),
+      long_running_tool_ids=storage_event.long_running_tool_ids,
+      grounding_metadata=grounding_metadata,
+      partial=storage_event.partial,
+      turn_complete=storage_event.turn_complete,
+      error_code=storage_event.error_code,
+      error_message=storage_event.error_message,
+      interrupted=storage_event.interrupted,
+  )
+
+
+# Built-in codecs used to read rows written with another codec than the one the
+# service is configured with.
+_builtin_event_codecs: dict[str, EventCodec] = {}
+
+
+def _get_event_codec(
+    name: str, event_codec: Optional[EventCodec]
+) -> EventCodec:
+  if event_codec and event_codec.name == name:
+    return event_codec
+  if name not in _builtin_event_codecs:
+    if name != "msgpack":
+      raise ValueError(f"No event codec named '{name}' is configured.")
+    from .msgpack_event_codec import MsgpackEventCodec
+
+    _builtin_event_codecs[name] = MsgpackEventCodec(compression_level=None)
+  return _builtin_event_codecs[name]
+
+
 def _extract_state_delta(state: dict[str, Any]):
   app_state_delta = {}
   user_state_delta = {}
@@ -576,12 +1755,32 @@ def _merge_state(app_state, user_state, session_state):
   return merged_state
 
 
+def _encode_content(
+    content: Optional[types.Content],
+) -> Optional[dict[str, Any]]:
+  if not content:
+    return None
+  encoded_content = content.model_dump(exclude_none=True)
+  # Workaround for multimodal Content throwing JSON not serializable
+  # error with SQLAlchemy.
+  for p in encoded_content.get("parts", []):
+    if "inline_data" in p:
+      p["inline_data"]["data"] = base64.b64encode(
+          p["inline_data"]["data"]
+      ).decode("utf-8")
+  return encoded_content
+
+
 def _decode_content(
     content: Optional[dict[str, Any]],
 ) -> Optional[types.Content]:
   if not content:
     return None
-  for p in content["parts"]:
+  for p in content.get("parts", []):
     if "inline_data" in p:
-      p["inline_data"]["data"] = base64.b64decode(p["inline_data"]["data"][0])
+      data = p["inline_data"]["data"]
+      # Older rows wrap the base64 string in a one-element list.
+      if isinstance(data, list):
+        data = data[0]
+      p["inline_data"]["data"] = base64.b64decode(data)
   return types.Content.model_validate(content)
@@ -0,0 +1,37 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import abc
+from typing import Any
+
+
+class EventCodec(abc.ABC):
+  """Encodes the payload of an event persisted by `DatabaseSessionService`.
+
+  The payload is a dict with the `content`, `actions` and `grounding_metadata`
+  of the event, dumped from their pydantic models in python mode (so inline
+  data stays `bytes`). Without a codec, these are stored in JSON columns.
+  """
+
+  name: str
+  """The name stored along with every encoded payload. Rows are decoded by the
+  codec with the same name, so it must change whenever the format does."""
+
+  @abc.abstractmethod
+  def encode(self, payload: dict[str, Any]) -> bytes:
+    """Encodes the payload of an event."""
+
+  @abc.abstractmethod
+  def decode(self, data: bytes) -> dict[str, Any]:
+    """Decodes the payload of an event."""
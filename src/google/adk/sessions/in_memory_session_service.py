@@ -12,27 +12,93 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 import copy
+import hashlib
+import os
 import time
 from typing import Any
+from typing import Literal
 from typing import Optional
 import uuid
 
 from typing_extensions import override
 
 from ..events.event import Event
+from .base_session_service import _decode_page_token
+from .base_session_service import _encode_page_token
+from .base_session_service import _page_sessions
 from .base_session_service import BaseSessionService
 from .base_session_service import GetSessionConfig
 from .base_session_service import ListEventsResponse
 from .base_session_service import ListSessionsResponse
+from .compaction import apply_compaction
+from .compaction import CompactionConfig
+from .compaction import EventSummarizer
+from .compaction import split_events_for_compaction
+from .compaction import summarize_events
 from .session import Session
 from .state import State
 
 
 class InMemorySessionService(BaseSessionService):
-  """An in-memory implementation of the session service."""
+  """An in-memory implementation of the session service.
 
-  def __init__(self):
+  By default every session handed out is a deep copy of the stored one, which
+  costs O(number of events) per read. With `snapshot_mode='shared'` the
+  returned session gets its own events list and state dict, but the `Event`
+  objects themselves are shared with the storage, so a read only costs
+  O(number of returned events) pointer copies. Events are never modified after
+  being appended, so callers must treat them as read-only in that mode.
+
+  The number of sessions held in memory can be bounded by `max_sessions`,
+  `max_event_bytes` and `idle_ttl_seconds`. Least recently used sessions are
+  evicted first, and the most recently used one is never evicted. Evicted
+  sessions are lost, unless `spill_dir` is set, in which case they are written
+  there as JSON files and transparently reloaded when accessed again. App and
+  user states are always kept in memory.
+  """
+
+  def __init__(
+      self,
+      *,
+      snapshot_mode: Literal['deep_copy', 'shared'] = 'deep_copy',
+      compaction_config: Optional[CompactionConfig] = None,
+      max_sessions: Optional[int] = None,
+      max_event_bytes: Optional[int] = None,
+      idle_ttl_seconds: Optional[float] = None,
+      spill_dir: Optional[str] = None,
+  ):
+    """
+    Args:
+      snapshot_mode: How sessions returned by `get_session` and
+        `create_session` are decoupled from the stored ones. `deep_copy` copies
+        everything; `shared` shares the (immutable) events with the storage.
+      compaction_config: If set, sessions are compacted when they grow beyond
+        `compaction_config.max_events` events. Archived events are dropped.
+      max_sessions: The maximum number of sessions held in memory.
+      max_event_bytes: The maximum total size of the events held in memory, as
+        serialized to JSON.
+      idle_ttl_seconds: How long a session is held in memory after it was last
+        used.
+      spill_dir: The directory evicted sessions are written to.
+    """
+    if snapshot_mode not in ('deep_copy', 'shared'):
+      raise ValueError(f'Unsupported snapshot mode: {snapshot_mode}')
+    self.snapshot_mode = snapshot_mode
+    self.compaction_config = compaction_config
+    self.max_sessions = max_sessions
+    self.max_event_bytes = max_event_bytes
+    self.idle_ttl_seconds = idle_ttl_seconds
+    self.spill_dir = spill_dir
+    # The keys of the sessions held in memory, least recently used first, mapped
+    # to the time they were last used. Only tracked if the memory is bounded.
+    self._lru: collections.OrderedDict[tuple[str, str, str], float] = (
+        collections.OrderedDict()
+    )
+    # A map from session key to the size of the events of the session.
+    self._event_bytes: dict[tuple[str, str, str], int] = {}
+    self._total_event_bytes = 0
     # A map from app name to a map from user ID to a map from session ID to session.
     self.sessions: dict[str, dict[str, dict[str, Session]]] = {}
     # A map from app name to a map from user ID to a map from key to the value.
@@ -62,13 +128,10 @@ class InMemorySessionService(BaseSessionService):
         last_update_time=time.time(),
     )
 
-    if app_name not in self.sessions:
-      self.sessions[app_name] = {}
-    if user_id not in self.sessions[app_name]:
-      self.sessions[app_name][user_id] = {}
-    self.sessions[app_name][user_id][session_id] = session
+    self._store_session(session)
+    self._evict_sessions()
 
-    copied_session = copy.deepcopy(session)
+    copied_session = self._snapshot(session, session.events)
     return self._merge_state(app_name, user_id, copied_session)
 
   @override
@@ -80,32 +143,41 @@ class InMemorySessionService(BaseSessionService):
       session_id: str,
       config: Optional[GetSessionConfig] = None,
   ) -> Session:
-    if app_name not in self.sessions:
-      return None
-    if user_id not in self.sessions[app_name]:
+    session = self._get_storage_session(app_name, user_id, session_id)
+    if session is None:
       return None
-    if session_id not in self.sessions[app_name][user_id]:
-      return None
-
-    session = self.sessions[app_name][user_id].get(session_id)
-    copied_session = copy.deepcopy(session)
+    self._evict_sessions()
 
+    # Select the events before copying so that only those are copied.
+    events = session.events
     if config:
       if config.num_recent_events:
-        copied_session.events = copied_session.events[
-            -config.num_recent_events :
-        ]
+        events = events[-config.num_recent_events :]
       elif config.after_timestamp:
-        i = len(session.events) - 1
+        i = len(events) - 1
         while i >= 0:
-          if copied_session.events[i].timestamp < config.after_timestamp:
+          if events[i].timestamp < config.after_timestamp:
             break
           i -= 1
-        if i >= 0:
-          copied_session.events = copied_session.events[i:]
+        events = events[i + 1 :]
 
+    copied_session = self._snapshot(session, events)
     return self._merge_state(app_name, user_id, copied_session)
 
+  def _snapshot(self, session: Session, events: list[Event]) -> Session:
+    """Returns a copy of the stored session with the given events."""
+    if self.snapshot_mode == 'shared':
+      return session.model_copy(
+          update={
+              'state': copy.deepcopy(session.state),
+              'events': list(events),
+          }
+      )
+    copied_session = session.model_copy(
+        update={'state': session.state, 'events': events}
+    )
+    return copy.deepcopy(copied_session)
+
   def _merge_state(self, app_name: str, user_id: str, copied_session: Session):
     # Merge app state
     if app_name in self.app_state:
@@ -129,35 +201,55 @@ class InMemorySessionService(BaseSessionService):
 
   @override
   def list_sessions(
-      self, *, app_name: str, user_id: str
+      self,
+      *,
+      app_name: str,
+      user_id: Optional[str],
+      page_size: Optional[int] = None,
+      page_token: Optional[str] = None,
+      updated_after: Optional[float] = None,
+      updated_before: Optional[float] = None,
   ) -> ListSessionsResponse:
-    empty_response = ListSessionsResponse()
-    if app_name not in self.sessions:
-      return empty_response
-    if user_id not in self.sessions[app_name]:
-      return empty_response
-
-    sessions_without_events = []
-    for session in self.sessions[app_name][user_id].values():
-      copied_session = copy.deepcopy(session)
-      copied_session.events = []
-      copied_session.state = {}
-      sessions_without_events.append(copied_session)
-    return ListSessionsResponse(sessions=sessions_without_events)
+    sessions = self._list_stored_sessions(app_name, user_id)
+    sessions.extend(self._list_spilled_sessions(app_name, user_id))
+    response = _page_sessions(
+        sessions, page_size, page_token, updated_after, updated_before
+    )
+    response.sessions = [
+        session.model_copy(update={'state': {}, 'events': []})
+        for session in response.sessions
+    ]
+    return response
 
   @override
   def delete_session(
       self, *, app_name: str, user_id: str, session_id: str
   ) -> None:
-    if (
-        self.get_session(
-            app_name=app_name, user_id=user_id, session_id=session_id
-        )
-        is None
-    ):
-      return None
+    self.sessions.get(app_name, {}).get(user_id, {}).pop(session_id, None)
+    self._forget_session((app_name, user_id, session_id))
+    if self.spill_dir:
+      self._remove_spilled_session(app_name, user_id, session_id)
 
-    self.sessions[app_name][user_id].pop(session_id)
+  @override
+  def purge_sessions_older_than(
+      self,
+      *,
+      app_name: str,
+      cutoff_time: float,
+      user_id: Optional[str] = None,
+  ) -> int:
+    sessions = self._list_stored_sessions(app_name, user_id)
+    sessions.extend(self._list_spilled_sessions(app_name, user_id))
+    old_sessions = [
+        session
+        for session in sessions
+        if session.last_update_time < cutoff_time
+    ]
+    for session in old_sessions:
+      self.delete_session(
+          app_name=app_name, user_id=session.user_id, session_id=session.id
+      )
+    return len(old_sessions)
 
   @override
   def append_event(self, session: Session, event: Event) -> Event:
@@ -169,11 +261,8 @@ class InMemorySessionService(BaseSessionService):
     app_name = session.app_name
     user_id = session.user_id
     session_id = session.id
-    if app_name not in self.sessions:
-      return event
-    if user_id not in self.sessions[app_name]:
-      return event
-    if session_id not in self.sessions[app_name][user_id]:
+    storage_session = self._get_storage_session(app_name, user_id, session_id)
+    if storage_session is None:
       return event
 
     if event.actions and event.actions.state_delta:
@@ -188,13 +277,58 @@ class InMemorySessionService(BaseSessionService):
               key.removeprefix(State.USER_PREFIX)
           ] = event.actions.state_delta[key]
 
-    storage_session = self.sessions[app_name][user_id].get(session_id)
     super().append_event(session=storage_session, event=event)
 
     storage_session.last_update_time = event.timestamp
+    if self._is_bounded() and not event.partial:
+      self._add_event_bytes(
+          (app_name, user_id, session_id), _event_bytes(event)
+      )
 
+    if (
+        self.compaction_config
+        and len(storage_session.events) > self.compaction_config.max_events
+    ):
+      self.compact_session(
+          session=session,
+          keep_recent_events=self.compaction_config.keep_recent_events,
+          summarizer=self.compaction_config.summarizer,
+      )
+
+    self._evict_sessions()
     return event
 
+  @override
+  def compact_session(
+      self,
+      *,
+      session: Session,
+      keep_recent_events: int,
+      summarizer: Optional[EventSummarizer] = None,
+  ) -> int:
+    storage_session = self._get_storage_session(
+        session.app_name, session.user_id, session.id
+    )
+    if storage_session is None:
+      return 0
+
+    archived, kept = split_events_for_compaction(
+        storage_session.events, keep_recent_events
+    )
+    if not archived:
+      return 0
+    summary = summarize_events(archived, summarizer, kept)
+    storage_session.events = ([summary] if summary else []) + kept
+    apply_compaction(session, {event.id for event in archived}, summary)
+    if self._is_bounded():
+      key = (session.app_name, session.user_id, session.id)
+      self._add_event_bytes(
+          key,
+          sum(_event_bytes(event) for event in storage_session.events)
+          - self._event_bytes.get(key, 0),
+      )
+    return len(archived)
+
   @override
   def list_events(
       self,
@@ -202,5 +336,208 @@ class InMemorySessionService(BaseSessionService):
       app_name: str,
       user_id: str,
       session_id: str,
+      page_size: Optional[int] = None,
+      page_token: Optional[str] = None,
   ) -> ListEventsResponse:
-    raise NotImplementedError()
+    session = self._get_storage_session(app_name, user_id, session_id)
+    if session is None:
+      return ListEventsResponse()
+
+    # Like the database services, pages are keyed by the (timestamp, id) of
+    # the last event of the previous page rather than by an offset, so that
+    # compacting the session in between does not shift the next page.
+    events = sorted(session.events, key=_event_position)
+    if page_token:
+      last_position = tuple(_decode_page_token(page_token))
+      events = [e for e in events if _event_position(e) > last_position]
+    next_page_token = None
+    if page_size is not None and len(events) > page_size:
+      events = events[:page_size]
+      next_page_token = _encode_page_token(list(_event_position(events[-1])))
+    if self.snapshot_mode == 'deep_copy':
+      events = copy.deepcopy(events)
+    return ListEventsResponse(events=events, next_page_token=next_page_token)
+
+  def _is_bounded(self) -> bool:
+    return (
+        self.max_sessions is not None
+        or self.max_event_bytes is not None
+        or self.idle_ttl_seconds is not None
+    )
+
+  def _get_storage_session(
+      self, app_name: str, user_id: str, session_id: str
+  ) -> Optional[Session]:
+    """Gets a stored session, reloading it if it was spilled."""
+    session = self.sessions.get(app_name, {}).get(user_id, {}).get(session_id)
+    if session is None and self.spill_dir:
+      spill_path = self._spill_path(app_name, user_id, session_id)
+      if os.path.exists(spill_path):
+        with open(spill_path, 'r', encoding='utf-8') as f:
+          session = Session.model_validate_json(f.read())
+        self._remove_spilled_session(app_name, user_id, session_id)
+        self._store_session(session)
+    if session is not None and self._is_bounded():
+      self._lru[(app_name, user_id, session_id)] = time.time()
+      self._lru.move_to_end((app_name, user_id, session_id))
+    return session
+
+  def _store_session(self, session: Session):
+    self.sessions.setdefault(session.app_name, {}).setdefault(
+        session.user_id, {}
+    )[session.id] = session
+    if self._is_bounded():
+      key = (session.app_name, session.user_id, session.id)
+      self._lru[key] = time.time()
+      self._lru.move_to_end(key)
+      self._add_event_bytes(
+          key, sum(_event_bytes(event) for event in session.events)
+      )
+
+  def _add_event_bytes(self, key: tuple[str, str, str], num_bytes: int):
+    self._event_bytes[key] = self._event_bytes.get(key, 0) + num_bytes
+    self._total_event_bytes += num_bytes
+
+  def _forget_session(self, key: tuple[str, str, str]):
+    self._lru.pop(key, None)
+    self._total_event_bytes -= self._event_bytes.pop(key, 0)
+
+  def _evict_sessions(self):
+    """Evicts the least recently used sessions until within the bounds."""
+    now = time.time()
+    while len(self._lru) > 1:
+      key, last_used = next(iter(self._lru.items()))
+      if not (
+          (self.max_sessions is not None and len(self._lru) > self.max_sessions)
+          or (
+              self.max_event_bytes is not None
+              and self._total_event_bytes > self.max_event_bytes
+          )
+          or (
+              self.idle_ttl_seconds is not None
+              and now - last_used > self.idle_ttl_seconds
+          )
+      ):
+        return
+      self._evict_session(key)
+
+  def _evict_session(self, key: tuple[str, str, str]):
+    app_name, user_id, session_id = key
+    user_sessions = self.sessions[app_name][user_id]
+    session = user_sessions.pop(session_id)
+    if not user_sessions:
+      del self.sessions[app_name][user_id]
+      if not self.sessions[app_name]:
+        del self.sessions[app_name]
+    self._forget_session(key)
+
+    if self.spill_dir:
+      spill_path = self._spill_path(app_name, user_id, session_id)
+      os.makedirs(os.path.dirname(spill_path), exist_ok=True)
+      _write_file(spill_path, session.model_dump_json())
+      # Listings only read the metadata, without the state and events.
+      _write_file(
+          _metadata_path(spill_path),
+          session.model_copy(
+              update={'state': {}, 'events': []}
+          ).model_dump_json(),
+      )
+
+  def _remove_spilled_session(
+      self, app_name: str, user_id: str, session_id: str
+  ):
+    spill_path = self._spill_path(app_name, user_id, session_id)
+    for path in (spill_path, _metadata_path(spill_path)):
+      if os.path.exists(path):
+        os.remove(path)
+
+  def _spill_path(self, app_name: str, user_id: str, session_id: str) -> str:
+    return os.path.join(
+        self._spill_user_dir(app_name, user_id),
+        _hash_name(session_id) + '.json',
+    )
+
+  def _spill_user_dir(self, app_name: str, user_id: str) -> str:
+    return os.path.join(
+        self.spill_dir, _hash_name(app_name), _hash_name(user_id)
+    )
+
+  def _list_stored_sessions(
+      self, app_name: str, user_id: Optional[str]
+  ) -> list[Session]:
+    """Lists the sessions in memory of a user, or of all users if not set."""
+    if user_id is None:
+      return [
+          session
+          for user_sessions in self.sessions.get(app_name, {}).values()
+          for session in user_sessions.values()
+      ]
+    return list(self.sessions.get(app_name, {}).get(user_id, {}).values())
+
+  def _list_spilled_sessions(
+      self, app_name: str, user_id: Optional[str]
+  ) -> list[Session]:
+    """Lists the spilled sessions of a user, or of all users if not set.
+
+    The sessions are read from their metadata files, so they have no state and
+    no events.
+    """
+    if not self.spill_dir:
+      return []
+    if user_id is None:
+      app_dir = os.path.join(self.spill_dir, _hash_name(app_name))
+      user_dirs = (
+          [os.path.join(app_dir, name) for name in sorted(os.listdir(app_dir))]
+          if os.path.isdir(app_dir)
+          else []
+      )
+    else:
+      user_dirs = [self._spill_user_dir(app_name, user_id)]
+    sessions = []
+    for user_dir in user_dirs:
+      if not os.path.isdir(user_dir):
+        continue
+      filenames = set(os.listdir(user_dir))
+      for filename in sorted(filenames):
+        if not filename.endswith('.json') or filename.endswith(
+            _METADATA_SUFFIX
+        ):
+          continue
+        path = os.path.join(user_dir, filename)
+        # The metadata is missing if the process died while spilling.
+        if os.path.basename(_metadata_path(path)) in filenames:
+          path = _metadata_path(path)
+        with open(path, 'r', encoding='utf-8') as f:
+          session = Session.model_validate_json(f.read())
+        sessions.append(session.model_copy(update={'state': {}, 'events': []}))
+    return sessions
+
+
+def _event_bytes(event: Event) -> int:
+  """The size of an event, as serialized to JSON."""
+  return len(event.model_dump_json(exclude_none=True))
+
+
+def _event_position(event: Event) -> tuple[float, str]:
+  """The position of an event in the listings of `list_events`."""
+  return (event.timestamp, event.id)
+
+
+_METADATA_SUFFIX = '.meta.json'
+
+
+def _metadata_path(spill_path: str) -> str:
+  """Returns the path of the metadata file of a spilled session."""
+  return spill_path.removesuffix('.json') + _METADATA_SUFFIX
+
+
+def _write_file(path: str, data: str):
+  # Writes to a temporary file first so a crash never leaves a partial one.
+  with open(path + '.tmp', 'w', encoding='utf-8') as f:
+    f.write(data)
+  os.replace(path + '.tmp', path)
+
+
+def _hash_name(name: str) -> str:
+  # Names can contain any character, so they are not used as paths directly.
+  return hashlib.sha256(name.encode('utf-8')).hexdigest()
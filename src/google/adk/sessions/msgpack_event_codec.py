@@ -0,0 +1,94 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import enum
+from typing import Any
+from typing import Optional
+
+import msgpack
+from typing_extensions import override
+
+from .event_codec import EventCodec
+
+# The magic number starting every zstd frame.
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+
+class MsgpackEventCodec(EventCodec):
+  """Encodes event payloads with msgpack, optionally compressed with zstd.
+
+  Inline data is stored as raw bytes instead of base64, and payloads larger
+  than `min_compress_size` are compressed when `compression_level` is set.
+  Requires `msgpack`, and `zstandard` for compression.
+  """
+
+  name = 'msgpack'
+
+  def __init__(
+      self,
+      *,
+      compression_level: Optional[int] = 3,
+      min_compress_size: int = 256,
+  ):
+    """
+    Args:
+      compression_level: The zstd compression level, or None to disable
+        compression.
+      min_compress_size: Payloads smaller than this many bytes are not
+        compressed.
+    """
+    self.compression_level = compression_level
+    self.min_compress_size = min_compress_size
+    self._compressor = None
+    self._decompressor = None
+    if compression_level is not None:
+      self._compressor = _import_zstandard().ZstdCompressor(
+          level=compression_level
+      )
+
+  @override
+  def encode(self, payload: dict[str, Any]) -> bytes:
+    data = msgpack.packb(payload, default=_to_msgpack)
+    if self._compressor and len(data) >= self.min_compress_size:
+      data = self._compressor.compress(data)
+    return data
+
+  @override
+  def decode(self, data: bytes) -> dict[str, Any]:
+    # Payloads are compressed or not depending on their size and on the
+    # settings of the codec that wrote them, so this is decided per payload.
+    if data[:4] == _ZSTD_MAGIC:
+      if not self._decompressor:
+        self._decompressor = _import_zstandard().ZstdDecompressor()
+      data = self._decompressor.decompress(data)
+    return msgpack.unpackb(data)
+
+
+def _to_msgpack(value: Any) -> Any:
+  if isinstance(value, enum.Enum):
+    return value.value
+  if isinstance(value, (set, frozenset)):
+    return list(value)
+  raise TypeError(f'Cannot encode object of type {type(value).__name__}.')
+
+
+def _import_zstandard():
+  try:
+    import zstandard
+  except ImportError as e:
+    raise ImportError(
+        'Compression in MsgpackEventCodec requires zstandard, please install'
+        ' it or set compression_level=None.'
+    ) from e
+  return zstandard
@@ -32,6 +32,7 @@ class Session(BaseModel):
     events: The events of the session, e.g. user input, model response, function
       call/response, etc.
     last_update_time: The last update time of the session.
+    version: The version of the session in storage.
   """
 
   model_config = ConfigDict(
@@ -52,3 +53,8 @@ class Session(BaseModel):
   call/response, etc."""
   last_update_time: float = 0.0
   """The last update time of the session."""
+  version: int = 0
+  """The version of the session in storage, incremented by every write.
+
+  Session services that support optimistic concurrency reject writes from a
+  session whose version is stale."""
@@ -0,0 +1,428 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Streaming export and import of sessions.
+
+Sessions are exported from any `BaseSessionService` as a flat stream of
+records: a session record, followed by one record per event of the session.
+Only a page of sessions and a page of events are held in memory at a time.
+
+A record is a dict with the keys of `RECORD_FIELDS`. Session records have
+`kind` set to `"session"` and the `last_update_time` and `state` of the
+session. Event records have `kind` set to `"event"`, the id, invocation id,
+author and timestamp of the event as columns for analytics, and the whole
+event, as dumped to JSON, in `event`.
+
+The records can be written as JSON Lines or as Parquet (which requires
+pyarrow), where `state` and `event` are stored as JSON strings.
+"""
+
+from __future__ import annotations
+
+import abc
+import json
+import os
+from typing import Any
+from typing import AsyncIterator
+from typing import Iterable
+from typing import Iterator
+from typing import Literal
+from typing import Optional
+from typing import TextIO
+
+from typing_extensions import override
+
+from ..events.event import Event
+from .base_session_service import BaseSessionService
+from .base_session_service import GetSessionConfig
+from .session import Session
+
+RECORD_FIELDS = (
+    'kind',
+    'app_name',
+    'user_id',
+    'session_id',
+    'last_update_time',
+    'state',
+    'event_id',
+    'invocation_id',
+    'author',
+    'timestamp',
+    'event',
+)
+"""The keys of the exported records."""
+
+ExportFormat = Literal['jsonl', 'parquet']
+
+
+class SessionRecordWriter(abc.ABC):
+  """Writes exported session records to a file."""
+
+  @abc.abstractmethod
+  def write(self, records: list[dict[str, Any]]):
+    """Writes records. They may be buffered until the next `flush`."""
+
+  @abc.abstractmethod
+  def flush(self):
+    """Persists the records written so far."""
+
+  @abc.abstractmethod
+  def close(self):
+    """Flushes and closes the writer."""
+
+
+class JsonlSessionRecordWriter(SessionRecordWriter):
+  """Writes records as JSON Lines."""
+
+  def __init__(self, file: TextIO):
+    self.file = file
+
+  @override
+  def write(self, records: list[dict[str, Any]]):
+    self.file.writelines(json.dumps(record) + '\n' for record in records)
+
+  @override
+  def flush(self):
+    self.file.flush()
+
+  @override
+  def close(self):
+    self.file.close()
+
+
+class ParquetSessionRecordWriter(SessionRecordWriter):
+  """Writes records as a Parquet file.
+
+  Records are buffered and written as a record batch on each flush, or once
+  `max_buffered_records` are buffered.
+  """
+
+  def __init__(self, path: str, *, max_buffered_records: int = 10_000):
+    pa, pq = _import_pyarrow()
+    self.max_buffered_records = max_buffered_records
+    self._pa = pa
+    self._schema = _parquet_schema(pa)
+    self._writer = pq.ParquetWriter(path, self._schema)
+    self._records: list[dict[str, Any]] = []
+
+  @override
+  def write(self, records: list[dict[str, Any]]):
+    self._records.extend(records)
+    if len(self._records) >= self.max_buffered_records:
+      self.flush()
+
+  @override
+  def flush(self):
+    if not self._records:
+      return
+    rows = [_to_parquet_row(record) for record in self._records]
+    self._writer.write_batch(
+        self._pa.RecordBatch.from_pylist(rows, schema=self._schema)
+    )
+    self._records = []
+
+  @override
+  def close(self):
+    self.flush()
+    self._writer.close()
+
+
+def open_session_record_writer(
+    path: str, export_format: ExportFormat, *, append: bool = False
+) -> SessionRecordWriter:
+  """Opens a writer of records to a file.
+
+  Args:
+    path: The path of the file.
+    export_format: The format of the file.
+    append: Whether to add the records to an existing file, e.g. to resume an
+      export, instead of overwriting it. Parquet files cannot be appended to,
+      so their path must not exist then.
+
+  Raises:
+    ValueError: If `append` is set and the Parquet file exists.
+  """
+  if export_format == 'jsonl':
+    return JsonlSessionRecordWriter(
+        open(path, 'a' if append else 'w', encoding='utf-8')
+    )
+  if export_format == 'parquet':
+    if append and os.path.exists(path):
+      raise ValueError(
+          f'Cannot append to the Parquet file {path}, export the remaining'
+          ' sessions to another file.'
+      )
+    return ParquetSessionRecordWriter(path)
+  raise ValueError(f'Unsupported export format: {export_format}')
+
+
+def read_session_records(
+    path: str, export_format: ExportFormat, *, batch_size: int = 1000
+) -> Iterator[dict[str, Any]]:
+  """Reads the records of a file.
+
+  Parquet files are read `batch_size` rows at a time.
+  """
+  if export_format == 'jsonl':
+    with open(path, 'r', encoding='utf-8') as f:
+      for line in f:
+        if line.strip():
+          yield json.loads(line)
+  elif export_format == 'parquet':
+    _, pq = _import_pyarrow()
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=batch_size):
+      for row in batch.to_pylist():
+        yield _from_parquet_row(row)
+  else:
+    raise ValueError(f'Unsupported export format: {export_format}')
+
+
+async def export_sessions(
+    session_service: BaseSessionService,
+    writer: SessionRecordWriter,
+    *,
+    app_name: str,
+    user_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    batch_size: int = 100,
+    events_page_size: int = 1000,
+) -> AsyncIterator[Optional[str]]:
+  """Exports the sessions of a user, or of all users of an app.
+
+  Sessions are exported in batches. The writer is flushed after each batch,
+  and then the cursor to resume the export from is yielded.
+
+  Args:
+    session_service: The session service to export from.
+    writer: The writer of the records.
+    app_name: The name of the app.
+    user_id: The id of the user. If None, the sessions of all users are
+      exported, which requires a session service that supports listing them,
+      i.e. `list_sessions` with no `user_id`.
+    cursor: A cursor yielded by a previous export, to resume it after the
+      batch the cursor was yielded for.
+    batch_size: The number of sessions per batch.
+    events_page_size: The number of events loaded at a time.
+
+  Yields:
+    The cursor to resume the export from, which is None after the last batch.
+  """
+  while True:
+    response = await session_service.list_sessions_async(
+        app_name=app_name,
+        user_id=user_id,
+        page_size=batch_size,
+        page_token=cursor,
+    )
+    for listed_session in response.sessions:
+      # Only the state is needed, the events are listed page by page below.
+      session = await session_service.get_session_async(
+          app_name=app_name,
+          user_id=listed_session.user_id,
+          session_id=listed_session.id,
+          config=GetSessionConfig(num_recent_events=1),
+      )
+      if session is None:
+        # Deleted since it was listed.
+        continue
+      writer.write([_session_record(session)])
+      page_token = None
+      while True:
+        events_response = await session_service.list_events_async(
+            app_name=app_name,
+            user_id=session.user_id,
+            session_id=session.id,
+            page_size=events_page_size,
+            page_token=page_token,
+        )
+        writer.write([
+            _event_record(app_name, session.user_id, session.id, event)
+            for event in events_response.events
+        ])
+        page_token = events_response.next_page_token
+        if not page_token:
+          break
+    writer.flush()
+    cursor = response.next_page_token
+    yield cursor
+    if not cursor:
+      return
+
+
+async def import_sessions(
+    session_service: BaseSessionService,
+    records: Iterable[dict[str, Any]],
+    *,
+    skip_records: int = 0,
+    checkpoint_interval: int = 100,
+) -> AsyncIterator[int]:
+  """Imports exported sessions.
+
+  Each session is created with its exported state, which is its state after
+  its last event, and its events are appended in order without their state
+  deltas, which the exported state already includes. App and user states are
+  therefore set to their exported values, and the imported events do not
+  record the state changes they made.
+
+  Sessions keep their exported ids, unless the session service assigns its
+  own, like `VertexAiSessionService`. Imports into such services cannot be
+  resumed, since the sessions imported after the checkpoint cannot be found.
+
+  Args:
+    session_service: The session service to import into.
+    records: The exported records.
+    skip_records: A checkpoint yielded by a previous import, to resume it. The
+      sessions imported after the checkpoint was yielded are deleted and
+      imported again.
+    checkpoint_interval: The number of sessions imported between checkpoints.
+
+  Yields:
+    Checkpoints, i.e. the number of records before the session being imported,
+    and finally the number of records once all are imported.
+
+  Raises:
+    ValueError: If the records are not in order, or if an import into a
+      session service that assigns its own session ids is resumed.
+  """
+  session = None
+  # The exported id of `session`.
+  session_record_id = None
+  # Whether the sessions may have been imported before, i.e. whether no
+  # checkpoint was yielded since the import was resumed.
+  resuming = bool(skip_records)
+  num_records = 0
+  num_sessions = 0
+  for record in records:
+    num_records += 1
+    if num_records <= skip_records:
+      continue
+    if record['kind'] == 'session':
+      if session and num_sessions % checkpoint_interval == 0:
+        yield num_records - 1
+        resuming = False
+      if resuming:
+        # It may have been imported in part before.
+        await session_service.delete_session_async(
+            app_name=record['app_name'],
+            user_id=record['user_id'],
+            session_id=record['session_id'],
+        )
+      session = await session_service.create_session_async(
+          app_name=record['app_name'],
+          user_id=record['user_id'],
+          state=record['state'],
+          session_id=record['session_id'],
+      )
+      session_record_id = record['session_id']
+      if resuming and session.id != session_record_id:
+        await session_service.delete_session_async(
+            app_name=session.app_name,
+            user_id=session.user_id,
+            session_id=session.id,
+        )
+        raise ValueError(
+            f'{type(session_service).__name__} assigns its own session ids,'
+            ' so imports into it cannot be resumed.'
+        )
+      num_sessions += 1
+    elif record['kind'] == 'event':
+      if session is None or session_record_id != record['session_id']:
+        raise ValueError(
+            f'Event {record["event_id"]} does not follow the record of its'
+            ' session.'
+        )
+      event = Event.model_validate(record['event'])
+      # Applying the state delta again would, e.g., increment counters twice.
+      event.actions.state_delta = {}
+      await session_service.append_event_async(session, event)
+      # The imported events are not needed anymore.
+      session.events.clear()
+    else:
+      raise ValueError(f'Unknown record kind: {record["kind"]}')
+  yield num_records
+
+
+def _session_record(session: Session) -> dict[str, Any]:
+  record = dict.fromkeys(RECORD_FIELDS)
+  record.update(
+      kind='session',
+      app_name=session.app_name,
+      user_id=session.user_id,
+      session_id=session.id,
+      last_update_time=session.last_update_time,
+      state=session.state,
+  )
+  return record
+
+
+def _event_record(
+    app_name: str, user_id: str, session_id: str, event: Event
+) -> dict[str, Any]:
+  record = dict.fromkeys(RECORD_FIELDS)
+  record.update(
+      kind='event',
+      app_name=app_name,
+      user_id=user_id,
+      session_id=session_id,
+      event_id=event.id,
+      invocation_id=event.invocation_id,
+      author=event.author,
+      timestamp=event.timestamp,
+      event=event.model_dump(mode='json', exclude_none=True),
+  )
+  return record
+
+
+def _parquet_schema(pa):
+  return pa.schema([
+      ('kind', pa.string()),
+      ('app_name', pa.string()),
+      ('user_id', pa.string()),
+      ('session_id', pa.string()),
+      ('last_update_time', pa.float64()),
+      ('state', pa.string()),
+      ('event_id', pa.string()),
+      ('invocation_id', pa.string()),
+      ('author', pa.string()),
+      ('timestamp', pa.float64()),
+      ('event', pa.string()),
+  ])
+
+
+def _to_parquet_row(record: dict[str, Any]) -> dict[str, Any]:
+  row = dict(record)
+  for field in ('state', 'event'):
+    if row[field] is not None:
+      row[field] = json.dumps(row[field])
+  return row
+
+
+def _from_parquet_row(row: dict[str, Any]) -> dict[str, Any]:
+  for field in ('state', 'event'):
+    if row[field] is not None:
+      row[field] = json.loads(row[field])
+  return row
+
+
+def _import_pyarrow():
+  try:
+    import pyarrow
+    import pyarrow.parquet
+  except ImportError as e:
+    raise ImportError(
+        'Exporting sessions as Parquet requires pyarrow, please install it or'
+        ' use the JSON Lines format.'
+    ) from e
+  return pyarrow, pyarrow.parquet
@@ -0,0 +1,150 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Locks serializing the invocations on a session.
+
+`Runner` holds the lock of a session for the whole invocation, so concurrent
+invocations on the same session wait for each other instead of interleaving
+their events or failing on stale sessions.
+"""
+
+from __future__ import annotations
+
+import abc
+import asyncio
+import collections
+import contextlib
+import threading
+from typing import AsyncIterator
+from typing import Optional
+
+from typing_extensions import override
+
+_SessionKey = tuple[str, str, str]
+
+
+class SessionLockTimeoutError(TimeoutError):
+  """Raised when the lock of a session is not acquired in time."""
+
+
+class BaseSessionLock(abc.ABC):
+  """Mutual exclusion of the invocations on a session."""
+
+  @abc.abstractmethod
+  def lock(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      session_id: str,
+      timeout: Optional[float] = None,
+  ) -> contextlib.AbstractAsyncContextManager[None]:
+    """Returns an async context manager holding the lock of a session.
+
+    Waiters acquire the lock in the order they started waiting.
+
+    Args:
+      app_name: The name of the app.
+      user_id: The id of the user.
+      session_id: The id of the session.
+      timeout: The maximum number of seconds to wait for the lock, or None to
+        wait until it is released.
+
+    Raises:
+      SessionLockTimeoutError: If the lock is not acquired within `timeout`.
+    """
+
+
+class InMemorySessionLock(BaseSessionLock):
+  """Locks sessions within the process.
+
+  The lock is handed over directly to the next waiter, which may run in
+  another thread and event loop, e.g. with `Runner.run`.
+  """
+
+  def __init__(self):
+    self._mutex = threading.Lock()
+    # The keys of the locked sessions, mapped to the waiters for their lock.
+    self._waiters: dict[
+        _SessionKey,
+        collections.deque[tuple[asyncio.AbstractEventLoop, asyncio.Future]],
+    ] = {}
+
+  @override
+  @contextlib.asynccontextmanager
+  async def lock(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      session_id: str,
+      timeout: Optional[float] = None,
+  ) -> AsyncIterator[None]:
+    key = (app_name, user_id, session_id)
+    await self._acquire(key, timeout)
+    try:
+      yield
+    finally:
+      self._release(key)
+
+  def locked(self, *, app_name: str, user_id: str, session_id: str) -> bool:
+    """Whether the lock of a session is held."""
+    with self._mutex:
+      return (app_name, user_id, session_id) in self._waiters
+
+  async def _acquire(self, key: _SessionKey, timeout: Optional[float]):
+    loop = asyncio.get_running_loop()
+    with self._mutex:
+      waiters = self._waiters.get(key)
+      if waiters is None:
+        self._waiters[key] = collections.deque()
+        return
+      waiter = (loop, loop.create_future())
+      waiters.append(waiter)
+    try:
+      await asyncio.wait_for(waiter[1], timeout)
+    except BaseException as e:
+      with self._mutex:
+        handed_over = waiter not in self._waiters[key]
+        if not handed_over:
+          self._waiters[key].remove(waiter)
+      if handed_over:
+        # The lock was handed over while timing out or being cancelled.
+        self._release(key)
+      if isinstance(e, asyncio.TimeoutError):
+        raise SessionLockTimeoutError(
+            f'Timed out waiting for the lock of session {key[2]}.'
+        ) from e
+      raise
+
+  def _release(self, key: _SessionKey):
+    while True:
+      with self._mutex:
+        waiters = self._waiters[key]
+        if not waiters:
+          del self._waiters[key]
+          return
+        loop, future = waiters.popleft()
+      try:
+        loop.call_soon_threadsafe(_set_future_result, future)
+        return
+      except RuntimeError:
+        # The event loop of the waiter is closed, so it will never take the
+        # lock. Hands it over to the next waiter instead.
+        continue
+
+
+def _set_future_result(future: asyncio.Future):
+  if not future.done():
+    future.set_result(None)
@@ -11,14 +11,21 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import asyncio
+from datetime import datetime
+from datetime import timezone
+import heapq
 import logging
 import re
 import time
 from typing import Any
 from typing import Optional
+from urllib.parse import urlencode
 
 from dateutil.parser import isoparse
 from google import genai
+from google.auth.credentials import Credentials
+from google.genai import types
 from typing_extensions import override
 
 from ..events.event import Event
@@ -33,17 +40,39 @@ logger = logging.getLogger(__name__)
 
 
 class VertexAiSessionService(BaseSessionService):
-  """Connects to the managed Vertex AI Session Service."""
+  """Connects to the managed Vertex AI Session Service.
+
+  The async methods share the pooled async HTTP client of `api_client`, so
+  concurrent requests reuse connections instead of blocking the event loop.
+  """
 
   def __init__(
       self,
       project: str = None,
       location: str = None,
+      *,
+      credentials: Optional[Credentials] = None,
+      http_options: Optional[types.HttpOptions] = None,
   ):
+    """
+    Args:
+      project: The Google Cloud project of the reasoning engines.
+      location: The location of the reasoning engines.
+      credentials: The credentials to authenticate with. Defaults to the
+        application default credentials.
+      http_options: HTTP options of the API client, e.g. to point it to
+        another `base_url`.
+    """
     self.project = project
     self.location = location
 
-    client = genai.Client(vertexai=True, project=project, location=location)
+    client = genai.Client(
+        vertexai=True,
+        project=project,
+        location=location,
+        credentials=credentials,
+        http_options=http_options,
+    )
     self.api_client = client._api_client
 
   @override
@@ -162,38 +191,29 @@ class VertexAiSessionService(BaseSessionService):
           if session.events[i].timestamp < config.after_timestamp:
             break
           i -= 1
-        if i >= 0:
-          session.events = session.events[i:]
+        session.events = session.events[i + 1 :]
 
     return session
 
   @override
   def list_sessions(
-      self, *, app_name: str, user_id: str
+      self,
+      *,
+      app_name: str,
+      user_id: Optional[str],
+      page_size: Optional[int] = None,
+      page_token: Optional[str] = None,
+      updated_after: Optional[float] = None,
+      updated_before: Optional[float] = None,
   ) -> ListSessionsResponse:
-    reasoning_engine_id = _parse_reasoning_engine_id(app_name)
-
     api_response = self.api_client.request(
         http_method='GET',
-        path=f'reasoningEngines/{reasoning_engine_id}/sessions?filter=user_id={user_id}',
+        path=_list_sessions_path(app_name, user_id, page_size, page_token),
         request_dict={},
     )
-
-    # Handles empty response case
-    if api_response.get('httpHeaders', None):
-      return ListSessionsResponse()
-
-    sessions = []
-    for api_session in api_response['sessions']:
-      session = Session(
-          app_name=app_name,
-          user_id=user_id,
-          id=api_session['name'].split('/')[-1],
-          state={},
-          last_update_time=isoparse(api_session['updateTime']).timestamp(),
-      )
-      sessions.append(session)
-    return ListSessionsResponse(sessions=sessions)
+    return _to_list_sessions_response(
+        app_name, user_id, api_response, updated_after, updated_before
+    )
 
   def delete_session(
       self, *, app_name: str, user_id: str, session_id: str
@@ -212,33 +232,216 @@ class VertexAiSessionService(BaseSessionService):
       app_name: str,
       user_id: str,
       session_id: str,
+      page_size: Optional[int] = None,
+      page_token: Optional[str] = None,
   ) -> ListEventsResponse:
-    reasoning_engine_id = _parse_reasoning_engine_id(app_name)
     api_response = self.api_client.request(
         http_method='GET',
-        path=f'reasoningEngines/{reasoning_engine_id}/sessions/{session_id}/events',
+        path=_list_events_path(
+            _session_path(app_name, session_id), page_size, page_token
+        ),
         request_dict={},
     )
 
     logger.info(f'List events response {api_response}')
 
-    # Handles empty response case
-    if api_response.get('httpHeaders', None):
-      return ListEventsResponse()
+    return _to_list_events_response(api_response)
 
-    session_events = api_response['sessionEvents']
+  @override
+  def append_event(self, session: Session, event: Event) -> Event:
+    # Update the in-memory session.
+    super().append_event(session=session, event=event)
 
-    return ListEventsResponse(
-        events=[_from_api_event(event) for event in session_events]
+    reasoning_engine_id = _parse_reasoning_engine_id(session.app_name)
+    self.api_client.request(
+        http_method='POST',
+        path=f'reasoningEngines/{reasoning_engine_id}/sessions/{session.id}:appendEvent',
+        request_dict=_convert_event_to_json(event),
     )
 
+    return event
+
   @override
-  def append_event(self, session: Session, event: Event) -> Event:
+  async def create_session_async(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      state: Optional[dict[str, Any]] = None,
+      session_id: Optional[str] = None,
+  ) -> Session:
+    reasoning_engine_id = _parse_reasoning_engine_id(app_name)
+
+    session_json_dict = {'user_id': user_id}
+    if state:
+      session_json_dict['session_state'] = state
+
+    api_response = await self.api_client.async_request(
+        http_method='POST',
+        path=f'reasoningEngines/{reasoning_engine_id}/sessions',
+        request_dict=session_json_dict,
+    )
+    logger.info(f'Create Session response {api_response}')
+
+    session_id = api_response['name'].split('/')[-3]
+    operation_id = api_response['name'].split('/')[-1]
+
+    max_retry_attempt = 5
+    while max_retry_attempt >= 0:
+      lro_response = await self.api_client.async_request(
+          http_method='GET',
+          path=f'operations/{operation_id}',
+          request_dict={},
+      )
+
+      if lro_response.get('done', None):
+        break
+
+      await asyncio.sleep(1)
+      max_retry_attempt -= 1
+
+    get_session_api_response = await self.api_client.async_request(
+        http_method='GET',
+        path=f'reasoningEngines/{reasoning_engine_id}/sessions/{session_id}',
+        request_dict={},
+    )
+    return _from_api_session(app_name, user_id, get_session_api_response)
+
+  @override
+  async def get_session_async(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      session_id: str,
+      config: Optional[GetSessionConfig] = None,
+  ) -> Session:
+    session_path = _session_path(app_name, session_id)
+    event_filter = None
+    if config and not config.num_recent_events and config.after_timestamp:
+      after_time = datetime.fromtimestamp(
+          config.after_timestamp, tz=timezone.utc
+      )
+      event_filter = f'timestamp>="{after_time.isoformat()}"'
+
+    def list_events_async(page_token: Optional[str]):
+      return self.api_client.async_request(
+          http_method='GET',
+          path=_list_events_path(
+              session_path, page_token=page_token, event_filter=event_filter
+          ),
+          request_dict={},
+      )
+
+    # The session and its first page of events are fetched concurrently.
+    events_task = asyncio.create_task(list_events_async(None))
+    try:
+      get_session_api_response = await self.api_client.async_request(
+          http_method='GET',
+          path=session_path,
+          request_dict={},
+      )
+    except BaseException:
+      events_task.cancel()
+      raise
+    session = _from_api_session(app_name, user_id, get_session_api_response)
+    update_timestamp = session.last_update_time
+
+    # Fetches the next page while the current one is processed.
+    timed_api_events = []
+    list_events_api_response = await events_task
+    while True:
+      next_page_token = list_events_api_response.get('nextPageToken', None)
+      if next_page_token:
+        events_task = asyncio.create_task(list_events_async(next_page_token))
+        # Lets the request of the next page be sent before continuing.
+        await asyncio.sleep(0)
+      for api_event in list_events_api_response.get('sessionEvents', []):
+        timestamp = isoparse(api_event['timestamp']).timestamp()
+        if timestamp <= update_timestamp:
+          timed_api_events.append((timestamp, api_event))
+      if not next_page_token:
+        break
+      list_events_api_response = await events_task
+
+    if config:
+      if config.num_recent_events:
+        # Only the most recent events are converted.
+        timed_api_events = heapq.nlargest(
+            config.num_recent_events,
+            timed_api_events,
+            key=lambda timed_api_event: timed_api_event[0],
+        )
+      elif config.after_timestamp:
+        timed_api_events = [
+            (timestamp, api_event)
+            for timestamp, api_event in timed_api_events
+            if timestamp >= config.after_timestamp
+        ]
+
+    session.events = [
+        _from_api_event(api_event) for _, api_event in timed_api_events
+    ]
+    session.events.sort(key=lambda event: event.timestamp)
+    return session
+
+  @override
+  async def list_sessions_async(
+      self,
+      *,
+      app_name: str,
+      user_id: Optional[str],
+      page_size: Optional[int] = None,
+      page_token: Optional[str] = None,
+      updated_after: Optional[float] = None,
+      updated_before: Optional[float] = None,
+  ) -> ListSessionsResponse:
+    api_response = await self.api_client.async_request(
+        http_method='GET',
+        path=_list_sessions_path(app_name, user_id, page_size, page_token),
+        request_dict={},
+    )
+    return _to_list_sessions_response(
+        app_name, user_id, api_response, updated_after, updated_before
+    )
+
+  @override
+  async def delete_session_async(
+      self, *, app_name: str, user_id: str, session_id: str
+  ) -> None:
+    reasoning_engine_id = _parse_reasoning_engine_id(app_name)
+    await self.api_client.async_request(
+        http_method='DELETE',
+        path=f'reasoningEngines/{reasoning_engine_id}/sessions/{session_id}',
+        request_dict={},
+    )
+
+  @override
+  async def list_events_async(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      session_id: str,
+      page_size: Optional[int] = None,
+      page_token: Optional[str] = None,
+  ) -> ListEventsResponse:
+    api_response = await self.api_client.async_request(
+        http_method='GET',
+        path=_list_events_path(
+            _session_path(app_name, session_id), page_size, page_token
+        ),
+        request_dict={},
+    )
+    return _to_list_events_response(api_response)
+
+  @override
+  async def append_event_async(self, session: Session, event: Event) -> Event:
     # Update the in-memory session.
     super().append_event(session=session, event=event)
 
     reasoning_engine_id = _parse_reasoning_engine_id(session.app_name)
-    self.api_client.request(
+    await self.api_client.async_request(
         http_method='POST',
         path=f'reasoningEngines/{reasoning_engine_id}/sessions/{session.id}:appendEvent',
         request_dict=_convert_event_to_json(event),
@@ -247,6 +450,114 @@ class VertexAiSessionService(BaseSessionService):
     return event
 
 
+def _from_api_session(
+    app_name: str, user_id: str, api_session: dict[str, Any]
+) -> Session:
+  return Session(
+      app_name=str(app_name),
+      user_id=str(user_id),
+      id=str(api_session['name'].split('/')[-1]),
+      state=api_session.get('sessionState', {}),
+      last_update_time=isoparse(api_session['updateTime']).timestamp(),
+  )
+
+
+def _list_sessions_path(
+    app_name: str,
+    user_id: Optional[str],
+    page_size: Optional[int],
+    page_token: Optional[str],
+) -> str:
+  reasoning_engine_id = _parse_reasoning_engine_id(app_name)
+  params = []
+  if user_id is not None:
+    params.append(f'filter=user_id={user_id}')
+  if page_size is not None:
+    params.append(f'pageSize={page_size}')
+  if page_token:
+    params.append(urlencode({'pageToken': page_token}))
+  path = f'reasoningEngines/{reasoning_engine_id}/sessions'
+  return f'{path}?{"&".join(params)}' if params else path
+
+
+def _session_path(app_name: str, session_id: str) -> str:
+  reasoning_engine_id = _parse_reasoning_engine_id(app_name)
+  return f'reasoningEngines/{reasoning_engine_id}/sessions/{session_id}'
+
+
+def _list_events_path(
+    session_path: str,
+    page_size: Optional[int] = None,
+    page_token: Optional[str] = None,
+    event_filter: Optional[str] = None,
+) -> str:
+  query_params = {}
+  if event_filter:
+    query_params['filter'] = event_filter
+  if page_size is not None:
+    query_params['pageSize'] = page_size
+  if page_token:
+    query_params['pageToken'] = page_token
+  path = f'{session_path}/events'
+  if query_params:
+    path = f'{path}?{urlencode(query_params)}'
+  return path
+
+
+def _to_list_events_response(
+    api_response: dict[str, Any],
+) -> ListEventsResponse:
+  # Handles empty response case
+  if api_response.get('httpHeaders', None):
+    return ListEventsResponse()
+
+  return ListEventsResponse(
+      events=[
+          _from_api_event(event) for event in api_response['sessionEvents']
+      ],
+      next_page_token=api_response.get('nextPageToken', None),
+  )
+
+
+def _to_list_sessions_response(
+    app_name: str,
+    user_id: Optional[str],
+    api_response: dict[str, Any],
+    updated_after: Optional[float],
+    updated_before: Optional[float],
+) -> ListSessionsResponse:
+  """Converts a page of sessions listed by the API.
+
+  The update time filters are applied to the page, so a page may have fewer
+  sessions than requested even if there are more.
+  """
+  # Handles empty response case
+  if api_response.get('httpHeaders', None):
+    return ListSessionsResponse()
+
+  sessions = []
+  for api_session in api_response['sessions']:
+    session = Session(
+        app_name=app_name,
+        user_id=api_session.get('userId', user_id),
+        id=api_session['name'].split('/')[-1],
+        state={},
+        last_update_time=isoparse(api_session['updateTime']).timestamp(),
+    )
+    if (
+        updated_after is not None and session.last_update_time < updated_after
+    ) or (
+        updated_before is not None
+        and session.last_update_time >= updated_before
+    ):
+      continue
+    sessions.append(session)
+  return ListSessionsResponse(
+      sessions=sessions,
+      next_page_token=api_response.get('nextPageToken', None),
+  )
+
+
 def _convert_event_to_json(event: Event):
   metadata_json = {
       'partial': event.partial,
@@ -41,10 +41,27 @@ class BaseTool(ABC):
   """Whether the tool is a long running operation, which typically returns a
   resource id first and finishes the operation later."""
 
-  def __init__(self, *, name, description, is_long_running: bool = False):
+  is_reentrant: bool = True
+  """Whether the tool can run concurrently with itself. The parallel calls of a
+  non-reentrant tool in a model response are run one at a time."""
+
+  is_independent: bool = False
+  """Whether `process_llm_request` only reads the model of the request and only
+  appends contents, instructions and tools to it. Consecutive independent tools
+  preprocess the request concurrently, e.g. to look up memories or examples."""
+
+  def __init__(
+      self,
+      *,
+      name,
+      description,
+      is_long_running: bool = False,
+      is_reentrant: bool = True,
+  ):
     self.name = name
     self.description = description
     self.is_long_running = is_long_running
+    self.is_reentrant = is_reentrant
 
   def _get_declaration(self) -> Optional[types.FunctionDeclaration]:
     """Gets the OpenAPI specification of this tool in the form of a FunctionDeclaration.
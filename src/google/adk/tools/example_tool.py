@@ -25,6 +25,7 @@ from ..examples.base_example_provider import BaseExampleProvider
 from ..examples.example import Example
 from .base_tool import BaseTool
 from .tool_context import ToolContext
+from .tool_executor import get_default_tool_executor
 
 if TYPE_CHECKING:
   from ..models.llm_request import LlmRequest
@@ -37,6 +38,8 @@ class ExampleTool(BaseTool):
     examples: The examples to add to the LLM request.
   """
 
+  is_independent = True
+
   def __init__(self, examples: Union[list[Example], BaseExampleProvider]):
     # Name and description are not used because this tool only changes
     # llm_request.
@@ -55,8 +58,11 @@ class ExampleTool(BaseTool):
     if not parts or not parts[0].text:
       return
 
-    llm_request.append_instructions([
-        example_util.build_example_si(
-            self.examples, parts[0].text, llm_request.model
-        )
-    ])
+    # Example providers may look the examples up in a remote store.
+    example_si = await get_default_tool_executor().run(
+        example_util.build_example_si,
+        self.examples,
+        parts[0].text,
+        llm_request.model,
+    )
+    llm_request.append_instructions([example_si])
@@ -23,21 +23,56 @@ from typing_extensions import override
 from ._automatic_function_calling_util import build_function_declaration
 from .base_tool import BaseTool
 from .tool_context import ToolContext
+from .tool_executor import get_default_tool_executor
+from .tool_executor import ToolTimeoutError
+from .tool_executor import wait_for_tool
 
 
 class FunctionTool(BaseTool):
   """A tool that wraps a user-defined Python function.
 
+  Synchronous functions run on the worker threads of the default
+  `ToolExecutor`, so that they do not block the event loop.
+
   Attributes:
     func: The function to wrap.
+    timeout: The maximum number of seconds to wait for the function, or None to
+      wait until it returns.
+    cpu_bound: Whether the function is synchronous and CPU-bound, and runs on a
+      worker process. It must then be picklable and cannot take a
+      `tool_context`.
   """
 
-  def __init__(self, func: Callable[..., Any]):
+  def __init__(
+      self,
+      func: Callable[..., Any],
+      *,
+      timeout: Optional[float] = None,
+      cpu_bound: bool = False,
+  ):
     super().__init__(name=func.__name__, description=func.__doc__)
     self.func = func
+    self._declaration_cache: Optional[
+        tuple[tuple[Callable[..., Any], str], types.FunctionDeclaration]
+    ] = None
+    self.timeout = timeout
+    self.cpu_bound = cpu_bound
+    if cpu_bound and (
+        inspect.iscoroutinefunction(func)
+        or 'tool_context' in inspect.signature(func).parameters
+    ):
+      raise ValueError(
+          f'CPU-bound tool {self.name} must be a synchronous function without'
+          ' a tool_context.'
+      )
 
   @override
   def _get_declaration(self) -> Optional[types.FunctionDeclaration]:
+    # The declaration is built once per function and API variant. It is shared
+    # by the LLM requests, which must not modify it.
+    cache_key = (self.func, self._api_variant)
+    if self._declaration_cache and self._declaration_cache[0] == cache_key:
+      return self._declaration_cache[1]
     function_decl = types.FunctionDeclaration.model_validate(
         build_function_declaration(
             func=self.func,
@@ -47,7 +82,7 @@ class FunctionTool(BaseTool):
             variant=self._api_variant,
         )
     )
-
+    self._declaration_cache = (cache_key, function_decl)
     return function_decl
 
   @override
@@ -76,10 +111,28 @@ class FunctionTool(BaseTool):
 You could retry calling this tool, but it is IMPORTANT for you to provide all the mandatory parameters."""
       return {'error': error_str}
 
-    if inspect.iscoroutinefunction(self.func):
-      return await self.func(**args_to_call) or {}
-    else:
-      return self.func(**args_to_call) or {}
+    try:
+      if inspect.iscoroutinefunction(self.func):
+        return (
+            await wait_for_tool(self.func(**args_to_call), self.timeout) or {}
+        )
+      else:
+        return (
+            await get_default_tool_executor().run(
+                self.func,
+                timeout=self.timeout,
+                cpu_bound=self.cpu_bound,
+                **args_to_call,
+            )
+            or {}
+        )
+    except ToolTimeoutError:
+      return {
+          'error': (
+              f'Invoking `{self.name}()` timed out after {self.timeout}'
+              ' seconds.'
+          )
+      }
 
   # TODO(hangfei): fix call live for function stream.
   async def _call_live(
@@ -31,6 +31,7 @@ from ....auth.auth_credential import AuthCredential
 from ....auth.auth_schemes import AuthScheme
 from ....tools.base_tool import BaseTool
 from ...tool_context import ToolContext
+from ...tool_executor import get_default_tool_executor
 from ..auth.auth_helpers import credential_to_param
 from ..auth.auth_helpers import dict_to_auth_scheme
 from ..auth.credential_exchangers.auto_auth_credential_exchanger import AutoAuthCredentialExchanger
@@ -455,7 +456,10 @@ class RestApiTool(BaseTool):
   async def run_async(
       self, *, args: dict[str, Any], tool_context: Optional[ToolContext]
   ) -> Dict[str, Any]:
-    return self.call(args=args, tool_context=tool_context)
+    # The request blocks, so it runs on a worker thread.
+    return await get_default_tool_executor().run(
+        self.call, args=args, tool_context=tool_context
+    )
 
   def call(
       self, *, args: dict[str, Any], tool_context: Optional[ToolContext]
@@ -21,6 +21,7 @@ from typing_extensions import override
 
 from .base_tool import BaseTool
 from .tool_context import ToolContext
+from .tool_executor import get_default_tool_executor
 
 if TYPE_CHECKING:
   from ..models import LlmRequest
@@ -29,6 +30,8 @@ if TYPE_CHECKING:
 class PreloadMemoryTool(BaseTool):
   """A tool that preloads the memory for the current user."""
 
+  is_independent = True
+
   def __init__(self):
     # Name and description are not used because this tool only
     # changes llm_request.
@@ -45,7 +48,9 @@ class PreloadMemoryTool(BaseTool):
     if not parts or not parts[0].text:
       return
     query = parts[0].text
-    response = tool_context.search_memory(query)
+    response = await get_default_tool_executor().run(
+        tool_context.search_memory, query
+    )
     if not response.memories:
       return
     memory_text = ''
@@ -25,6 +25,7 @@ from typing_extensions import override
 from vertexai.preview import rag
 
 from ..tool_context import ToolContext
+from ..tool_executor import get_default_tool_executor
 from .base_retrieval_tool import BaseRetrievalTool
 
 if TYPE_CHECKING:
@@ -90,7 +91,8 @@ class VertexAiRagRetrieval(BaseRetrievalTool):
       tool_context: ToolContext,
   ) -> Any:
 
-    response = rag.retrieval_query(
+    response = await get_default_tool_executor().run(
+        rag.retrieval_query,
         text=args['query'],
         rag_resources=self.vertex_rag_store.rag_resources,
         rag_corpora=self.vertex_rag_store.rag_corpora,
@@ -0,0 +1,231 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Runs synchronous tools off the event loop.
+
+A blocking tool run on the event loop stalls every other invocation served by
+the same process. `ToolExecutor` runs them on a pool of worker threads
+instead, or on a pool of worker processes for CPU-bound tools.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+import os
+import threading
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class ToolTimeoutError(asyncio.TimeoutError):
+  """Raised when a tool does not return within its timeout.
+
+  Distinguishes the timeout of the call from a `TimeoutError` raised by the
+  tool itself, which is propagated as is.
+  """
+
+
+async def wait_for_tool(awaitable: Awaitable[Any], timeout: Optional[float]):
+  """Waits for a tool call, like `asyncio.wait_for`.
+
+  Args:
+    awaitable: The tool call.
+    timeout: The maximum number of seconds to wait, or None to wait until the
+      call returns. The call is cancelled after a timeout.
+
+  Returns:
+    The result of the call.
+
+  Raises:
+    ToolTimeoutError: If the call does not return within `timeout`.
+  """
+  future = asyncio.ensure_future(awaitable)
+  try:
+    done, _ = await asyncio.wait({future}, timeout=timeout)
+  except asyncio.CancelledError:
+    future.cancel()
+    raise
+  if not done:
+    future.cancel()
+    await asyncio.wait({future})
+    raise ToolTimeoutError(f'The tool call timed out after {timeout} seconds.')
+  return future.result()
+
+
+class ToolPoolStats(BaseModel):
+  """Statistics of a pool of workers running tools."""
+
+  max_workers: int
+  """The number of workers of the pool."""
+  submitted: int = 0
+  """The number of calls submitted to the pool."""
+  in_flight: int = 0
+  """The number of calls submitted and not finished, including the calls
+  waiting for a free worker and the calls that timed out but still run."""
+  timed_out: int = 0
+  """The number of calls whose caller stopped waiting after their timeout."""
+
+  @property
+  def saturation(self) -> float:
+    """The number of calls in flight per worker.
+
+    Calls are queued for a free worker once it exceeds 1.
+    """
+    return self.in_flight / self.max_workers
+
+
+class ToolExecutorStats(BaseModel):
+  """Statistics of a `ToolExecutor`."""
+
+  thread_pool: ToolPoolStats
+  process_pool: ToolPoolStats
+
+
+class ToolExecutor:
+  """Runs synchronous tool functions on pools of workers.
+
+  Workers are started on demand. Calls to the thread pool run in a copy of the
+  caller's context, so that tracing spans and other context variables carry
+  over.
+  """
+
+  def __init__(
+      self,
+      *,
+      max_workers: Optional[int] = None,
+      max_process_workers: Optional[int] = None,
+  ):
+    """
+    Args:
+      max_workers: The number of worker threads. Defaults to the default of
+        `ThreadPoolExecutor`.
+      max_process_workers: The number of worker processes for CPU-bound tools.
+        Defaults to the number of processors.
+    """
+    if max_workers is None:
+      # The default of ThreadPoolExecutor.
+      max_workers = min(32, (os.cpu_count() or 1) + 4)
+    if max_process_workers is None:
+      max_process_workers = os.cpu_count() or 1
+    self._thread_pool = concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix='adk-tool'
+    )
+    self._process_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+    self._max_process_workers = max_process_workers
+    self._lock = threading.Lock()
+    self._thread_pool_stats = ToolPoolStats(max_workers=max_workers)
+    self._process_pool_stats = ToolPoolStats(max_workers=max_process_workers)
+
+  async def run(
+      self,
+      func: Callable[..., Any],
+      /,
+      *args: Any,
+      timeout: Optional[float] = None,
+      cpu_bound: bool = False,
+      **kwargs: Any,
+  ) -> Any:
+    """Runs a function on a worker and returns its result.
+
+    Args:
+      func: The function to run. Functions run on worker processes, and their
+        arguments and results, must be picklable.
+      *args: The positional arguments of the function.
+      timeout: The maximum number of seconds to wait for the result, or None
+        to wait until the function returns. The function keeps running after a
+        timeout, since threads cannot be interrupted.
+      cpu_bound: Whether to run the function on a worker process, so that it
+        does not hold the GIL of the serving process.
+      **kwargs: The keyword arguments of the function.
+
+    Returns:
+      The result of the function.
+
+    Raises:
+      ToolTimeoutError: If the function does not return within `timeout`.
+    """
+    if cpu_bound:
+      pool = self._get_process_pool()
+      stats = self._process_pool_stats
+      call = functools.partial(func, *args, **kwargs)
+    else:
+      pool = self._thread_pool
+      stats = self._thread_pool_stats
+      call = functools.partial(
+          contextvars.copy_context().run, func, *args, **kwargs
+      )
+    with self._lock:
+      future = pool.submit(call)
+      stats.submitted += 1
+      stats.in_flight += 1
+    future.add_done_callback(functools.partial(self._on_done, stats))
+    try:
+      return await wait_for_tool(asyncio.wrap_future(future), timeout)
+    except ToolTimeoutError:
+      with self._lock:
+        stats.timed_out += 1
+      raise
+
+  def stats(self) -> ToolExecutorStats:
+    """Returns a snapshot of the statistics of the pools."""
+    with self._lock:
+      return ToolExecutorStats(
+          thread_pool=self._thread_pool_stats.model_copy(),
+          process_pool=self._process_pool_stats.model_copy(),
+      )
+
+  def shutdown(self, wait: bool = True):
+    """Shuts down the pools, waiting for the running calls if `wait`."""
+    self._thread_pool.shutdown(wait=wait)
+    if self._process_pool:
+      self._process_pool.shutdown(wait=wait)
+
+  def _get_process_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+    with self._lock:
+      if self._process_pool is None:
+        self._process_pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self._max_process_workers
+        )
+      return self._process_pool
+
+  def _on_done(self, stats: ToolPoolStats, _: concurrent.futures.Future):
+    with self._lock:
+      stats.in_flight -= 1
+
+
+_default_tool_executor: Optional[ToolExecutor] = None
+_default_tool_executor_lock = threading.Lock()
+
+
+def get_default_tool_executor() -> ToolExecutor:
+  """Returns the executor of synchronous tools, creating it if needed."""
+  global _default_tool_executor
+  with _default_tool_executor_lock:
+    if _default_tool_executor is None:
+      _default_tool_executor = ToolExecutor()
+    return _default_tool_executor
+
+
+def set_default_tool_executor(executor: ToolExecutor):
+  """Sets the executor of synchronous tools, e.g. to resize its pools."""
+  global _default_tool_executor
+  with _default_tool_executor_lock:
+    _default_tool_executor = executor
@@ -0,0 +1,119 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmarks the encodings of persisted event payloads.
+
+Compares the legacy pickled actions, the JSON columns and the msgpack codec
+with and without zstd compression, on encode/decode time and row size.
+
+Usage:
+  python tests/benchmarks/event_codec_benchmark.py [num_events]
+"""
+
+import json
+import pickle
+import sys
+import timeit
+
+from google.adk.events import Event
+from google.adk.events import EventActions
+from google.adk.sessions import MsgpackEventCodec
+from google.genai import types
+
+
+def _make_events(num_events: int) -> list[Event]:
+  events = []
+  for i in range(num_events):
+    events.append(
+        Event(
+            invocation_id=f'invocation{i // 10}',
+            author='agent',
+            content=types.Content(
+                role='model',
+                parts=[
+                    types.Part(text=f'message number {i} ' * 20),
+                    types.Part.from_function_call(
+                        name='lookup', args={'query': f'q{i}', 'limit': 10}
+                    ),
+                ],
+            ),
+            actions=EventActions(
+                state_delta={'counter': i, 'history': list(range(20))},
+                artifact_delta={f'file{i}': 0},
+            ),
+        )
+    )
+  return events
+
+
+def _payload(event: Event, mode: str) -> dict:
+  return {
+      'content': event.content.model_dump(mode=mode, exclude_none=True),
+      'actions': event.actions.model_dump(mode=mode, exclude_none=True),
+  }
+
+
+def _legacy_encode(event: Event) -> bytes:
+  content = json.dumps(
+      event.content.model_dump(mode='json', exclude_none=True)
+  ).encode()
+  return content + pickle.dumps(event.actions)
+
+
+def _json_encode(event: Event) -> bytes:
+  return json.dumps(_payload(event, 'json')).encode()
+
+
+def _bench(label: str, events: list[Event], encode, decode):
+  encoded = [encode(event) for event in events]
+  encode_seconds = timeit.timeit(
+      lambda: [encode(event) for event in events], number=5
+  )
+  decode_seconds = timeit.timeit(
+      lambda: [decode(data) for data in encoded], number=5
+  )
+  per_event = 1_000_000 / (5 * len(events))
+  size = sum(len(data) for data in encoded) / len(events)
+  print(
+      f'{label:<20} encode {encode_seconds * per_event:8.2f} us'
+      f'  decode {decode_seconds * per_event:8.2f} us'
+      f'  size {size:8.1f} B'
+  )
+
+
+def main(num_events: int = 2_000):
+  events = _make_events(num_events)
+  print(f'Event payload encodings over {num_events} events (per event)')
+  _bench(
+      'pickle (legacy)',
+      events,
+      _legacy_encode,
+      # Only the pickled actions are decoded, content is read as JSON.
+      lambda data: pickle.loads(data[data.index(b'\x80') :]),
+  )
+  _bench('json', events, _json_encode, json.loads)
+  for label, codec in (
+      ('msgpack', MsgpackEventCodec(compression_level=None)),
+      ('msgpack+zstd', MsgpackEventCodec(min_compress_size=0)),
+  ):
+    _bench(
+        label,
+        events,
+        lambda event, codec=codec: codec.encode(_payload(event, 'python')),
+        codec.decode,
+    )
+
+
+if __name__ == '__main__':
+  main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000)
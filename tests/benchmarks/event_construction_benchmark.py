@@ -0,0 +1,150 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmarks the construction of events on the streaming hot path.
+
+Compares the dump and validation round trips with the fast paths, for the
+events of model response chunks, merged parallel function responses and event
+ids.
+
+Usage:
+  python tests/benchmarks/event_construction_benchmark.py [num_events]
+"""
+
+import random
+import string
+import sys
+import timeit
+
+from google.adk.events import Event
+from google.adk.events import EventActions
+from google.adk.flows.llm_flows.functions import merge_parallel_function_response_events
+from google.adk.models import LlmResponse
+from google.genai import types
+
+
+def _make_chunks(num_events: int) -> list[LlmResponse]:
+  return [
+      LlmResponse(
+          content=types.Content(
+              role='model', parts=[types.Part(text=f'chunk {i} ' * 10)]
+          ),
+          partial=True,
+      )
+      for i in range(num_events)
+  ]
+
+
+def _make_function_response_events(num_calls: int) -> list[Event]:
+  return [
+      Event(
+          invocation_id='invocation',
+          author='agent',
+          content=types.Content(
+              role='user',
+              parts=[
+                  types.Part.from_function_response(
+                      name='lookup', response={'result': list(range(20))}
+                  )
+              ],
+          ),
+          actions=EventActions(state_delta={f'call{i}': i}),
+      )
+      for i in range(num_calls)
+  ]
+
+
+def _legacy_finalize(event: Event, llm_response: LlmResponse) -> Event:
+  return Event.model_validate({
+      **event.model_dump(exclude_none=True),
+      **llm_response.model_dump(exclude_none=True),
+  })
+
+
+def _legacy_merge(events: list[Event]) -> Event:
+  merged_actions = EventActions()
+  merged_requested_auth_configs = {}
+  for event in events:
+    merged_requested_auth_configs.update(event.actions.requested_auth_configs)
+    merged_actions = merged_actions.model_copy(
+        update=event.actions.model_dump()
+    )
+  merged_actions.requested_auth_configs = merged_requested_auth_configs
+  merged_event = Event(
+      invocation_id=Event.new_id(),
+      author=events[0].author,
+      branch=events[0].branch,
+      content=types.Content(
+          role='user',
+          parts=[part for event in events for part in event.content.parts],
+      ),
+      actions=merged_actions,
+  )
+  merged_event.timestamp = events[0].timestamp
+  return merged_event
+
+
+def _legacy_new_id() -> str:
+  characters = string.ascii_letters + string.digits
+  return ''.join(random.choice(characters) for _ in range(8))
+
+
+def _bench(label: str, number: int, legacy, fast):
+  legacy_seconds = timeit.timeit(legacy, number=5)
+  fast_seconds = timeit.timeit(fast, number=5)
+  per_item = 1_000_000 / (5 * number)
+  print(
+      f'{label:<28} legacy {legacy_seconds * per_item:8.2f} us'
+      f'  fast {fast_seconds * per_item:8.2f} us'
+      f'  speedup {legacy_seconds / fast_seconds:5.1f}x'
+  )
+
+
+def main(num_events: int = 2_000):
+  print(f'Event construction over {num_events} events (per event)')
+  template = Event(
+      invocation_id='invocation', author='agent', branch='root.agent'
+  )
+  chunks = _make_chunks(num_events)
+  _bench(
+      'model response chunk',
+      num_events,
+      lambda: [_legacy_finalize(template, chunk) for chunk in chunks],
+      lambda: [template._merge_llm_response(chunk) for chunk in chunks],
+  )
+
+  num_merges = max(num_events // 4, 1)
+  function_response_events = _make_function_response_events(4)
+  _bench(
+      'parallel function responses',
+      num_merges,
+      lambda: [
+          _legacy_merge(function_response_events) for _ in range(num_merges)
+      ],
+      lambda: [
+          merge_parallel_function_response_events(function_response_events)
+          for _ in range(num_merges)
+      ],
+  )
+
+  _bench(
+      'event id',
+      num_events,
+      lambda: [_legacy_new_id() for _ in range(num_events)],
+      lambda: [Event.new_id() for _ in range(num_events)],
+  )
+
+
+if __name__ == '__main__':
+  main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000)
@@ -0,0 +1,91 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmarks InMemorySessionService reads of a long session.
+
+Usage:
+  python tests/benchmarks/in_memory_session_benchmark.py [num_events]
+"""
+
+import sys
+import timeit
+
+from google.adk.events import Event
+from google.adk.events import EventActions
+from google.adk.sessions import InMemorySessionService
+from google.adk.sessions.base_session_service import GetSessionConfig
+from google.genai import types
+
+_APP_NAME = 'benchmark_app'
+_USER_ID = 'user'
+
+
+def _populate(session_service: InMemorySessionService, num_events: int) -> str:
+  session = session_service.create_session(app_name=_APP_NAME, user_id=_USER_ID)
+  for i in range(num_events):
+    session_service.append_event(
+        session=session,
+        event=Event(
+            invocation_id=f'invocation{i // 10}',
+            author='user' if i % 2 == 0 else 'agent',
+            content=types.Content(
+                role='user' if i % 2 == 0 else 'model',
+                parts=[types.Part(text=f'message number {i} ' * 8)],
+            ),
+            actions=EventActions(state_delta={'counter': i}),
+        ),
+    )
+  return session.id
+
+
+def _bench(label: str, fn, number: int):
+  seconds = timeit.timeit(fn, number=number) / number
+  print(f'{label:<40} {seconds * 1000:10.3f} ms')
+
+
+def main(num_events: int = 10_000):
+  print(f'InMemorySessionService with {num_events} events')
+  for snapshot_mode in ('deep_copy', 'shared'):
+    session_service = InMemorySessionService(snapshot_mode=snapshot_mode)
+    session_id = _populate(session_service, num_events)
+    number = 5 if snapshot_mode == 'deep_copy' else 200
+
+    _bench(
+        f'[{snapshot_mode}] get_session',
+        lambda: session_service.get_session(
+            app_name=_APP_NAME, user_id=_USER_ID, session_id=session_id
+        ),
+        number,
+    )
+    _bench(
+        f'[{snapshot_mode}] get_session (last 20)',
+        lambda: session_service.get_session(
+            app_name=_APP_NAME,
+            user_id=_USER_ID,
+            session_id=session_id,
+            config=GetSessionConfig(num_recent_events=20),
+        ),
+        200,
+    )
+    _bench(
+        f'[{snapshot_mode}] list_sessions',
+        lambda: session_service.list_sessions(
+            app_name=_APP_NAME, user_id=_USER_ID
+        ),
+        200,
+    )
+
+
+if __name__ == '__main__':
+  main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -75,6 +75,26 @@ def test_canonical_model_inherit():
   assert sub_agent.canonical_model == parent_agent.canonical_model
 
 
+def test_canonical_tools_cached():
+  def tool_1():
+    pass
+
+  def tool_2():
+    pass
+
+  agent = LlmAgent(name='test_agent', tools=[tool_1])
+  canonical_tools = agent.canonical_tools
+
+  assert [tool.name for tool in canonical_tools] == ['tool_1']
+  assert agent.canonical_tools[0] is canonical_tools[0]
+
+  agent.tools.append(tool_2)
+  assert [tool.name for tool in agent.canonical_tools] == ['tool_1', 'tool_2']
+
+  agent.tools = [tool_2]
+  assert [tool.name for tool in agent.canonical_tools] == ['tool_2']
+
+
 def test_canonical_instruction_str():
   agent = LlmAgent(name='test_agent', instruction='instruction')
   ctx = _create_readonly_context(agent)
@@ -0,0 +1,92 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from click.testing import CliRunner
+from google.adk.cli.cli_tools_click import main
+from google.adk.events import Event
+from google.adk.sessions import DatabaseSessionService
+
+
+def test_sessions_export_import(tmp_path):
+  source_db_url = f'sqlite:///{tmp_path / "source.db"}'
+  session_service = DatabaseSessionService(source_db_url)
+  for i in range(3):
+    session = session_service.create_session(
+        app_name='my_app', user_id='user', session_id=f'session{i}'
+    )
+    session_service.append_event(
+        session, Event(invocation_id='invocation', author='user')
+    )
+  output_path = str(tmp_path / 'sessions.jsonl')
+
+  runner = CliRunner()
+  result = runner.invoke(
+      main,
+      [
+          'sessions',
+          'export',
+          f'--session_db_url={source_db_url}',
+          '--app_name=my_app',
+          '--user_id=user',
+          '--batch_size=2',
+          output_path,
+      ],
+  )
+  assert result.exit_code == 0, result.output
+  assert '--cursor=' in result.output
+
+  target_db_url = f'sqlite:///{tmp_path / "target.db"}'
+  result = runner.invoke(
+      main,
+      [
+          'sessions',
+          'import',
+          f'--session_db_url={target_db_url}',
+          output_path,
+      ],
+  )
+  assert result.exit_code == 0, result.output
+  assert 'Imported 6 records' in result.output
+
+  imported_sessions = DatabaseSessionService(target_db_url).list_sessions(
+      app_name='my_app', user_id='user'
+  )
+  assert [s.id for s in imported_sessions.sessions] == [
+      'session0',
+      'session1',
+      'session2',
+  ]
+
+
+def test_sessions_export_all_users(tmp_path):
+  session_db_url = f'sqlite:///{tmp_path / "sessions.db"}'
+  session_service = DatabaseSessionService(session_db_url)
+  for user_id in ('user0', 'user1'):
+    session_service.create_session(app_name='my_app', user_id=user_id)
+  output_path = str(tmp_path / 'sessions.jsonl')
+
+  result = CliRunner().invoke(
+      main,
+      [
+          'sessions',
+          'export',
+          f'--session_db_url={session_db_url}',
+          '--app_name=my_app',
+          output_path,
+      ],
+  )
+  assert result.exit_code == 0, result.output
+  assert 'Exported the sessions of my_app' in result.output
+  with open(output_path, encoding='utf-8') as f:
+    assert f.read().count('"kind": "session"') == 2
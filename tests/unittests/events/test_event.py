@@ -0,0 +1,59 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pickle
+import string
+
+from google.adk.events import Event
+from google.adk.events import EventActions
+from google.adk.models import LlmResponse
+from google.genai import types
+
+
+def test_new_id():
+  ids = {Event.new_id() for _ in range(100)}
+
+  assert len(ids) == 100
+  for event_id in ids:
+    assert len(event_id) == 8
+    assert set(event_id) <= set(string.ascii_letters + string.digits)
+
+
+def test_merge_llm_response_matches_validation():
+  event = Event(
+      invocation_id='invocation',
+      author='agent',
+      branch='root.agent',
+      actions=EventActions(state_delta={'key': 'value'}),
+  )
+  llm_response = LlmResponse(
+      content=types.Content(role='model', parts=[types.Part(text='hello')]),
+      partial=True,
+      custom_metadata={'step': 1},
+  )
+
+  merged = event._merge_llm_response(llm_response)
+  validated = Event.model_validate({
+      **event.model_dump(exclude_none=True),
+      **llm_response.model_dump(exclude_none=True),
+  })
+
+  assert merged == validated
+  assert merged.model_fields_set == validated.model_fields_set
+  assert merged.id == event.id
+  assert merged.content is llm_response.content
+  merged.actions.state_delta['key'] = 'changed'
+  assert event.actions.state_delta == {'key': 'value'}
+  # Copies of the event must keep working.
+  assert pickle.loads(pickle.dumps(merged)) == merged
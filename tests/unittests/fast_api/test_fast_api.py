@@ -23,6 +23,7 @@ from typing import AsyncGenerator
 from google.adk.agents import BaseAgent
 from google.adk.agents import LiveRequest
 from google.adk.agents.run_config import RunConfig
+from google.adk.cli.fast_api import _ClosingStreamingResponse
 from google.adk.cli.fast_api import AgentRunRequest
 from google.adk.cli.fast_api import get_fast_api_app
 from google.adk.cli.utils import envs
@@ -31,6 +32,7 @@ from google.adk.runners import Runner
 from google.genai import types
 import httpx
 import pytest
+from starlette.requests import ClientDisconnect
 from uvicorn.main import run as uvicorn_run
 import websockets
 
@@ -219,6 +221,35 @@ async def test_sse_endpoint():
       assert event_count == 3  # Expecting 3 events from dummy_run_async
 
 
+@pytest.mark.asyncio
+async def test_streaming_response_closes_generator_on_disconnect():
+  closed = False
+
+  async def event_generator():
+    nonlocal closed
+    try:
+      yield "data: 1\n\n"
+      yield "data: 2\n\n"
+    finally:
+      closed = True
+
+  async def receive():
+    return {"type": "http.disconnect"}
+
+  async def send(message):
+    if message["type"] == "http.response.body":
+      raise OSError("The client disconnected.")
+
+  response = _ClosingStreamingResponse(
+      event_generator(), media_type="text/event-stream"
+  )
+  with pytest.raises(ClientDisconnect):
+    await response(
+        {"type": "http", "asgi": {"spec_version": "2.4"}}, receive, send
+    )
+  assert closed
+
+
 @pytest.mark.asyncio
 async def test_websocket_endpoint():
   base_http_url = "http://127.0.0.1:8000"
@@ -0,0 +1,130 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from google.adk.agents import Agent
+from google.adk.events import Event
+from google.adk.flows.llm_flows import contents
+from google.adk.models import LlmRequest
+from google.genai import types
+import pytest
+
+from ... import utils
+
+
+def _function_call_event(call_id: str) -> Event:
+  return Event(
+      author='root_agent',
+      content=types.Content(
+          role='model',
+          parts=[
+              types.Part(
+                  function_call=types.FunctionCall(
+                      id=call_id, name='tool', args={}
+                  )
+              )
+          ],
+      ),
+  )
+
+
+def _function_response_event(call_id: str) -> Event:
+  return Event(
+      author='root_agent',
+      content=types.Content(
+          role='user',
+          parts=[
+              types.Part(
+                  function_response=types.FunctionResponse(
+                      id=call_id, name='tool', response={'result': call_id}
+                  )
+              )
+          ],
+      ),
+  )
+
+
+def _events() -> list[Event]:
+  return [
+      Event(author='user', content=types.UserContent('hi')),
+      _function_call_event('adk-1'),
+      _function_response_event('adk-1'),
+      Event(author='other_agent', content=types.ModelContent('hello')),
+      _function_call_event('adk-2'),
+      Event(author='root_agent', content=types.ModelContent('waiting')),
+      _function_response_event('adk-2'),
+  ]
+
+
+def test_incremental_build_matches_full_build():
+  events = _events()
+  builder = contents._ContentsBuilder(None, 'root_agent')
+  for i in range(len(events) + 1):
+    assert builder.build(events[:i]) == contents._get_contents(
+        None, events[:i], 'root_agent'
+    )
+
+  built_contents = builder.build(events)
+  # The async function response is moved after its function call.
+  assert [c.role for c in built_contents] == [
+      'user',
+      'model',
+      'user',
+      'user',
+      'model',
+      'user',
+  ]
+  # Client function call ids are removed from the request only.
+  assert built_contents[1].parts[0].function_call.id is None
+  assert events[1].content.parts[0].function_call.id == 'adk-1'
+
+
+def test_build_reuses_normalized_contents():
+  events = _events()
+  builder = contents._ContentsBuilder(None, 'root_agent')
+  first_contents = builder.build(events[:3])
+  first_contents[0].parts.append(types.Part(text='added to the request'))
+  second_contents = builder.build(events)
+
+  assert second_contents[0] is not first_contents[0]
+  assert second_contents[0].parts == [types.Part(text='hi')]
+  assert second_contents[1].parts[0] is first_contents[1].parts[0]
+
+
+def test_build_after_events_are_replaced():
+  events = _events()
+  builder = contents._ContentsBuilder(None, 'root_agent')
+  builder.build(events)
+  compacted_events = [
+      Event(author='user', content=types.UserContent('summary'))
+  ] + events[-3:]
+
+  assert builder.build(compacted_events) == contents._get_contents(
+      None, compacted_events, 'root_agent'
+  )
+
+
+@pytest.mark.asyncio
+async def test_request_processor_caches_builder_per_agent():
+  agent = Agent(model='gemini-1.5-flash', name='root_agent')
+  invocation_context = utils.create_invocation_context(agent, 'hi')
+  llm_request = LlmRequest()
+  async for _ in contents.request_processor.run_async(
+      invocation_context, llm_request
+  ):
+    pass
+
+  assert list(invocation_context._contents_builders) == [
+      (invocation_context.branch, 'root_agent')
+  ]
+  assert utils.simplify_contents(llm_request.contents) == [('user', 'hi')]
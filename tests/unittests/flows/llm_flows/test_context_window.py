@@ -0,0 +1,203 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from google.adk.agents import Agent
+from google.adk.agents import ContextWindowConfig
+from google.adk.agents.context_window import DropToolPayloads
+from google.adk.agents.context_window import estimate_tokens
+from google.adk.agents.context_window import KeepRecentTurns
+from google.adk.agents.context_window import SummarizeEvictedHistory
+from google.genai import types
+import pytest
+
+from ... import utils
+
+
+def _turn(i: int) -> list[types.Content]:
+  """A turn of 19 tokens, with a function call and response."""
+  return [
+      types.UserContent(f'question {i}'.ljust(28)),
+      types.ModelContent([
+          types.Part.from_function_call(name='tool', args={}),
+      ]),
+      types.Content(
+          role='user',
+          parts=[
+              types.Part.from_function_response(
+                  name='tool', response={'result': f'{i}'.ljust(10)}
+              )
+          ],
+      ),
+      types.ModelContent(f'answer {i}'.ljust(16)),
+  ]
+
+
+def _turns(num_turns: int) -> list[types.Content]:
+  return [content for i in range(num_turns) for content in _turn(i)]
+
+
+def _texts(contents: list[types.Content]) -> list[str]:
+  return [
+      part.text.strip()
+      for content in contents
+      for part in content.parts
+      if part.text
+  ]
+
+
+def _invocation_context():
+  agent = Agent(name='root_agent', model=utils.MockModel.create(responses=[]))
+  return utils.create_invocation_context(agent)
+
+
+def test_estimate_tokens():
+  assert [estimate_tokens(content) for content in _turn(0)] == [7, 1, 7, 4]
+  assert (
+      estimate_tokens(
+          types.Content(
+              role='user',
+              parts=[
+                  types.Part.from_bytes(data=b'image', mime_type='image/png')
+              ],
+          )
+      )
+      == 258
+  )
+
+
+@pytest.mark.asyncio
+async def test_keep_recent_turns():
+  contents = _turns(5)
+  kept = await KeepRecentTurns().fit(
+      contents,
+      max_tokens=45,
+      estimate_tokens=estimate_tokens,
+      invocation_context=_invocation_context(),
+  )
+  assert kept == contents[-8:]
+
+  kept = await KeepRecentTurns(max_turns=1).fit(
+      contents,
+      max_tokens=1000,
+      estimate_tokens=estimate_tokens,
+      invocation_context=_invocation_context(),
+  )
+  assert kept == contents[-4:]
+
+  # The last turn is kept even if it does not fit.
+  kept = await KeepRecentTurns().fit(
+      contents,
+      max_tokens=1,
+      estimate_tokens=estimate_tokens,
+      invocation_context=_invocation_context(),
+  )
+  assert kept == contents[-4:]
+
+
+@pytest.mark.asyncio
+async def test_drop_tool_payloads():
+  contents = _turns(3)
+  assert (
+      await DropToolPayloads().fit(
+          contents,
+          max_tokens=1000,
+          estimate_tokens=estimate_tokens,
+          invocation_context=_invocation_context(),
+      )
+      is contents
+  )
+
+  fitted = await DropToolPayloads(placeholder='-').fit(
+      contents,
+      max_tokens=53,
+      estimate_tokens=estimate_tokens,
+      invocation_context=_invocation_context(),
+  )
+  assert len(fitted) == len(contents)
+  assert [c.parts[0].function_response.response for c in fitted[2::4]] == [
+      {'result': '-'},
+      {'result': '-'},
+      {'result': '2'.ljust(10)},
+  ]
+  # The session history is not modified.
+  assert contents[2].parts[0].function_response.response == {
+      'result': '0'.ljust(10)
+  }
+
+
+@pytest.mark.asyncio
+async def test_summarize_evicted_history():
+  summarizer = utils.MockModel.create(responses=['first', 'second'])
+  strategy = SummarizeEvictedHistory(summarizer, target_ratio=0.5)
+  invocation_context = _invocation_context()
+
+  async def fit(contents):
+    return await strategy.fit(
+        contents,
+        max_tokens=60,
+        estimate_tokens=estimate_tokens,
+        invocation_context=invocation_context,
+    )
+
+  contents = _turns(3)
+  assert await fit(contents) is contents
+
+  # The window moves down to half of the budget.
+  contents = _turns(4)
+  fitted = await fit(contents)
+  assert _texts(fitted) == [
+      'Summary of the earlier conversation: first',
+      'question 3',
+      'answer 3',
+  ]
+  assert len(summarizer.requests) == 1
+  assert _texts(summarizer.requests[0].contents)[0].startswith(
+      '[user] question 0'
+  )
+
+  # The window stays put while the contents fit.
+  contents = _turns(5)
+  assert (await fit(contents))[0] == fitted[0]
+  assert len(summarizer.requests) == 1
+
+  # The newly evicted turns are summarized with the previous summary.
+  contents = _turns(6)
+  fitted = await fit(contents)
+  assert _texts(fitted)[0] == 'Summary of the earlier conversation: second'
+  assert len(summarizer.requests) == 2
+  transcript = _texts(summarizer.requests[1].contents)[0]
+  assert transcript.startswith('[user] Summary of the earlier conversation:')
+  assert 'question 3' in transcript
+  assert 'question 0' not in transcript
+
+
+def test_agent_with_context_window():
+  responses = [f'answer {i}' for i in range(4)]
+  mock_model = utils.MockModel.create(responses=responses)
+  agent = Agent(
+      name='root_agent',
+      model=mock_model,
+      context_window=ContextWindowConfig(
+          max_tokens=10, strategy=KeepRecentTurns()
+      ),
+  )
+  runner = utils.InMemoryRunner(agent)
+  for i in range(4):
+    runner.run(f'question {i}')
+
+  assert utils.simplify_contents(mock_model.requests[-1].contents) == [
+      ('user', 'question 2'),
+      ('model', 'answer 2'),
+      ('user', 'question 3'),
+  ]
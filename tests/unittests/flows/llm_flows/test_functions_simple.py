@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 from typing import Any
 from typing import AsyncGenerator
 from typing import Callable
@@ -217,6 +218,54 @@ async def test_function_tool():
   assert function_called == 3
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    'max_concurrent_tool_calls, is_reentrant, expected_max_running',
+    [(10, True, 3), (2, True, 2), (10, False, 1), (1, True, 1)],
+)
+async def test_parallel_function_calls(
+    max_concurrent_tool_calls, is_reentrant, expected_max_running
+):
+  function_calls = [
+      types.Part.from_function_call(name='fetch', args={'x': x})
+      # The last call finishes first.
+      for x in (3, 2, 1)
+  ]
+  function_responses = [
+      types.Part.from_function_response(name='fetch', response={'result': x})
+      for x in (3, 2, 1)
+  ]
+  mock_model = utils.MockModel.create(responses=[function_calls, 'response1'])
+  running = 0
+  max_running = 0
+
+  async def fetch(x: int) -> int:
+    nonlocal running, max_running
+    running += 1
+    max_running = max(max_running, running)
+    await asyncio.sleep(x * 0.01)
+    running -= 1
+    return x
+
+  tool = FunctionTool(func=fetch)
+  tool.is_reentrant = is_reentrant
+  agent = Agent(
+      name='root_agent',
+      model=mock_model,
+      tools=[tool],
+      max_concurrent_tool_calls=max_concurrent_tool_calls,
+  )
+  runner = utils.TestInMemoryRunner(agent)
+  events = await runner.run_async_with_new_session('test')
+
+  assert utils.simplify_events(events) == [
+      ('root_agent', function_calls),
+      ('root_agent', function_responses),
+      ('root_agent', 'response1'),
+  ]
+  assert max_running == expected_max_running
+
+
 def test_update_state():
   mock_model = utils.MockModel.create(
       responses=[
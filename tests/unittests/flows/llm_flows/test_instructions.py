@@ -14,6 +14,8 @@
 
 from google.adk.agents import Agent
 from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.events import Event
+from google.adk.events import EventActions
 from google.adk.flows.llm_flows import instructions
 from google.adk.models import LlmRequest
 from google.adk.sessions import Session
@@ -162,3 +164,115 @@ async def test_build_system_instruction_with_namespace():
   assert request.config.system_instruction == (
       """Use the echo_info tool to echo 1234567890, app_value, user_value, {a:key}."""
   )
+
+
+@pytest.mark.asyncio
+async def test_rendered_instruction_cached_until_dependencies_change(
+    monkeypatch,
+):
+  agent = Agent(
+      model="gemini-1.5-flash",
+      name="agent",
+      instruction="Customer {customerId} uploaded {artifact.file.txt}.",
+  )
+  invocation_context = utils.create_invocation_context(agent=agent)
+  session = invocation_context.session
+  session.state["customerId"] = "1234567890"
+  artifact_service = invocation_context.artifact_service
+  artifact_service.save_artifact(
+      app_name=session.app_name,
+      user_id=session.user_id,
+      session_id=session.id,
+      filename="file.txt",
+      artifact=types.Part.from_text(text="v0"),
+  )
+  loaded_filenames = []
+  load_artifact = type(artifact_service).load_artifact
+
+  def load_artifact_and_count(self, **kwargs):
+    loaded_filenames.append(kwargs["filename"])
+    return load_artifact(self, **kwargs)
+
+  monkeypatch.setattr(
+      type(artifact_service), "load_artifact", load_artifact_and_count
+  )
+
+  async def build_system_instruction():
+    request = LlmRequest(
+        model="gemini-1.5-flash",
+        config=types.GenerateContentConfig(system_instruction=""),
+    )
+    async for _ in instructions.request_processor.run_async(
+        invocation_context, request
+    ):
+      pass
+    return request.config.system_instruction
+
+  first = await build_system_instruction()
+  assert "Customer 1234567890 uploaded" in first
+  assert await build_system_instruction() == first
+  assert loaded_filenames == ["file.txt"]
+
+  # Unrelated state changes do not render the instruction again.
+  invocation_context.session_service.append_event(
+      session,
+      Event(
+          author="agent",
+          invocation_id="test_id",
+          actions=EventActions(state_delta={"other": 1}),
+      ),
+  )
+  assert await build_system_instruction() == first
+  assert loaded_filenames == ["file.txt"]
+
+  # A new artifact version does.
+  artifact_service.save_artifact(
+      app_name=session.app_name,
+      user_id=session.user_id,
+      session_id=session.id,
+      filename="file.txt",
+      artifact=types.Part.from_text(text="v1"),
+  )
+  invocation_context.session_service.append_event(
+      session,
+      Event(
+          author="agent",
+          invocation_id="test_id",
+          actions=EventActions(artifact_delta={"file.txt": 1}),
+      ),
+  )
+  assert "v1" in await build_system_instruction()
+  assert loaded_filenames == ["file.txt", "file.txt"]
+
+  # So does a change of a state key.
+  session.state["customerId"] = "42"
+  assert "Customer 42 uploaded" in await build_system_instruction()
+  assert loaded_filenames == ["file.txt", "file.txt", "file.txt"]
+
+
+@pytest.mark.asyncio
+async def test_rendered_instruction_invalidated_by_in_place_mutation():
+  agent = Agent(
+      model="gemini-1.5-flash",
+      name="agent",
+      instruction="Items: {items}",
+  )
+  invocation_context = utils.create_invocation_context(agent=agent)
+  invocation_context.session.state["items"] = ["a"]
+
+  async def build_system_instruction():
+    request = LlmRequest(
+        model="gemini-1.5-flash",
+        config=types.GenerateContentConfig(system_instruction=""),
+    )
+    async for _ in instructions.request_processor.run_async(
+        invocation_context, request
+    ):
+      pass
+    return request.config.system_instruction
+
+  assert await build_system_instruction() == "Items: ['a']"
+
+  # The list is modified in place, without a new event.
+  invocation_context.session.state["items"].append("b")
+  assert await build_system_instruction() == "Items: ['a', 'b']"
@@ -0,0 +1,168 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+
+from google.adk.agents import Agent
+from google.adk.examples import BaseExampleProvider
+from google.adk.examples import Example
+from google.adk.flows.llm_flows.single_flow import SingleFlow
+from google.adk.memory import InMemoryMemoryService
+from google.adk.models import LlmRequest
+from google.adk.tools import BaseTool
+from google.adk.tools import ExampleTool
+from google.adk.tools import FunctionTool
+from google.adk.tools import preload_memory
+from google.adk.tools import ToolContext
+import pytest
+
+from ... import utils
+
+
+class _InstructionTool(BaseTool):
+  """Appends an instruction after a delay."""
+
+  def __init__(self, name: str, delay: float, running: list[str]):
+    super().__init__(name=name, description=name)
+    self.delay = delay
+    self.running = running
+    self.max_running = 0
+
+  async def process_llm_request(
+      self, *, tool_context: ToolContext, llm_request: LlmRequest
+  ) -> None:
+    self.running.append(self.name)
+    self.max_running = max(self.max_running, len(self.running))
+    await asyncio.sleep(self.delay)
+    self.running.remove(self.name)
+    llm_request.append_instructions([f'instruction of {self.name}'])
+
+
+class _IndependentInstructionTool(_InstructionTool):
+  is_independent = True
+
+
+def greet(name: str) -> str:
+  """Greets someone."""
+  return f'Hello {name}'
+
+
+def lookup(query: str) -> str:
+  """Looks up the query."""
+  return query
+
+
+class _IndependentFunctionTool(FunctionTool):
+  is_independent = True
+
+
+class _BarrierMemoryService(InMemoryMemoryService):
+  """Blocks the memory search until the barrier is passed."""
+
+  def __init__(self, barrier: threading.Barrier):
+    super().__init__()
+    self.barrier = barrier
+
+  def search_memory(self, *, app_name: str, user_id: str, query: str):
+    self.barrier.wait()
+    return super().search_memory(
+        app_name=app_name, user_id=user_id, query=query
+    )
+
+
+class _BarrierExampleProvider(BaseExampleProvider):
+  """Blocks the example lookup until the barrier is passed."""
+
+  def __init__(self, barrier: threading.Barrier):
+    self.barrier = barrier
+
+  def get_examples(self, query: str) -> list[Example]:
+    self.barrier.wait()
+    return []
+
+
+async def _preprocess(agent: Agent, memory_service=None) -> LlmRequest:
+  invocation_context = utils.create_invocation_context(agent, 'hi')
+  if memory_service:
+    invocation_context.memory_service = memory_service
+  llm_request = LlmRequest()
+  async for _ in SingleFlow()._preprocess_async(
+      invocation_context, llm_request
+  ):
+    pass
+  return llm_request
+
+
+@pytest.mark.asyncio
+async def test_independent_tools_run_concurrently_in_order():
+  running = []
+  tools = [
+      _IndependentInstructionTool('first', 0.05, running),
+      _IndependentInstructionTool('second', 0, running),
+      _InstructionTool('third', 0, running),
+      _IndependentInstructionTool('fourth', 0, running),
+  ]
+  agent = Agent(
+      name='root_agent',
+      model=utils.MockModel.create(responses=[]),
+      instruction='agent instruction',
+      tools=tools,
+  )
+
+  llm_request = await _preprocess(agent)
+
+  assert tools[1].max_running == 2
+  assert tools[2].max_running == 1
+  assert llm_request.config.system_instruction.split('\n\n')[-4:] == [
+      'instruction of first',
+      'instruction of second',
+      'instruction of third',
+      'instruction of fourth',
+  ]
+
+
+@pytest.mark.asyncio
+async def test_independent_tools_merge_function_declarations():
+  agent = Agent(
+      name='root_agent',
+      model=utils.MockModel.create(responses=[]),
+      tools=[FunctionTool(greet), _IndependentFunctionTool(lookup)],
+  )
+
+  llm_request = await _preprocess(agent)
+
+  assert len(llm_request.config.tools) == 1
+  assert [
+      declaration.name
+      for declaration in llm_request.config.tools[0].function_declarations
+  ] == ['greet', 'lookup']
+  assert list(llm_request.tools_dict) == ['greet', 'lookup']
+
+
+@pytest.mark.asyncio
+async def test_preload_memory_and_example_tools_run_concurrently():
+  # Both tools block until the other one runs too, so a sequential run breaks
+  # the barrier once it times out.
+  barrier = threading.Barrier(2, timeout=5)
+  agent = Agent(
+      name='root_agent',
+      model=utils.MockModel.create(responses=[]),
+      tools=[preload_memory, ExampleTool(_BarrierExampleProvider(barrier))],
+  )
+
+  llm_request = await _preprocess(agent, _BarrierMemoryService(barrier))
+
+  assert not barrier.broken
+  assert llm_request.config.system_instruction is not None
@@ -0,0 +1,165 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import AsyncGenerator
+from typing import Optional
+
+from google.adk.models import BaseLlm
+from google.adk.models import CachingLlm
+from google.adk.models import InMemoryLlmResponseCache
+from google.adk.models import LlmRequest
+from google.adk.models import LlmResponse
+from google.adk.models import SqliteLlmResponseCache
+from google.genai import types
+import pytest
+
+
+class _CountingLlm(BaseLlm):
+  """Answers with the number of calls, in two chunks when streaming."""
+
+  model: str = 'counting'
+  calls: int = 0
+  error_code: Optional[str] = None
+
+  async def generate_content_async(
+      self, llm_request: LlmRequest, stream: bool = False
+  ) -> AsyncGenerator[LlmResponse, None]:
+    self.calls += 1
+    if stream:
+      yield LlmResponse(
+          content=types.ModelContent(f'call {self.calls}'), partial=True
+      )
+    yield LlmResponse(
+        content=types.ModelContent(f'call {self.calls}'),
+        error_code=self.error_code,
+    )
+
+
+def _request(text: str = 'hi') -> LlmRequest:
+  return LlmRequest(
+      contents=[types.UserContent(text)],
+      config=types.GenerateContentConfig(system_instruction='Be brief.'),
+  )
+
+
+async def _generate(
+    llm: BaseLlm, llm_request: LlmRequest, stream: bool = False
+) -> list[tuple[str, bool]]:
+  return [
+      (llm_response.content.parts[0].text, bool(llm_response.partial))
+      async for llm_response in llm.generate_content_async(
+          llm_request, stream=stream
+      )
+  ]
+
+
+@pytest.mark.asyncio
+async def test_replays_identical_requests():
+  llm = CachingLlm(llm=_CountingLlm())
+
+  assert llm.model == 'counting'
+  assert await _generate(llm, _request()) == [('call 1', False)]
+  assert await _generate(llm, _request()) == [('call 1', False)]
+  assert await _generate(llm, _request('hello')) == [('call 2', False)]
+  assert (llm.hits, llm.misses) == (1, 2)
+
+  # Streamed responses are cached separately, chunk by chunk.
+  assert await _generate(llm, _request(), stream=True) == [
+      ('call 3', True),
+      ('call 3', False),
+  ]
+  assert await _generate(llm, _request(), stream=True) == [
+      ('call 3', True),
+      ('call 3', False),
+  ]
+  assert llm.llm.calls == 3
+
+
+def test_key_includes_tool_declarations():
+  llm = CachingLlm(llm=_CountingLlm())
+  llm_request = _request()
+  llm_request.config.tools = [
+      types.Tool(
+          function_declarations=[types.FunctionDeclaration(name='lookup')]
+      )
+  ]
+
+  assert llm._request_key(llm_request, False) != llm._request_key(
+      _request(), False
+  )
+  assert llm._request_key(llm_request, False) == llm._request_key(
+      llm_request.model_copy(deep=True), False
+  )
+
+
+@pytest.mark.asyncio
+async def test_bypass_errors_and_ttl():
+  llm = CachingLlm(llm=_CountingLlm())
+  llm_request = _request()
+  llm_request.bypass_cache = True
+  assert await _generate(llm, llm_request) == [('call 1', False)]
+  assert await _generate(llm, _request()) == [('call 2', False)]
+
+  llm.llm.error_code = 'RESOURCE_EXHAUSTED'
+  assert await _generate(llm, _request('error')) == [('call 3', False)]
+  assert await _generate(llm, _request('error')) == [('call 4', False)]
+
+  llm = CachingLlm(llm=_CountingLlm(), ttl=0)
+  assert await _generate(llm, _request()) == [('call 1', False)]
+  assert await _generate(llm, _request()) == [('call 2', False)]
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_evicts_least_recently_used():
+  cache = InMemoryLlmResponseCache(max_entries=2)
+  response = LlmResponse(content=types.ModelContent('hello'))
+  await cache.put('a', [response])
+  await cache.put('b', [response])
+  await cache.get('a')
+  await cache.put('c', [response])
+
+  assert await cache.get('a') == [response]
+  assert await cache.get('b') is None
+  # Cached responses are copies.
+  (cached,) = await cache.get('c')
+  cached.content.parts[0].text = 'changed'
+  assert await cache.get('c') == [response]
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cache(tmp_path):
+  path = str(tmp_path / 'llm_responses.db')
+  responses = [
+      LlmResponse(content=types.ModelContent('hel'), partial=True),
+      LlmResponse(
+          content=types.ModelContent(
+              [types.Part.from_bytes(data=b'image', mime_type='image/png')]
+          )
+      ),
+  ]
+  cache = SqliteLlmResponseCache(path, max_entries=2)
+  await cache.put('a', responses)
+  await cache.put('b', responses, ttl=0)
+  await cache.put('c', responses)
+  cache.close()
+
+  cache = SqliteLlmResponseCache(path)
+  try:
+    assert await cache.get('a') is None
+    assert await cache.get('b') is None
+    assert [response.model_dump() for response in await cache.get('c')] == [
+        response.model_dump() for response in responses
+    ]
+  finally:
+    cache.close()
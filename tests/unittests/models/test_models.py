@@ -12,7 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import gc
+from typing import Any
+from typing import AsyncGenerator
+import weakref
+
 from google.adk import models
+from google.adk.models import registry
+from google.adk.models import LlmRequest
+from google.adk.models import LlmResponse
+from google.adk.models.base_llm import BaseLlm
 from google.adk.models.anthropic_llm import Claude
 from google.adk.models.google_llm import Gemini
 from google.adk.models.registry import LLMRegistry
@@ -58,3 +68,92 @@ def test_non_exist_model():
   with pytest.raises(ValueError) as e_info:
     models.LLMRegistry.resolve('non-exist-model')
   assert 'Model non-exist-model not found.' in str(e_info.value)
+
+
+def test_get_llm_shares_instances(monkeypatch):
+  llm = LLMRegistry.get_llm('gemini-1.5-flash')
+
+  assert isinstance(llm, Gemini)
+  assert LLMRegistry.get_llm('gemini-1.5-flash') is llm
+  assert LLMRegistry.get_llm('gemini-1.5-pro') is not llm
+  # Instances are not shared across client configurations.
+  monkeypatch.setenv('GOOGLE_CLOUD_LOCATION', 'other-location')
+  assert LLMRegistry.get_llm('gemini-1.5-flash') is not llm
+
+
+@pytest.mark.asyncio
+async def test_get_llm_shares_instances_per_event_loop():
+  llm = LLMRegistry.get_llm('gemini-1.5-flash')
+
+  assert llm is not LLMRegistry.new_llm('gemini-1.5-flash')
+  assert LLMRegistry.get_llm('gemini-1.5-flash') is llm
+  # Outside of the event loop.
+  other_llm = await asyncio.to_thread(LLMRegistry.get_llm, 'gemini-1.5-flash')
+  assert other_llm is not llm
+
+
+class _LoopBoundLlm(BaseLlm):
+  """References the event loop it is created in, like async HTTP clients."""
+
+  loop: Any = None
+
+  @staticmethod
+  def supported_models() -> list[str]:
+    return ['loop-bound-model']
+
+  def model_post_init(self, context: Any):
+    self.loop = asyncio.get_running_loop()
+
+  async def generate_content_async(
+      self, llm_request: LlmRequest, stream: bool = False
+  ) -> AsyncGenerator[LlmResponse, None]:
+    yield LlmResponse()
+
+
+def test_get_llm_drops_event_loop_pools():
+  LLMRegistry.register(_LoopBoundLlm)
+
+  async def get_llm():
+    llm = LLMRegistry.get_llm('loop-bound-model')
+    assert LLMRegistry.get_llm('loop-bound-model') is llm
+    return weakref.ref(asyncio.get_running_loop())
+
+  loop_ref = asyncio.run(get_llm())
+  gc.collect()
+
+  assert loop_ref() is None
+  assert not any(
+      isinstance(llm, _LoopBoundLlm)
+      for pool in registry._loop_llm_pools.values()
+      for llm in pool.values()
+  )
+
+
+def test_get_llm_leaves_no_pending_tasks():
+  LLMRegistry.register(_LoopBoundLlm)
+
+  async def get_llm():
+    LLMRegistry.get_llm('loop-bound-model')
+    return asyncio.all_tasks() - {asyncio.current_task()}
+
+  assert not asyncio.run(get_llm())
+
+
+def test_get_llm_drops_pools_of_closed_event_loops():
+  LLMRegistry.register(_LoopBoundLlm)
+
+  async def get_llm():
+    LLMRegistry.get_llm('loop-bound-model')
+    return weakref.ref(asyncio.get_running_loop())
+
+  # Closed without shutting down its async generators.
+  loop = asyncio.new_event_loop()
+  loop_ref = weakref.ref(loop)
+  loop.run_until_complete(get_llm())
+  loop.close()
+  del loop
+
+  asyncio.run(get_llm())
+  gc.collect()
+
+  assert loop_ref() is None
@@ -0,0 +1,780 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import enum
+import threading
+import time
+
+from google.adk.artifacts import InMemoryArtifactService
+from google.adk.events import Event
+from google.adk.events import EventActions
+from google.adk.sessions import AsyncDatabaseSessionService
+from google.adk.sessions import CompactionConfig
+from google.adk.sessions import DatabaseSessionService
+from google.adk.sessions import EventSummarizer
+from google.adk.sessions import InMemorySessionService
+from google.adk.sessions.base_session_service import BaseSessionService
+from google.adk.sessions.base_session_service import GetSessionConfig
+from google.adk.sessions.blob_offload import is_blob_reference
+from google.adk.sessions.compaction import split_events_for_compaction
+from google.adk.sessions.compaction import summarize_events_async
+from google.adk.sessions.database_session_service import StorageAppState
+from google.adk.sessions.database_session_service import StorageSession
+from google.adk.sessions.database_session_service import StorageStateEntry
+from google.adk.sessions.database_session_service import StorageUserState
+from google.genai import types
+import pytest
+
+
+class SessionServiceType(enum.Enum):
+  IN_MEMORY = 'IN_MEMORY'
+  DATABASE = 'DATABASE'
+  ASYNC_DATABASE = 'ASYNC_DATABASE'
+  DATABASE_PER_KEY = 'DATABASE_PER_KEY'
+  ASYNC_DATABASE_PER_KEY = 'ASYNC_DATABASE_PER_KEY'
+
+
+def get_session_service(
+    service_type: SessionServiceType = SessionServiceType.IN_MEMORY,
+):
+  """Creates a session service for testing."""
+  if service_type == SessionServiceType.DATABASE:
+    return DatabaseSessionService('sqlite:///:memory:')
+  if service_type == SessionServiceType.ASYNC_DATABASE:
+    return AsyncDatabaseSessionService('sqlite+aiosqlite:///:memory:')
+  if service_type == SessionServiceType.DATABASE_PER_KEY:
+    return DatabaseSessionService('sqlite:///:memory:', state_layout='per_key')
+  if service_type == SessionServiceType.ASYNC_DATABASE_PER_KEY:
+    return AsyncDatabaseSessionService(
+        'sqlite+aiosqlite:///:memory:', state_layout='per_key'
+    )
+  return InMemorySessionService()
+
+
+DATABASE_SERVICE_TYPES = [
+    SessionServiceType.DATABASE,
+    SessionServiceType.ASYNC_DATABASE,
+    SessionServiceType.DATABASE_PER_KEY,
+    SessionServiceType.ASYNC_DATABASE_PER_KEY,
+]
+
+ALL_SERVICE_TYPES = [SessionServiceType.IN_MEMORY] + DATABASE_SERVICE_TYPES
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('service_type', ALL_SERVICE_TYPES)
+async def test_get_empty_session(service_type):
+  session_service = get_session_service(service_type)
+  assert not await session_service.get_session_async(
+      app_name='my_app', user_id='test_user', session_id='123'
+  )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('service_type', ALL_SERVICE_TYPES)
+async def test_create_get_delete_session(service_type):
+  session_service = get_session_service(service_type)
+  app_name = 'my_app'
+  user_id = 'test_user'
+  state = {'key': 'value'}
+
+  session = await session_service.create_session_async(
+      app_name=app_name, user_id=user_id, state=state
+  )
+  assert session.app_name == app_name
+  assert session.user_id == user_id
+  assert session.id
+  assert session.state == state
+  assert (
+      await session_service.get_session_async(
+          app_name=app_name, user_id=user_id, session_id=session.id
+      )
+      == session
+  )
+
+  await session_service.delete_session_async(
+      app_name=app_name, user_id=user_id, session_id=session.id
+  )
+  assert not await session_service.get_session_async(
+      app_name=app_name, user_id=user_id, session_id=session.id
+  )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('service_type', ALL_SERVICE_TYPES)
+async def test_list_sessions(service_type):
+  session_service = get_session_service(service_type)
+  app_name = 'my_app'
+  user_id = 'test_user'
+
+  session_ids = ['session' + str(i) for i in range(5)]
+  for session_id in session_ids:
+    await session_service.create_session_async(
+        app_name=app_name, user_id=user_id, session_id=session_id
+    )
+
+  sessions = (
+      await session_service.list_sessions_async(
+          app_name=app_name, user_id=user_id
+      )
+  ).sessions
+  assert sorted(session.id for session in sessions) == session_ids
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('service_type', ALL_SERVICE_TYPES)
+async def test_list_sessions_pagination(service_type):
+  session_service = get_session_service(service_type)
+  for i in range(5):
+    await session_service.create_session_async(
+        app_name='my_app', user_id='user', session_id=f'session{i}'
+    )
+  await session_service.create_session_async(
+      app_name='my_app', user_id='other_user', session_id='session9'
+  )
+
+  pages = []
+  page_token = None
+  while True:
+    response = await session_service.list_sessions_async(
+        app_name='my_app', user_id='user', page_size=2, page_token=page_token
+    )
+    pages.append([session.id for session in response.sessions])
+    page_token = response.next_page_token
+    if not page_token:
+      break
+  assert pages == [
+      ['session0', 'session1'],
+      ['session2', 'session3'],
+      ['session4'],
+  ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('service_type', ALL_SERVICE_TYPES)
+async def test_list_sessions_of_all_users(service_type):
+  session_service = get_session_service(service_type)
+  for user_id in ('user_b', 'user_a'):
+    for session_id in ('session0', 'session1'):
+      await session_service.create_session_async(
+          app_name='my_app', user_id=user_id, session_id=session_id
+      )
+  await session_service.create_session_async(
+      app_name='other_app', user_id='user_a', session_id='session9'
+  )
+
+  pages = []
+  page_token = None
+  while True:
+    response = await session_service.list_sessions_async(
+        app_name='my_app', user_id=None, page_size=3, page_token=page_token
+    )
+    pages.append([(s.user_id, s.id) for s in response.sessions])
+    page_token = response.next_page_token
+    if not page_token:
+      break
+  assert pages == [
+      [('user_a', 'session0'), ('user_a', 'session1'), ('user_b', 'session0')],
+      [('user_b', 'session1')],
+  ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('service_type', ALL_SERVICE_TYPES)
+async def test_delete_sessions(service_type):
+  session_service = get_session_service(service_type)
+  for i in range(3):
+    await session_service.create_session_async(
+        app_name='my_app', user_id='user', session_id=f'session{i}'
+    )
+
+  await session_service.delete_sessions_async(
+      app_name='my_app',
+      user_id='user',
+      session_ids=['session0', 'session2', 'missing'],
+  )
+
+  response = await session_service.list_sessions_async(
+      app_name='my_app', user_id='user'
+  )
+  assert [session.id for session in response.sessions] == ['session1']
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('service_type', ALL_SERVICE_TYPES)
+async def test_purge_sessions_older_than(service_type):
+  session_service = get_session_service(service_type)
+  for user_id in ('user', 'other_user'):
+    await session_service.create_session_async(
+        app_name='my_app',
+        user_id=user_id,
+        session_id='old_session',
+        state={'key': 'value'},
+    )
+  cutoff_time = time.time()
+  # Databases may store update times with a resolution of one second.
+  await asyncio.sleep(1.1)
+  await session_service.create_session_async(
+      app_name='my_app', user_id='user', session_id='new_session'
+  )
+
+  old_sessions = await session_service.list_sessions_async(
+      app_name='my_app', user_id='user', updated_before=cutoff_time
+  )
+  assert [session.id for session in old_sessions.sessions] == ['old_session']
+  new_sessions = await session_service.list_sessions_async(
+      app_name='my_app', user_id='user', updated_after=cutoff_time
+  )
+  assert [session.id for session in new_sessions.sessions] == ['new_session']
+
+  assert (
+      await session_service.purge_sessions_older_than_async(
+          app_name='my_app', user_id='user', cutoff_time=cutoff_time
+      )
+      == 1
+  )
+  assert (
+      await session_service.purge_sessions_older_than_async(
+          app_name='my_app', cutoff_time=cutoff_time
+      )
+      == 1
+  )
+  for user_id in ('user', 'other_user'):
+    assert not await session_service.get_session_async(
+        app_name='my_app', user_id=user_id, session_id='old_session'
+    )
+  assert await session_service.get_session_async(
+      app_name='my_app', user_id='user', session_id='new_session'
+  )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('service_type', ALL_SERVICE_TYPES)
+async def test_append_event_state_and_bytes(service_type):
+  session_service = get_session_service(service_type)
+  app_name = 'my_app'
+  user_id = 'user'
+
+  session = await session_service.create_session_async(
+      app_name=app_name, user_id=user_id, state={'key': 'value'}
+  )
+  event = Event(
+      invocation_id='invocation',
+      author='user',
+      content=types.Content(
+          role='user',
+          parts=[
+              types.Part.from_bytes(
+                  data=b'test_image_data', mime_type='image/png'
+              ),
+          ],
+      ),
+      actions=EventActions(
+          state_delta={
+              'app:key': 'app_value',
+              'user:key': 'user_value',
+              'temp:key': 'temp',
+              'key': 'new_value',
+          }
+      ),
+  )
+  await session_service.append_event_async(session=session, event=event)
+
+  assert session.state.get('app:key') == 'app_value'
+  assert session.state.get('user:key') == 'user_value'
+  assert session.state.get('key') == 'new_value'
+  assert not session.state.get('temp:key')
+
+  session_from_storage = await session_service.get_session_async(
+      app_name=app_name, user_id=user_id, session_id=session.id
+  )
+  assert session_from_storage.state == session.state
+  assert len(session_from_storage.events) == 1
+  assert session_from_storage.events[0].content.parts[
+      0
+  ] == types.Part.from_bytes(data=b'test_image_data', mime_type='image/png')
+
+  other_session = await session_service.create_session_async(
+      app_name=app_name, user_id=user_id
+  )
+  assert other_session.state.get('app:key') == 'app_value'
+  assert other_session.state.get('user:key') == 'user_value'
+  assert not other_session.state.get('key')
+
+
+def test_default_purge_sessions_older_than_of_all_users():
+  class DefaultPurgeSessionService(InMemorySessionService):
+    purge_sessions_older_than = BaseSessionService.purge_sessions_older_than
+
+  session_service = DefaultPurgeSessionService()
+  for user_id in ('user', 'other_user'):
+    session_service.create_session(
+        app_name='my_app', user_id=user_id, session_id='old_session'
+    )
+  cutoff_time = time.time()
+  time.sleep(0.01)
+  session_service.create_session(
+      app_name='my_app', user_id='user', session_id='new_session'
+  )
+
+  assert (
+      session_service.purge_sessions_older_than(
+          app_name='my_app', cutoff_time=cutoff_time
+      )
+      == 2
+  )
+  sessions = session_service.list_sessions(app_name='my_app', user_id=None)
+  assert [s.id for s in sessions.sessions] == ['new_session']
+
+
+@pytest.mark.parametrize(
+    'db_url',
+    ['sqlite+aiosqlite:///:memory:', 'sqlite+aiosqlite:///{tmp_path}/db'],
+)
+def test_async_database_sync_methods(db_url, tmp_path):
+  session_service = AsyncDatabaseSessionService(
+      db_url.format(tmp_path=tmp_path)
+  )
+  session = session_service.create_session(
+      app_name='my_app', user_id='user', state={'key': 'value'}
+  )
+  session_service.append_event(
+      session=session,
+      event=Event(
+          invocation_id='invocation',
+          author='user',
+          actions=EventActions(state_delta={'key': 'new_value'}),
+      ),
+  )
+
+  session_from_storage = session_service.get_session(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+  assert session_from_storage.state == {'key': 'new_value'}
+  assert len(session_from_storage.events) == 1
+  assert [
+      s.id
+      for s in session_service.list_sessions(
+          app_name='my_app', user_id='user'
+      ).sessions
+  ] == [session.id]
+
+  session_service.delete_session(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+  assert not session_service.get_session(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+
+
+@pytest.mark.asyncio
+async def test_async_database_sync_and_async_methods_share_storage():
+  session_service = get_session_service(SessionServiceType.ASYNC_DATABASE)
+  session = await session_service.create_session_async(
+      app_name='my_app', user_id='user'
+  )
+
+  # Sync calls from a running event loop block it, but do not deadlock.
+  assert session_service.get_session(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+  await session_service.delete_session_async(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+  assert not session_service.get_session(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+
+
+@pytest.mark.asyncio
+async def test_async_database_blob_offload():
+  artifact_service = InMemoryArtifactService()
+  session_service = AsyncDatabaseSessionService(
+      'sqlite+aiosqlite:///:memory:',
+      artifact_service=artifact_service,
+      blob_offload_min_bytes=1024,
+  )
+  large_part = types.Part.from_bytes(data=b'x' * 2048, mime_type='image/png')
+  session = await session_service.create_session_async(
+      app_name='my_app', user_id='user'
+  )
+  await session_service.append_event_async(
+      session=session,
+      event=Event(
+          invocation_id='invocation',
+          author='user',
+          content=types.Content(role='user', parts=[large_part]),
+      ),
+  )
+
+  session_from_storage = await session_service.get_session_async(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+  part = session_from_storage.events[0].content.parts[0]
+  assert is_blob_reference(part)
+  assert (
+      session_service.load_blob(
+          session=session_from_storage, blob_uri=part.file_data.file_uri
+      )
+      == large_part
+  )
+
+
+async def _create_session_with_events(session_service, num_events):
+  session = await session_service.create_session_async(
+      app_name='my_app', user_id='user'
+  )
+  for i in range(num_events):
+    await session_service.append_event_async(
+        session=session,
+        event=Event(
+            invocation_id='invocation',
+            author='user',
+            timestamp=1_700_000_000.0 + i,
+            content=types.Content(role='user', parts=[types.Part(text=f'{i}')]),
+        ),
+    )
+  return session
+
+
+def _texts(events):
+  return [event.content.parts[0].text for event in events]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('service_type', ALL_SERVICE_TYPES)
+async def test_get_session_with_config(service_type):
+  session_service = get_session_service(service_type)
+  session = await _create_session_with_events(session_service, 10)
+
+  recent = await session_service.get_session_async(
+      app_name='my_app',
+      user_id='user',
+      session_id=session.id,
+      config=GetSessionConfig(num_recent_events=3),
+  )
+  assert _texts(recent.events) == ['7', '8', '9']
+
+  after = await session_service.get_session_async(
+      app_name='my_app',
+      user_id='user',
+      session_id=session.id,
+      config=GetSessionConfig(after_timestamp=1_700_000_006.0),
+  )
+  assert _texts(after.events) == ['6', '7', '8', '9']
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('service_type', ALL_SERVICE_TYPES)
+async def test_list_events_pagination(service_type):
+  session_service = get_session_service(service_type)
+  session = await _create_session_with_events(session_service, 7)
+
+  all_events = await session_service.list_events_async(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+  assert _texts(all_events.events) == [str(i) for i in range(7)]
+  assert all_events.next_page_token is None
+
+  pages = []
+  page_token = None
+  while True:
+    response = await session_service.list_events_async(
+        app_name='my_app',
+        user_id='user',
+        session_id=session.id,
+        page_size=3,
+        page_token=page_token,
+    )
+    pages.append(_texts(response.events))
+    page_token = response.next_page_token
+    if not page_token:
+      break
+  assert pages == [['0', '1', '2'], ['3', '4', '5'], ['6']]
+
+
+def _state_event(state_delta):
+  return Event(
+      invocation_id='invocation',
+      author='user',
+      actions=EventActions(state_delta=state_delta),
+  )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('service_type', DATABASE_SERVICE_TYPES)
+async def test_append_event_stale_session(service_type):
+  session_service = get_session_service(service_type)
+  session = await session_service.create_session_async(
+      app_name='my_app', user_id='user'
+  )
+  stale_session = session.model_copy(deep=True)
+  assert session.version == 0
+
+  await session_service.append_event_async(
+      session=session, event=_state_event({'a': 1})
+  )
+  assert session.version == 1
+
+  with pytest.raises(ValueError, match='stale'):
+    await session_service.append_event_async(
+        session=stale_session, event=_state_event({'b': 2})
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('service_type', DATABASE_SERVICE_TYPES)
+async def test_append_event_rebase(service_type):
+  session_service = get_session_service(service_type)
+  session_service.conflict_retries = 1
+  session = await session_service.create_session_async(
+      app_name='my_app', user_id='user', state={'a': 0, 'b': 0}
+  )
+  stale_session = session.model_copy(deep=True)
+  await session_service.append_event_async(
+      session=session, event=_state_event({'a': 1})
+  )
+
+  # Deltas on different keys are rebased onto the stored session.
+  await session_service.append_event_async(
+      session=stale_session, event=_state_event({'b': 2})
+  )
+  assert stale_session.version == 2
+  assert stale_session.state == {'a': 1, 'b': 2}
+  stored_session = await session_service.get_session_async(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+  assert stored_session.state == {'a': 1, 'b': 2}
+  assert stored_session.version == 2
+
+  # Deltas on the same key conflict.
+  with pytest.raises(ValueError, match=r"\['b'\]"):
+    await session_service.append_event_async(
+        session=session, event=_state_event({'b': 3})
+    )
+
+
+@pytest.mark.asyncio
+async def test_per_key_state_layout():
+  session_service = get_session_service(SessionServiceType.DATABASE_PER_KEY)
+  session = await session_service.create_session_async(
+      app_name='my_app',
+      user_id='user',
+      state={'app:a': 1, 'user:b': 2, 'c': 3},
+  )
+  await session_service.append_event_async(
+      session=session, event=_state_event({'app:a': 10, 'd': 4})
+  )
+
+  with session_service.DatabaseSessionFactory() as sessionFactory:
+    assert not sessionFactory.query(StorageAppState).all()
+    assert not sessionFactory.query(StorageUserState).all()
+    assert sorted(
+        (entry.scope, entry.key, entry.value)
+        for entry in sessionFactory.query(StorageStateEntry).all()
+    ) == [
+        ('app', 'a', 10),
+        ('session', 'c', 3),
+        ('session', 'd', 4),
+        ('user', 'b', 2),
+    ]
+    assert sessionFactory.query(StorageSession).one().state == {}
+
+  other_session = await session_service.create_session_async(
+      app_name='my_app', user_id='user'
+  )
+  assert other_session.state == {'app:a': 10, 'user:b': 2}
+
+  await session_service.delete_session_async(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+  with session_service.DatabaseSessionFactory() as sessionFactory:
+    assert not (
+        sessionFactory.query(StorageStateEntry)
+        .filter(StorageStateEntry.scope == 'session')
+        .all()
+    )
+
+
+class _CountingSummarizer(EventSummarizer):
+
+  def summarize(self, events):
+    return types.Content(parts=[types.Part(text=f'summary of {len(events)}')])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('service_type', ALL_SERVICE_TYPES)
+async def test_compaction(service_type):
+  session_service = get_session_service(service_type)
+  session_service.compaction_config = CompactionConfig(
+      max_events=6, keep_recent_events=2, summarizer=_CountingSummarizer()
+  )
+  session = await _create_session_with_events(session_service, 7)
+  assert _texts(session.events) == ['summary of 5', '5', '6']
+
+  session_from_storage = await session_service.get_session_async(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+  assert _texts(session_from_storage.events) == ['summary of 5', '5', '6']
+  assert session_from_storage.events[0].author == 'user'
+  assert session_from_storage.events[0].content.role == 'user'
+  assert (
+      session_from_storage.events[0].timestamp
+      < session_from_storage.events[1].timestamp
+  )
+
+  # The previous summary is folded into the next one.
+  assert (
+      await session_service.compact_session_async(
+          session=session, keep_recent_events=1
+      )
+      == 2
+  )
+  session_from_storage = await session_service.get_session_async(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+  assert _texts(session_from_storage.events) == ['6']
+  assert _texts(session.events) == ['6']
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('service_type', ALL_SERVICE_TYPES)
+async def test_list_events_pagination_across_compaction(service_type):
+  session_service = get_session_service(service_type)
+  session = await _create_session_with_events(session_service, 7)
+
+  response = await session_service.list_events_async(
+      app_name='my_app', user_id='user', session_id=session.id, page_size=3
+  )
+  assert _texts(response.events) == ['0', '1', '2']
+
+  await session_service.compact_session_async(
+      session=session, keep_recent_events=3, summarizer=_CountingSummarizer()
+  )
+  response = await session_service.list_events_async(
+      app_name='my_app',
+      user_id='user',
+      session_id=session.id,
+      page_size=3,
+      page_token=response.next_page_token,
+  )
+  # The archived events after the previous page are replaced by their summary.
+  assert _texts(response.events) == ['summary of 4', '4', '5']
+
+
+@pytest.mark.asyncio
+async def test_summarize_events_async():
+  class ThreadSummarizer(EventSummarizer):
+
+    def summarize(self, events):
+      return types.Content(parts=[types.Part(text=str(threading.get_ident()))])
+
+  events = [
+      Event(invocation_id='invocation', author='user', timestamp=timestamp)
+      for timestamp in (1.0, 2.0, 2.0000001)
+  ]
+
+  summary = await summarize_events_async(
+      events[:1], ThreadSummarizer(), events[1:]
+  )
+  # The sync summarizer does not run on the event loop.
+  assert summary.content.parts[0].text != str(threading.get_ident())
+  assert events[0].timestamp < summary.timestamp < events[1].timestamp
+
+  summary = await summarize_events_async(
+      events[:2], ThreadSummarizer(), events[2:]
+  )
+  assert events[1].timestamp < summary.timestamp < events[2].timestamp
+
+
+def test_split_events_for_compaction_keeps_function_calls():
+  events = [
+      Event(
+          invocation_id='invocation',
+          author='agent',
+          content=types.Content(
+              role='model',
+              parts=[types.Part.from_function_call(name='tool', args={})],
+          ),
+      ),
+      Event(
+          invocation_id='invocation',
+          author='agent',
+          content=types.Content(
+              role='user',
+              parts=[
+                  types.Part.from_function_response(name='tool', response={})
+              ],
+          ),
+      ),
+  ]
+  assert split_events_for_compaction(events, 1) == ([], events)
+  assert split_events_for_compaction(events, 0) == (events, [])
+
+
+@pytest.mark.asyncio
+async def test_async_defaults_support_former_signatures():
+  class LegacySessionService(InMemorySessionService):
+
+    def list_sessions(self, *, app_name, user_id):
+      return super().list_sessions(app_name=app_name, user_id=user_id)
+
+    def list_events(self, *, app_name, user_id, session_id):
+      return super().list_events(
+          app_name=app_name, user_id=user_id, session_id=session_id
+      )
+
+  session_service = LegacySessionService()
+  session = await session_service.create_session_async(
+      app_name='my_app', user_id='user'
+  )
+
+  response = await session_service.list_sessions_async(
+      app_name='my_app', user_id='user'
+  )
+  assert [s.id for s in response.sessions] == [session.id]
+  response = await session_service.list_events_async(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+  assert response.events == []
+
+
+@pytest.mark.asyncio
+async def test_database_async_methods_run_in_worker_threads():
+  threads = set()
+
+  class RecordingSessionService(DatabaseSessionService):
+
+    def create_session(self, **kwargs):
+      threads.add(threading.get_ident())
+      return super().create_session(**kwargs)
+
+    def append_event(self, session, event):
+      threads.add(threading.get_ident())
+      return super().append_event(session, event)
+
+  session_service = RecordingSessionService('sqlite:///:memory:')
+  session = await session_service.create_session_async(
+      app_name='my_app', user_id='user'
+  )
+  await session_service.append_event_async(
+      session, Event(invocation_id='invocation', author='user')
+  )
+
+  assert threads and threading.get_ident() not in threads
+  session_from_storage = await session_service.get_session_async(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+  assert len(session_from_storage.events) == 1
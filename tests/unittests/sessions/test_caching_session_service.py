@@ -0,0 +1,174 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from google.adk.events import Event
+from google.adk.events import EventActions
+from google.adk.sessions import AsyncDatabaseSessionService
+from google.adk.sessions import CachingSessionService
+from google.adk.sessions import DatabaseSessionService
+from google.adk.sessions import InMemorySessionService
+from google.adk.sessions.base_session_service import GetSessionConfig
+import pytest
+
+
+def _event(state_delta=None):
+  return Event(
+      invocation_id='invocation',
+      author='user',
+      actions=EventActions(state_delta=state_delta or {}),
+  )
+
+
+def test_read_through():
+  backing_service = InMemorySessionService()
+  session_service = CachingSessionService(backing_service)
+  session = backing_service.create_session(
+      app_name='my_app', user_id='user', state={'key': 'value'}
+  )
+
+  cached_session = session_service.get_session(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+  assert cached_session == session
+  assert (session_service.hits, session_service.misses) == (0, 1)
+
+  for i in range(3):
+    session_service.append_event(cached_session, _event({'key': i}))
+
+  assert session_service.get_session(
+      app_name='my_app', user_id='user', session_id=session.id
+  ) == backing_service.get_session(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+  recent = session_service.get_session(
+      app_name='my_app',
+      user_id='user',
+      session_id=session.id,
+      config=GetSessionConfig(num_recent_events=2),
+  )
+  assert recent.events == cached_session.events[-2:]
+  assert (session_service.hits, session_service.misses) == (2, 1)
+  assert session_service.hit_rate == 2 / 3
+
+  session_service.delete_session(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+  assert not session_service.get_session(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+
+
+def test_max_sessions():
+  session_service = CachingSessionService(
+      InMemorySessionService(), max_sessions=1
+  )
+  first = session_service.create_session(app_name='my_app', user_id='user')
+  session_service.create_session(app_name='my_app', user_id='user')
+
+  session_service.get_session(
+      app_name='my_app', user_id='user', session_id=first.id
+  )
+  assert (session_service.hits, session_service.misses) == (0, 1)
+
+
+def test_invalidate_on_stale_append():
+  backing_service = DatabaseSessionService('sqlite:///:memory:')
+  session_service = CachingSessionService(backing_service)
+  session = session_service.create_session(app_name='my_app', user_id='user')
+
+  # Another writer appends to the session behind the cache's back.
+  other_session = backing_service.get_session(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+  backing_service.append_event(other_session, _event({'key': 'other'}))
+
+  with pytest.raises(ValueError):
+    session_service.append_event(session, _event({'key': 'mine'}))
+  assert session_service.invalidations == 1
+
+  reloaded_session = session_service.get_session(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+  assert reloaded_session.state == {'key': 'other'}
+  assert session_service.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_async_read_through():
+  session_service = CachingSessionService(
+      AsyncDatabaseSessionService('sqlite+aiosqlite:///:memory:')
+  )
+  session = await session_service.create_session_async(
+      app_name='my_app', user_id='user'
+  )
+  await session_service.append_event_async(session, _event({'key': 'value'}))
+
+  cached_session = await session_service.get_session_async(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+  assert cached_session.state == {'key': 'value'}
+  assert cached_session.version == session.version == 1
+  assert [e.id for e in cached_session.events] == [e.id for e in session.events]
+  assert (session_service.hits, session_service.misses) == (1, 0)
+
+  # The cached copy stays in sync, so later appends pass the version check.
+  await session_service.append_event_async(
+      cached_session, _event({'key': 'new_value'})
+  )
+  assert session_service.invalidations == 0
+
+
+def test_app_and_user_state_are_shared():
+  session_service = CachingSessionService(InMemorySessionService())
+  first = session_service.create_session(
+      app_name='my_app', user_id='user', state={'key': 'first'}
+  )
+  second = session_service.create_session(app_name='my_app', user_id='user')
+
+  session_service.append_event(
+      second, _event({'app:key': 'app', 'user:key': 'user'})
+  )
+
+  cached_session = session_service.get_session(
+      app_name='my_app', user_id='user', session_id=first.id
+  )
+  assert cached_session.state == {
+      'key': 'first',
+      'app:key': 'app',
+      'user:key': 'user',
+  }
+  assert session_service.misses == 0
+
+
+def test_invalidate_on_rebased_append():
+  backing_service = DatabaseSessionService(
+      'sqlite:///:memory:', conflict_retries=1
+  )
+  session_service = CachingSessionService(backing_service)
+  session = session_service.create_session(app_name='my_app', user_id='user')
+
+  other_session = backing_service.get_session(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+  backing_service.append_event(other_session, _event({'other': 'value'}))
+
+  session_service.append_event(session, _event({'mine': 'value'}))
+  assert session.state == {'other': 'value', 'mine': 'value'}
+  assert session_service.invalidations == 1
+
+  reloaded_session = session_service.get_session(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+  assert reloaded_session.state == {'other': 'value', 'mine': 'value'}
+  assert len(reloaded_session.events) == 2
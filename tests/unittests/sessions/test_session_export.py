@@ -0,0 +1,297 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from google.adk.events import Event
+from google.adk.events import EventActions
+from google.adk.sessions import DatabaseSessionService
+from google.adk.sessions import InMemorySessionService
+from google.adk.sessions.session_export import export_sessions
+from google.adk.sessions.session_export import import_sessions
+from google.adk.sessions.session_export import open_session_record_writer
+from google.adk.sessions.session_export import read_session_records
+from google.genai import types
+import pytest
+
+
+async def _create_sessions(session_service, num_sessions, num_events):
+  for i in range(num_sessions):
+    session = await session_service.create_session_async(
+        app_name='my_app',
+        user_id='user',
+        session_id=f'session{i}',
+        state={'initial': i},
+    )
+    for j in range(num_events):
+      await session_service.append_event_async(
+          session,
+          Event(
+              invocation_id=f'invocation{j}',
+              author='user',
+              content=types.Content(
+                  role='user',
+                  parts=[
+                      types.Part(text=f'{i}.{j}'),
+                      types.Part(
+                          inline_data=types.Blob(
+                              data=bytes([i, j]), mime_type='image/png'
+                          )
+                      ),
+                  ],
+              ),
+              actions=EventActions(state_delta={'last': j}),
+          ),
+      )
+
+
+async def _assert_same_sessions(session_service, other_session_service):
+  sessions = (
+      await session_service.list_sessions_async(
+          app_name='my_app', user_id='user'
+      )
+  ).sessions
+  other_sessions = (
+      await other_session_service.list_sessions_async(
+          app_name='my_app', user_id='user'
+      )
+  ).sessions
+  assert [s.id for s in sessions] == [s.id for s in other_sessions]
+  for session_id in (s.id for s in sessions):
+    session = await session_service.get_session_async(
+        app_name='my_app', user_id='user', session_id=session_id
+    )
+    other_session = await other_session_service.get_session_async(
+        app_name='my_app', user_id='user', session_id=session_id
+    )
+    assert other_session.state == session.state
+    # The state deltas are not imported, the state already includes them.
+    assert [
+        (e.id, e.content, e.actions.model_copy(update={'state_delta': {}}))
+        for e in session.events
+    ] == [(e.id, e.content, e.actions) for e in other_session.events]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('export_format', ['jsonl', 'parquet'])
+async def test_export_import_round_trip(tmp_path, export_format):
+  if export_format == 'parquet':
+    pytest.importorskip('pyarrow')
+  session_service = DatabaseSessionService('sqlite:///:memory:')
+  await _create_sessions(session_service, num_sessions=5, num_events=3)
+
+  path = str(tmp_path / f'sessions.{export_format}')
+  writer = open_session_record_writer(path, export_format)
+  cursors = [
+      cursor
+      async for cursor in export_sessions(
+          session_service,
+          writer,
+          app_name='my_app',
+          user_id='user',
+          batch_size=2,
+          events_page_size=2,
+      )
+  ]
+  writer.close()
+  assert len(cursors) == 3
+  assert cursors[-1] is None
+
+  records = list(read_session_records(path, export_format))
+  assert [record['kind'] for record in records] == (
+      ['session'] + ['event'] * 3
+  ) * 5
+  assert records[1]['author'] == 'user'
+
+  imported_session_service = InMemorySessionService()
+  checkpoints = [
+      checkpoint
+      async for checkpoint in import_sessions(
+          imported_session_service, records, checkpoint_interval=2
+      )
+  ]
+  assert checkpoints == [8, 16, 20]
+  await _assert_same_sessions(session_service, imported_session_service)
+
+
+@pytest.mark.asyncio
+async def test_resume_export_and_import(tmp_path):
+  session_service = InMemorySessionService()
+  await _create_sessions(session_service, num_sessions=3, num_events=2)
+
+  # Stops the export after its first batch.
+  first_path = str(tmp_path / 'first.jsonl')
+  writer = open_session_record_writer(first_path, 'jsonl')
+  exported_sessions = export_sessions(
+      session_service, writer, app_name='my_app', user_id='user', batch_size=2
+  )
+  cursor = await exported_sessions.__anext__()
+  await exported_sessions.aclose()
+  writer.close()
+
+  # The resumed export is appended to the first one.
+  writer = open_session_record_writer(first_path, 'jsonl', append=True)
+  async for _ in export_sessions(
+      session_service,
+      writer,
+      app_name='my_app',
+      user_id='user',
+      cursor=cursor,
+      batch_size=2,
+  ):
+    pass
+  writer.close()
+  records = list(read_session_records(first_path, 'jsonl'))
+  assert [r['session_id'] for r in records if r['kind'] == 'session'] == [
+      'session0',
+      'session1',
+      'session2',
+  ]
+
+  # Stops the import in the middle of the third session, after the checkpoint
+  # before the second one.
+  imported_session_service = InMemorySessionService()
+  async for _ in import_sessions(
+      imported_session_service, records[:8], checkpoint_interval=1
+  ):
+    pass
+  async for _ in import_sessions(
+      imported_session_service, records, skip_records=3
+  ):
+    pass
+  await _assert_same_sessions(session_service, imported_session_service)
+
+
+@pytest.mark.asyncio
+async def test_export_all_users(tmp_path):
+  session_service = DatabaseSessionService('sqlite:///:memory:')
+  for user_id in ('user0', 'user1'):
+    session = await session_service.create_session_async(
+        app_name='my_app', user_id=user_id, session_id=f'{user_id}_session'
+    )
+    await session_service.append_event_async(
+        session, Event(invocation_id='invocation', author='user')
+    )
+  await session_service.create_session_async(
+      app_name='other_app', user_id='user0'
+  )
+
+  path = str(tmp_path / 'sessions.jsonl')
+  writer = open_session_record_writer(path, 'jsonl')
+  async for _ in export_sessions(
+      session_service, writer, app_name='my_app', batch_size=1
+  ):
+    pass
+  writer.close()
+  records = list(read_session_records(path, 'jsonl'))
+  assert [(r['kind'], r['user_id'], r['session_id']) for r in records] == [
+      ('session', 'user0', 'user0_session'),
+      ('event', 'user0', 'user0_session'),
+      ('session', 'user1', 'user1_session'),
+      ('event', 'user1', 'user1_session'),
+  ]
+
+
+@pytest.mark.asyncio
+async def test_import_does_not_apply_state_deltas_again(tmp_path):
+  session_service = InMemorySessionService()
+  sessions = [
+      await session_service.create_session_async(
+          app_name='my_app', user_id='user', session_id=f'session{i}'
+      )
+      for i in range(2)
+  ]
+  # The second session is imported last, but updates the user state first.
+  for session, count in ((sessions[1], 1), (sessions[0], 2)):
+    await session_service.append_event_async(
+        session,
+        Event(
+            invocation_id='invocation',
+            author='user',
+            actions=EventActions(
+                state_delta={'count': count, 'user:count': count}
+            ),
+        ),
+    )
+  path = str(tmp_path / 'sessions.jsonl')
+  writer = open_session_record_writer(path, 'jsonl')
+  async for _ in export_sessions(
+      session_service, writer, app_name='my_app', user_id='user'
+  ):
+    pass
+  writer.close()
+
+  imported_session_service = InMemorySessionService()
+  async for _ in import_sessions(
+      imported_session_service, read_session_records(path, 'jsonl')
+  ):
+    pass
+  for session_id, count in (('session0', 2), ('session1', 1)):
+    imported_session = await imported_session_service.get_session_async(
+        app_name='my_app', user_id='user', session_id=session_id
+    )
+    assert imported_session.state == {'count': count, 'user:count': 2}
+    assert len(imported_session.events) == 1
+    assert not imported_session.events[0].actions.state_delta
+
+
+class _NewIdsSessionService(InMemorySessionService):
+  """Assigns its own session ids, like `VertexAiSessionService`."""
+
+  async def create_session_async(self, *, session_id=None, **kwargs):
+    return await super().create_session_async(**kwargs)
+
+
+@pytest.mark.asyncio
+async def test_import_into_service_with_own_ids(tmp_path):
+  session_service = InMemorySessionService()
+  await _create_sessions(session_service, num_sessions=2, num_events=2)
+  path = str(tmp_path / 'sessions.jsonl')
+  writer = open_session_record_writer(path, 'jsonl')
+  async for _ in export_sessions(
+      session_service, writer, app_name='my_app', user_id='user'
+  ):
+    pass
+  writer.close()
+  records = list(read_session_records(path, 'jsonl'))
+
+  imported_session_service = _NewIdsSessionService()
+  async for _ in import_sessions(imported_session_service, records):
+    pass
+  imported_sessions = (
+      await imported_session_service.list_sessions_async(
+          app_name='my_app', user_id='user'
+      )
+  ).sessions
+  assert len(imported_sessions) == 2
+  assert not {'session0', 'session1'} & {s.id for s in imported_sessions}
+
+  with pytest.raises(ValueError):
+    async for _ in import_sessions(
+        _NewIdsSessionService(), records, skip_records=3
+    ):
+      pass
+
+
+def test_parquet_export_is_not_appended(tmp_path):
+  path = tmp_path / 'sessions.parquet'
+  path.touch()
+  with pytest.raises(ValueError):
+    open_session_record_writer(str(path), 'parquet', append=True)
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_orphan_events():
+  records = [{'kind': 'event', 'session_id': 'session0', 'event_id': 'event0'}]
+  with pytest.raises(ValueError):
+    async for _ in import_sessions(InMemorySessionService(), records):
+      pass
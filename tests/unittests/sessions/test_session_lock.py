@@ -0,0 +1,176 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+from typing import AsyncGenerator
+
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.runners import Runner
+from google.adk.sessions import DatabaseSessionLock
+from google.adk.sessions import InMemorySessionLock
+from google.adk.sessions import InMemorySessionService
+from google.adk.sessions import SessionLockTimeoutError
+from google.genai import types
+import pytest
+from typing_extensions import override
+
+_SESSION_KEY = dict(app_name='my_app', user_id='user', session_id='session')
+
+
+class _SlowAgent(BaseAgent):
+
+  @override
+  async def _run_async_impl(
+      self, ctx: InvocationContext
+  ) -> AsyncGenerator[Event, None]:
+    for i in range(2):
+      await asyncio.sleep(0.05)
+      yield Event(
+          author=self.name,
+          invocation_id=ctx.invocation_id,
+          content=types.Content(parts=[types.Part(text=str(i))]),
+      )
+
+
+@pytest.mark.asyncio
+async def test_lock_serializes_in_order():
+  session_lock = InMemorySessionLock()
+  order = []
+
+  async def hold(i):
+    async with session_lock.lock(**_SESSION_KEY):
+      order.append(('start', i))
+      await asyncio.sleep(0.01)
+      order.append(('end', i))
+
+  await asyncio.gather(*(hold(i) for i in range(3)))
+
+  assert order == [
+      ('start', 0),
+      ('end', 0),
+      ('start', 1),
+      ('end', 1),
+      ('start', 2),
+      ('end', 2),
+  ]
+  assert not session_lock.locked(**_SESSION_KEY)
+
+
+@pytest.mark.asyncio
+async def test_lock_timeout():
+  session_lock = InMemorySessionLock()
+  async with session_lock.lock(**_SESSION_KEY):
+    with pytest.raises(SessionLockTimeoutError):
+      async with session_lock.lock(**_SESSION_KEY, timeout=0.01):
+        pass
+    # Other sessions are not locked.
+    async with session_lock.lock(
+        app_name='my_app', user_id='user', session_id='other', timeout=0.01
+    ):
+      pass
+  async with session_lock.lock(**_SESSION_KEY, timeout=0.01):
+    pass
+
+
+def test_lock_handover_across_event_loops():
+  session_lock = InMemorySessionLock()
+  locked = threading.Event()
+  acquired = []
+
+  async def hold():
+    async with session_lock.lock(**_SESSION_KEY):
+      locked.set()
+      await asyncio.sleep(0.05)
+      acquired.append('first')
+
+  async def wait():
+    locked.wait()
+    async with session_lock.lock(**_SESSION_KEY, timeout=5):
+      acquired.append('second')
+
+  thread = threading.Thread(target=lambda: asyncio.run(hold()))
+  thread.start()
+  asyncio.run(wait())
+  thread.join()
+
+  assert acquired == ['first', 'second']
+
+
+@pytest.mark.asyncio
+async def test_runner_serializes_invocations():
+  session_service = InMemorySessionService()
+  session = session_service.create_session(app_name='my_app', user_id='user')
+  runner = Runner(
+      app_name='my_app',
+      agent=_SlowAgent(name='slow_agent'),
+      session_service=session_service,
+  )
+
+  async def run(text):
+    return [
+        event
+        async for event in runner.run_async(
+            user_id='user',
+            session_id=session.id,
+            new_message=types.Content(
+                role='user', parts=[types.Part(text=text)]
+            ),
+        )
+    ]
+
+  await asyncio.gather(run('first'), run('second'))
+
+  session = session_service.get_session(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+  assert [e.content.parts[0].text for e in session.events] == [
+      'first',
+      '0',
+      '1',
+      'second',
+      '0',
+      '1',
+  ]
+
+
+
+@pytest.mark.asyncio
+async def test_runner_releases_lock_when_closed():
+  session_service = InMemorySessionService()
+  session = session_service.create_session(app_name='my_app', user_id='user')
+  session_lock = InMemorySessionLock()
+  runner = Runner(
+      app_name='my_app',
+      agent=_SlowAgent(name='slow_agent'),
+      session_service=session_service,
+      session_lock=session_lock,
+  )
+  events = runner.run_async(
+      user_id='user',
+      session_id=session.id,
+      new_message=types.Content(role='user', parts=[types.Part(text='hi')]),
+  )
+  lock_key = dict(app_name='my_app', user_id='user', session_id=session.id)
+
+  await events.__anext__()
+  assert session_lock.locked(**lock_key)
+  await events.aclose()
+  assert not session_lock.locked(**lock_key)
+
+def test_database_lock_rejects_unsupported_dialects():
+  with pytest.raises(ValueError):
+    DatabaseSessionLock('sqlite:///:memory:')
@@ -12,13 +12,29 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import base64
 import enum
+import hashlib
+import json
+import pickle
+import threading
+import time
+
 import pytest
+import sqlalchemy
 
+from google.adk.artifacts import InMemoryArtifactService
 from google.adk.events import Event
 from google.adk.events import EventActions
 from google.adk.sessions import DatabaseSessionService
 from google.adk.sessions import InMemorySessionService
+from google.adk.sessions import MsgpackEventCodec
+from google.adk.sessions.base_session_service import GetSessionConfig
+from google.adk.sessions.blob_offload import hydrate_blob_references
+from google.adk.sessions.blob_offload import hydrate_blob_references_async
+from google.adk.sessions.blob_offload import hydrate_session
+from google.adk.sessions.blob_offload import is_blob_reference
+from google.adk.sessions.database_session_service import StorageEvent
 from google.genai import types
 
 
@@ -298,3 +314,492 @@ def test_append_event_complete(service_type):
       )
       == session
   )
+
+
+def test_in_memory_shared_snapshot_mode():
+  session_service = InMemorySessionService(snapshot_mode='shared')
+  app_name = 'my_app'
+  user_id = 'user'
+
+  session = session_service.create_session(
+      app_name=app_name, user_id=user_id, state={'key': 'value'}
+  )
+  for i in range(3):
+    session_service.append_event(
+        session=session,
+        event=Event(
+            invocation_id='invocation',
+            author='user',
+            content=types.Content(
+                role='user', parts=[types.Part(text=f'text{i}')]
+            ),
+        ),
+    )
+
+  snapshot = session_service.get_session(
+      app_name=app_name, user_id=user_id, session_id=session.id
+  )
+  stored_session = session_service.sessions[app_name][user_id][session.id]
+  # Events are shared with the storage, the containers are not.
+  assert snapshot.events[0] is stored_session.events[0]
+  assert snapshot.events is not stored_session.events
+  snapshot.events.clear()
+  snapshot.state['key'] = 'changed'
+  assert len(stored_session.events) == 3
+  assert stored_session.state['key'] == 'value'
+
+  tail = session_service.get_session(
+      app_name=app_name,
+      user_id=user_id,
+      session_id=session.id,
+      config=GetSessionConfig(num_recent_events=2),
+  )
+  assert [e.content.parts[0].text for e in tail.events] == ['text1', 'text2']
+
+
+def test_in_memory_invalid_snapshot_mode():
+  with pytest.raises(ValueError):
+    InMemorySessionService(snapshot_mode='unknown')
+
+
+def test_database_write_behind():
+  session_service = DatabaseSessionService(
+      'sqlite:///:memory:', write_behind=True, max_buffered_events=3
+  )
+  app_name = 'my_app'
+  user_id = 'user'
+
+  def count_stored_events():
+    with session_service.DatabaseSessionFactory() as sessionFactory:
+      return sessionFactory.query(StorageEvent).count()
+
+  def new_event(i):
+    return Event(
+        invocation_id='invocation',
+        author='user',
+        content=types.Content(role='user', parts=[types.Part(text=f'{i}')]),
+        actions=EventActions(state_delta={'key': i, 'app:key': i}),
+    )
+
+  session = session_service.create_session(app_name=app_name, user_id=user_id)
+  session_service.append_event(session=session, event=new_event(0))
+  session_service.append_event(session=session, event=new_event(1))
+
+  # The events are buffered, but the in-memory session is up to date.
+  assert count_stored_events() == 0
+  assert len(session.events) == 2
+  assert session.state['key'] == 1
+
+  session_service.flush(session=session)
+  assert count_stored_events() == 2
+
+  # Reaching max_buffered_events forces a flush.
+  for i in range(2, 5):
+    session_service.append_event(session=session, event=new_event(i))
+  assert count_stored_events() == 5
+
+  # Reads see the buffered events.
+  session_service.append_event(session=session, event=new_event(5))
+  session_from_storage = session_service.get_session(
+      app_name=app_name, user_id=user_id, session_id=session.id
+  )
+  assert len(session_from_storage.events) == 6
+  assert session_from_storage.state['key'] == 5
+  assert session_from_storage.state['app:key'] == 5
+
+
+@pytest.mark.parametrize(
+    'event_codec',
+    [
+        None,
+        MsgpackEventCodec(),
+        MsgpackEventCodec(compression_level=None),
+        MsgpackEventCodec(min_compress_size=0),
+    ],
+)
+def test_database_event_codec(event_codec):
+  session_service = DatabaseSessionService(
+      'sqlite:///:memory:', event_codec=event_codec
+  )
+  app_name = 'my_app'
+  user_id = 'user'
+
+  session = session_service.create_session(app_name=app_name, user_id=user_id)
+  event = Event(
+      invocation_id='invocation',
+      author='user',
+      content=types.Content(
+          role='user',
+          parts=[
+              types.Part(text='test_text'),
+              types.Part.from_bytes(
+                  data=b'test_image_data', mime_type='image/png'
+              ),
+          ],
+      ),
+      actions=EventActions(
+          state_delta={'key': {'nested': [1, 2]}},
+          artifact_delta={'file': 0},
+          transfer_to_agent='agent',
+      ),
+      long_running_tool_ids={'tool1'},
+  )
+  session_service.append_event(session=session, event=event)
+
+  assert (
+      session_service.get_session(
+          app_name=app_name, user_id=user_id, session_id=session.id
+      )
+      == session
+  )
+
+  # Rows written with the msgpack codec stay readable without it.
+  reader = DatabaseSessionService('sqlite:///:memory:')
+  reader.db_engine = session_service.db_engine
+  reader.DatabaseSessionFactory = session_service.DatabaseSessionFactory
+  assert (
+      reader.get_session(
+          app_name=app_name, user_id=user_id, session_id=session.id
+      ).events
+      == session.events
+  )
+
+
+_LEGACY_SCHEMA = [
+    """CREATE TABLE sessions (
+        app_name VARCHAR NOT NULL, user_id VARCHAR NOT NULL,
+        id VARCHAR NOT NULL, state TEXT NOT NULL,
+        create_time DATETIME NOT NULL, update_time DATETIME NOT NULL,
+        PRIMARY KEY (app_name, user_id, id))""",
+    """CREATE TABLE app_states (
+        app_name VARCHAR NOT NULL, state TEXT NOT NULL,
+        update_time DATETIME NOT NULL, PRIMARY KEY (app_name))""",
+    """CREATE TABLE user_states (
+        app_name VARCHAR NOT NULL, user_id VARCHAR NOT NULL,
+        state TEXT NOT NULL, update_time DATETIME NOT NULL,
+        PRIMARY KEY (app_name, user_id))""",
+    """CREATE TABLE events (
+        id VARCHAR NOT NULL, app_name VARCHAR NOT NULL,
+        user_id VARCHAR NOT NULL, session_id VARCHAR NOT NULL,
+        invocation_id VARCHAR NOT NULL, author VARCHAR NOT NULL,
+        branch VARCHAR, timestamp DATETIME NOT NULL, content TEXT,
+        actions BLOB NOT NULL, long_running_tool_ids_json TEXT,
+        grounding_metadata TEXT, partial BOOLEAN, turn_complete BOOLEAN,
+        error_code VARCHAR, error_message VARCHAR, interrupted BOOLEAN,
+        PRIMARY KEY (id, app_name, user_id, session_id),
+        FOREIGN KEY(app_name, user_id, session_id)
+          REFERENCES sessions (app_name, user_id, id) ON DELETE CASCADE)""",
+]
+
+
+def test_database_legacy_events_migration(tmp_path):
+  db_url = f'sqlite:///{tmp_path / "sessions.db"}'
+  engine = sqlalchemy.create_engine(db_url)
+  with engine.begin() as connection:
+    for statement in _LEGACY_SCHEMA:
+      connection.execute(sqlalchemy.text(statement))
+    connection.execute(
+        sqlalchemy.text(
+            "INSERT INTO sessions VALUES ('my_app', 'user', 'session', '{}',"
+            " '2025-01-01 00:00:00', '2025-01-01 00:00:00')"
+        )
+    )
+    connection.execute(
+        sqlalchemy.text(
+            "INSERT INTO app_states VALUES ('my_app', '{}',"
+            " '2025-01-01 00:00:00')"
+        )
+    )
+    connection.execute(
+        sqlalchemy.text(
+            "INSERT INTO user_states VALUES ('my_app', 'user', '{}',"
+            " '2025-01-01 00:00:00')"
+        )
+    )
+    connection.execute(
+        sqlalchemy.text(
+            'INSERT INTO events (id, app_name, user_id, session_id,'
+            ' invocation_id, author, timestamp, content, actions) VALUES'
+            " ('event', 'my_app', 'user', 'session', 'invocation', 'user',"
+            " '2025-01-01 00:00:00', :content, :actions)"
+        ),
+        {
+            'content': json.dumps({
+                'role': 'user',
+                'parts': [{
+                    'inline_data': {
+                        'data': [base64.b64encode(b'data').decode()],
+                        'mime_type': 'image/png',
+                    }
+                }],
+            }),
+            'actions': pickle.dumps(EventActions(state_delta={'key': 'value'})),
+        },
+    )
+
+  session_service = DatabaseSessionService(db_url)
+
+  # Legacy rows are readable, and new rows can be added to the legacy table.
+  session = session_service.get_session(
+      app_name='my_app', user_id='user', session_id='session'
+  )
+  assert session.events[0].actions.state_delta == {'key': 'value'}
+  assert session.events[0].content.parts[0].inline_data.data == b'data'
+  session_service.append_event(
+      session=session,
+      event=Event(
+          invocation_id='invocation',
+          author='user',
+          actions=EventActions(state_delta={'key': 'new_value'}),
+      ),
+  )
+
+  assert session_service.migrate_legacy_events(batch_size=1) == 1
+  assert session_service.migrate_legacy_events() == 0
+  with session_service.DatabaseSessionFactory() as sessionFactory:
+    assert all(
+        e.actions_json is not None
+        for e in sessionFactory.query(StorageEvent).all()
+    )
+  migrated_events = session_service.get_session(
+      app_name='my_app', user_id='user', session_id='session'
+  ).events
+  assert [e.id for e in migrated_events] == [e.id for e in session.events]
+  assert [e.actions for e in migrated_events] == [
+      e.actions for e in session.events
+  ]
+  assert migrated_events[0].content == session.events[0].content
+
+
+def test_database_blob_offload():
+  artifact_service = InMemoryArtifactService()
+  session_service = DatabaseSessionService(
+      'sqlite:///:memory:',
+      artifact_service=artifact_service,
+      blob_offload_min_bytes=1024,
+  )
+  app_name = 'my_app'
+  user_id = 'user'
+  large_part = types.Part.from_bytes(data=b'x' * 2048, mime_type='image/png')
+  small_part = types.Part.from_bytes(data=b'small', mime_type='image/png')
+
+  session = session_service.create_session(app_name=app_name, user_id=user_id)
+  for _ in range(2):
+    session_service.append_event(
+        session=session,
+        event=Event(
+            invocation_id='invocation',
+            author='user',
+            content=types.Content(role='user', parts=[large_part, small_part]),
+        ),
+    )
+
+  # The in-memory session keeps the original bytes.
+  assert session.events[0].content.parts[0] == large_part
+
+  # Identical blobs are stored once, apart from the artifacts of the session.
+  assert not artifact_service.list_artifact_keys(
+      app_name=app_name, user_id=user_id, session_id=session.id
+  )
+  assert list(artifact_service.artifacts) == [
+      f'{app_name}/{user_id}/adk-blobs:{session.id}/'
+      f'adk-blob-{hashlib.sha256(b"x" * 2048).hexdigest()}'
+  ]
+
+  session_from_storage = session_service.get_session(
+      app_name=app_name, user_id=user_id, session_id=session.id
+  )
+  contents = [event.content for event in session_from_storage.events]
+  assert is_blob_reference(contents[0].parts[0])
+  assert contents[0].parts[1] == small_part
+
+  hydrated_session = hydrate_session(
+      session_from_storage, session_service=session_service
+  )
+  assert [event.content.parts for event in hydrated_session.events] == [
+      [large_part, small_part],
+      [large_part, small_part],
+  ]
+  assert is_blob_reference(contents[0].parts[0])
+
+  hydrate_blob_references(
+      contents, session_service=session_service, session=session_from_storage
+  )
+  assert [content.parts for content in contents] == [
+      [large_part, small_part],
+      [large_part, small_part],
+  ]
+
+  # Other session services did not offload the blobs.
+  session_from_storage = session_service.get_session(
+      app_name=app_name, user_id=user_id, session_id=session.id
+  )
+  with pytest.raises(ValueError):
+    hydrate_blob_references(
+        [session_from_storage.events[0].content],
+        session_service=InMemorySessionService(),
+        session=session_from_storage,
+    )
+
+
+@pytest.mark.asyncio
+async def test_hydrate_blob_references_async_reuses_loaded_blobs():
+  loaded_blob_threads = []
+
+  class RecordingSessionService(DatabaseSessionService):
+
+    def load_blob(self, *, session, blob_uri):
+      loaded_blob_threads.append(threading.get_ident())
+      return super().load_blob(session=session, blob_uri=blob_uri)
+
+  session_service = RecordingSessionService(
+      'sqlite:///:memory:',
+      artifact_service=InMemoryArtifactService(),
+      blob_offload_min_bytes=1024,
+  )
+  large_part = types.Part.from_bytes(data=b'x' * 2048, mime_type='image/png')
+  session = session_service.create_session(app_name='my_app', user_id='user')
+  for _ in range(2):
+    session_service.append_event(
+        session=session,
+        event=Event(
+            invocation_id='invocation',
+            author='user',
+            content=types.Content(role='user', parts=[large_part]),
+        ),
+    )
+  session = session_service.get_session(
+      app_name='my_app', user_id='user', session_id=session.id
+  )
+
+  loaded_parts = {}
+  for _ in range(2):
+    contents = [
+        event.content.model_copy(update={'parts': list(event.content.parts)})
+        for event in session.events
+    ]
+    await hydrate_blob_references_async(
+        contents,
+        session_service=session_service,
+        session=session,
+        loaded_parts=loaded_parts,
+    )
+    assert [content.parts for content in contents] == [
+        [large_part],
+        [large_part],
+    ]
+
+  # The blob is loaded once, and not on the event loop.
+  assert len(loaded_blob_threads) == 1
+  assert threading.get_ident() not in loaded_blob_threads
+
+def _get(session_service, session):
+  return session_service.get_session(
+      app_name=session.app_name, user_id=session.user_id, session_id=session.id
+  )
+
+
+def test_in_memory_max_sessions():
+  session_service = InMemorySessionService(max_sessions=2)
+  sessions = [
+      session_service.create_session(app_name='my_app', user_id='user')
+      for _ in range(3)
+  ]
+
+  assert not _get(session_service, sessions[0])
+  assert _get(session_service, sessions[1])
+  assert _get(session_service, sessions[2])
+
+
+def test_in_memory_max_event_bytes():
+  session_service = InMemorySessionService(max_event_bytes=2500)
+  event = Event(
+      invocation_id='invocation',
+      author='user',
+      content=types.Content(role='user', parts=[types.Part(text='x' * 800)]),
+  )
+  old_session = session_service.create_session(app_name='my_app', user_id='u')
+  session_service.append_event(old_session, event)
+  new_session = session_service.create_session(app_name='my_app', user_id='u')
+  session_service.append_event(new_session, event)
+  assert _get(session_service, old_session)
+
+  # The least recently used session is evicted, even if it is bigger.
+  session_service.append_event(new_session, event)
+  assert not _get(session_service, old_session)
+  assert len(_get(session_service, new_session).events) == 2
+
+
+def test_in_memory_idle_ttl(monkeypatch):
+  now = 1_700_000_000.0
+  monkeypatch.setattr(time, 'time', lambda: now)
+  session_service = InMemorySessionService(idle_ttl_seconds=60)
+  idle_session = session_service.create_session(app_name='my_app', user_id='u')
+
+  now += 61
+  active_session = session_service.create_session(
+      app_name='my_app', user_id='u'
+  )
+  assert not _get(session_service, idle_session)
+  assert _get(session_service, active_session)
+
+
+def test_in_memory_spill(tmp_path):
+  session_service = InMemorySessionService(
+      max_sessions=1, spill_dir=str(tmp_path)
+  )
+  spilled_session = session_service.create_session(
+      app_name='my_app', user_id='../user', state={'key': 'value'}
+  )
+  session_service.append_event(
+      spilled_session,
+      Event(
+          invocation_id='invocation',
+          author='user',
+          content=types.Content(
+              role='user',
+              parts=[
+                  types.Part.from_bytes(data=b'\x00\xff', mime_type='image/png')
+              ],
+          ),
+          actions=EventActions(state_delta={'key': 'new_value'}),
+      ),
+  )
+  other_session = session_service.create_session(
+      app_name='my_app', user_id='../user'
+  )
+  # The session is spilled along with its metadata.
+  (metadata_path,) = tmp_path.rglob('*.meta.json')
+  (spill_path,) = set(tmp_path.rglob('*.json')) - {metadata_path}
+
+  # Listings only read the metadata.
+  spilled_data = spill_path.read_text()
+  spill_path.write_text('not read')
+  assert sorted(
+      session.id
+      for session in session_service.list_sessions(
+          app_name='my_app', user_id='../user'
+      ).sessions
+  ) == sorted([spilled_session.id, other_session.id])
+  spill_path.write_text(spilled_data)
+
+  # Sessions spilled without their metadata are still listed.
+  metadata_path.unlink()
+  assert (
+      len(
+          session_service.list_sessions(
+              app_name='my_app', user_id='../user'
+          ).sessions
+      )
+      == 2
+  )
+
+  # The spilled session is reloaded, and the other one is spilled instead.
+  assert _get(session_service, spilled_session) == spilled_session
+  assert _get(session_service, other_session) == other_session
+
+  session_service.delete_session(
+      app_name='my_app', user_id='../user', session_id=spilled_session.id
+  )
+  assert not list(tmp_path.rglob('*.json'))
+  assert not _get(session_service, spilled_session)
@@ -12,16 +12,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+import http.server
+import json
 import re
+import threading
 import this
 from typing import Any
+import urllib.parse
 import uuid
 from dateutil.parser import isoparse
 from google.adk.events import Event
 from google.adk.events import EventActions
 from google.adk.sessions import Session
 from google.adk.sessions import VertexAiSessionService
+from google.adk.sessions.base_session_service import GetSessionConfig
 from google.genai import types
+from google.oauth2.credentials import Credentials
 import pytest
 
 
@@ -112,6 +119,7 @@ MOCK_SESSION = Session(
 
 SESSION_REGEX = r'^reasoningEngines/([^/]+)/sessions/([^/]+)$'
 SESSIONS_REGEX = r'^reasoningEngines/([^/]+)/sessions\?filter=user_id=([^/]+)$'
+ALL_SESSIONS_REGEX = r'^reasoningEngines/([^/]+)/sessions$'
 EVENTS_REGEX = r'^reasoningEngines/([^/]+)/sessions/([^/]+)/events$'
 LRO_REGEX = r'^operations/([^/]+)$'
 
@@ -144,6 +152,8 @@ class MockApiClient:
                 if session['userId'] == match.group(2)
             ],
         }
+      elif re.match(ALL_SESSIONS_REGEX, path):
+        return {'sessions': list(self.session_dict.values())}
       elif re.match(EVENTS_REGEX, path):
         match = re.match(EVENTS_REGEX, path)
         if match:
@@ -245,6 +255,16 @@ def test_list_sessions():
   assert sessions.sessions[1].id == '2'
 
 
+def test_list_sessions_of_all_users():
+  session_service = mock_vertex_ai_session_service()
+  sessions = session_service.list_sessions(app_name='123', user_id=None)
+  assert [(s.user_id, s.id) for s in sessions.sessions] == [
+      ('user', '1'),
+      ('user', '2'),
+      ('user2', '3'),
+  ]
+
+
 def test_create_session():
   session_service = mock_vertex_ai_session_service()
 
@@ -261,3 +281,224 @@ def test_create_session():
   assert session == session_service.get_session(
       app_name='123', user_id='user', session_id=session_id
   )
+
+
+class FakeSessionsApiHandler(http.server.BaseHTTPRequestHandler):
+  """A local stand-in for the reasoning engine sessions API."""
+
+  PAGE_SIZE = 2
+
+  def log_message(self, format, *args):
+    pass
+
+  def _send(self, status: int, body: Any):
+    data = json.dumps(body).encode()
+    self.send_response(status)
+    self.send_header('Content-Type', 'application/json')
+    self.send_header('Content-Length', str(len(data)))
+    self.end_headers()
+    self.wfile.write(data)
+
+  def _route(self) -> tuple[str, dict[str, str]]:
+    url = urllib.parse.urlsplit(self.path)
+    path = re.sub(r'^/v1beta1/(projects/[^/]+/locations/[^/]+/)?', '', url.path)
+    return path, dict(urllib.parse.parse_qsl(url.query))
+
+  def _read_json(self) -> dict[str, Any]:
+    length = int(self.headers.get('Content-Length') or 0)
+    return json.loads(self.rfile.read(length)) if length else {}
+
+  def do_GET(self):
+    server = self.server
+    path, query = self._route()
+    if match := re.fullmatch(r'reasoningEngines/123/sessions/(\w+)', path):
+      if server.check_concurrent_fetch:
+        # Only answers once the events are requested too, or times out.
+        server.fetched_concurrently = server.events_requested.wait(timeout=5)
+      if match.group(1) not in server.sessions:
+        return self._send(404, {'error': {'code': 404, 'message': 'Not found'}})
+      return self._send(200, server.sessions[match.group(1)])
+    if match := re.fullmatch(
+        r'reasoningEngines/123/sessions/(\w+)/events', path
+    ):
+      server.events_requested.set()
+      events = server.events.get(match.group(1), [])
+      if 'filter' in query:
+        after = re.fullmatch(r'timestamp>="(.+)"', query['filter']).group(1)
+        events = [
+            event
+            for event in events
+            if isoparse(event['timestamp']) >= isoparse(after)
+        ]
+      start = int(query.get('pageToken', 0))
+      end = start + int(query.get('pageSize', self.PAGE_SIZE))
+      response = {'sessionEvents': events[start:end]}
+      if end < len(events):
+        response['nextPageToken'] = str(end)
+      server.event_page_requests += 1
+      return self._send(200, response)
+    if path == 'reasoningEngines/123/sessions':
+      user_id = re.fullmatch(r'user_id=(\w+)', query['filter']).group(1)
+      return self._send(
+          200,
+          {
+              'sessions': [
+                  session
+                  for session in server.sessions.values()
+                  if session['userId'] == user_id
+              ]
+          },
+      )
+    if re.fullmatch(r'operations/\w+', path):
+      return self._send(200, {'done': True})
+    self._send(404, {'error': {'code': 404, 'message': 'Not found'}})
+
+  def do_POST(self):
+    server = self.server
+    path, _ = self._route()
+    request = self._read_json()
+    if path == 'reasoningEngines/123/sessions':
+      session_id = str(len(server.sessions) + 1)
+      server.sessions[session_id] = {
+          'name': f'reasoningEngines/123/sessions/{session_id}',
+          'userId': request['user_id'],
+          'sessionState': request.get('session_state', {}),
+          'updateTime': '2024-12-12T12:12:12.123456Z',
+      }
+      return self._send(
+          200,
+          {'name': f'reasoningEngines/123/sessions/{session_id}/operations/1'},
+      )
+    if match := re.fullmatch(
+        r'reasoningEngines/123/sessions/(\w+):appendEvent', path
+    ):
+      session_id = match.group(1)
+      seconds = request['timestamp']['seconds']
+      nanos = request['timestamp']['nanos']
+      timestamp = datetime.datetime.fromtimestamp(
+          seconds + nanos / 1e9, tz=datetime.timezone.utc
+      ).isoformat()
+      events = server.events.setdefault(session_id, [])
+      events.append({
+          'name': (
+              f'reasoningEngines/123/sessions/{session_id}/events/{len(events)}'
+          ),
+          'invocationId': request['invocation_id'],
+          'author': request['author'],
+          'timestamp': timestamp,
+          'content': request.get('content'),
+      })
+      server.sessions[session_id]['updateTime'] = timestamp
+      return self._send(200, {})
+    self._send(404, {'error': {'code': 404, 'message': 'Not found'}})
+
+  def do_DELETE(self):
+    path, _ = self._route()
+    match = re.fullmatch(r'reasoningEngines/123/sessions/(\w+)', path)
+    self.server.sessions.pop(match.group(1), None)
+    self._send(200, {})
+
+
+@pytest.fixture
+def fake_sessions_api():
+  server = http.server.ThreadingHTTPServer(
+      ('127.0.0.1', 0), FakeSessionsApiHandler
+  )
+  server.sessions = {}
+  server.events = {}
+  server.check_concurrent_fetch = False
+  server.events_requested = threading.Event()
+  server.fetched_concurrently = False
+  server.event_page_requests = 0
+  thread = threading.Thread(target=server.serve_forever, daemon=True)
+  thread.start()
+  yield server
+  server.shutdown()
+  server.server_close()
+
+
+def fake_api_vertex_ai_session_service(server) -> VertexAiSessionService:
+  return VertexAiSessionService(
+      project='test-project',
+      location='test-location',
+      credentials=Credentials(token='test-token'),
+      http_options=types.HttpOptions(
+          base_url=f'http://127.0.0.1:{server.server_port}/'
+      ),
+  )
+
+
+@pytest.mark.asyncio
+async def test_async_session_lifecycle(fake_sessions_api):
+  session_service = fake_api_vertex_ai_session_service(fake_sessions_api)
+
+  session = await session_service.create_session_async(
+      app_name='123', user_id='user', state={'key': 'value'}
+  )
+  assert session.state == {'key': 'value'}
+
+  for i in range(5):
+    await session_service.append_event_async(
+        session,
+        Event(
+            invocation_id=f'invocation_{i}',
+            author='user',
+            timestamp=1_700_000_000 + i,
+            content=types.Content(parts=[types.Part(text=f'text_{i}')]),
+        ),
+    )
+
+  fake_sessions_api.check_concurrent_fetch = True
+  loaded_session = await session_service.get_session_async(
+      app_name='123', user_id='user', session_id=session.id
+  )
+  assert fake_sessions_api.fetched_concurrently
+  fake_sessions_api.check_concurrent_fetch = False
+  assert fake_sessions_api.event_page_requests == 3
+  assert [event.invocation_id for event in loaded_session.events] == [
+      f'invocation_{i}' for i in range(5)
+  ]
+  assert loaded_session.last_update_time == 1_700_000_004
+
+  recent_session = await session_service.get_session_async(
+      app_name='123',
+      user_id='user',
+      session_id=session.id,
+      config=GetSessionConfig(num_recent_events=2),
+  )
+  assert [event.invocation_id for event in recent_session.events] == [
+      'invocation_3',
+      'invocation_4',
+  ]
+
+  fake_sessions_api.event_page_requests = 0
+  after_session = await session_service.get_session_async(
+      app_name='123',
+      user_id='user',
+      session_id=session.id,
+      config=GetSessionConfig(after_timestamp=1_700_000_003),
+  )
+  assert [event.invocation_id for event in after_session.events] == [
+      'invocation_3',
+      'invocation_4',
+  ]
+  # The timestamp filter is applied by the API.
+  assert fake_sessions_api.event_page_requests == 1
+
+  events_response = await session_service.list_events_async(
+      app_name='123', user_id='user', session_id=session.id, page_size=3
+  )
+  assert len(events_response.events) == 3
+  assert events_response.next_page_token == '3'
+
+  sessions_response = await session_service.list_sessions_async(
+      app_name='123', user_id='user'
+  )
+  assert [s.id for s in sessions_response.sessions] == [session.id]
+
+  await session_service.delete_session_async(
+      app_name='123', user_id='user', session_id=session.id
+  )
+  assert not (
+      await session_service.list_sessions_async(app_name='123', user_id='user')
+  ).sessions
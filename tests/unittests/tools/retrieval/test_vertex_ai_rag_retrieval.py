@@ -12,10 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
+from unittest import mock
+from unittest.mock import MagicMock
+
 from google.adk.agents import Agent
 from google.adk.tools.function_tool import FunctionTool
 from google.adk.tools.retrieval.vertex_ai_rag_retrieval import VertexAiRagRetrieval
 from google.genai import types
+import pytest
+from vertexai.preview import rag
 
 from ... import utils
 
@@ -145,3 +151,25 @@ def test_vertex_rag_retrieval_for_gemini_2_x():
       )
   ]
   assert 'rag_retrieval' not in mockModel.requests[0].tools_dict
+
+
+@pytest.mark.asyncio
+async def test_vertex_rag_retrieval_runs_query_off_event_loop():
+  query_threads = []
+
+  def retrieval_query(**kwargs):
+    query_threads.append(threading.get_ident())
+    return MagicMock()
+
+  tool = VertexAiRagRetrieval(
+      name='rag_retrieval',
+      description='rag_retrieval',
+      rag_corpora=[
+          'projects/123456789/locations/us-central1/ragCorpora/1234567890'
+      ],
+  )
+  with mock.patch.object(rag, 'retrieval_query', retrieval_query):
+    await tool.run_async(args={'query': 'query'}, tool_context=MagicMock())
+
+  assert query_threads
+  assert threading.get_ident() not in query_threads
@@ -12,6 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import os
+import threading
+import time
 from unittest.mock import MagicMock
 
 from google.adk.tools.function_tool import FunctionTool
@@ -73,6 +77,28 @@ def test_init():
   assert tool.func == function_for_testing_with_no_args
 
 
+def test_get_declaration_cached(monkeypatch):
+  """Test that the declaration is built once per function and API variant."""
+
+  def add(x: int, y: int) -> int:
+    return x + y
+
+  tool = FunctionTool(add)
+  declaration = tool._get_declaration()
+
+  assert declaration.name == "add"
+  assert tool._get_declaration() is declaration
+
+  monkeypatch.setenv(
+      "GOOGLE_GENAI_USE_VERTEXAI",
+      "0" if tool._api_variant == "VERTEX_AI" else "1",
+  )
+  assert tool._get_declaration() is not declaration
+
+  tool.func = function_for_testing_with_no_args
+  assert tool._get_declaration().name == "function_for_testing_with_no_args"
+
+
 @pytest.mark.asyncio
 async def test_run_async_with_tool_context_async_func():
   """Test that run_async calls the function with tool_context when tool_context is in signature (async function)."""
@@ -236,3 +262,84 @@ async def test_run_async_with_optional_args_not_set_async_func():
   args = {"arg1": "test_value_1", "arg3": "test_value_3"}
   result = await tool.run_async(args=args, tool_context=MagicMock())
   assert result == "test_value_1,test_value_3"
+
+
+def function_for_testing_returning_pid():
+  """Function for testing returning the process id."""
+  return os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_run_async_sync_func_off_event_loop():
+  """Test that run_async runs sync functions on a worker thread."""
+
+  def get_thread_id():
+    return threading.get_ident()
+
+  tool = FunctionTool(get_thread_id)
+  result = await tool.run_async(args={}, tool_context=MagicMock())
+  assert result != threading.get_ident()
+
+
+@pytest.mark.asyncio
+async def test_run_async_timeout():
+  """Test that run_async reports the timeout of a slow function."""
+
+  def slow_function():
+    time.sleep(0.5)
+
+  tool = FunctionTool(slow_function, timeout=0.01)
+  result = await tool.run_async(args={}, tool_context=MagicMock())
+  assert result == {
+      "error": "Invoking `slow_function()` timed out after 0.01 seconds."
+  }
+
+
+def _raise_timeout_error():
+  raise TimeoutError("The tool timed out.")
+
+
+async def _async_raise_timeout_error():
+  raise TimeoutError("The tool timed out.")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "func", [_raise_timeout_error, _async_raise_timeout_error]
+)
+@pytest.mark.parametrize("timeout", [None, 10])
+async def test_run_async_propagates_timeout_error_of_function(func, timeout):
+  """Test that a TimeoutError of the function is not reported as a timeout."""
+  tool = FunctionTool(func, timeout=timeout)
+  with pytest.raises(TimeoutError, match="The tool timed out."):
+    await tool.run_async(args={}, tool_context=MagicMock())
+
+
+@pytest.mark.asyncio
+async def test_run_async_timeout_of_async_function():
+  """Test that run_async reports the timeout of a slow async function."""
+
+  async def slow_function():
+    await asyncio.sleep(10)
+
+  tool = FunctionTool(slow_function, timeout=0.01)
+  result = await tool.run_async(args={}, tool_context=MagicMock())
+  assert result == {
+      "error": "Invoking `slow_function()` timed out after 0.01 seconds."
+  }
+
+
+@pytest.mark.asyncio
+async def test_run_async_cpu_bound():
+  """Test that run_async runs CPU-bound functions on a worker process."""
+  tool = FunctionTool(function_for_testing_returning_pid, cpu_bound=True)
+  result = await tool.run_async(args={}, tool_context=MagicMock())
+  assert result != os.getpid()
+
+
+def test_init_cpu_bound_with_tool_context():
+  """Test that CPU-bound functions cannot take a tool_context."""
+  with pytest.raises(ValueError):
+    FunctionTool(
+        function_for_testing_with_1_arg_and_tool_context, cpu_bound=True
+    )
@@ -0,0 +1,59 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import contextvars
+import threading
+
+from google.adk.tools.tool_executor import ToolExecutor
+import pytest
+
+_request_id = contextvars.ContextVar('request_id', default=None)
+
+
+@pytest.mark.asyncio
+async def test_run_in_caller_context():
+  executor = ToolExecutor(max_workers=1)
+  _request_id.set('request')
+  try:
+    assert await executor.run(_request_id.get) == 'request'
+  finally:
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_stats():
+  executor = ToolExecutor(max_workers=1)
+  release = threading.Event()
+  try:
+    blocked = asyncio.ensure_future(executor.run(release.wait))
+    queued = asyncio.ensure_future(executor.run(lambda: 'queued'))
+    await asyncio.sleep(0)
+    stats = executor.stats().thread_pool
+    assert (stats.submitted, stats.in_flight) == (2, 2)
+    assert stats.saturation == 2
+
+    with pytest.raises(asyncio.TimeoutError):
+      await executor.run(lambda: None, timeout=0.01)
+    assert executor.stats().thread_pool.timed_out == 1
+
+    release.set()
+    assert await blocked
+    assert await queued == 'queued'
+    await asyncio.sleep(0.01)
+    stats = executor.stats().thread_pool
+    assert (stats.submitted, stats.in_flight) == (3, 0)
+  finally:
+    release.set()
+    executor.shutdown()